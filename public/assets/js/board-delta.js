@@ -0,0 +1,127 @@
+/*
+ * board-delta.js -- bring a loaded leaderboard.json up to date from the delta log.
+ *
+ * WHY THIS FILE EXISTS
+ * --------------------
+ * scripts/publish-live-board.py republishes the live board every few hours. A page
+ * left open on /leaderboard/ used to show whatever it loaded, and the only way to see
+ * a new score was to reload the whole board. Alongside leaderboard.json the publisher
+ * now writes leaderboard-delta.json: for each recent revision, the entries added or
+ * changed (`upsert`) and the ones gone (`remove`). A page polls that small file and
+ * applies what it has not seen.
+ *
+ * THE CONTRACT (publish-live-board.py, append_delta)
+ *   - leaderboard.json carries meta.revision; the log carries `revision` (the newest),
+ *     `oldest_base` (the oldest revision it can be applied to) and `board_key`.
+ *   - a page at revision R may apply every delta after R, in order, when the board key
+ *     matches and oldest_base <= R <= revision. Anything else -- a new board key, a
+ *     page too far behind, a board with no revision at all -- means reload the board.
+ *   - `remove` names an entry by its entry_uuid, or, when the API gave it none, by the
+ *     whole entry; `upsert` replaces the entry with the same uuid or adds a new one.
+ *   - every delta states the board's total_entries after it. A result that disagrees
+ *     is discarded and the board reloaded, so a delta can never leave a page showing a
+ *     board the publisher did not publish.
+ *
+ * applyBoardDelta() returns {board, applied} or null. null always means "reload
+ * leaderboard.json"; it never means "nothing changed" (that is applied: 0). Entries
+ * are re-ranked with the publisher's own key (rank_key), so a page that applied deltas
+ * shows the order a fresh load would.
+ */
+(function () {
+  'use strict';
+
+  function canonical(v) {
+    if (Array.isArray(v)) { return '[' + v.map(canonical).join(',') + ']'; }
+    if (v && typeof v === 'object') {
+      return '{' + Object.keys(v).sort().map(function (k) {
+        return JSON.stringify(k) + ':' + canonical(v[k]);
+      }).join(',') + '}';
+    }
+    return JSON.stringify(v);
+  }
+
+  function hasUuid(e) { return typeof e.entry_uuid === 'string' && e.entry_uuid !== ''; }
+
+  function matches(entry, ref) {
+    return typeof ref === 'string' ? entry.entry_uuid === ref
+                                   : !hasUuid(ref) && canonical(entry) === canonical(ref);
+  }
+
+  function cmp(a, b) { return a < b ? -1 : (a > b ? 1 : 0); }
+
+  // publish-live-board.py rank_key: score desc, doom_integral desc (ADR-0002), then
+  // date, uuid, name ascending.
+  function rankEntries(entries) {
+    return entries.slice().sort(function (a, b) {
+      return ((Number(b.score) || 0) - (Number(a.score) || 0))
+        || ((Number(b.doom_integral) || 0) - (Number(a.doom_integral) || 0))
+        || cmp(String(a.date || ''), String(b.date || ''))
+        || cmp(String(a.entry_uuid || ''), String(b.entry_uuid || ''))
+        || cmp(String(a.player_name || ''), String(b.player_name || ''));
+    });
+  }
+
+  function sameKey(a, b) {
+    return !!a && !!b && a.seed === b.seed && a.ladder_epoch === b.ladder_epoch;
+  }
+
+  function applyBoardDelta(board, log) {
+    var meta = (board && board.meta) || {};
+    var rev = meta.revision;
+    if (!log || typeof rev !== 'number' || typeof log.revision !== 'number'
+        || !Array.isArray(log.deltas) || !sameKey(meta.board_key, log.board_key)) {
+      return null;
+    }
+    if (rev === log.revision) { return { board: board, applied: 0 }; }
+    if (rev < log.oldest_base || rev > log.revision) { return null; }
+
+    var entries = (board.entries || []).slice();
+    var last = null;
+    var expected = rev + 1;
+    for (var i = 0; i < log.deltas.length; i++) {
+      var d = log.deltas[i];
+      if (d.revision <= rev) { continue; }
+      if (d.revision !== expected) { return null; }   // a gap: never guess across it
+      (d.remove || []).forEach(function (ref) {
+        for (var j = 0; j < entries.length; j++) {
+          if (matches(entries[j], ref)) { entries.splice(j, 1); return; }
+        }
+      });
+      (d.upsert || []).forEach(function (e) {
+        for (var j = 0; hasUuid(e) && j < entries.length; j++) {
+          if (entries[j].entry_uuid === e.entry_uuid) { entries[j] = e; return; }
+        }
+        entries.push(e);
+      });
+      if (entries.length !== d.total_entries) { return null; }
+      last = d;
+      expected++;
+    }
+    if (!last || last.revision !== log.revision) { return null; }
+
+    var ranked = rankEntries(entries);
+    var players = {};
+    var builds = {};
+    ranked.forEach(function (e) {
+      if (e.player_name) { players[e.player_name] = true; }
+      if (e.game_mode) { builds[e.game_mode] = true; }
+    });
+    var nextMeta = Object.assign({}, meta, {
+      revision: last.revision,
+      generated: last.generated,
+      total_entries: ranked.length,
+      total_players: Object.keys(players).length,
+      builds_seen: Object.keys(builds).sort()
+    });
+    return {
+      board: Object.assign({}, board, { meta: nextMeta, entries: ranked,
+                                        data_status: last.data_status }),
+      applied: log.revision - rev
+    };
+  }
+
+  var API = { applyBoardDelta: applyBoardDelta, rankEntries: rankEntries };
+
+  if (typeof window !== 'undefined') { window.applyBoardDelta = applyBoardDelta; }
+  if (typeof module !== 'undefined' && module.exports) { module.exports = API; }
+})();
@@ -37,12 +37,13 @@ import argparse
 import json
 import os
 import sys
-import urllib.error
 import urllib.parse
-import urllib.request
 from datetime import datetime, timezone
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import http_client  # noqa: E402
+
 # Windows consoles default to cp1252: the first non-ASCII byte written to stdout
 # raises UnicodeEncodeError and kills the script before it does any work. No-op
 # on UTF-8 platforms. See CLAUDE.md "Environment / tooling".
@@ -75,14 +76,9 @@ def load_json(path, default=None):
 
 
 def get_json(url, headers=None, timeout=15):
-    req = urllib.request.Request(url, headers=headers or {})
-    try:
-        with urllib.request.urlopen(req, timeout=timeout) as r:
-            return json.loads(r.read().decode("utf-8")), None
-    except urllib.error.HTTPError as e:
-        return None, "HTTP %s" % e.code
-    except Exception as e:
-        return None, str(e)
+    # Shared keep-alive pool (scripts/http_client.py): the Plausible and GitHub
+    # calls below each hit their host more than once.
+    return http_client.get_json(url, headers, timeout)
 
 
 # ---------------------------------------------------------------- stream A
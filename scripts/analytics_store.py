@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Checkpointed state for incremental access-log ingestion (extract_analytics.py).
+
+WHY THIS EXISTS
+---------------
+A full extraction reads access.log, access.log.1 and the rotated .gz files end to
+end and recounts the whole window, although all but the last day was counted by
+the run before. With --incremental, extract_analytics.py keeps this state between
+runs instead:
+
+  * per log file, how many bytes of it have been counted, and
+  * per day, the aggregates those bytes produced,
+
+so each run reads only what was appended since the last one, folds it into the
+days it belongs to, and reports any window from the stored days. A daily run
+costs one day of traffic, not thirty.
+
+THE STATE FILE
+--------------
+    {"format": 2, "updated": "<YYYY-MM-DD>",
+     "files": {"<fingerprint>": {"name": "access.log.1", "inode": 1234,
+                                 "offset": 52311, "seen": "<YYYY-MM-DD>"}, ...},
+     "days":  {"<YYYY-MM-DD>": {"hits": 812, "requests": 640, "page_views": 201,
+                                "bandwidth_bytes": 9312345, "visitors": "<sketch>",
+                                "paths": {...}, "path_visitors": {"/": "<sketch>"},
+                                "status": {...}, "referrers": {...},
+                                "hours": {...}}, ...}}
+
+A file is known by its FINGERPRINT -- the SHA-256 of its first line (at most
+4 KB) -- not by its name, because rotation renames: today's access.log is
+tomorrow's access.log.1 and next week's access.log.2.gz, with the same first line
+throughout. So a renamed or compressed file resumes at the offset it had; a file
+with a first line never seen is new and read from byte 0; and a file truncated in
+place (copytruncate) starts with a different line, so it is new too. The inode is
+kept to make sure the file read is the file probed, and to say what happened.
+
+Offsets only ever advance past a complete line. A line still being written is
+read, whole, by the next run.
+
+UNIQUE VISITORS
+---------------
+Visitors are counted with a HyperLogLog sketch, not a set of hashed addresses:
+one per day, and one per day for each page. A sketch is a fixed array of small
+registers (VISITOR_PRECISION 12: 4,096 of them, a standard error of 1.6%; pages
+use PAGE_PRECISION 10: 1,024, 3.3%), whatever the traffic. Sketches MERGE: the
+union of two is the register-wise maximum, exactly the sketch of the combined
+visitors. So uniques over any range of days, for the site or one page, come from
+merging stored sketches -- daily numbers could never be added up into that, and
+nothing has to be reparsed. A sketch cannot be turned back into the hashes that
+built it, which a set of (trivially reversible) IPv4 hashes could.
+
+WHAT IT IS CAREFUL ABOUT
+------------------------
+  * Nothing is counted twice. Offsets and days are saved together, in one atomic
+    write, after the run. A run that dies part way leaves the previous state, and
+    the next run reads the same bytes again from the same offsets.
+  * It is local: .analytics-state/ is gitignored and never deployed. CI carries
+    it between runs in the Actions cache. Losing it costs one full read, not
+    correctness.
+  * Bounded. Days older than RETAIN_DAYS and files not seen for as long are
+    dropped on save. A damaged file, or one of another FORMAT, is set aside with
+    a warning and the run starts from scratch.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import math
+import os
+import sys
+import zlib
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_STATE = ROOT / ".analytics-state" / "dreamhost.json"
+FORMAT = 2  # 2: visitor sets became HyperLogLog sketches
+RETAIN_DAYS = 62  # a --month report of last month, or --days 30, with room to spare
+HEAD_BYTES = 4096
+VISITOR_PRECISION = 12
+PAGE_PRECISION = 10
+
+
+def is_page(path: str) -> bool:
+    """A page view is a successful request for an HTML page or a directory."""
+    return path.endswith('.html') or path.endswith('/') or path == '/'
+
+
+def fingerprint(head: bytes):
+    """Identify a log by its first line (within HEAD_BYTES). None while it is empty."""
+    head = head[:HEAD_BYTES]
+    cut = head.find(b"\n")
+    if cut >= 0:
+        head = head[:cut + 1]
+    if not head:
+        return None
+    return hashlib.sha256(head).hexdigest()
+
+
+class HyperLogLog:
+    """
+    Approximate distinct count of 64-bit hashes in 2**p one-byte registers.
+
+    Flajolet et al. (2007), with linear counting below 2.5 * 2**p, where it is
+    more accurate. The input is already a uniform hash (AnalyticsExtractor's
+    anonymize_ip: 64 bits of SHA-256), so no second hash is taken.
+    """
+
+    __slots__ = ("p", "registers")
+
+    def __init__(self, p: int = VISITOR_PRECISION, registers: bytes = None):
+        if not 4 <= p <= 16:
+            raise ValueError("HyperLogLog precision must be 4..16, not %r" % p)
+        self.p = p
+        m = 1 << p
+        self.registers = bytearray(registers) if registers is not None else bytearray(m)
+        if len(self.registers) != m:
+            raise ValueError("%d registers for precision %d" % (len(self.registers), p))
+
+    def add_hash(self, h: int):
+        """Add one 64-bit hash."""
+        p = self.p
+        rest = h & ((1 << (64 - p)) - 1)
+        rank = 64 - p - rest.bit_length() + 1
+        i = h >> (64 - p)
+        if rank > self.registers[i]:
+            self.registers[i] = rank
+
+    def add(self, ip_hash: str):
+        """Add one anonymised address (16 hex digits)."""
+        self.add_hash(int(ip_hash, 16))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Make this the sketch of the union. Both must have the same precision."""
+        if other.p != self.p:
+            raise ValueError("cannot merge precision %d into %d" % (other.p, self.p))
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def copy(self) -> "HyperLogLog":
+        return HyperLogLog(self.p, self.registers)
+
+    def count(self) -> int:
+        """The estimated number of distinct hashes added."""
+        m = len(self.registers)
+        zeros = self.registers.count(0)
+        if zeros == m:
+            return 0
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_json(self) -> str:
+        """The sketch as "p:base64(zlib(registers))"; a sparse one is a few bytes."""
+        return "%d:%s" % (self.p, base64.b64encode(zlib.compress(bytes(self.registers), 9))
+                          .decode("ascii"))
+
+    @classmethod
+    def from_json(cls, text: str) -> "HyperLogLog":
+        p, _, blob = text.partition(":")
+        try:
+            return cls(int(p), zlib.decompress(base64.b64decode(blob, validate=True)))
+        except (zlib.error, ValueError) as e:
+            raise ValueError("unreadable HyperLogLog sketch: %s" % e) from None
+
+    def __eq__(self, other):
+        return (isinstance(other, HyperLogLog) and self.p == other.p
+                and self.registers == other.registers)
+
+
+def union(sketches, p: int = VISITOR_PRECISION) -> HyperLogLog:
+    """One sketch of everything any of `sketches` saw."""
+    out = HyperLogLog(p)
+    for sk in sketches:
+        out.merge(sk)
+    return out
+
+
+def _new_day():
+    return {"hits": 0, "requests": 0, "page_views": 0, "bandwidth_bytes": 0,
+            "visitors": HyperLogLog(VISITOR_PRECISION), "paths": Counter(),
+            "path_visitors": {}, "status": Counter(), "referrers": Counter(),
+            "hours": Counter()}
+
+
+class DailyAggregates:
+    """Per-day totals of parsed log entries, mergeable and serialisable."""
+
+    def __init__(self):
+        self.days = {}
+
+    def add(self, entry):
+        """Fold one extract_analytics parse_log_line() entry into its day."""
+        day = self.days.get(entry['date'])
+        if day is None:
+            day = self.days[entry['date']] = _new_day()
+        day["hits"] += 1
+        # Skip bots for visitor counts
+        if not entry['is_bot']:
+            day["requests"] += 1
+            h = int(entry['ip_hash'], 16)
+            day["visitors"].add_hash(h)
+            day["bandwidth_bytes"] += entry['size']
+            if entry['status'] == 200 and is_page(entry['path']):
+                day["page_views"] += 1
+                day["paths"][entry['path']] += 1
+                page = day["path_visitors"].get(entry['path'])
+                if page is None:
+                    page = day["path_visitors"][entry['path']] = HyperLogLog(PAGE_PRECISION)
+                page.add_hash(h)
+        day["status"][entry['status']] += 1
+        day["hours"][entry['hour']] += 1
+        if entry.get('referrer_domain'):
+            day["referrers"][entry['referrer_domain']] += 1
+
+    def merge(self, other):
+        """Add another DailyAggregates' days into these."""
+        for d, theirs in other.days.items():
+            mine = self.days.get(d)
+            if mine is None:
+                mine = self.days[d] = _new_day()
+            for k in ("hits", "requests", "page_views", "bandwidth_bytes"):
+                mine[k] += theirs[k]
+            mine["visitors"].merge(theirs["visitors"])
+            for path, sk in theirs["path_visitors"].items():
+                if path in mine["path_visitors"]:
+                    mine["path_visitors"][path].merge(sk)
+                else:
+                    mine["path_visitors"][path] = sk.copy()
+            for k in ("paths", "status", "referrers", "hours"):
+                mine[k].update(theirs[k])
+
+    def _range(self, start: str = None, end: str = None):
+        return [v for d, v in sorted(self.days.items())
+                if (not start or d >= start) and (not end or d <= end)]
+
+    def visitors(self, start: str = None, end: str = None) -> HyperLogLog:
+        """The merged visitor sketch of every stored day in [start, end]."""
+        return union(v["visitors"] for v in self._range(start, end))
+
+    def page_visitors(self, path: str, start: str = None, end: str = None) -> HyperLogLog:
+        """The merged visitor sketch of one page over [start, end]."""
+        return union((v["path_visitors"][path] for v in self._range(start, end)
+                      if path in v["path_visitors"]), PAGE_PRECISION)
+
+    def prune(self, oldest: str):
+        """Drop every day before `oldest` (YYYY-MM-DD)."""
+        for d in [d for d in self.days if d < oldest]:
+            del self.days[d]
+
+    def to_json(self):
+        return {d: {"hits": v["hits"], "requests": v["requests"],
+                    "page_views": v["page_views"], "bandwidth_bytes": v["bandwidth_bytes"],
+                    "visitors": v["visitors"].to_json(),
+                    "paths": dict(v["paths"]),
+                    "path_visitors": {p: sk.to_json()
+                                      for p, sk in sorted(v["path_visitors"].items())},
+                    "status": {str(k): n for k, n in v["status"].items()},
+                    "referrers": dict(v["referrers"]),
+                    "hours": {str(k): n for k, n in v["hours"].items()}}
+                for d, v in sorted(self.days.items())}
+
+    @classmethod
+    def from_json(cls, doc):
+        agg = cls()
+        for d, v in doc.items():
+            agg.days[d] = {"hits": v["hits"], "requests": v["requests"],
+                           "page_views": v["page_views"],
+                           "bandwidth_bytes": v["bandwidth_bytes"],
+                           "visitors": HyperLogLog.from_json(v["visitors"]),
+                           "paths": Counter(v["paths"]),
+                           "path_visitors": {p: HyperLogLog.from_json(sk)
+                                             for p, sk in v["path_visitors"].items()},
+                           "status": Counter({int(k): n for k, n in v["status"].items()}),
+                           "referrers": Counter(v["referrers"]),
+                           "hours": Counter({int(k): n for k, n in v["hours"].items()})}
+        return agg
+
+
+class IngestState:
+    """File offsets and the daily aggregates they produced, loaded and saved together."""
+
+    def __init__(self, path=DEFAULT_STATE):
+        self.path = Path(path)
+        self.files = {}
+        self.days = DailyAggregates()
+
+    @classmethod
+    def load(cls, path=DEFAULT_STATE):
+        """The saved state, or an empty one if there is none or it is unusable."""
+        state = cls(path)
+        if not state.path.exists():
+            return state
+        try:
+            doc = json.loads(state.path.read_text(encoding="utf-8"))
+            if doc.get("format") != FORMAT:
+                raise ValueError("format %r, expected %d" % (doc.get("format"), FORMAT))
+            files = {fp: {"name": str(r["name"]), "inode": r.get("inode"),
+                          "offset": int(r["offset"]), "seen": str(r["seen"])}
+                     for fp, r in doc["files"].items()}
+            days = DailyAggregates.from_json(doc["days"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            aside = state.path.with_name(state.path.name + ".unusable")
+            os.replace(state.path, aside)
+            print(f"  Warning: ingest state {state.path} is unusable ({e}); "
+                  f"moved to {aside.name}, reading every log from the start")
+            return state
+        state.files, state.days = files, days
+        return state
+
+    def offset(self, fp) -> int:
+        """Bytes of the file with this fingerprint already counted."""
+        rec = self.files.get(fp)
+        return rec["offset"] if rec else 0
+
+    def advance(self, fp, name, inode, offset, today: str):
+        self.files[fp] = {"name": name, "inode": inode, "offset": offset, "seen": today}
+
+    def save(self, today: str):
+        """Prune to RETAIN_DAYS and write atomically: offsets and days land together."""
+        oldest = (date.fromisoformat(today) - timedelta(days=RETAIN_DAYS)).isoformat()
+        self.days.prune(oldest)
+        self.files = {fp: r for fp, r in self.files.items() if r["seen"] >= oldest}
+        doc = {"format": FORMAT, "updated": today,
+               "files": dict(sorted(self.files.items())), "days": self.days.to_json()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(doc, separators=(",", ":")) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unique visitors over any range of days, from the ingest state")
+    parser.add_argument("--state", default=str(DEFAULT_STATE))
+    parser.add_argument("--from", dest="start", help="first day (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", help="last day (YYYY-MM-DD)")
+    parser.add_argument("--path", action="append",
+                        help="also report this page's unique visitors (repeatable)")
+    args = parser.parse_args()
+
+    if not Path(args.state).exists():
+        print("No ingest state at %s -- run extract_analytics.py --incremental first"
+              % args.state)
+        return 1
+    state = IngestState.load(args.state)
+    days = [d for d in sorted(state.days.days)
+            if (not args.start or d >= args.start) and (not args.end or d <= args.end)]
+    if not days:
+        print("No stored days in that range")
+        return 1
+    print("%s to %s (%d stored days)" % (days[0], days[-1], len(days)))
+    print("  unique visitors: %d" % state.days.visitors(args.start, args.end).count())
+    for path in args.path or []:
+        print("  %s: %d" % (path, state.days.page_visitors(path, args.start, args.end).count()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Time the compiled event-page template against the f-string it replaced.
+
+WHY THIS EXISTS
+---------------
+Rendering event pages is the bulk of every sync: ~1,200 pages on a full run,
+each re-rendered whenever the generator changes. The page template
+(scripts/sync/templates/event-detail.html.tmpl) was introduced to make that
+cheaper, and a claim of "faster" with no number behind it goes stale the first
+time someone adds a slot. This prints the number.
+
+It renders the same records through both renderers:
+
+  legacy     the f-string, over a fully pre-escaped copy of each record -- read
+             from git, as scripts/sync/sync-events.py stood in the parent of
+             the commit that added templates/event-detail.html.tmpl (--legacy-rev
+             names another)
+  template   generate_event_detail_page() -- the compiled template, escaping
+             only what it prints
+
+and reports microseconds per page as the BEST of several repeats (the minimum is
+the least noisy estimate of what the code costs; everything above it is the
+machine). Before timing anything it checks the two agree on every page, so a
+"speed-up" that changed the output is reported as a failure, not a win.
+test-event-template.py is the real equivalence test; this check only keeps the
+numbers honest. Without the history (a shallow clone) only the template is timed.
+
+Not a CI gate: timings on shared runners are too noisy to assert on.
+
+Usage:
+    python scripts/bench-event-render.py                      # public/data/events.json
+    python scripts/bench-event-render.py --corpus PATH.json   # any events.json-shaped file
+    python scripts/bench-event-render.py --repeat 7
+    python scripts/bench-event-render.py --legacy-rev REV     # f-string from REV
+"""
+
+import argparse
+import importlib.util
+import json
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+SYNC_EVENTS = "scripts/sync/sync-events.py"
+TEMPLATE = "scripts/sync/templates/event-detail.html.tmpl"
+
+
+def git(*args):
+    out = subprocess.run(["git", "-C", str(ROOT), *args], capture_output=True,
+                         text=True, encoding="utf-8")
+    return out.stdout if out.returncode == 0 else None
+
+
+def load_legacy(rev):
+    """sync-events.py at `rev` (default: just before the template), or None.
+
+    Executed under its real path, so SCRIPT_DIR and friends resolve as they did;
+    only definitions run at import, and only generate_event_detail_page is called.
+    """
+    if rev is None:
+        added = git("log", "--diff-filter=A", "--format=%H", "-1", "--", TEMPLATE)
+        if not added or not added.strip():
+            return None
+        rev = added.strip() + "^"
+    source = git("show", f"{rev}:{SYNC_EVENTS}")
+    if source is None:
+        return None
+    module = types.ModuleType("legacy_sync_events")
+    module.__file__ = str(ROOT / SYNC_EVENTS)
+    exec(compile(source, f"{rev}:{SYNC_EVENTS}", "exec"), module.__dict__)
+    return module
+
+
+def best_per_page(render, items, repeat):
+    """Minimum over `repeat` passes of the mean seconds per page."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for event_id, event in items:
+            render(event_id, event)
+        best = min(best, (time.perf_counter() - start) / len(items))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--corpus", type=Path, default=ROOT / "public" / "data" / "events.json",
+                        help="events.json-shaped file of published records")
+    parser.add_argument("--repeat", type=int, default=5, help="passes per renderer (default 5)")
+    parser.add_argument("--legacy-rev", help="git revision to read the f-string renderer "
+                                             "from (default: the one before the template)")
+    args = parser.parse_args()
+
+    se = load("sync_events", ROOT / SYNC_EVENTS)
+    legacy = load_legacy(args.legacy_rev)
+
+    corpus = json.loads(args.corpus.read_text(encoding="utf-8"))
+    items = list(corpus.items())
+    if not items:
+        print(f"FAIL: {args.corpus} holds no events")
+        return 1
+
+    start = time.perf_counter()
+    se.event_page_template()
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    if legacy is None:
+        print(f"  (no git history for {SYNC_EVENTS}: timing the template alone)")
+    else:
+        mismatched = [event_id for event_id, event in items
+                      if se.generate_event_detail_page(event_id, event)
+                      != legacy.generate_event_detail_page(event_id, event)]
+        if mismatched:
+            print(f"FAIL: the renderers disagree on {len(mismatched)} page(s), e.g. "
+                  f"{mismatched[:3]} -- run scripts/test-event-template.py")
+            return 1
+
+    old = legacy and best_per_page(legacy.generate_event_detail_page, items, args.repeat)
+    new = best_per_page(se.generate_event_detail_page, items, args.repeat)
+
+    print(f"{len(items)} pages from {args.corpus}, best of {args.repeat}")
+    print(f"  {'renderer':<10} {'us/page':>10} {'full run':>10}")
+    for name, secs in (("legacy", old), ("template", new)):
+        if secs:
+            print(f"  {name:<10} {secs * 1e6:>10.1f} {secs * len(items):>9.2f}s")
+    print(f"  template compile, once per process: {compile_ms:.1f} ms")
+    if old:
+        print(f"  speed-up: x{old / new:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Time and size ingest_scores.py's k-way merge against the collect-and-sort it replaced.
+
+WHY THIS EXISTS
+---------------
+ingest_scores.py aggregates every publishable seed file into one board. It used to
+pour all of them into a dict and sorted() the lot; it now merges the files as
+ranked streams (merge_ranked(): heapq.merge, dedup by entry_key(), optional stop
+after N). The point of the change is that a full historical aggregate should not
+make the publisher's footprint grow with history, and a claim like that needs a
+number behind it on boards far larger than the seed directory holds today.
+
+It builds synthetic seed boards -- FILES boards, TOTAL entries between them, one
+run in DUP_EVERY copied into a second file the way a re-export would -- and
+reports, for each strategy:
+
+  sort       the old path: dict by entry_key(), then sorted() by ADR-0002
+  merge      merge_ranked(streams), the whole board
+  merge-top  merge_ranked(streams, N), the best N only (--top N)
+
+as the BEST wall time of several repeats and the peak memory the aggregation
+itself allocated (tracemalloc, measured in a separate pass so its overhead does
+not count against the timing). The input boards are built before measuring, as
+the seed file cache holds them in a real run, so only the aggregate is charged.
+Before timing anything it checks the strategies publish the same board (and the
+top N is that board's prefix): a faster merge that changed the board is a
+failure, not a win.
+
+Not a CI gate: timings on shared runners are too noisy to assert on.
+
+Usage:
+    python scripts/bench-ingest-merge.py                    # 10^5 and 10^6 entries
+    python scripts/bench-ingest-merge.py --total 200000 --files 52 --top 100
+    python scripts/bench-ingest-merge.py --repeat 5
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import ingest_scores  # noqa: E402
+
+DUP_EVERY = 50
+
+
+def boards(total, files, seed=1):
+    """`files` ranked seed boards holding `total` entries between them."""
+    rng = random.Random(seed)
+    out = [[] for _ in range(files)]
+    for i in range(total):
+        e = {"score": rng.randint(0, 5000), "doom_integral": round(rng.random() * 100, 1),
+             "player_name": "P%d" % rng.randint(0, total // 20 or 1),
+             "date": "2026-%02d-%02d" % (1 + i % 12, 1 + i % 28), "entry_uuid": "run-%d" % i}
+        out[i % files].append(e)
+        if i % DUP_EVERY == 0:
+            out[(i + 1) % files].append(e)
+    return [sorted(b, key=ingest_scores.adr_rank, reverse=True) for b in out]
+
+
+def collect_and_sort(streams, top=None):
+    entries = {}
+    for stream in streams:
+        for e in stream:
+            entries[ingest_scores.entry_key(e)] = e
+    return sorted(entries.values(), key=ingest_scores.adr_rank, reverse=True)
+
+
+def merge(streams, top=None):
+    return list(ingest_scores.merge_ranked(streams, top))
+
+
+def measure(fn, streams, top, repeat):
+    """(best seconds, peak bytes allocated by one call)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(streams, top)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn(streams, top)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--total", type=int, action="append",
+                        help="entries across all boards (repeatable; default 10^5 and 10^6)")
+    parser.add_argument("--files", type=int, default=104,
+                        help="seed boards to merge (default 104: two years of weeks)")
+    parser.add_argument("--top", type=int, default=1000, help="N for merge-top (default 1000)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes per strategy")
+    args = parser.parse_args()
+
+    for total in args.total or [10 ** 5, 10 ** 6]:
+        streams = boards(total, args.files)
+        held = sum(len(s) for s in streams)
+        want = collect_and_sort(streams)
+        if merge(streams) != want or merge(streams, args.top) != want[:args.top]:
+            print("FAIL: the merge and collect-and-sort disagree at %d entries -- "
+                  "run scripts/test_ingest_scores.py" % total)
+            return 1
+
+        print("%d entries in %d boards (%d rows with re-exported copies), best of %d"
+              % (total, args.files, held, args.repeat))
+        print("  %-15s %10s %12s" % ("strategy", "seconds", "peak MiB"))
+        rows = (("sort", collect_and_sort, None), ("merge", merge, None),
+                ("merge-top", merge, args.top))
+        results = {}
+        for name, fn, top in rows:
+            secs, peak = measure(fn, streams, top, args.repeat)
+            results[name] = (secs, peak)
+            print("  %-15s %10.3f %12.1f" % (name if top is None else "%s %d" % (name, top),
+                                             secs, peak / 2 ** 20))
+        s, m, t = results["sort"], results["merge"], results["merge-top"]
+        print("  merge vs sort: x%.2f time, x%.2f memory; top %d vs sort: x%.1f time, "
+              "x%.0f less memory" % (s[0] / m[0], m[1] / s[1], args.top, s[0] / t[0],
+                                     s[1] / max(t[1], 1)))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
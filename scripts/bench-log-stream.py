@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Time and size the streaming log analysis on a synthetic multi-GB access log.
+
+WHY THIS EXISTS
+---------------
+extract_analytics.py used to hold a whole log window in memory -- the captured
+text, a list of its lines, and a parsed dict per line -- before counting
+anything. It now reads one line at a time into a LogAggregator. The claim that
+matters is that peak memory stays flat as the log grows: the night a post goes
+viral is the night the logs are biggest.
+
+It writes a combined-format log of each requested size (a fixed audience of
+--visitors addresses over 30 days in time order, bots, 4xx, referrers, a junk line now and
+then), then analyses it in a fresh child process and reports lines/s and the
+child's peak RSS for:
+
+  streamed       extractor.analyze_logs(extractor.fetch_logs(log_files=[path]))
+  materialised   the old shape: every line in a list, a dict per line, then the
+                 count -- only up to --materialised-max, since it needs several
+                 times the file size in RAM
+  gzip           the same log as a .gz, decompressed as it is read (--gz)
+  parallel       extractor.analyze_files([path], jobs=--jobs): byte ranges parsed
+                 in worker processes and merged (peak RSS is the parent's only)
+
+Not a CI gate: it takes minutes per GB and timings on shared runners are noise.
+
+Usage:
+    python scripts/bench-log-stream.py                     # 0.1 GB and 2 GB
+    python scripts/bench-log-stream.py --gb 0.25 --gb 4 --gz
+    python scripts/bench-log-stream.py --gb 1 --jobs 8
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+SCRIPTS = Path(__file__).resolve().parent
+
+PATHS = ["/", "/index.html", "/blog/", "/blog/post-%d.html", "/assets/app.js",
+         "/leaderboard/", "/data/version.json", "/events/%d.html", "/metrics/"]
+AGENTS = ["Mozilla/5.0 (X11; Linux x86_64) Firefox/128.0",
+          "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0) Safari/604.1",
+          "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/126.0",
+          "Mozilla/5.0 (compatible; Googlebot/2.1)", "curl/8.4.0"]
+REFS = ["-", "-", "-", "https://www.google.com/", "https://pdoom1.com/blog/",
+        "https://news.ycombinator.com/item?id=1", "https://www.reddit.com/r/ControlProblem/"]
+
+
+def write_log(path, size, visitors, seed=7):
+    """A combined-format log of about `size` bytes; returns the number of lines."""
+    rng = random.Random(seed)
+    ips = ["%d.%d.%d.%d" % (rng.randint(1, 223), rng.randrange(256), rng.randrange(256),
+                            rng.randrange(1, 255)) for _ in range(visitors)]
+    written = lines = 0
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        while written < size:
+            batch = []
+            for _ in range(5000):
+                if rng.random() < 0.001:
+                    batch.append("garbage that is not a log line")
+                    continue
+                p = rng.choice(PATHS)
+                if "%d" in p:
+                    p %= rng.randrange(200)
+                # the clock runs through 30 days as the file fills, as a real log's does
+                t = 86400 + int(30 * 86400 * min(written + 150 * len(batch), size) / size)
+                batch.append(
+                    '%s - - [%02d/Nov/2025:%02d:%02d:%02d +0000] "GET %s HTTP/1.1" %d %d "%s" "%s"'
+                    % (rng.choice(ips), min(t // 86400, 30), t // 3600 % 24,
+                       t // 60 % 60, t % 60, p,
+                       rng.choice((200, 200, 200, 200, 304, 404)), rng.randrange(200000),
+                       rng.choice(REFS), rng.choice(AGENTS)))
+            chunk = "\n".join(batch) + "\n"
+            f.write(chunk)
+            written += len(chunk)
+            lines += len(batch)
+    return lines
+
+
+def child(path, mode):
+    """Analyse one file in this (fresh) process; print lines, seconds and peak RSS."""
+    import importlib.util
+    import io
+    from contextlib import redirect_stdout
+    spec = importlib.util.spec_from_file_location("extract_analytics",
+                                                  SCRIPTS / "extract_analytics.py")
+    ea = importlib.util.module_from_spec(spec)
+    sys.modules["extract_analytics"] = ea  # so pool workers can unpickle results
+    spec.loader.exec_module(ea)
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        ex = ea.AnalyticsExtractor("unused.pem")
+        ex.output_dir = tmp
+        t0 = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            if mode == "materialised":
+                with ea.open_log(path) as f:
+                    lines = f.read().strip().split("\n")
+                entries = [e for e in map(ex.parse_log_line, lines) if e]
+                aggregator = ea.LogAggregator()
+                for e in entries:
+                    aggregator.add(e)
+                result, n = aggregator.result(), len(lines)
+            elif mode.startswith("parallel-"):
+                jobs = int(mode.split("-", 1)[1])
+                result = ex.analyze_files([str(path)], jobs=jobs)
+                n = ex.lines_fetched
+            else:
+                result = ex.analyze_logs(ex.fetch_logs(log_files=[str(path)]))
+                n = ex.lines_fetched
+        secs = time.perf_counter() - t0
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        rss = rss / 2 ** 20 if sys.platform == "darwin" else rss / 2 ** 10  # -> MB
+    except ImportError:  # Windows
+        rss = None
+    print(json.dumps({"lines": n, "seconds": secs, "rss_mb": rss,
+                      "requests": result["metadata"]["total_requests"]}))
+
+
+def run(path, mode):
+    out = subprocess.run([sys.executable, __file__, "--child", str(path), mode],
+                         capture_output=True, text=True, encoding="utf-8")
+    if out.returncode != 0:
+        raise SystemExit("child failed (%s, %s):\n%s" % (path.name, mode, out.stderr))
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--gb", type=float, action="append",
+                        help="log size in GB (repeatable; default 0.1 and 2)")
+    parser.add_argument("--visitors", type=int, default=20000,
+                        help="distinct client addresses in the synthetic audience")
+    parser.add_argument("--materialised-max", type=float, default=0.25,
+                        help="largest size (GB) to also run the old in-memory path on")
+    parser.add_argument("--gz", action="store_true", help="also time the log as a .gz")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="workers for the parallel mode (0 = one per CPU; 1 skips it)")
+    parser.add_argument("--dir", help="where to write the logs (default: a temp dir)")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(Path(args.child[0]), args.child[1])
+        return 0
+
+    work = Path(args.dir) if args.dir else Path(tempfile.mkdtemp())
+    work.mkdir(parents=True, exist_ok=True)
+    try:
+        print("  %-8s %-13s %12s %9s %11s %10s"
+              % ("size", "mode", "lines", "seconds", "lines/s", "peak RSS"))
+        for gb in args.gb or [0.1, 2.0]:
+            size = int(gb * 2 ** 30)
+            targets = [(work / ("access-%g.log" % gb), ["streamed"])]
+            jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+            if jobs > 1:
+                targets[0][1].append("parallel-%d" % jobs)
+            if gb <= args.materialised_max:
+                targets[0][1].append("materialised")
+            if args.gz:
+                targets.append((work / ("access-%g.log.gz" % gb), ["gzip"]))
+            for path, modes in targets:
+                t0 = time.perf_counter()
+                write_log(path, size, args.visitors)
+                print("  (wrote %s, %.0f MB on disk, in %.0f s)"
+                      % (path.name, path.stat().st_size / 2 ** 20, time.perf_counter() - t0))
+                for mode in modes:
+                    r = run(path, mode)
+                    print("  %-8s %-13s %12d %9.1f %11.0f %10s"
+                          % ("%g GB" % gb, mode, r["lines"], r["seconds"],
+                             r["lines"] / r["seconds"],
+                             "%.0f MB" % r["rss_mb"] if r["rss_mb"] is not None else "n/a"))
+                path.unlink()
+    finally:
+        if not args.dir:
+            shutil.rmtree(work, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
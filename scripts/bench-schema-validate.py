@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Time the compiled entry validator against the jsonschema calls it replaced.
+
+WHY THIS EXISTS
+---------------
+ingest_scores.py used to check every seed entry with jsonschema's iter_errors(),
+one entry at a time. It now asks scripts/schema_compiler.py's generated validator
+for the invalid indices of a whole entries array in one call. That is only worth
+the extra module if it is measurably faster at the board sizes a league night
+produces, and only acceptable if it gives the same answer.
+
+It builds ENTRIES synthetic seed entries, one in INVALID_EVERY broken in a way the
+contract rejects (a negative level, a missing or over-long name, a string where a
+number belongs), and reports the best wall time of several repeats for:
+
+  iter_errors   the old path: list(Draft7Validator.iter_errors(e)) per entry
+  is_valid      jsonschema's own short-circuit, per entry
+  compiled      CompiledSchema.invalid_indices(entries), one call
+  compile       generating + exec'ing the validator from the schemas (cold run)
+  cache load    reading it back from .schema-cache/ (every later run)
+
+Before timing anything it checks that all three validators reject exactly the same
+indices: a faster validator that disagrees is a failure, not a win.
+
+Not a CI gate: timings on shared runners are too noisy to assert on.
+
+Usage:
+    python scripts/bench-schema-validate.py                 # 10^4 and 10^5 entries
+    python scripts/bench-schema-validate.py --entries 1000000 --repeat 1
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import schema_compiler  # noqa: E402
+
+try:
+    import jsonschema
+except ImportError:
+    print("bench-schema-validate.py needs jsonschema (the reference): pip install jsonschema")
+    sys.exit(2)
+
+SCHEMA = "leaderboard-seed.schema.json"
+POINTER = "#/$defs/entry"
+INVALID_EVERY = 20
+BREAKS = (
+    lambda e: e.update(level_reached=-1),
+    lambda e: e.pop("player_name"),
+    lambda e: e.update(player_name="x" * 70),
+    lambda e: e.update(doom_integral="high"),
+)
+
+
+def entries(n, seed=1):
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        e = {"score": rng.randint(0, 5000), "doom_integral": round(rng.random() * 100, 1),
+             "player_name": "P%d" % rng.randint(0, 999), "date": "2026-08-%02d" % (1 + i % 28),
+             "level_reached": rng.randint(1, 80), "game_mode": "standard",
+             "duration_seconds": round(rng.random() * 3600, 1), "entry_uuid": "run-%d" % i}
+        if i % INVALID_EVERY == 0:
+            BREAKS[(i // INVALID_EVERY) % len(BREAKS)](e)
+        out.append(e)
+    return out
+
+
+def best(fn, repeat):
+    t = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        t = min(t, time.perf_counter() - start)
+    return t
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--entries", type=int, action="append",
+                        help="entries to validate (repeatable; default 10^4 and 10^5)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes per strategy")
+    args = parser.parse_args()
+
+    seed_schema = json.loads((schema_compiler.SCHEMAS / SCHEMA).read_text(encoding="utf-8"))
+    reference = jsonschema.Draft7Validator(seed_schema["$defs"]["entry"])
+    cache = Path(tempfile.mkdtemp())
+    try:
+        compile_s = best(lambda: schema_compiler.load(SCHEMA, POINTER, cache_dir=None),
+                         args.repeat)
+        schema_compiler.load(SCHEMA, POINTER, cache_dir=cache)
+        load_s = best(lambda: schema_compiler.load(SCHEMA, POINTER, cache_dir=cache),
+                      args.repeat)
+        compiled = schema_compiler.load(SCHEMA, POINTER, cache_dir=cache)
+    finally:
+        shutil.rmtree(cache, ignore_errors=True)
+    print("validator: compile %.1f ms cold, %.1f ms from the cache"
+          % (compile_s * 1e3, load_s * 1e3))
+    print()
+
+    for n in args.entries or [10 ** 4, 10 ** 5]:
+        batch = entries(n)
+        old = [i for i, e in enumerate(batch) if list(reference.iter_errors(e))]
+        if (compiled.invalid_indices(batch) != old
+                or [i for i, e in enumerate(batch) if not reference.is_valid(e)] != old):
+            print("FAIL: the validators disagree at %d entries -- "
+                  "run scripts/test-schema-compiler.py" % n)
+            return 1
+
+        print("%d entries, %d invalid, best of %d" % (n, len(old), args.repeat))
+        print("  %-12s %10s %14s" % ("strategy", "seconds", "entries/s"))
+        rows = (
+            ("iter_errors", lambda: [i for i, e in enumerate(batch)
+                                     if list(reference.iter_errors(e))]),
+            ("is_valid", lambda: [i for i, e in enumerate(batch) if not reference.is_valid(e)]),
+            ("compiled", lambda: compiled.invalid_indices(batch)),
+        )
+        results = {}
+        for name, fn in rows:
+            results[name] = secs = best(fn, args.repeat)
+            print("  %-12s %10.4f %14.0f" % (name, secs, n / secs))
+        print("  compiled vs iter_errors: x%.0f; vs is_valid: x%.0f"
+              % (results["iter_errors"] / results["compiled"],
+                 results["is_valid"] / results["compiled"]))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
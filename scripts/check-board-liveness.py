@@ -78,20 +78,27 @@ RUN
     python scripts/check-board-liveness.py
     python scripts/check-board-liveness.py --seed some-seed --version L4
     python scripts/check-board-liveness.py --check      # no file write
+    python scripts/check-board-liveness.py --workers 1  # one board at a time
+    python scripts/check-board-liveness.py --full       # ignore the schedule, ask every board
+    python scripts/check-board-liveness.py --no-cache   # neither read nor write the response cache
 """
 
 import argparse
+import hashlib
 import io
 import json
 import re
 import sys
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
 from datetime import datetime, timezone
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import http_client  # noqa: E402
+import response_cache  # noqa: E402
+
 # CLAUDE.md: the Windows console is cp1252 and dies on the FIRST non-ASCII print,
 # before doing any work. Reconfigure before anything else can print.
 for _s in (sys.stdout, sys.stderr):
@@ -114,6 +121,11 @@ SNAPSHOT_JSON = LB_DIR / "leaderboard.json"
 PRESERVED_DIR = LB_DIR / "preserved"
 TARGETS_JSON = LB_DIR / "board-probe-targets.json"
 OUT_JSON = LB_DIR / "board-liveness.json"
+HISTORY_JSON = LB_DIR / "board-probe-history.json"
+# Not an artifact: the last body (and any validators) of every board asked, so the
+# next run can revalidate instead of re-reading. Gitignored; CI keeps it with
+# actions/cache.
+CACHE_PATH = ROOT / ".board-cache" / "responses.json"
 
 SCORE_API = "https://api.pdoom1.com/score_api.php"
 
@@ -144,18 +156,57 @@ def load_json(path, default=None):
 # A per-request timeout bounds one GET, not a run. See the budget block in main().
 PROBE_BUDGET_S = 600          # 10 minutes for the whole probe loop
 UNREACHABLE_STREAK = 8        # consecutive connection-level failures = the host is down
+# Boards asked at once. Each probe is a tiny GET whose cost is almost all round trip,
+# so a run is bounded by latency, not by the API's work; eight in flight takes the
+# 2,070-board sweep from the SUM of the round trips to roughly an eighth of it while
+# staying well inside what one shared PHP host serves without noticing. It is the
+# HTTP client's per-host limit, so no worker waits on a connection slot.
+PROBE_WORKERS = http_client.PER_HOST
 
 
 def get_json(url, headers=None, timeout=20):
-    """GET only. Returns (data, error_string)."""
-    req = urllib.request.Request(url, headers=headers or {}, method="GET")
+    """GET only. Returns (data, error_string).
+
+    Through scripts/http_client.py's shared keep-alive pool: every board lives on
+    one host, so one TLS handshake per worker serves the whole sweep instead of one
+    per board. An error string beginning "HTTP " is still an answer from a living
+    host -- the breaker below relies on that -- and anything else is not."""
+    return http_client.get_json(url, headers, timeout)
+
+
+# ---------------------------------------------------------------- response cache
+# Board reads go through a response_cache.ResponseCache while main() -- or the
+# publisher, which shares probe_board() -- is running. Each board's last body is
+# kept, so a board that has not changed is recognised as such: by a 304 if the API
+# ever sends validators, by the SHA-256 of the body until then. An unchanged board
+# is not parsed or summarised again (its summary is a derived value of the body),
+# and the publisher takes the winning board's rows from the body probe_board()
+# already read instead of asking for them twice. With no cache open -- tests, or
+# --no-cache -- probe_board() reads through get_json() exactly as before.
+BOARD_CACHE = None
+
+
+def open_board_cache(path=None):
+    """Start reading boards through the on-disk cache. Returns it."""
+    global BOARD_CACHE
+    BOARD_CACHE = response_cache.ResponseCache(
+        path or CACHE_PATH,
+        derived_key=hashlib.sha256(Path(__file__).read_bytes()).hexdigest())
+    return BOARD_CACHE
+
+
+def board_url(seed, version):
+    return "%s?%s" % (SCORE_API, urllib.parse.urlencode({"seed": seed, "version": version}))
+
+
+def fetched_board(seed, version):
+    """The board's JSON exactly as probe_board() read it in this process, or None
+    when it was not read through the cache (or did not parse)."""
+    body = BOARD_CACHE.body(board_url(seed, version)) if BOARD_CACHE else None
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as r:
-            return json.loads(r.read().decode("utf-8")), None
-    except urllib.error.HTTPError as e:
-        return None, "HTTP %s" % e.code
-    except Exception as e:
-        return None, "%s: %s" % (type(e).__name__, e)
+        return json.loads(body.decode("utf-8")) if body is not None else None
+    except ValueError:
+        return None
 
 
 def key_shape(version):
@@ -222,10 +273,15 @@ def derive_targets(extra_seeds, extra_versions):
         notes.append("anomaly archive absent -- probe set is narrower than it should be, "
                      "and orphans cannot be classified as known vs new")
 
-    # 3. Whatever the last run saw, so the set grows as the ladder moves.
+    # 3. Whatever earlier runs saw, so the set grows as the ladder moves. The probe
+    #    history remembers every key ever asked about; board-liveness.json only lists
+    #    the boards the LAST run asked, which under the schedule is a subset.
     for b in ((load_json(OUT_JSON, {}) or {}).get("boards") or []):
         add(seeds, b.get("seed"))
         add(versions, b.get("version"))
+    for seed, version in sorted(load_history()["keys"]):
+        add(seeds, seed)
+        add(versions, version)
 
     # 4. Pinned values -- only from the data file, and only with a source. A pinned value
     #    with no source is a hardcoded literal wearing a costume, so it is refused.
@@ -274,34 +330,258 @@ def current_epoch(targets):
     return None, None
 
 
+# ---------------------------------------------------------------- schedule
+# derive_targets() only ever grows: every seed ever seen x L1..L(highest+lookahead),
+# so the candidate set grows with the square of the project's age, and almost all of
+# it is boards nobody has ever submitted to and nobody will. Asking about each of
+# them every six hours is most of this script's traffic and teaches it nothing.
+#
+# So the probe keeps a per-key history in board-probe-history.json and asks each
+# board on a schedule:
+#
+#   HOT, every run    a board that held entries within HOT_RUNS runs; the site's
+#                     own seeds (published and weekly) on the published, current or
+#                     highest-seen epoch or the lookahead window, where a fork lands
+#                     first; the published key itself.
+#   BACKED OFF        an empty board is asked every run for BACKOFF_GRACE empty
+#                     answers, then every 2, 4, 8, 16 runs ...
+#   FULL CYCLE        ... capped at FULL_CYCLE_RUNS. At the cap a board is asked on
+#                     its own slot of the cycle (a hash of its key), so the swept
+#                     boards spread evenly across runs instead of arriving together.
+#
+# Every board is therefore still asked at least once per FULL_CYCLE_RUNS runs (a
+# week at four runs a day): an orphan on a long-dead key is found late, never
+# missed. A board never asked before is due at once. An error is not an observation,
+# so it leaves the board's backoff where it was and the board due again next run.
+# --full asks everything, as every run did before the schedule existed.
+#
+# Time is counted in RUNS, not hours: a run that never happened (a cancelled cron, a
+# week of outage) must not age a board into being skipped.
+HISTORY_VERSION = 1
+HOT_RUNS = 4
+BACKOFF_GRACE = 2
+FULL_CYCLE_RUNS = 28
+
+
+def load_history():
+    """{"run": last run number, "keys": {(seed, version): [last_populated_run,
+    empty_streak, last_checked_run]}}. Anything unreadable is an empty history --
+    which means "ask everything", the safe direction."""
+    doc = load_json(HISTORY_JSON, {}) or {}
+    keys = {}
+    if doc.get("version") == HISTORY_VERSION:
+        for row in doc.get("keys") or []:
+            if (isinstance(row, list) and len(row) == 5
+                    and all(isinstance(x, str) for x in row[:2])):
+                keys[(row[0], row[1])] = list(row[2:])
+    return {"run": doc.get("run", 0) if keys else 0, "keys": keys}
+
+
+def save_history(history):
+    """One key per line, sorted, so the committed file diffs by board."""
+    rows = sorted([s, v] + h for (s, v), h in history["keys"].items())
+    lines = ",\n".join("    " + json.dumps(r, ensure_ascii=False) for r in rows)
+    HISTORY_JSON.write_text(
+        '{\n  "_comment": "Per-board probe schedule state for scripts/check-board-liveness.py: '
+        '[seed, version, last_populated_run, empty_streak, last_checked_run]. Runs, not '
+        'timestamps. Not a score store.",\n'
+        '  "version": %d,\n  "run": %d,\n  "updated_at": %s,\n  "keys": [\n%s\n  ]\n}\n'
+        % (HISTORY_VERSION, history["run"], json.dumps(now_iso()), lines),
+        encoding="utf-8", newline="\n")
+
+
+def cycle_slot(seed, version):
+    digest = hashlib.sha256(("%s\0%s" % (seed, version)).encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") % FULL_CYCLE_RUNS
+
+
+def probe_interval(empty_streak):
+    """Runs between asks of a board that has answered empty `empty_streak` times."""
+    return min(2 ** max(0, empty_streak - BACKOFF_GRACE), FULL_CYCLE_RUNS)
+
+
+def hot_versions(versions, pinned):
+    """The epochs a live score can appear on: `pinned` (published and current), the
+    highest epoch seen and the lookahead window above it."""
+    epochs = [int(m.group(1)) for m in (EPOCH_RE.match(str(v)) for v in versions) if m]
+    hot = {v for v in pinned if v}
+    if epochs:
+        top = max(epochs) - EPOCH_LOOKAHEAD          # the highest one actually SEEN
+        hot.update("L%d" % n for n in range(max(1, top), max(epochs) + 1))
+    return hot
+
+
+def schedule(pairs, history, run, hot_pairs):
+    """(due, skipped): the boards to ask this run, most urgent first, and how many
+    were left for a later run."""
+    due = []
+    for seed, version in pairs:
+        h = history["keys"].get((seed, version))
+        if h is None or (seed, version) in hot_pairs:
+            due.append((0, seed, version))
+            continue
+        last_populated, streak, last_checked = h
+        since = run - last_checked
+        if last_populated is not None and run - last_populated <= HOT_RUNS:
+            due.append((0, seed, version))
+            continue
+        interval = probe_interval(streak)
+        if interval < FULL_CYCLE_RUNS:
+            if since >= interval:
+                due.append((1, seed, version))
+        elif since >= FULL_CYCLE_RUNS or run % FULL_CYCLE_RUNS == cycle_slot(seed, version):
+            due.append((1 if since < FULL_CYCLE_RUNS else 0, seed, version))
+    # Urgent (hot, new, overdue) first, so a budget cut loses the least valuable asks.
+    due.sort(key=lambda d: d[0])
+    return [(s, v) for _, s, v in due], len(pairs) - len(due)
+
+
+def record_history(history, results, run):
+    """Fold this run's answers into the history. Errors change nothing."""
+    for r in results:
+        if r.get("error"):
+            continue
+        key = (r["seed"], r["version"])
+        last_populated, streak, _ = history["keys"].get(key, [None, 0, run])
+        if (r.get("entries") or 0) > 0:
+            last_populated, streak = run, 0
+        else:
+            streak += 1
+        history["keys"][key] = [last_populated, streak, run]
+    history["run"] = run
+
+
 # ---------------------------------------------------------------- probing
-def probe_board(seed, version):
-    q = urllib.parse.urlencode({"seed": seed, "version": version})
-    data, err = get_json("%s?%s" % (SCORE_API, q))
-    base = {"seed": seed, "version": version, "key_shape": key_shape(version)}
-    if err:
-        base.update({"error": err, "entries": None})
-        return base
+def summarize_board(data):
+    """What board-liveness.json records about one board's payload."""
     if not isinstance(data, dict) or not data.get("ok"):
-        base.update({"error": "unexpected payload: %s" % json.dumps(data)[:120],
-                     "entries": None})
-        return base
+        return {"error": "unexpected payload: %s" % json.dumps(data)[:120], "entries": None}
     entries = data.get("entries") or []
     players = sorted({e.get("player_name") for e in entries if e.get("player_name")})
     dates = sorted(e.get("date") for e in entries if e.get("date"))
     # An epoch board spans builds, so record which builds appear. That is the evidence
     # the split is working, and it is the only place a build version belongs.
-    base.update({
+    return {
         "entries": len(entries),
         "players": len(players),
         "player_names": players,
         "builds_seen": sorted({e.get("game_mode") for e in entries if e.get("game_mode")}),
         "first_entry": dates[0] if dates else None,
         "last_entry": dates[-1] if dates else None,
-    })
+    }
+
+
+def probe_board(seed, version):
+    url = board_url(seed, version)
+    base = {"seed": seed, "version": version, "key_shape": key_shape(version)}
+    cache = BOARD_CACHE
+    if cache is None:
+        data, err = get_json(url)
+        base.update({"error": err, "entries": None} if err else summarize_board(data))
+        return base
+    got = cache.fetch(url, timeout=20)
+    if got.error:
+        base.update({"error": got.error, "entries": None})
+        return base
+
+    def summarize():
+        try:
+            return summarize_board(json.loads(got.body.decode("utf-8")))
+        except Exception as e:
+            return {"error": http_client.classify_error(e)[1], "entries": None}
+
+    # An unchanged body has the summary it had last time; it is not parsed again.
+    base.update(cache.derived(url, "summary", summarize))
     return base
 
 
+class ProbeBreaker:
+    """The run's two stop conditions, shared by every worker.
+
+    One instance per run, read and updated under one lock, so all workers see the same
+    budget and the same unreachable streak. `streak` counts consecutive connection-level
+    failures in the order probes COMPLETE: with several in flight that is the order the
+    host answered (or failed to), which is the order that says whether it is down.
+    """
+
+    def __init__(self, budget_s, streak_limit):
+        self.budget_s = budget_s
+        self.streak_limit = streak_limit
+        self.started = time.monotonic()
+        self.streak = 0
+        self.tripped = False          # False | "budget" | "unreachable"
+        self.lock = threading.Lock()
+
+    def may_start(self):
+        """Whether another probe may begin. Once tripped, stays tripped."""
+        with self.lock:
+            if not self.tripped:
+                if time.monotonic() - self.started > self.budget_s:
+                    self.tripped = "budget"
+                elif self.streak >= self.streak_limit:
+                    self.tripped = "unreachable"
+            return not self.tripped
+
+    def record(self, result):
+        # Connection-level failures mean the host, not the board. An HTTP status is a
+        # real answer and must NOT trip the breaker.
+        err = result.get("error") or ""
+        with self.lock:
+            self.streak = self.streak + 1 if err and not err.startswith("HTTP ") else 0
+
+
+def probe_all(pairs, probe, workers=PROBE_WORKERS, budget_s=PROBE_BUDGET_S,
+              streak=UNREACHABLE_STREAK):
+    """Probe every (seed, version) in `pairs` with up to `workers` in flight.
+
+    Returns (results, budget_hit): `results` holds one record per board that was
+    actually asked, in the ORDER OF `pairs` -- never completion order -- so
+    board-liveness.json diffs cleanly between runs however the responses raced.
+    `budget_hit` is False, "budget" or "unreachable", exactly as the serial loop
+    reported it. Probes already in flight when the breaker trips are allowed to
+    finish and are kept: they were asked, so their answers are observations.
+
+    A probe that RAISES is that board's error, not the end of its worker: an
+    exception in a thread is otherwise printed to stderr and forgotten, and the
+    run would report a short sweep as complete. It does not feed the breaker -- a
+    bug in our parsing says nothing about whether the host is up. Should results
+    still come back short with the breaker untripped, `budget_hit` is
+    "incomplete", so the caller says so instead of reading absence as silence.
+    """
+    breaker = ProbeBreaker(budget_s, streak)
+    slots = [None] * len(pairs)
+    cursor = iter(range(len(pairs)))
+    cursor_lock = threading.Lock()
+
+    def worker():
+        while breaker.may_start():
+            with cursor_lock:
+                i = next(cursor, None)
+            if i is None:
+                return
+            try:
+                r = probe(*pairs[i])
+            except Exception as e:
+                seed, version = pairs[i]
+                slots[i] = {"seed": seed, "version": version, "key_shape": key_shape(version),
+                            "error": "probe failed: %s" % http_client.classify_error(e)[1],
+                            "entries": None}
+                continue
+            breaker.record(r)
+            slots[i] = r
+
+    threads = [threading.Thread(target=worker, daemon=True)
+               for _ in range(max(1, min(workers, len(pairs))))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    results = [r for r in slots if r is not None]
+    if len(results) < len(pairs) and not breaker.tripped:
+        return results, "incomplete"
+    return results, breaker.tripped
+
+
 def main():
     ap = argparse.ArgumentParser(
         description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
@@ -309,7 +589,15 @@ def main():
     ap.add_argument("--version", action="append", default=[],
                     help="extra board version / ladder epoch (repeatable)")
     ap.add_argument("--check", action="store_true", help="exit code only, no file write")
+    ap.add_argument("--workers", type=int, default=PROBE_WORKERS,
+                    help="boards probed at once (default %d)" % PROBE_WORKERS)
+    ap.add_argument("--full", action="store_true",
+                    help="ask every candidate board, ignoring the probe schedule")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="read every board in full; neither read nor write the response cache")
     args = ap.parse_args()
+    global BOARD_CACHE
+    cache = BOARD_CACHE = None if args.no_cache else open_board_cache()
 
     targets = load_json(TARGETS_JSON, {}) or {}
     epoch, epoch_source = current_epoch(targets)
@@ -343,6 +631,29 @@ def main():
     seeds, versions, notes = derive_targets(args.seed, args.version)
     archive = set(archived_keys())
 
+    # The schedule (see "schedule" above). Hot: the site's own seeds on the epochs a
+    # live score can land on, plus the published key itself. Every OTHER seed on those
+    # epochs is a new key the first time the epoch appears, so it is asked at once and
+    # then backs off like any board that stays empty.
+    history = load_history()
+    run = history["run"] + 1
+    candidates = [(s, v) for s in seeds for v in versions]
+    hot = hot_versions(versions, (site_epoch, epoch, published_epoch))
+    hot_seeds = {site_seed, (load_json(WEEKLY_JSON, {}) or {}).get("seed")}
+    hot_pairs = ({(s, v) for s, v in candidates if s in hot_seeds and v in hot}
+                 | {(site_seed, site_epoch)})
+    if args.full or not history["keys"]:
+        pairs, skipped = candidates, 0
+        notes.append("full sweep: every one of %d candidate board(s) asked (%s)"
+                     % (len(candidates), "--full" if args.full else "no probe history yet"))
+    else:
+        pairs, skipped = schedule(candidates, history, run, hot_pairs)
+        notes.append("scheduled %d of %d candidate board(s): %d hot, %d backed off until a "
+                     "later run (every board is asked at least once per %d runs; --full "
+                     "asks all)" % (len(pairs), len(candidates),
+                                    sum(1 for p in pairs if p in hot_pairs), skipped,
+                                    FULL_CYCLE_RUNS))
+
     print("Board liveness probe -- %s" % now_iso())
     print("=" * 74)
     print("  site seed (published)   %s   [from %s]" % (site_seed or "UNKNOWN", site_seed_source))
@@ -370,32 +681,15 @@ def main():
     #   PROBE_BUDGET_S  -- the whole loop, however it is slow.
     #   UNREACHABLE_STREAK -- the host is down; asking 2,070 times learns nothing
     #                         the first few already told us.
-    results, errors = [], 0
-    budget_hit = False
-    unreachable_streak = 0
+    # Both live in one ProbeBreaker that every worker consults before each probe, so
+    # running boards concurrently (probe_all) changes how long a sweep takes, not
+    # when it stops. Results come back in seed-major order regardless.
     started = time.monotonic()
-
-    for s in seeds:
-        for v in versions:
-            if time.monotonic() - started > PROBE_BUDGET_S:
-                budget_hit = "budget"
-                break
-            if unreachable_streak >= UNREACHABLE_STREAK:
-                budget_hit = "unreachable"
-                break
-            r = probe_board(s, v)
-            err = r.get("error") or ""
-            if err:
-                errors += 1
-                # Connection-level failures mean the host, not the board. An HTTP
-                # status is a real answer and must NOT trip the breaker.
-                unreachable_streak = (unreachable_streak + 1
-                                      if not err.startswith("HTTP ") else 0)
-            else:
-                unreachable_streak = 0
-            results.append(r)
-        if budget_hit:
-            break
+    results, budget_hit = probe_all(pairs, probe_board, args.workers)
+    # Asked most-urgent first; reported seed-major, as a full sweep always was.
+    position = {p: i for i, p in enumerate(candidates)}
+    results.sort(key=lambda r: position[(r["seed"], r["version"])])
+    errors = sum(1 for r in results if r.get("error"))
 
     if budget_hit:
         # Partial data is reported as partial. A short probe that says so is
@@ -403,11 +697,13 @@ def main():
         # failure this whole subsystem exists to prevent.
         notes.append(
             "PROBE INCOMPLETE (%s): asked %d of %d board(s) in %.0fs. %s"
-            % (budget_hit, len(results), len(seeds) * len(versions),
+            % (budget_hit, len(results), len(pairs),
                time.monotonic() - started,
                "The score API looks unreachable -- check the VPS before reading anything below."
                if budget_hit == "unreachable" else
-               "Ran out of wall-clock budget; the remaining boards were not asked about.")
+               "Ran out of wall-clock budget; the remaining boards were not asked about."
+               if budget_hit == "budget" else
+               "A probe worker stopped early; the remaining boards were not asked about.")
         )
         print("  " + notes[-1])
 
@@ -433,8 +729,12 @@ def main():
     if superseded:
         pending_publication, unknown = unknown, []
 
-    print("  probed %d board(s): %d seed(s) x %d version(s); %d unreadable"
-          % (len(results), len(seeds), len(versions), errors))
+    print("  probed %d board(s) of %d candidate(s) (%d seed(s) x %d version(s)); "
+          "%d unreadable; %.1fs, %d at once"
+          % (len(results), len(candidates), len(seeds), len(versions), errors,
+             time.monotonic() - started, max(1, args.workers)))
+    if cache is not None:
+        print("  " + cache.summary())
     print("-" * 74)
     for r in sorted(populated, key=lambda x: -(x["entries"] or 0)):
         tag = "DEPLOYED" if is_deployed(r) else \
@@ -591,7 +891,8 @@ def main():
         "deployed_build": build,
         "deployed_board": deployed_board,
         "probe": {"seeds": seeds, "versions": versions, "boards_probed": len(results),
-                  "unreachable": errors, "notes": notes},
+                  "boards_candidate": len(candidates), "boards_scheduled_later": skipped,
+                  "run": run, "unreachable": errors, "notes": notes},
         "archived_orphans": {
             "acknowledged": True,
             "boards": known,
@@ -625,6 +926,10 @@ def main():
         OUT_JSON.parent.mkdir(parents=True, exist_ok=True)
         OUT_JSON.write_text(json.dumps(record, indent=2) + "\n",
                             encoding="utf-8", newline="\n")
+        record_history(history, results, run)
+        save_history(history)
+        if cache is not None:
+            cache.save()
         print()
         print("  wrote %s" % OUT_JSON.relative_to(ROOT))
     return exit_code
@@ -51,6 +51,9 @@ import sys
 from collections import Counter
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import tree_scan  # noqa: E402  (must follow the sys.path line)
+
 for _s in (sys.stdout, sys.stderr):
     try:
         _s.reconfigure(encoding="utf-8", errors="replace")
@@ -65,7 +68,8 @@ TEXT_SUFFIX = re.compile(r"\.(py|js|mjs|cjs|md|json|ya?ml|html|css|sh|txt)$", re
 CONTROL = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
 
 # Paths whose CONTENT is scraped from elsewhere. Damage here is upstream's to fix.
-GENERATED = ("public/events/", "public/data/events.json", "public/design-notes/",
+GENERATED = ("public/events/", "public/data/events.json", "public/data/events/",
+             "public/design-notes/",
              "public/data/issues-cache.json", "public/docs/pdoom1-open-issues.md")
 
 NAMES = {0x00: "NUL", 0x03: "ETX", 0x07: "BEL", 0x08: "BACKSPACE", 0x0b: "VT",
@@ -79,6 +83,30 @@ def tracked_files():
     return [f for f in out.split("\n") if f and TEXT_SUFFIX.search(f)]
 
 
+def scan_checkers(files=None):
+    """This guard's Checker for the shared tree scan (scripts/tree_scan.py).
+
+    The file set is still git's, not the filesystem's: an untracked scratch
+    file is nobody's damage yet. Per file the result is [[line, code], ...],
+    or None for a file that is not valid UTF-8 (skipped, as it always was).
+    """
+    tracked = set(tracked_files() if files is None else files)
+
+    def check(f):
+        try:
+            if not f.valid_utf8:
+                return None
+            text = f.text
+        except OSError:
+            return None
+        return [[text.count("\n", 0, m.start()) + 1, ord(m.group())]
+                for m in CONTROL.finditer(text)]
+
+    return [tree_scan.Checker("control-characters",
+                              tree_scan.fingerprint(Path(__file__)),
+                              tracked.__contains__, check)]
+
+
 def main():
     ap = argparse.ArgumentParser(description=__doc__,
                                  formatter_class=argparse.RawDescriptionHelpFormatter)
@@ -87,21 +115,15 @@ def main():
 
     fails, warns, seen = [], [], Counter()
     files = tracked_files()
+    found = tree_scan.scan(scan_checkers(files), ROOT).results["control-characters"]
 
     for rel in files:
-        p = ROOT / rel
-        try:
-            text = p.read_bytes().decode("utf-8")
-        except (OSError, UnicodeDecodeError):
-            continue
-        hits = list(CONTROL.finditer(text))
+        hits = found.get(rel)
         if not hits:
             continue
         generated = any(rel.startswith(g) or rel == g for g in GENERATED)
         bucket = warns if generated else fails
-        for m in hits:
-            code = ord(m.group())
-            line = text.count("\n", 0, m.start()) + 1
+        for line, code in hits:
             seen[code] += 1
             bucket.append((rel, line, code))
 
@@ -76,11 +76,12 @@ import argparse
 import io
 import json
 import sys
-import urllib.error
-import urllib.request
 from datetime import datetime, timezone
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import http_client  # noqa: E402
+
 # CLAUDE.md: the Windows console is cp1252 and dies on the FIRST non-ASCII print,
 # before doing any work. Reconfigure before anything else can print.
 for _s in (sys.stdout, sys.stderr):
@@ -120,15 +121,9 @@ def load_json(path, default=None):
 
 
 def fetch_manifest(url, timeout=20):
-    """GET only. Returns (data, error_string). Never raises."""
-    try:
-        req = urllib.request.Request(url, method="GET")
-        with urllib.request.urlopen(req, timeout=timeout) as r:
-            return json.loads(r.read().decode("utf-8")), None
-    except urllib.error.HTTPError as e:
-        return None, "HTTP %s" % e.code
-    except Exception as e:
-        return None, "%s: %s" % (type(e).__name__, e)
+    """GET only. Returns (data, error_string). Never raises. The latest-release URL
+    answers 302; scripts/http_client.py follows it."""
+    return http_client.get_json(url, timeout=timeout)
 
 
 def normalise_epoch(raw):
@@ -29,6 +29,10 @@ import json
 import os
 import re
 import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import tree_scan  # noqa: E402  (must follow the sys.path line)
 
 for _s in (sys.stdout, sys.stderr):
     try:
@@ -125,6 +129,51 @@ def allowlisted(path, line):
     return False
 
 
+def claims_in(visible, unavailable):
+    """(line, platforms claimed, text) for every unqualified availability claim
+    naming an unavailable platform. ALLOWLIST is applied by the caller, so a
+    cached result stays valid when an entry is added."""
+    found = []
+    for n, raw in enumerate(visible.split("\n"), 1):
+        line = raw.rstrip("\n")
+        if SOFT_QUALIFIER.search(line):
+            continue  # a softened promise, not a present-tense claim
+        names_hit = [p for p, rx in PLATFORM_NAMES.items() if rx.search(line)]
+        unavail_hit = [p for p in names_hit if p in unavailable]
+        if not unavail_hit:
+            continue
+        is_list = len(names_hit) >= 2
+        is_verb = bool(AVAILABILITY_VERB.search(line))
+        if is_list or is_verb:
+            found.append([n, unavail_hit, line])
+    return found
+
+
+def scan_checkers(unavailable=None):
+    """This guard's Checker for the shared tree scan (scripts/tree_scan.py).
+
+    Empty when there is nothing to guard against, exactly as scan() opens no
+    page in that state.
+    """
+    if unavailable is None:
+        platforms = load_available_platforms()
+        if platforms is None:
+            return []
+        unavailable = [p for p, ok in platforms.items() if not ok]
+    if not unavailable:
+        return []
+    reachable = set(REACHABLE)
+
+    def check(f):
+        # Universal newlines: the line numbers printed below are counted on the
+        # text open() in text mode gives, which is what this guard always read.
+        return claims_in(strip_to_visible_text(f.universal_text()), unavailable)
+
+    key = tree_scan.fingerprint(Path(__file__), sorted(unavailable))
+    return [tree_scan.Checker("platform-claims", key, reachable.__contains__, check,
+                              roots=sorted({rel.rpartition("/")[0] for rel in REACHABLE}))]
+
+
 def scan():
     platforms = load_available_platforms()
     if platforms is None:
@@ -140,26 +189,16 @@ def scan():
         print("No unavailable platforms to guard against. OK.")
         return 0
 
+    result = tree_scan.scan(scan_checkers(unavailable), ROOT)
+    claims = result.results["platform-claims"]
     findings = []
     for rel in REACHABLE:
-        path = os.path.join(ROOT, rel)
-        if not os.path.isfile(path):
+        if rel not in claims:
             print(f"  note: {rel} not found, skipped")
             continue
-        with open(path, "r", encoding="utf-8", errors="replace") as f:
-            visible = strip_to_visible_text(f.read())
-        for n, raw in enumerate(visible.split("\n"), 1):
-                line = raw.rstrip("\n")
-                if SOFT_QUALIFIER.search(line):
-                    continue  # a softened promise, not a present-tense claim
-                names_hit = [p for p, rx in PLATFORM_NAMES.items() if rx.search(line)]
-                unavail_hit = [p for p in names_hit if p in unavailable]
-                if not unavail_hit:
-                    continue
-                is_list = len(names_hit) >= 2
-                is_verb = bool(AVAILABILITY_VERB.search(line))
-                if (is_list or is_verb) and not allowlisted(rel, line):
-                    findings.append((rel, n, unavail_hit, line.strip()[:160]))
+        for n, hit, line in claims[rel]:
+            if not allowlisted(rel, line):
+                findings.append((rel, n, hit, line.strip()[:160]))
 
     if not findings:
         print(f"OK: no reachable page claims {unavailable} as available.")
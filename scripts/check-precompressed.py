@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Every .gz / .br sibling under public/ decompresses to its source, exactly.
+
+WHY THIS EXISTS
+---------------
+public/.htaccess serves `X.br` or `X.gz` INSTEAD of `X` to any browser that
+accepts the encoding -- which is every browser. So a sibling that no longer
+matches its source is not a wasted file; it is the page. An edit to X that
+missed the precompression stage never reaches a reader, the deploy looks
+green, and the plain file on the server is correct, so nobody who checks it by
+hand sees the problem.
+
+scripts/precompress.py is built not to leave one behind, but its skip decision
+trusts its own manifest. This does not read the manifest at all: it finds every
+sibling precompress.py would own (`X.gz` / `X.br` with X eligible), decompresses
+it and compares the result with X byte for byte. It fails on:
+
+  * a sibling whose bytes decompress to anything other than X;
+  * a sibling that does not decompress at all;
+  * a sibling whose source X is missing (a deleted page still served);
+  * a .br sibling when the brotli package is not installed -- it cannot be
+    verified, and an unverifiable sibling is treated as a wrong one.
+
+The deploy workflows run it after precompress.py and before the rsync.
+
+Run:  python scripts/check-precompressed.py [--public DIR]   (exit 0 = pass)
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import precompress  # noqa: E402
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+
+def find_problems(public: Path) -> tuple:
+    """([(sibling rel, problem), ...], number of siblings checked)."""
+    have_brotli = precompress.load_brotli() is not None
+    problems = []
+    checked = 0
+    for rel in precompress.walk(public):
+        owned = precompress.sibling_source(rel)
+        if owned is None:
+            continue
+        source, variant = owned
+        checked += 1
+        if not (public / source).is_file():
+            problems.append((rel, f"its source {source} does not exist"))
+            continue
+        if variant == "br" and not have_brotli:
+            problems.append((rel, "cannot be verified: the brotli package is not installed"))
+            continue
+        try:
+            body = precompress.decompress((public / rel).read_bytes(), variant)
+        except Exception as exc:  # any codec error means the sibling is broken
+            problems.append((rel, f"does not decompress ({type(exc).__name__}: {exc})"))
+            continue
+        if body != (public / source).read_bytes():
+            problems.append((rel, f"decompresses to {len(body):,} bytes that are not "
+                                  f"{source}"))
+    return problems, checked
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--public", type=Path, default=precompress.PUBLIC,
+                        help="tree to check (default public/)")
+    args = parser.parse_args(argv)
+
+    problems, checked = find_problems(args.public)
+    if problems:
+        print(f"FAIL: {len(problems)} of {checked} precompressed sibling(s) would serve "
+              f"something other than their source:")
+        for rel, problem in problems:
+            print(f"  {rel}: {problem}")
+        print("Re-run scripts/precompress.py, or delete the sibling to serve the plain file.")
+        return 1
+    print(f"PASS: all {checked} precompressed sibling(s) under {args.public} "
+          f"decompress to their source byte for byte")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,10 +29,14 @@ the generator's redaction supersedes this. Never delete a page here; rsync
 """
 
 import argparse
+import hashlib
 import importlib.util
 import re
 import sys
-from pathlib import Path
+from pathlib import Path, PurePosixPath
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import tree_scan  # noqa: E402  (must follow the sys.path line)
 
 for _s in (sys.stdout, sys.stderr):
     try:
@@ -42,6 +46,7 @@ for _s in (sys.stdout, sys.stderr):
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 PUBLIC_DIR = REPO_ROOT / "public"
+GENERATOR = REPO_ROOT / "scripts" / "sync" / "sync-events.py"
 SCAN_SUFFIXES = {".html", ".json", ".md", ".xml", ".txt"}
 
 # Addresses the project publishes ON PURPOSE, plus form placeholders. Matched
@@ -83,8 +88,7 @@ def load_generator_pattern():
     so it is not blind in the same places, and a count it can see that
     EMAIL_PATTERN cannot is reported as a DISAGREEMENT below.
     """
-    path = REPO_ROOT / "scripts" / "sync" / "sync-events.py"
-    spec = importlib.util.spec_from_file_location("sync_events", path)
+    spec = importlib.util.spec_from_file_location("sync_events", GENERATOR)
     module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
     return module.EMAIL_PATTERN, module.REDACTION_MARKER, module.unexplained_residue
@@ -108,25 +112,58 @@ def read(path: Path) -> str:
         return f.read()
 
 
-def scan(pattern):
-    """Return {relative_path: [address, ...]} for every disallowed address."""
-    findings = {}
-    for path in sorted(PUBLIC_DIR.rglob("*")):
-        if not path.is_file() or path.suffix.lower() not in SCAN_SUFFIXES:
-            continue
-        hits = [m for m in pattern.findall(read(path)) if not is_allowed(m)]
-        if hits:
-            findings[path.relative_to(REPO_ROOT).as_posix()] = hits
-    return findings
+def address_digest(address: str) -> str:
+    """What the scan cache stores in place of an address.
+
+    The shared scan cache (scripts/tree_scan.py) is a file on disk, and an
+    address written there is an address copied somewhere nobody audits. A
+    digest still lets main() count DISTINCT addresses across files, which is
+    all it ever needed the text for.
+    """
+    return hashlib.sha256(address.encode("utf-8")).hexdigest()[:16]
 
 
-def scan_residue(unexplained_residue):
-    """Return {relative_path: unexplained_count} where the independent scanner
-    sees address-shaped text EMAIL_PATTERN cannot account for.
+def scan_checkers(pattern=None, unexplained_residue=None):
+    """This guard's Checker for the shared tree scan.
 
-    This is a DISAGREEMENT check, not a second detector: everything
-    EMAIL_PATTERN can see is already handled by scan() above, so what matters is
-    the remainder. A positive remainder means the shared pattern has a hole,
+    ONE checker runs both halves -- EMAIL_PATTERN and the independent residue
+    scanner -- on the same decoded text, so a file is read once, not once per
+    half. Its key covers this file (ALLOWED lives here) and the generator
+    (EMAIL_PATTERN and the residue rules live there): editing either one
+    throws away every cached verdict.
+    """
+    if pattern is None:
+        pattern, _, unexplained_residue = load_generator_pattern()
+
+    def select(rel):
+        return PurePosixPath(rel).suffix.lower() in SCAN_SUFFIXES
+
+    def check(f):
+        text = f.text
+        if "@" not in text:
+            return None       # both halves need a literal '@' to match anything
+        hits = [address_digest(m) for m in pattern.findall(text) if not is_allowed(m)]
+        residue = unexplained_residue(text)
+        if not hits and not residue:
+            return None
+        return {"hits": hits, "residue": residue}
+
+    rel_public = PUBLIC_DIR.relative_to(REPO_ROOT).as_posix()
+    return [tree_scan.Checker(
+        "published-emails", tree_scan.fingerprint(Path(__file__), GENERATOR),
+        select, check, roots=(rel_public,))]
+
+
+def scan(pattern, unexplained_residue, use_cache=True):
+    """Return (findings, residue) for every scannable file under public/.
+
+    findings  {relative_path: [address digest, ...]} for disallowed addresses
+    residue   {relative_path: unexplained_count} where the independent scanner
+              sees address-shaped text EMAIL_PATTERN cannot account for.
+
+    The residue half is a DISAGREEMENT check, not a second detector: everything
+    EMAIL_PATTERN can see is already handled by the first half, so what matters
+    is the remainder. A positive remainder means the shared pattern has a hole,
     which is the one failure that cannot be seen from inside the pattern.
 
     The comparison is POSITIONAL, done in sync-events.py. Comparing totals
@@ -134,17 +171,17 @@ def scan_residue(unexplained_residue):
     EMAIL_PATTERN and ignored by the independent scanner, so on any ordinary
     page the subtraction goes negative and hides a real leak.
     """
-    findings = {}
-    for path in sorted(PUBLIC_DIR.rglob("*")):
-        if not path.is_file() or path.suffix.lower() not in SCAN_SUFFIXES:
-            continue
-        text = read(path)
-        if "@" not in text:
+    checkers = scan_checkers(pattern, unexplained_residue)
+    result = tree_scan.scan(checkers, REPO_ROOT, use_cache=use_cache)
+    findings, residue = {}, {}
+    for rel, hit in result.results["published-emails"].items():
+        if not hit:
             continue
-        unexplained = unexplained_residue(text)
-        if unexplained > 0:
-            findings[path.relative_to(REPO_ROOT).as_posix()] = unexplained
-    return findings
+        if hit["hits"]:
+            findings[rel] = hit["hits"]
+        if hit["residue"] > 0:
+            residue[rel] = hit["residue"]
+    return findings, residue
 
 
 def fix(pattern, marker, findings):
@@ -167,8 +204,7 @@ def main():
     args = parser.parse_args()
 
     pattern, marker, unexplained_residue = load_generator_pattern()
-    findings = scan(pattern)
-    residue = scan_residue(unexplained_residue)
+    findings, residue = scan(pattern, unexplained_residue)
 
     if not findings and not residue:
         print("PASS: no third-party email addresses published under public/ "
@@ -226,7 +262,9 @@ def main():
 
     print()
     fix(pattern, marker, findings)
-    remaining = scan(pattern)
+    # No cache: --fix just rewrote these files, and a verdict on them has to
+    # come from reading them.
+    remaining, _ = scan(pattern, unexplained_residue, use_cache=False)
     if remaining:
         print(f"\nFAIL: {len(remaining)} files still carry addresses after --fix")
         return 1
@@ -49,11 +49,15 @@ still printed -- demoting a severity is not the same as hiding it.
 
 import argparse
 import datetime as dt
+import fnmatch
 import json
 import re
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import tree_scan  # noqa: E402  (must follow the sys.path line)
+
 # Windows consoles default to cp1252: the first non-ASCII byte written to stdout
 # raises UnicodeEncodeError and kills the script before it does any work. No-op
 # on UTF-8 platforms. See CLAUDE.md "Environment / tooling".
@@ -97,6 +101,9 @@ SKIP_FILES = {
     # A dated observation of which score-API boards exist, per game version. Listing
     # non-current versions is its entire purpose -- none is presented as current.
     "board-liveness.json",
+    # The probe's schedule: when each (seed, version) board last held entries and was
+    # last asked. Same content as board-liveness.json, kept across runs.
+    "board-probe-history.json",
     # The published live board. Every entry carries the build the player ran, in
     # `game_mode`, and a board is keyed by (seed, LADDER EPOCH) precisely so that ONE
     # board legitimately spans several builds. So a correct board routinely holds build
@@ -106,6 +113,20 @@ SKIP_FILES = {
     # fabricate a score's provenance. Written by scripts/publish-live-board.py.
     "leaderboard.json",
     "published-board.json",
+    # Entry-level changes to leaderboard.json, written beside it by the same script, so
+    # it carries the same `game_mode` observations for the same reason.
+    "leaderboard-delta.json",
+    # The rank index (scripts/rank_index.py): slices and partitions of leaderboard.json,
+    # rewritten with it by both publishers, so the same `game_mode` observations again.
+    "leaderboard-top.json",
+    "leaderboard-players.json",
+    "leaderboard-builds.json",
+    # The league history (scripts/league_history.py): every archived and preserved
+    # entry, with its `game_mode`, and per-epoch labels such as `build v0.12.0` for
+    # the boards the pre-split keying forked. Records of what was played.
+    "league-history.json",
+    "league-history-players.json",
+    "league-history-epochs.json",
     # Board keys and epoch provenance, every value carrying a `source`. It cites the
     # versions that bracket a ladder fork by design.
     "board-probe-targets.json",
@@ -137,6 +158,27 @@ SKIP_FILES = {
     "test-update-version-info.py",
     "test-health-check.py",
     "test-sync-events.py",
+    # Synthetic access logs. Each builds nginx lines on fixed dates, with fixed user
+    # agents such as curl/8.4.0, and asserts what extract_analytics.py reports for a
+    # window over them. The dates are the fixture's calendar, not a claim about today;
+    # relative dates would make a failure depend on the day it ran.
+    "bench-log-stream.py",
+    "test-extract-analytics.py",
+    "test-analytics-incremental.py",
+    "test-analytics-sketch.py",
+    "test-analytics-parallel.py",
+    # Score-API rows served by scripts/stub_score_api.py. A row carries the build its
+    # player ran in `game_mode`, exactly as leaderboard.json does above, so a fixture
+    # row names a build; none is presented as the current release.
+    "test-board-probe-concurrency.py",
+    "test-http-client.py",
+    "test-response-cache.py",
+    # The probe schedule's candidate boards. "v0.11.0" is there as the pre-epoch board
+    # key the real candidate set still carries (see board-probe-targets.json above).
+    "test-board-probe-schedule.py",
+    # A seed_leaderboard_weekly-2026-w01.json fed to ingest_scores.py: its entries are
+    # dated in the week the seed names, as a real export's are.
+    "test-rank-index.py",
 }
 
 # Line-level false positives: (file substring, line substring, reason). Same contract as
@@ -212,21 +254,29 @@ def current_version():
     return None
 
 
-def iter_files():
-    seen = set()
-    self_name = Path(__file__).name
-    for pattern in SCAN_GLOBS:
-        for p in REPO_ROOT.glob(pattern):
-            if not p.is_file() or p in seen:
-                continue
-            if SKIP_PARTS & set(p.relative_to(REPO_ROOT).parts):
-                continue
-            if p.name == self_name:
-                continue          # this file documents the patterns it hunts
-            if p.name in SKIP_FILES:
-                continue
-            seen.add(p)
-            yield p
+def glob_matches(rel, pattern):
+    """Path.glob() semantics for the SCAN_GLOBS shapes, on a relative POSIX path:
+    `dir/**/*.ext` is any depth under dir (including dir itself), `dir/*.ext` is
+    direct children only. Case-sensitive, as glob is on the Linux runner."""
+    head, sep, tail = pattern.partition("/**/")
+    directory, _, name = rel.rpartition("/")
+    if sep:
+        return ((directory == head or directory.startswith(head + "/"))
+                and fnmatch.fnmatchcase(name, tail))
+    want_dir, _, want_name = pattern.rpartition("/")
+    return directory == want_dir and fnmatch.fnmatchcase(name, want_name)
+
+
+def selected(rel):
+    """The file set SCAN_GLOBS names, minus the skips below it."""
+    if not any(glob_matches(rel, g) for g in SCAN_GLOBS):
+        return False
+    if SKIP_PARTS & set(rel.split("/")):
+        return False
+    name = rel.rsplit("/", 1)[-1]
+    if name == Path(__file__).name:
+        return False              # this file documents the patterns it hunts
+    return name not in SKIP_FILES
 
 
 def blank_scripts(text):
@@ -236,96 +286,124 @@ def blank_scripts(text):
     return SCRIPT_OR_STYLE.sub(repl, text)
 
 
-def scan(max_age_days):
-    cur = current_version()
-    today = dt.date.today()
+def scan_file(rel, text, cur, today, max_age_days):
+    """Every finding in one file. Pure in its arguments, which is what lets the
+    shared scan cache keep it: the key below covers cur, today and the age."""
     findings = []
 
-    for path in iter_files():
-        rel = path.relative_to(REPO_ROOT).as_posix()
-        try:
-            text = path.read_text(encoding="utf-8", errors="replace")
-        except Exception:
-            continue
+    # Prose-only view: client-side markdown parsers are full of regex
+    # replacement templates that read as dollar amounts otherwise.
+    prose_lines = blank_scripts(text).splitlines()
+    lines = text.splitlines()
 
-        # Prose-only view: client-side markdown parsers are full of regex
-        # replacement templates that read as dollar amounts otherwise.
-        prose_lines = blank_scripts(text).splitlines()
-        lines = text.splitlines()
+    for i, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if len(stripped) > 400:
+            continue
+        if line_allowlisted(rel, line):
+            continue
 
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            if len(stripped) > 400:
+        # --- VERSION ---------------------------------------------------
+        ip_spans = [mm.span() for mm in IPV4_RE.finditer(line)]
+        for m in VERSION_RE.finditer(line):
+            if any(a <= m.start() < b for a, b in ip_spans):
                 continue
-            if line_allowlisted(rel, line):
+            if PIN_CONTEXT.search(line[:m.start()][-12:]):
                 continue
-
-            # --- VERSION ---------------------------------------------------
-            ip_spans = [mm.span() for mm in IPV4_RE.finditer(line)]
-            for m in VERSION_RE.finditer(line):
-                if any(a <= m.start() < b for a, b in ip_spans):
-                    continue
-                if PIN_CONTEXT.search(line[:m.start()][-12:]):
-                    continue
-                found = "%s.%s.%s" % m.groups()
-                if cur and found == cur:
-                    continue
-                if found.startswith("0.0"):
-                    continue
-                if OTHER_PRODUCT.search(line):
-                    continue          # "built with Godot 4.5.1" is not our version
-                is_fallback = bool(FALLBACK_HINT.search(line))
-                claims_current = bool(CURRENTNESS_WORD.search(line))
-                historical = bool(HISTORICAL_FILES.search(rel))
-                if historical and not (is_fallback or claims_current):
-                    continue          # an archive naming an old version is correct
-                if is_fallback:
-                    sev = "HIGH"
-                elif claims_current:
-                    sev = "MEDIUM"
-                else:
-                    sev = "LOW"
-                findings.append({
-                    "kind": "VERSION",
-                    "severity": sev,
-                    "file": rel, "line": i,
-                    "found": found, "expected": cur,
-                    "fallback": is_fallback,
-                    "text": stripped[:150],
-                })
-
-            # --- DATE ------------------------------------------------------
-            for m in DATE_RE.finditer(line):
-                try:
-                    d = dt.date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
-                except ValueError:
-                    continue
-                age = (today - d).days
-                if age < max_age_days or age < 0:
-                    continue
-                findings.append({
-                    "kind": "DATE",
-                    "severity": "HIGH" if CURRENTNESS_WORD.search(line) else "LOW",
-                    "file": rel, "line": i,
-                    "found": m.group(0), "age_days": age,
-                    "text": stripped[:150],
-                })
-
-            # --- ASSERTED (prose only) -------------------------------------
-            if not rel.endswith(".html"):
+            found = "%s.%s.%s" % m.groups()
+            if cur and found == cur:
                 continue
-            pline = prose_lines[i - 1] if i - 1 < len(prose_lines) else ""
-            cm = CURRENCY_CLAIM.search(pline)
-            if cm and not re.search(r"(free|\$0\b|donat|fund|budget|cost|price of)",
-                                    pline, re.I):
-                findings.append({
-                    "kind": "ASSERTED",
-                    "severity": "MEDIUM",
-                    "file": rel, "line": i,
-                    "found": cm.group(0).strip(),
-                    "text": pline.strip()[:150],
-                })
+            if found.startswith("0.0"):
+                continue
+            if OTHER_PRODUCT.search(line):
+                continue          # "built with Godot 4.5.1" is not our version
+            is_fallback = bool(FALLBACK_HINT.search(line))
+            claims_current = bool(CURRENTNESS_WORD.search(line))
+            historical = bool(HISTORICAL_FILES.search(rel))
+            if historical and not (is_fallback or claims_current):
+                continue          # an archive naming an old version is correct
+            if is_fallback:
+                sev = "HIGH"
+            elif claims_current:
+                sev = "MEDIUM"
+            else:
+                sev = "LOW"
+            findings.append({
+                "kind": "VERSION",
+                "severity": sev,
+                "file": rel, "line": i,
+                "found": found, "expected": cur,
+                "fallback": is_fallback,
+                "text": stripped[:150],
+            })
+
+        # --- DATE ------------------------------------------------------
+        for m in DATE_RE.finditer(line):
+            try:
+                d = dt.date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+            except ValueError:
+                continue
+            age = (today - d).days
+            if age < max_age_days or age < 0:
+                continue
+            findings.append({
+                "kind": "DATE",
+                "severity": "HIGH" if CURRENTNESS_WORD.search(line) else "LOW",
+                "file": rel, "line": i,
+                "found": m.group(0), "age_days": age,
+                "text": stripped[:150],
+            })
+
+        # --- ASSERTED (prose only) -------------------------------------
+        if not rel.endswith(".html"):
+            continue
+        pline = prose_lines[i - 1] if i - 1 < len(prose_lines) else ""
+        cm = CURRENCY_CLAIM.search(pline)
+        if cm and not re.search(r"(free|\$0\b|donat|fund|budget|cost|price of)",
+                                pline, re.I):
+            findings.append({
+                "kind": "ASSERTED",
+                "severity": "MEDIUM",
+                "file": rel, "line": i,
+                "found": cm.group(0).strip(),
+                "text": pline.strip()[:150],
+            })
+
+    return findings
+
+
+def scan_checkers(max_age_days=180):
+    """This guard's Checker for the shared tree scan (scripts/tree_scan.py)."""
+    cur = current_version()
+    today = dt.date.today()
+
+    def check(f):
+        try:
+            # The universal-newline view, which is what read_text() gave this
+            # guard before the shared scan: line numbers are counted on it.
+            text = f.universal_text()
+        except OSError:
+            return None
+        return scan_file(f.rel, text, cur, today, max_age_days)
+
+    roots = tuple(g.split("/*", 1)[0] for g in SCAN_GLOBS)
+    key = tree_scan.fingerprint(Path(__file__), cur, today.isoformat(), max_age_days)
+    return [tree_scan.Checker("stale-facts", key, selected, check, roots=roots)]
 
+
+def scan(max_age_days):
+    cur = current_version()
+    result = tree_scan.scan(scan_checkers(max_age_days), REPO_ROOT)
+    per_file = result.results["stale-facts"]
+    # Grouped by SCAN_GLOBS entry, in order, the way the per-glob walk this
+    # replaced yielded them -- so --json lists findings in a stable order.
+    findings, seen = [], set()
+    for pattern in SCAN_GLOBS:
+        for rel, found in per_file.items():
+            if rel in seen or not glob_matches(rel, pattern):
+                continue
+            seen.add(rel)
+            findings.extend(found or ())
     return cur, findings
 
 
@@ -56,6 +56,9 @@ import sys
 from collections import defaultdict
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import tree_scan  # noqa: E402  (must follow the sys.path line)
+
 for _s in (sys.stdout, sys.stderr):
     try:
         _s.reconfigure(encoding="utf-8", errors="replace")
@@ -87,6 +90,53 @@ def norm_hex(h):
     return h
 
 
+def load_colours():
+    """tokens.json's `colors`. Raises (OSError, ValueError) when the file cannot
+    be read, which main() reports as CANNOT TELL."""
+    return json.loads(TOKENS.read_text(encoding="utf-8")).get("colors") or {}
+
+
+def token_vars(colors):
+    """kebab css var -> canonical value."""
+    return {kebab(k): norm_hex(v) for k, v in colors.items() if isinstance(v, str)}
+
+
+def scan_checkers(want=None):
+    """This guard's Checker for the shared tree scan (scripts/tree_scan.py).
+
+    Per page it keeps only the declarations main() can use under ANY --var: a
+    token-named variable, or any variable holding a token value. The key covers
+    the palette, so a tokens.json edit rescans.
+    """
+    if want is None:
+        try:
+            want = token_vars(load_colours())
+        except (OSError, ValueError):
+            return []
+    names, values = set(want), set(want.values())
+
+    def select(rel):
+        return rel.endswith(".html")
+
+    def check(f):
+        try:
+            if not f.valid_utf8:
+                return None           # read_text() raised on these; skipped
+            text = f.text
+        except OSError:
+            return None
+        decls = []
+        for m in DECL_RE.finditer(text):
+            var, val = m.group(1)[2:], norm_hex(m.group(2))
+            if var in names or val in values:
+                decls.append([var, val])
+        return decls
+
+    key = tree_scan.fingerprint(Path(__file__), sorted(want.items()))
+    return [tree_scan.Checker("token-drift", key, select, check,
+                              roots=(PUBLIC.relative_to(ROOT).as_posix(),))]
+
+
 def main():
     ap = argparse.ArgumentParser(
         description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
@@ -97,27 +147,26 @@ def main():
     args = ap.parse_args()
 
     try:
-        tokens = json.loads(TOKENS.read_text(encoding="utf-8"))
+        colors = load_colours()
     except (OSError, ValueError) as e:
         print("CANNOT TELL: could not read %s (%s)." % (TOKENS, e))
         print("Absence of the token file is UNKNOWN, never agreement.")
         return 2
 
-    colors = tokens.get("colors") or {}
     if not colors:
         print("CANNOT TELL: tokens.json carries no colours, so there is nothing to")
         print("check pages against.")
         return 2
 
     # kebab css var -> canonical value
-    want = {kebab(k): norm_hex(v) for k, v in colors.items() if isinstance(v, str)}
+    want = token_vars(colors)
+    pages = tree_scan.scan(scan_checkers(want), ROOT).results["token-drift"]
     if args.var:
         want = {k: v for k, v in want.items() if k == args.var.lstrip("-")}
         if not want:
             print("No such token variable: --%s" % args.var.lstrip("-"))
             return 2
 
-    files = sorted(PUBLIC.rglob("*.html"))
     drift = defaultdict(list)      # var -> [(path, found)]
     agree = defaultdict(int)       # var -> count
     other_dialect = defaultdict(int)
@@ -125,15 +174,11 @@ def main():
 
     token_values = {v for v in want.values()}
 
-    for f in files:
-        try:
-            text = f.read_text(encoding="utf-8")
-        except (OSError, UnicodeDecodeError):
+    for rel, decls in pages.items():
+        if decls is None:
             continue
         scanned += 1
-        rel = f.relative_to(ROOT).as_posix()
-        for m in DECL_RE.finditer(text):
-            var, val = m.group(1)[2:], norm_hex(m.group(2))
+        for var, val in decls:
             if var in want:
                 if val == want[var]:
                     agree[var] += 1
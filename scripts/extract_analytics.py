@@ -9,18 +9,62 @@ Usage:
     python scripts/extract_analytics.py --help
     python scripts/extract_analytics.py --days 30
     python scripts/extract_analytics.py --month 2025-11
+    python scripts/extract_analytics.py --log-file access.log --log-file access.log.2.gz
+    python scripts/extract_analytics.py --days 30 --jobs 0
+
+STREAMING
+---------
+Logs are never held in memory. Each source -- an SSH pipe or a local file, .gz
+decompressed on the fly -- is read one line at a time, each line is parsed and
+folded into a LogAggregator, and then dropped. The aggregator's size depends on
+how many distinct days, paths, referrers and visitors the window has, not on how
+many lines it took to see them, so a traffic spike costs time, not memory. It
+used to capture every file as one string, split it into a list, and build a dict
+per line on top of that: several times the raw log size, at exactly the moment
+the logs were biggest.
+
+INCREMENTAL
+-----------
+With --incremental a run reads only what was appended to each log since the
+last run, folds it into stored per-day aggregates, and reports the window from
+those days. Offsets and days are kept in .analytics-state/ (see
+scripts/analytics_store.py); rotation and copytruncate are detected by each
+file's first line, not its name.
+
+PARALLEL
+--------
+With --jobs N a full run parses across N processes. Each plain log is cut into
+byte ranges on line boundaries (a .gz is one range), every range is parsed into
+its own LogAggregator, and the parent merges them in log order, so the output
+is the serial one exactly. Logs on the VPS are first copied to a temporary
+directory, since a pipe cannot be split. Timestamps, address hashes, referrer
+domains and bot checks are memoised per distinct value in either mode.
+
+Benchmark: python scripts/bench-log-stream.py
+Tests:     python scripts/test-extract-analytics.py
+           python scripts/test-analytics-incremental.py
+           python scripts/test-analytics-parallel.py
 """
 
 import argparse
+import gzip
+import io
 import json
 import re
+import shlex
 import subprocess
-from collections import Counter, defaultdict
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional
 from urllib.parse import urlparse
 import hashlib
+import os
+import tempfile
 
 import sys
 
@@ -33,230 +77,302 @@ for _stream in (sys.stdout, sys.stderr):
     except (AttributeError, ValueError):
         pass
 
-class AnalyticsExtractor:
-    """Extract and process analytics from DreamHost web server logs."""
-
-    def __init__(self, ssh_key: str, ssh_host: str = "ubuntu@208.113.200.215"):
-        self.ssh_key = ssh_key
-        self.ssh_host = ssh_host
-        self.output_dir = Path("public/data/analytics/dreamhost")
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Nginx log format: Combined Log Format
-        # IP - - [timestamp] "METHOD /path HTTP/1.1" status size "referrer" "user-agent"
-        self.log_pattern = re.compile(
-            r'(?P<ip>[\d.]+) - - \[(?P<timestamp>[^\]]+)\] '
-            r'"(?P<method>\w+) (?P<path>[^\s]+) HTTP/[^"]*" '
-            r'(?P<status>\d+) (?P<size>\d+) '
-            r'"(?P<referrer>[^"]*)" "(?P<user_agent>[^"]*)"'
-        )
-
-    def anonymize_ip(self, ip: str) -> str:
-        """Anonymize IP address using SHA-256 hash (GDPR compliant)."""
-        return hashlib.sha256(ip.encode()).hexdigest()[:16]
-
-    def fetch_logs(self, days: int = 30) -> List[str]:
-        """
-        Fetch Nginx access logs from DreamHost VPS via SSH.
-
-        Args:
-            days: Number of days of logs to fetch
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import analytics_store  # noqa: E402
+from analytics_store import is_page  # noqa: E402
+
+
+def open_log(path) -> io.TextIOBase:
+    """Open a local access log for line-by-line reading; .gz is decompressed as read."""
+    if str(path).endswith('.gz'):
+        return gzip.open(path, 'rt', encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+# Nginx log format: Combined Log Format
+# IP - - [timestamp] "METHOD /path HTTP/1.1" status size "referrer" "user-agent"
+LOG_PATTERN = re.compile(
+    r'(?P<ip>[\d.]+) - - \[(?P<timestamp>[^\]]+)\] '
+    r'"(?P<method>\w+) (?P<path>[^\s]+) HTTP/[^"]*" '
+    r'(?P<status>\d+) (?P<size>\d+) '
+    r'"(?P<referrer>[^"]*)" "(?P<user_agent>[^"]*)"'
+)
+
+BOT_MARKERS = ('bot', 'crawler', 'spider', 'scraper', 'curl', 'wget')
+
+# $time_local, e.g. 10/Nov/2025:14:30:00 +0000
+NGINX_TIME = re.compile(
+    r'(\d\d)/([A-Z][a-z]{2})/(\d{4}):(\d\d):(\d\d):(\d\d) '
+    r'([+-])(\d\d)([0-5]\d)\Z'
+)
+MONTHS = {name: i for i, name in enumerate(
+    ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), 1)}
+
+
+# Per-line work that depends on one field only is memoised. A log is written in
+# time order with many requests per second, from a few thousand addresses, a
+# handful of referrers and user agents, so nearly every lookup is a hit and the
+# timestamp parse, SHA-256, urlparse and the bot scan run once per distinct value
+# instead of once per line. The caches are bounded; a miss just recomputes. The
+# timestamp cache is the smallest: lines arrive in time order, so only the last
+# few seconds' strings are ever asked for again.
+@lru_cache(maxsize=1024)
+def parse_timestamp(timestamp_str: str):
+    """(datetime, ISO date, hour) for '10/Nov/2025:14:30:00 +0000', or None."""
+    # A miss is usually nginx's own fixed-width format, built directly; strptime
+    # (locale lookups and a regex of its own) only sees anything else. Both
+    # refuse the same impossible dates -- datetime() validates the fields.
+    match = NGINX_TIME.match(timestamp_str)
+    try:
+        if match and match.group(2) in MONTHS:
+            day, month, year, hour, minute, second, sign, zh, zm = match.groups()
+            offset = timedelta(hours=int(zh), minutes=int(zm))
+            dt = datetime(int(year), MONTHS[month], int(day), int(hour), int(minute),
+                          int(second), tzinfo=timezone(-offset if sign == '-' else offset))
+        else:
+            dt = datetime.strptime(timestamp_str, '%d/%b/%Y:%H:%M:%S %z')
+    except ValueError:
+        return None
+    return dt, dt.date().isoformat(), dt.hour
 
-        Returns:
-            List of log lines
-        """
-        print(f"Fetching logs from {self.ssh_host} (last {days} days)...")
 
-        # DreamHost/Nginx logs are typically in /var/log/nginx/
-        # We'll fetch the access log and recent rotated logs
-        log_files = [
-            "/var/log/nginx/access.log",
-            "/var/log/nginx/access.log.1",
-        ]
+@lru_cache(maxsize=65536)
+def anonymize_ip(ip: str) -> str:
+    """Anonymize IP address using SHA-256 hash (GDPR compliant)."""
+    return hashlib.sha256(ip.encode()).hexdigest()[:16]
 
-        # If we need more history, fetch compressed logs
-        if days > 7:
-            log_files.append("/var/log/nginx/access.log.2.gz")
-        if days > 14:
-            log_files.append("/var/log/nginx/access.log.3.gz")
 
-        all_lines = []
+@lru_cache(maxsize=4096)
+def referrer_domain(referrer: str) -> Optional[str]:
+    """The host a referrer URL names, or None if it does not parse."""
+    try:
+        return urlparse(referrer).netloc
+    except ValueError:
+        return None
 
-        for log_file in log_files:
-            try:
-                # Check if file is compressed
-                if log_file.endswith('.gz'):
-                    cmd = f"zcat {log_file}"
-                else:
-                    cmd = f"cat {log_file}"
-
-                result = subprocess.run(
-                    ["ssh", "-i", self.ssh_key, self.ssh_host, cmd],
-                    capture_output=True,
-                    text=True,
-                    timeout=60,
-                    encoding="utf-8", errors="replace"
-                )
-
-                if result.returncode == 0:
-                    lines = result.stdout.strip().split('\n')
-                    all_lines.extend(lines)
-                    print(f"  Fetched {len(lines)} lines from {log_file}")
-                else:
-                    print(f"  Warning: Could not fetch {log_file}")
 
-            except subprocess.TimeoutExpired:
-                print(f"  Warning: Timeout fetching {log_file}")
-            except Exception as e:
-                print(f"  Warning: Error fetching {log_file}: {e}")
+@lru_cache(maxsize=4096)
+def is_bot(user_agent: str) -> bool:
+    user_agent = user_agent.lower()
+    return any(bot in user_agent for bot in BOT_MARKERS)
 
-        print(f"Total log lines fetched: {len(all_lines)}")
-        return all_lines
 
-    def parse_log_line(self, line: str) -> Dict:
-        """Parse a single Nginx log line."""
-        match = self.log_pattern.match(line)
-        if not match:
-            return None
+def parse_log_line(line: str) -> Optional[Dict]:
+    """Parse a single Nginx log line; None if it is not one."""
+    match = LOG_PATTERN.match(line)
+    if not match:
+        return None
 
-        data = match.groupdict()
+    data = match.groupdict()
 
-        # Parse timestamp
-        try:
-            # Format: 10/Nov/2025:14:30:00 +0000
-            timestamp_str = data['timestamp']
-            dt = datetime.strptime(timestamp_str, '%d/%b/%Y:%H:%M:%S %z')
-            data['datetime'] = dt
-            data['date'] = dt.date().isoformat()
-            data['hour'] = dt.hour
-        except ValueError:
-            return None
+    # Parse timestamp
+    parsed = parse_timestamp(data['timestamp'])
+    if parsed is None:
+        return None
+    data['datetime'], data['date'], data['hour'] = parsed
 
-        # Anonymize IP
-        data['ip_hash'] = self.anonymize_ip(data['ip'])
-        del data['ip']  # Remove original IP
+    # Anonymize IP
+    data['ip_hash'] = anonymize_ip(data['ip'])
+    del data['ip']  # Remove original IP
 
-        # Parse status and size
-        data['status'] = int(data['status'])
-        data['size'] = int(data['size'])
+    # Parse status and size
+    data['status'] = int(data['status'])
+    data['size'] = int(data['size'])
 
-        # Clean referrer
-        if data['referrer'] == '-':
-            data['referrer'] = None
-        else:
-            # Extract domain from referrer
-            try:
-                parsed = urlparse(data['referrer'])
-                data['referrer_domain'] = parsed.netloc
-            except:
-                data['referrer_domain'] = None
-
-        # Parse user agent for bot detection
-        user_agent = data['user_agent'].lower()
-        data['is_bot'] = any(bot in user_agent for bot in [
-            'bot', 'crawler', 'spider', 'scraper', 'curl', 'wget'
-        ])
-
-        return data
-
-    def analyze_logs(self, log_lines: List[str], start_date: str = None, end_date: str = None) -> Dict:
+    # Clean referrer
+    if data['referrer'] == '-':
+        data['referrer'] = None
+    else:
+        data['referrer_domain'] = referrer_domain(data['referrer'])
+
+    # Parse user agent for bot detection
+    data['is_bot'] = is_bot(data['user_agent'])
+
+    return data
+
+
+class LogAggregator:
+    """
+    Running totals for one analytics window, fed one parsed entry at a time.
+
+    Holds exactly what analyze_logs() reports and nothing per line: a few numbers
+    and a HyperLogLog visitor sketch per day, a sketch per page, and one Counter
+    each for pages, status codes, referrer domains and hours. Counters keep
+    first-seen order, which is the tie order of most_common(), so the result is
+    the same as aggregating a list of every entry in the order the lines arrived.
+    Aggregators of consecutive stretches of log, merged in order, are the
+    aggregator of the whole (see merge()).
+    """
+
+    def __init__(self, start_date: str = None, end_date: str = None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.total_requests = 0
+        self.period_start = None
+        self.period_end = None
+        self.daily = {}
+        self.path_stats = Counter()
+        self.status_codes = Counter()
+        self.referrer_domains = Counter()
+        self.hourly_distribution = Counter()
+        self.path_visitors = {}
+
+    @classmethod
+    def from_days(cls, days: "analytics_store.DailyAggregates", start_date: str = None,
+                  end_date: str = None) -> "LogAggregator":
         """
-        Analyze log lines and generate statistics.
+        The window's totals from stored per-day aggregates, without a log line.
 
-        Args:
-            log_lines: Raw log lines from server
-            start_date: Optional start date (YYYY-MM-DD)
-            end_date: Optional end date (YYYY-MM-DD)
-
-        Returns:
-            Dictionary of analytics data
+        Days are merged oldest first, so a tie in a top list goes to whatever was
+        seen on the earlier day.
         """
-        print("Analyzing logs...")
-
-        parsed_entries = []
-        for line in log_lines:
-            if not line.strip():
+        aggregator = cls(start_date, end_date)
+        for date in sorted(days.days):
+            day = days.days[date]
+            if not day["hits"]:
                 continue
+            if start_date and date < start_date:
+                continue
+            if end_date and date > end_date:
+                continue
+            aggregator.total_requests += day["hits"]
+            if aggregator.period_start is None:
+                aggregator.period_start = date
+            aggregator.period_end = date
+            if day["requests"]:
+                aggregator.daily[date] = {
+                    'requests': day["requests"],
+                    'unique_visitors': day["visitors"].copy(),
+                    'page_views': day["page_views"],
+                    'bandwidth_bytes': day["bandwidth_bytes"]
+                }
+            aggregator.path_stats.update(day["paths"])
+            for path, sketch in day["path_visitors"].items():
+                if path in aggregator.path_visitors:
+                    aggregator.path_visitors[path].merge(sketch)
+                else:
+                    aggregator.path_visitors[path] = sketch.copy()
+            aggregator.status_codes.update(day["status"])
+            aggregator.referrer_domains.update(day["referrers"])
+            aggregator.hourly_distribution.update(day["hours"])
+        return aggregator
+
+    def add(self, entry: Dict) -> bool:
+        """Fold one parse_log_line() entry in. False if it is outside the window."""
+        date = entry['date']
+        if self.start_date and date < self.start_date:
+            return False
+        if self.end_date and date > self.end_date:
+            return False
+
+        self.total_requests += 1
+        if self.period_start is None or date < self.period_start:
+            self.period_start = date
+        if self.period_end is None or date > self.period_end:
+            self.period_end = date
+
+        # Skip bots for visitor counts
+        if not entry['is_bot']:
+            day = self.daily.get(date)
+            if day is None:
+                day = self.daily[date] = {
+                    'requests': 0,
+                    'unique_visitors': analytics_store.HyperLogLog(
+                        analytics_store.VISITOR_PRECISION),
+                    'page_views': 0,
+                    'bandwidth_bytes': 0
+                }
+            day['requests'] += 1
+            h = int(entry['ip_hash'], 16)
+            day['unique_visitors'].add_hash(h)
+            day['bandwidth_bytes'] += entry['size']
+
+            # Count successful requests to HTML pages as page views
+            if entry['status'] == 200 and is_page(entry['path']):
+                day['page_views'] += 1
+                self.path_stats[entry['path']] += 1
+                page = self.path_visitors.get(entry['path'])
+                if page is None:
+                    page = self.path_visitors[entry['path']] = analytics_store.HyperLogLog(
+                        analytics_store.PAGE_PRECISION)
+                page.add_hash(h)
+
+        self.status_codes[entry['status']] += 1
+        self.hourly_distribution[entry['hour']] += 1
+
+        if entry.get('referrer_domain'):
+            self.referrer_domains[entry['referrer_domain']] += 1
+        return True
+
+    def merge(self, other: "LogAggregator") -> "LogAggregator":
+        """
+        Fold in the aggregator of the lines that come after this one's.
 
-            entry = self.parse_log_line(line)
-            if entry:
-                # Filter by date range if specified
-                if start_date and entry['date'] < start_date:
-                    continue
-                if end_date and entry['date'] > end_date:
-                    continue
-
-                parsed_entries.append(entry)
-
-        print(f"Parsed {len(parsed_entries)} valid log entries")
-
-        if not parsed_entries:
+        Sums and sketch unions do not care about order, but Counter.update()
+        appends keys it has not seen in other's first-seen order -- so merging
+        chunk aggregators in file order leaves every tie in a top list exactly
+        where one pass over the whole log would have.
+        """
+        self.total_requests += other.total_requests
+        for date in (other.period_start, other.period_end):
+            if date is None:
+                continue
+            if self.period_start is None or date < self.period_start:
+                self.period_start = date
+            if self.period_end is None or date > self.period_end:
+                self.period_end = date
+        for date, theirs in other.daily.items():
+            day = self.daily.get(date)
+            if day is None:
+                self.daily[date] = dict(theirs,
+                                        unique_visitors=theirs['unique_visitors'].copy())
+                continue
+            day['requests'] += theirs['requests']
+            day['unique_visitors'].merge(theirs['unique_visitors'])
+            day['page_views'] += theirs['page_views']
+            day['bandwidth_bytes'] += theirs['bandwidth_bytes']
+        self.path_stats.update(other.path_stats)
+        for path, sketch in other.path_visitors.items():
+            if path in self.path_visitors:
+                self.path_visitors[path].merge(sketch)
+            else:
+                self.path_visitors[path] = sketch.copy()
+        self.status_codes.update(other.status_codes)
+        self.referrer_domains.update(other.referrer_domains)
+        self.hourly_distribution.update(other.hourly_distribution)
+        return self
+
+    def result(self) -> Dict:
+        """The analytics document analyze_logs() returns."""
+        if not self.total_requests:
             return {"error": "No valid log entries found"}
 
-        # Analytics calculations
         analytics = {
             "metadata": {
                 "generated_at": datetime.now().isoformat(),
-                "period_start": min(e['date'] for e in parsed_entries),
-                "period_end": max(e['date'] for e in parsed_entries),
-                "total_requests": len(parsed_entries),
+                "period_start": self.period_start,
+                "period_end": self.period_end,
+                "total_requests": self.total_requests,
                 "anonymization": "IP addresses hashed (SHA-256)",
-                "privacy": "No PII collected"
+                "privacy": "No PII collected",
+                "unique_visitors": "HyperLogLog estimate (standard error 1.6%; 3.3% per page)"
             }
         }
 
-        # Daily statistics
-        daily_stats = defaultdict(lambda: {
-            'requests': 0,
-            'unique_visitors': set(),
-            'page_views': 0,
-            'bandwidth_bytes': 0
-        })
-
-        # Path statistics
-        path_stats = Counter()
-        status_codes = Counter()
-        referrer_domains = Counter()
-        hourly_distribution = Counter()
-
-        for entry in parsed_entries:
-            date = entry['date']
-
-            # Skip bots for visitor counts
-            if not entry['is_bot']:
-                daily_stats[date]['requests'] += 1
-                daily_stats[date]['unique_visitors'].add(entry['ip_hash'])
-                daily_stats[date]['bandwidth_bytes'] += entry['size']
-
-                # Count successful requests to HTML pages as page views
-                if entry['status'] == 200 and (
-                    entry['path'].endswith('.html') or
-                    entry['path'].endswith('/') or
-                    entry['path'] == '/'
-                ):
-                    daily_stats[date]['page_views'] += 1
-                    path_stats[entry['path']] += 1
-
-            status_codes[entry['status']] += 1
-            hourly_distribution[entry['hour']] += 1
-
-            if entry.get('referrer_domain') and entry['referrer_domain']:
-                referrer_domains[entry['referrer_domain']] += 1
-
-        # Convert daily stats to serializable format
+        daily_stats = self.daily
         analytics['daily'] = {}
         for date, stats in sorted(daily_stats.items()):
             analytics['daily'][date] = {
                 'requests': stats['requests'],
-                'unique_visitors': len(stats['unique_visitors']),
+                'unique_visitors': stats['unique_visitors'].count(),
                 'page_views': stats['page_views'],
                 'bandwidth_mb': round(stats['bandwidth_bytes'] / (1024 * 1024), 2)
             }
 
         # Summary statistics
-        total_unique_visitors = len(set(
-            entry['ip_hash'] for entry in parsed_entries if not entry['is_bot']
-        ))
+        total_unique_visitors = analytics_store.union(
+            s['unique_visitors'] for s in daily_stats.values()
+        ).count()
 
         analytics['summary'] = {
             'total_unique_visitors': total_unique_visitors,
@@ -272,28 +388,509 @@ class AnalyticsExtractor:
 
         # Top pages (limit to top 20)
         analytics['top_pages'] = [
-            {"path": path, "views": count}
-            for path, count in path_stats.most_common(20)
+            {"path": path, "views": count,
+             "unique_visitors": self.path_visitors[path].count()}
+            for path, count in self.path_stats.most_common(20)
         ]
 
         # Status code distribution
-        analytics['status_codes'] = dict(status_codes)
+        analytics['status_codes'] = dict(self.status_codes)
 
         # Top referrers (limit to top 20, exclude own domain)
         analytics['top_referrers'] = [
             {"domain": domain, "count": count}
-            for domain, count in referrer_domains.most_common(20)
+            for domain, count in self.referrer_domains.most_common(20)
             if 'pdoom1.com' not in domain
         ]
 
         # Hourly traffic distribution (0-23)
         analytics['hourly_distribution'] = {
-            str(hour): hourly_distribution.get(hour, 0)
+            str(hour): self.hourly_distribution.get(hour, 0)
             for hour in range(24)
         }
 
         return analytics
 
+
+class LocalLog:
+    """A log file on this machine, for --incremental (see AnalyticsExtractor.ingest_log)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.name = str(path)
+        self.gz = self.name.endswith('.gz')
+
+    def _open(self):
+        return gzip.open(self.path, 'rb') if self.gz else open(self.path, 'rb')
+
+    def probe(self):
+        """(inode, size or None for .gz, fingerprint), or None if unreadable."""
+        try:
+            inode = os.stat(self.path).st_ino
+            with self._open() as f:
+                head = f.read(analytics_store.HEAD_BYTES)
+            size = None if self.gz else os.stat(self.path).st_size
+        except (OSError, EOFError):
+            return None
+        return inode, size, analytics_store.fingerprint(head)
+
+    def lines(self, offset: int, inode: int) -> Iterator[bytes]:
+        """Bytes from offset on, and only if the file is still the inode probed."""
+        try:
+            with self._open() as f:
+                if os.fstat(f.fileno()).st_ino != inode:
+                    print(f"  Warning: {self.name} was replaced while being read; "
+                          f"leaving it for the next run")
+                    return
+                f.seek(offset)
+                yield from f
+        except (OSError, EOFError) as e:
+            print(f"  Warning: Error reading {self.name}: {e}")
+
+
+class RemoteLog:
+    """A log file on the VPS, probed and read over SSH, for --incremental."""
+
+    def __init__(self, extractor: "AnalyticsExtractor", path: str):
+        self.extractor = extractor
+        self.name = path
+        self.gz = path.endswith('.gz')
+
+    def probe(self):
+        """(inode, uncompressed size, fingerprint) in one round trip, or None."""
+        q, head = shlex.quote(self.name), analytics_store.HEAD_BYTES
+        if self.gz:
+            cmd = (f"stat -c %i {q} && zcat {q} | wc -c && "
+                   f"zcat {q} | head -c {head} | head -n 1 | sha256sum")
+        else:
+            cmd = f"stat -c '%i %s' {q} && head -c {head} {q} | head -n 1 | sha256sum"
+        try:
+            result = subprocess.run(self.extractor.ssh_argv(cmd), capture_output=True,
+                                    text=True, encoding="utf-8", errors="replace",
+                                    timeout=60)
+            if result.returncode != 0:
+                return None
+            inode, size, digest = result.stdout.split()[:3]
+            return int(inode), int(size), (digest if int(size) else None)
+        except (subprocess.TimeoutExpired, OSError, ValueError):
+            return None
+
+    def lines(self, offset: int, inode: int) -> Iterator[bytes]:
+        """Bytes from offset on, and only if the file is still the inode probed."""
+        q = shlex.quote(self.name)
+        same = f'test "$(stat -c %i {q})" = {int(inode)}'
+        if self.gz and offset == 0:
+            # Unread rotated log: send it compressed and decompress here
+            cmd, gz = f"{same} && cat {q}", True
+        elif self.gz:
+            cmd, gz = f"{same} && zcat {q} | tail -c +{offset + 1}", False
+        else:
+            cmd, gz = f"{same} && tail -c +{offset + 1} {q}", False
+        return self.extractor.stream_command(self.extractor.ssh_argv(cmd), self.name,
+                                             gz=gz, binary=True)
+
+
+# ---------------------------------------------------------------------------
+# Parallel parsing
+#
+# Parsing is per line and shares nothing, so a log shards cleanly: each plain
+# file is cut into byte ranges that start and end on a line boundary, each
+# range is parsed in a worker into a LogAggregator of its own, and the parent
+# merges them in file-then-offset order (pool.map yields in submission order).
+# LogAggregator.merge() keeps first-seen order, so the result is the one a
+# single pass would give, tie for tie -- whatever the worker count or chunk size.
+#
+# A range is read through the same UTF-8 text layer as open_log(), so it splits
+# into the same lines a serial read does. A .gz cannot be entered mid-stream and
+# is one chunk, decompressed by one worker; several rotated .gz files still
+# spread across the pool.
+#
+# Below a few MB a chunk costs more to ship than to parse, so small files are
+# not split, and a run that comes to a single chunk never starts a pool.
+MIN_CHUNK_BYTES = 4 * 1024 * 1024
+CHUNKS_PER_JOB = 4
+
+
+class _ByteRange(io.RawIOBase):
+    """At most `length` bytes of an open binary file, from where it stands."""
+
+    def __init__(self, f, length: int):
+        self.f = f
+        self.left = length
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.left <= 0:
+            return 0
+        n = self.f.readinto(memoryview(buffer)[:min(len(buffer), self.left)]) or 0
+        self.left -= n
+        return n
+
+    def close(self):
+        self.f.close()
+        super().close()
+
+
+def open_log_range(path, start: int = 0, end: Optional[int] = None) -> io.TextIOBase:
+    """open_log(), limited to bytes [start, end) of a plain file (end=None: all)."""
+    if end is None:
+        return open_log(path)
+    f = open(path, 'rb')
+    f.seek(start)
+    return io.TextIOWrapper(io.BufferedReader(_ByteRange(f, end - start)),
+                            encoding="utf-8", errors="replace")
+
+
+def plan_chunks(path, jobs: int) -> List[tuple]:
+    """
+    (path, start, end) byte ranges covering a log, each ending just after a newline.
+
+    A .gz, an unreadable file or one under two MIN_CHUNK_BYTES is one chunk with
+    end=None (read to the end, and any error reported by whoever reads it).
+    """
+    if str(path).endswith('.gz'):
+        return [(path, 0, None)]
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return [(path, 0, None)]
+    n = min(jobs * CHUNKS_PER_JOB, size // MIN_CHUNK_BYTES)
+    if n <= 1:
+        return [(path, 0, None)]
+    bounds = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, n):
+            f.seek(max(size * i // n, bounds[-1]))
+            f.readline()  # to the start of the next line
+            if f.tell() >= size:
+                break
+            if f.tell() > bounds[-1]:
+                bounds.append(f.tell())
+    bounds.append(size)
+    return [(path, lo, hi) for lo, hi in zip(bounds, bounds[1:])]
+
+
+def _aggregate_chunk(chunk: tuple) -> tuple:
+    """(LogAggregator, lines read, warning or None) for one planned chunk."""
+    path, start, end, start_date, end_date = chunk
+    aggregator = LogAggregator(start_date, end_date)
+    count, warning = 0, None
+    try:
+        with open_log_range(path, start, end) as f:
+            for line in f:
+                count += 1
+                if not line.strip():
+                    continue
+                entry = parse_log_line(line)
+                if entry:
+                    aggregator.add(entry)
+    except (OSError, EOFError) as e:
+        warning = f"  Warning: Error reading {path}: {e}"
+    return aggregator, count, warning
+
+
+def resolve_jobs(jobs: int) -> int:
+    """--jobs 0 means one worker per CPU."""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+class AnalyticsExtractor:
+    """Extract and process analytics from DreamHost web server logs."""
+
+    def __init__(self, ssh_key: str, ssh_host: str = "ubuntu@208.113.200.215"):
+        self.ssh_key = ssh_key
+        self.ssh_host = ssh_host
+        self.output_dir = Path("public/data/analytics/dreamhost")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.lines_fetched = 0
+        self.log_pattern = LOG_PATTERN
+
+    def anonymize_ip(self, ip: str) -> str:
+        """Anonymize IP address using SHA-256 hash (GDPR compliant)."""
+        return anonymize_ip(ip)
+
+    def remote_log_files(self, days: int = 30) -> List[str]:
+        """The Nginx access logs on the VPS that cover the last `days` days."""
+        # DreamHost/Nginx logs are typically in /var/log/nginx/
+        # We'll fetch the access log and recent rotated logs
+        log_files = [
+            "/var/log/nginx/access.log",
+            "/var/log/nginx/access.log.1",
+        ]
+
+        # If we need more history, fetch compressed logs
+        if days > 7:
+            log_files.append("/var/log/nginx/access.log.2.gz")
+        if days > 14:
+            log_files.append("/var/log/nginx/access.log.3.gz")
+        return log_files
+
+    def ssh_argv(self, command: str) -> List[str]:
+        """The argv that runs a shell command on the VPS."""
+        return ["ssh", "-i", self.ssh_key, self.ssh_host, command]
+
+    def stream_command(self, argv: List[str], label: str, gz: bool = False,
+                       idle_timeout: float = 60, binary: bool = False) -> Iterator[str]:
+        """
+        Yield the lines a command writes to stdout, as it writes them.
+
+        gz=True decompresses the stream locally, so a rotated log crosses the
+        network compressed. binary=True yields undecoded lines, for callers that
+        count bytes. The old 60 s limit on the whole transfer would cut a
+        large log short, so the timeout is now on silence: the command is killed
+        if no line arrives for idle_timeout seconds. A command that fails, stalls
+        or is abandoned by the consumer is always reaped.
+        """
+        proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        raw = gzip.GzipFile(fileobj=proc.stdout) if gz else proc.stdout
+        stream = raw if binary else io.TextIOWrapper(raw, encoding="utf-8", errors="replace")
+        seen = [0]
+        done = threading.Event()
+        stalled = threading.Event()
+
+        def watchdog():
+            last, since = -1, time.monotonic()
+            while not done.wait(min(1.0, idle_timeout / 4)):
+                if seen[0] != last:
+                    last, since = seen[0], time.monotonic()
+                elif time.monotonic() - since >= idle_timeout:
+                    stalled.set()
+                    proc.kill()
+                    return
+
+        threading.Thread(target=watchdog, daemon=True).start()
+        try:
+            for line in stream:
+                seen[0] += 1
+                yield line
+        except (OSError, EOFError) as e:
+            if not stalled.is_set():
+                print(f"  Warning: Error reading {label}: {e}")
+        finally:
+            done.set()
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+            proc.stdout.close()
+
+        if stalled.is_set():
+            print(f"  Warning: Timeout reading {label} "
+                  f"(no data for {idle_timeout:g}s, kept {seen[0]} lines)")
+        elif proc.returncode != 0:
+            print(f"  Warning: Could not fetch {label}")
+
+    def read_log_file(self, path) -> Iterator[str]:
+        """Yield the lines of a local log file (.gz decompressed as read)."""
+        try:
+            with open_log(path) as f:
+                yield from f
+        except (OSError, EOFError) as e:
+            print(f"  Warning: Error reading {path}: {e}")
+
+    def fetch_logs(self, days: int = 30, log_files: Optional[List[str]] = None) -> Iterator[str]:
+        """
+        Stream Nginx access log lines, from the VPS via SSH or from local files.
+
+        Args:
+            days: Number of days of logs to fetch
+            log_files: Local files to read instead of the VPS (.gz allowed)
+
+        Yields:
+            Log lines, one at a time. self.lines_fetched counts them.
+        """
+        self.lines_fetched = 0
+        if log_files:
+            print(f"Reading {len(log_files)} local log file(s)...")
+            sources = [(f, self.read_log_file(f)) for f in log_files]
+        else:
+            print(f"Fetching logs from {self.ssh_host} (last {days} days)...")
+            sources = [
+                (f, self.stream_command(self.ssh_argv(f"cat {shlex.quote(f)}"),
+                                        f, gz=f.endswith('.gz')))
+                for f in self.remote_log_files(days)
+            ]
+
+        for name, lines in sources:
+            count = 0
+            for line in lines:
+                count += 1
+                yield line
+            self.lines_fetched += count
+            if count:
+                print(f"  Fetched {count} lines from {name}")
+
+        print(f"Total log lines fetched: {self.lines_fetched}")
+
+    def log_sources(self, days: int = 30, log_files: Optional[List[str]] = None) -> List:
+        """The logs an incremental run probes: local files, or the VPS's."""
+        if log_files:
+            return [LocalLog(f) for f in log_files]
+        return [RemoteLog(self, f) for f in self.remote_log_files(days)]
+
+    def ingest_log(self, source, state: "analytics_store.IngestState",
+                   today: str) -> Optional[int]:
+        """
+        Count the complete lines appended to one log since the state last read it.
+
+        Returns the number of new lines, or None if the log could not be probed.
+        A final line without its newline is still being written: it is left for
+        the next run, and the offset stops before it.
+        """
+        probe = source.probe()
+        if probe is None:
+            print(f"  Warning: Could not fetch {source.name}")
+            return None
+        inode, size, fp = probe
+        if fp is None:
+            return 0
+        known = state.files.get(fp)
+        offset = state.offset(fp)
+        if known and known["name"] != source.name:
+            print(f"  {source.name} was {known['name']} (rotated); resuming at byte {offset}")
+        if size is not None and size < offset:
+            print(f"  Warning: {source.name} is shorter than the {offset} bytes already "
+                  f"counted from it; skipping")
+            size = offset
+
+        count = 0
+        if size is None or size > offset:
+            for raw in source.lines(offset, inode):
+                if not raw.endswith(b"\n"):
+                    break
+                offset += len(raw)
+                count += 1
+                line = raw.decode("utf-8", "replace")
+                if not line.strip():
+                    continue
+                entry = self.parse_log_line(line)
+                if entry:
+                    state.days.add(entry)
+        state.advance(fp, source.name, inode, offset, today)
+        print(f"  Read {count} new lines from {source.name} (now at byte {offset})")
+        return count
+
+    def ingest(self, sources: List, state: "analytics_store.IngestState", today: str) -> int:
+        """
+        Fold every source's new lines into state. Returns how many could be read.
+
+        The state is only changed in memory; the caller saves it once, after
+        every source is done, so offsets and days are never saved out of step.
+        """
+        print(f"Reading new log lines ({len(sources)} file(s))...")
+        self.lines_fetched = 0
+        readable = 0
+        for source in sources:
+            count = self.ingest_log(source, state, today)
+            if count is not None:
+                readable += 1
+                self.lines_fetched += count
+        print(f"Total new log lines: {self.lines_fetched}")
+        return readable
+
+    def parse_log_line(self, line: str) -> Dict:
+        """Parse a single Nginx log line."""
+        return parse_log_line(line)
+
+    def analyze_logs(self, log_lines: Iterable[str], start_date: str = None,
+                     end_date: str = None) -> Dict:
+        """
+        Analyze log lines and generate statistics.
+
+        Args:
+            log_lines: Raw log lines, any iterable -- consumed once, never stored
+            start_date: Optional start date (YYYY-MM-DD)
+            end_date: Optional end date (YYYY-MM-DD)
+
+        Returns:
+            Dictionary of analytics data
+        """
+        print("Analyzing logs...")
+
+        aggregator = LogAggregator(start_date, end_date)
+        for line in log_lines:
+            if not line.strip():
+                continue
+
+            entry = self.parse_log_line(line)
+            if entry:
+                aggregator.add(entry)
+
+        print(f"Parsed {aggregator.total_requests} valid log entries")
+        return aggregator.result()
+
+    def analyze_files(self, log_files: List[str], start_date: str = None,
+                      end_date: str = None, jobs: int = 1,
+                      labels: Optional[Dict[str, str]] = None) -> Dict:
+        """
+        analyze_logs(fetch_logs(log_files=...)), parsed across up to `jobs` processes.
+
+        The analytics are identical to the serial path's (see "Parallel parsing").
+        labels maps a file to the name it is reported under (spooled remote logs).
+        self.lines_fetched counts the lines read, as fetch_logs() does.
+        """
+        labels = labels or {}
+        chunks = [chunk + (start_date, end_date)
+                  for path in log_files for chunk in plan_chunks(path, jobs)]
+        jobs = min(jobs, len(chunks))
+        print(f"Analyzing {len(log_files)} log file(s) in {len(chunks)} chunk(s)"
+              + (f" across {jobs} processes..." if jobs > 1 else "..."))
+
+        if jobs > 1:
+            pool = ProcessPoolExecutor(max_workers=jobs)
+            results = pool.map(_aggregate_chunk, chunks)
+        else:
+            pool, results = None, map(_aggregate_chunk, chunks)
+
+        aggregator = LogAggregator(start_date, end_date)
+        counts = Counter()
+        try:
+            for chunk, (partial, count, warning) in zip(chunks, results):
+                if warning:
+                    print(warning)
+                aggregator.merge(partial)
+                counts[chunk[0]] += count
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        self.lines_fetched = sum(counts.values())
+        for path in log_files:
+            if counts[path]:
+                print(f"  Fetched {counts[path]} lines from {labels.get(path, path)}")
+        print(f"Total log lines fetched: {self.lines_fetched}")
+        print(f"Parsed {aggregator.total_requests} valid log entries")
+        return aggregator.result()
+
+    def spool_logs(self, days: int, directory) -> Dict[str, str]:
+        """
+        Copy the VPS's logs for the last `days` days into directory, as they are.
+
+        For --jobs: a pipe cannot be split into ranges, a file can. Rotated .gz
+        logs cross the network and land on disk still compressed. Returns
+        {local path: remote path}, in remote_log_files() order.
+        """
+        print(f"Fetching logs from {self.ssh_host} (last {days} days)...")
+        spooled = {}
+        for name in self.remote_log_files(days):
+            local = Path(directory) / Path(name).name
+            with open(local, 'wb') as out:
+                for raw in self.stream_command(self.ssh_argv(f"cat {shlex.quote(name)}"),
+                                               name, binary=True):
+                    out.write(raw)
+            spooled[str(local)] = name
+        return spooled
+
+    def analyze_days(self, days: "analytics_store.DailyAggregates", start_date: str = None,
+                     end_date: str = None) -> Dict:
+        """Analytics for a window from stored daily aggregates (--incremental)."""
+        aggregator = LogAggregator.from_days(days, start_date, end_date)
+        print(f"Aggregated {aggregator.total_requests} log entries from stored days")
+        return aggregator.result()
+
     def save_analytics(self, analytics: Dict, filename: str):
         """Save analytics data to JSON file."""
         output_path = self.output_dir / filename
@@ -385,6 +982,31 @@ def main():
         "--output",
         help="Output filename (default: auto-generated)"
     )
+    parser.add_argument(
+        "--log-file",
+        action="append",
+        help="Read a local access log instead of fetching over SSH "
+             "(.gz is decompressed as read; repeatable)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Read only what was appended since the last run and report from "
+             "stored daily aggregates (state in --state)"
+    )
+    parser.add_argument(
+        "--state",
+        default=str(analytics_store.DEFAULT_STATE),
+        help="Ingest state for --incremental (default: .analytics-state/dreamhost.json)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Parse across N processes (0 = one per CPU; default 1). Full runs "
+             "only: --incremental reads just the appended bytes, serially"
+    )
     parser.add_argument(
         "--report",
         action="store_true",
@@ -415,15 +1037,34 @@ def main():
         end_date = datetime.now().date().isoformat()
         output_filename = args.output or f"last_{args.days}_days.json"
 
-    # Fetch logs
-    log_lines = extractor.fetch_logs(days=args.days)
-
-    if not log_lines:
-        print("Error: No logs fetched")
-        return 1
+    if args.incremental:
+        # Only the bytes appended since the last run are read; the window is
+        # reported from the stored days they were folded into
+        today = datetime.now().date().isoformat()
+        state = analytics_store.IngestState.load(args.state)
+        sources = extractor.log_sources(days=args.days, log_files=args.log_file)
+        if not extractor.ingest(sources, state, today):
+            print("Error: No logs fetched")
+            return 1
+        state.save(today)
+        analytics = extractor.analyze_days(state.days, start_date, end_date)
+    else:
+        jobs = resolve_jobs(args.jobs)
+        if jobs > 1 and args.log_file:
+            analytics = extractor.analyze_files(args.log_file, start_date, end_date, jobs)
+        elif jobs > 1:
+            with tempfile.TemporaryDirectory(prefix="analytics-logs-") as spool:
+                spooled = extractor.spool_logs(args.days, spool)
+                analytics = extractor.analyze_files(list(spooled), start_date, end_date,
+                                                    jobs, labels=spooled)
+        else:
+            # Fetch and analyze in one pass: lines are aggregated as they arrive
+            log_lines = extractor.fetch_logs(days=args.days, log_files=args.log_file)
+            analytics = extractor.analyze_logs(log_lines, start_date, end_date)
 
-    # Analyze
-    analytics = extractor.analyze_logs(log_lines, start_date, end_date)
+        if not extractor.lines_fetched:
+            print("Error: No logs fetched")
+            return 1
 
     # Save
     extractor.save_analytics(analytics, output_filename)
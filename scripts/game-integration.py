@@ -25,6 +25,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import rank_index  # noqa: E402
+
 # Windows consoles default to cp1252: the first non-ASCII byte written to stdout
 # raises UnicodeEncodeError and kills the script before it does any work. No-op
 # on UTF-8 platforms. See CLAUDE.md "Environment / tooling".
@@ -334,9 +337,14 @@ class GameRepositoryIntegration:
         try:
             with open(self.leaderboard_output, 'w', encoding='utf-8') as f:
                 json.dump(leaderboard_data, f, indent=2, ensure_ascii=False)
+            # The page draws leaderboard-top.json first and only falls back to the
+            # full board when it is missing, so an index left from the previous
+            # board would show the old standings over the new one.
+            rank_index.write_index(leaderboard_data, self.leaderboard_output)
             
             print(f"SUCCESS: Exported leaderboard data to: {self.leaderboard_output}")
-            print(f"STATS: Entries: {len(leaderboard_data['entries'])}")
+            print(f"STATS: Entries: {len(leaderboard_data['entries'])} "
+                  f"(rank index rewritten beside it)")
             
             if leaderboard_data['entries']:
                 top_entry = leaderboard_data['entries'][0]
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""One read-only HTTP client for every script that asks a remote API for JSON.
+
+WHY THIS EXISTS
+---------------
+check-board-liveness.py, publish-live-board.py, check-epoch-drift.py and
+alpha-watch.py each carried the same five lines: build a urllib Request, call
+urlopen, decode, and turn any failure into a string. urlopen opens a NEW TCP
+connection -- and for https, a new TLS handshake -- for every call and closes it
+after one response. The liveness probe asks the same host about ~2,000 boards
+whose JSON bodies are a few hundred bytes, so nearly all of each request's cost
+was the handshake, paid again for every board.
+
+So this keeps connections open and reuses them:
+
+  * POOLED KEEP-ALIVE. An HTTP/1.1 connection that finished its response cleanly
+    goes back into an idle pool for its (scheme, host, port) and serves the next
+    request to that host. A connection the server marked `Connection: close` is
+    not reused.
+  * PER-HOST LIMIT. At most `per_host` requests to one host are in flight at once,
+    however many threads ask; the rest wait their turn. check-board-liveness.py's
+    worker pool sizes its workers against the same number.
+  * GZIP. Requests say `Accept-Encoding: gzip`, and a gzip body is decoded before
+    anyone sees it. Board JSON compresses several-fold.
+  * ONE TIMEOUT, ONE ERROR VOCABULARY. get_json() returns (data, error_string) and
+    never raises, exactly as every copy it replaces did. An error string starting
+    "HTTP " is an answer from a living host; anything else means the host could not
+    be read. The liveness breaker depends on that distinction, so it is made in one
+    place -- classify_error() -- instead of four.
+
+WHAT IT IS CAREFUL ABOUT
+------------------------
+  * GET only. There is no post(). This repo is a READ-ONLY consumer of the score
+    API (pdoom1 PR #679), and a client that cannot write cannot write by accident.
+  * A pooled connection can be closed by the server between requests. When a
+    REUSED connection fails before any response arrives, the request is retried
+    once on a fresh connection -- safe, because a GET is idempotent. A fresh
+    connection that fails is reported, never retried.
+  * Redirects are followed (up to MAX_REDIRECTS), across hosts: the epoch-drift
+    manifest is a GitHub latest-release URL that answers 302. An Authorization or
+    Cookie header is not carried to a different host.
+  * Proxies from the environment are NOT honoured, unlike urlopen. None of the
+    runners this repo uses has one.
+
+USAGE
+-----
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import http_client
+
+    data, err = http_client.get_json(url)                  # shared default client
+    data, err = http_client.get_json(url, {"Authorization": "Bearer ..."}, timeout=15)
+"""
+
+import gzip
+import http.client
+import json
+import socket
+import ssl
+import threading
+import urllib.parse
+import zlib
+
+USER_AGENT = "pdoom1-website-scripts (read-only)"
+DEFAULT_TIMEOUT = 20
+PER_HOST = 8
+MAX_REDIRECTS = 5
+REDIRECTS = (301, 302, 303, 307, 308)
+
+# A reused connection the server has already closed fails in one of these ways
+# before any response byte arrives. Only then is the request retried.
+STALE_CONNECTION = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                    BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+
+class HttpError(Exception):
+    """A response with a status of 400 or above -- a real answer from the host."""
+
+    def __init__(self, status):
+        super().__init__("HTTP %s" % status)
+        self.status = status
+
+
+def classify_error(exc):
+    """(kind, message) for anything get() can raise.
+
+    kind is "http" (the host answered with an error status), "timeout",
+    "connection" (refused, reset, DNS, TLS) or "payload" (the body was not what
+    was promised). The message for "http" is exactly "HTTP <status>"; every other
+    message is "<ExceptionType>: <text>", the form the replaced copies used.
+    """
+    if isinstance(exc, HttpError):
+        return "http", str(exc)
+    message = "%s: %s" % (type(exc).__name__, exc)
+    if isinstance(exc, (socket.timeout, TimeoutError)):
+        return "timeout", message
+    if isinstance(exc, (OSError, http.client.HTTPException)):
+        return "connection", message
+    return "payload", message
+
+
+class Response:
+    __slots__ = ("status", "headers", "body", "url")
+
+    def __init__(self, status, headers, body, url):
+        self.status, self.headers, self.body, self.url = status, headers, body, url
+
+
+class HttpClient:
+    """A thread-safe pool of keep-alive connections, GET only.
+
+    One instance per process is the intent (see default_client()); every thread
+    may call get() and get_json() on it concurrently.
+    """
+
+    def __init__(self, per_host=PER_HOST, timeout=DEFAULT_TIMEOUT, user_agent=USER_AGENT):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self._lock = threading.Lock()
+        self._idle = {}          # (scheme, host, port) -> [connection, ...]
+        self._slots = {}         # (scheme, host, port) -> BoundedSemaphore
+        self._ssl = None
+        self.stats = {"requests": 0, "connections": 0, "reused": 0, "retried": 0}
+
+    # ------------------------------------------------------------ connections
+    def _context(self):
+        if self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        return self._ssl
+
+    def _slot(self, key):
+        with self._lock:
+            if key not in self._slots:
+                self._slots[key] = threading.BoundedSemaphore(self.per_host)
+            return self._slots[key]
+
+    def _connect(self, key, timeout):
+        """A new, not yet connected, connection to `key`."""
+        with self._lock:
+            self.stats["connections"] += 1
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout,
+                                               context=self._context())
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _checkout(self, key, timeout):
+        """(connection, reused). An idle pooled connection if there is one."""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                conn = idle.pop()
+                self.stats["reused"] += 1
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+        return self._connect(key, timeout), False
+
+    def _checkin(self, key, conn):
+        with self._lock:
+            self._idle.setdefault(key, []).append(conn)
+
+    def close(self):
+        """Close every idle connection. In-flight requests finish normally."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    # ------------------------------------------------------------ requests
+    def _once(self, url, headers, timeout):
+        """One GET of one URL, no redirects. Returns a Response; raises on failure."""
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError("unsupported URL scheme: %r" % url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        target = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+        sent = {"User-Agent": self.user_agent, "Accept-Encoding": "gzip",
+                "Connection": "keep-alive"}
+        sent.update(headers or {})
+
+        with self._slot(key):
+            with self._lock:
+                self.stats["requests"] += 1
+            conn, reused = self._checkout(key, timeout)
+            try:
+                try:
+                    conn.request("GET", target, headers=sent)
+                    resp = conn.getresponse()
+                except STALE_CONNECTION:
+                    if not reused:
+                        raise
+                    # The server closed it while it sat in the pool. One retry, fresh.
+                    conn.close()
+                    with self._lock:
+                        self.stats["retried"] += 1
+                    conn = self._connect(key, timeout)
+                    conn.request("GET", target, headers=sent)
+                    resp = conn.getresponse()
+                body = resp.read()
+            except BaseException:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+
+        encoding = (resp.getheader("Content-Encoding") or "").strip().lower()
+        if encoding in ("gzip", "x-gzip"):
+            body = gzip.decompress(body)
+        elif encoding == "deflate":
+            body = zlib.decompress(body)
+        return Response(resp.status, resp.headers, body, url)
+
+    def get(self, url, headers=None, timeout=None):
+        """GET `url`, following redirects. Raises HttpError for a status >= 400."""
+        timeout = self.timeout if timeout is None else timeout
+        for _ in range(MAX_REDIRECTS + 1):
+            resp = self._once(url, headers, timeout)
+            location = resp.headers.get("Location")
+            if resp.status in REDIRECTS and location:
+                target = urllib.parse.urljoin(url, location)
+                if urllib.parse.urlsplit(target).netloc != urllib.parse.urlsplit(url).netloc:
+                    # A credential is for the host it was issued for, not wherever
+                    # that host points next.
+                    headers = {k: v for k, v in (headers or {}).items()
+                               if k.lower() not in ("authorization", "cookie")}
+                url = target
+                continue
+            if resp.status >= 400:
+                raise HttpError(resp.status)
+            return resp
+        raise http.client.HTTPException("more than %d redirects" % MAX_REDIRECTS)
+
+    def get_json(self, url, headers=None, timeout=None):
+        """GET only. Returns (data, error_string) and never raises."""
+        try:
+            return json.loads(self.get(url, headers, timeout).body.decode("utf-8")), None
+        except Exception as e:
+            return None, classify_error(e)[1]
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_client():
+    """The process-wide client, so every caller shares one pool."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = HttpClient()
+        return _default
+
+
+def get_json(url, headers=None, timeout=DEFAULT_TIMEOUT):
+    """GET `url` through the shared pool. Returns (data, error_string)."""
+    return default_client().get_json(url, headers, timeout)
@@ -18,7 +18,10 @@ seed_leaderboard_*.json -- validated against schemas/leaderboard-seed.schema.jso
      "live" | "live-empty" | "pre-launch" | "legacy" (this script emits three of the
      four -- "live-empty" means "current board key, genuinely no rows yet", which only
      the live publisher can establish, since this one reads files off disk),
-  5. recomputes weekly/current.json statistics for internal consistency.
+  5. recomputes weekly/current.json statistics for internal consistency,
+  6. writes the rank index beside it (leaderboard-{top,players,builds}.json, see
+     scripts/rank_index.py), so the page can draw the top of the board without
+     downloading and sorting all of it.
 
 Per the FROZEN v1 contract (pdoom1 PR #679), scores live in the PHP score API and the
 website is a READ-ONLY consumer -- so this is a read *cache/snapshot* publisher, never an
@@ -29,18 +32,45 @@ ADR-0002 (score DESC, doom_integral DESC).
 Test/dev seeds (test*, party*, demo*, final-verification*, natural-game-over*) are
 EXCLUDED by default so fixtures are never shown as real scores. --include-tests overrides.
 
+SEED FILE CACHE: weekly seed files accumulate, one or more per league week, and
+almost none of them ever change after their week closes. Each is read once per run,
+hashed, and looked up in .ingest-cache/seed-files.json (gitignored). A file whose
+bytes hash to a cached record is neither parsed nor re-validated: its version stamp,
+seed name, entries and per-entry verdicts all come from the record. A new or edited
+file is parsed exactly once and recorded. See "Seed file cache" below for what
+invalidates a record. --no-cache parses everything, as this script always used to.
+
 Run:  python scripts/ingest_scores.py            # publish from current seed files
       python scripts/ingest_scores.py --input DIR --include-tests
+      python scripts/ingest_scores.py --no-cache # ignore and do not write the cache
+      python scripts/ingest_scores.py --top 1000 # publish only the best 1000 entries
+
+AGGREGATION: the publishable seed files are merged as ranked streams (a k-way heap
+merge, deduplicated by entry_key()) rather than collected and sorted whole; with
+--top N the merge stops after N entries. See "Aggregation" below. What that does NOT
+bound is the input: every publishable file's entries are in memory for the whole
+run, as the SeedFiles record the cache returns (parsed once, or loaded from the
+cache), plus one row number per distinct entry key. --top N shrinks the board and
+the merge, not that footprint, which still grows with history.
 """
 
 import argparse
+import bisect
 import glob
+import hashlib
+import heapq
+import itertools
 import json
+import os
 import re
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import rank_index  # noqa: E402
+import schema_compiler  # noqa: E402
+
 for _s in (sys.stdout, sys.stderr):
     try: _s.reconfigure(encoding="utf-8", errors="replace")
     except (AttributeError, ValueError): pass
@@ -52,6 +82,9 @@ LB_DIR = PUBLIC / "leaderboard" / "data"
 
 TEST_SEED_RE = re.compile(r"(test|party|demo|final-verification|natural-game-over)", re.I)
 
+CACHE_PATH = ROOT / ".ingest-cache" / "seed-files.json"
+CACHE_VERSION = 1
+
 
 def load_json(p):
     return json.loads(Path(p).read_text(encoding="utf-8"))
@@ -77,18 +110,188 @@ def real_game_version():
     return ver
 
 
-def validate_entry_schema():
-    """Return a validator for the seed 'entry' contract, or None if jsonschema absent."""
+def validate_entry_schema(cache_dir=None):
+    """A batch validator for the seed 'entry' contract, or None if none can be built.
+
+    The compiled one (scripts/schema_compiler.py) when the schema compiles, which it
+    does today, with its generated source kept in `cache_dir`; jsonschema's
+    Draft7Validator behind the same interface when a new keyword does not; None only
+    when neither is possible."""
+    try:
+        return schema_compiler.load("leaderboard-seed.schema.json", "#/$defs/entry", SCHEMAS,
+                                    cache_dir)
+    except schema_compiler.Unsupported as e:
+        print(f"  (entry schema not compilable: {e} -- validating with jsonschema)")
+    except Exception as e:
+        print(f"  (entry schema unreadable: {e} -- publishing without per-entry schema check)")
+        return None
     try:
         import jsonschema
         seed_schema = load_json(SCHEMAS / "leaderboard-seed.schema.json")
-        entry_schema = seed_schema["$defs"]["entry"]
-        return jsonschema.Draft7Validator(entry_schema)
+        return JsonschemaEntries(jsonschema.Draft7Validator(seed_schema["$defs"]["entry"]))
     except Exception as e:
         print(f"  (jsonschema unavailable: {e} -- publishing without per-entry schema check)")
         return None
 
 
+class JsonschemaEntries:
+    """jsonschema behind the compiled validator's interface: invalid_indices() and a
+    `key` naming the schema's bytes and the jsonschema release that applied it."""
+
+    def __init__(self, validator):
+        self.validator = validator
+        from importlib.metadata import PackageNotFoundError, version as dist_version
+        try:
+            release = dist_version("jsonschema")
+        except PackageNotFoundError:
+            release = ""
+        schema = (SCHEMAS / "leaderboard-seed.schema.json").read_bytes()
+        self.key = hashlib.sha256(schema + b"\0" + release.encode()).hexdigest()
+
+    def invalid_indices(self, entries):
+        return [i for i, e in enumerate(entries) if not self.validator.is_valid(e)]
+
+
+def validator_key(validator):
+    """What a cached per-entry verdict depends on besides the entry itself: the
+    schema and the code that applied it (compiler or jsonschema release). None when
+    there is no validator -- an unchecked entry has no verdict to cache."""
+    return None if validator is None else validator.key
+
+
+# ---------------------------------------------------------------------------
+# Seed file cache.
+#
+# main() used to open and parse every seed file up to three times a run (once to
+# read its version stamp, once for its entries, once more to count the entries of
+# a file it excluded) and to schema-check every entry of every publishable file,
+# every run. The files are append-only history: a closed week's file is never
+# edited. So each file is now read ONCE, and its parse is cached under the SHA-256
+# of its bytes:
+#
+#   {"version": 1, "code": <hash of this script>,
+#    "files": {<sha256>: {"game_version", "seed", "entries", "error",
+#                         "checked": {"key": <validator_key>, "invalid": [i, ...]}}}}
+#
+# Keyed by CONTENT, not by name or mtime: a record can only ever describe the
+# bytes it was parsed from, so a rewritten file -- however quickly, at whatever
+# size -- misses and is re-parsed. What else a record depends on is keyed too:
+#
+#   * this script's own source ("code"): a change to how records are built drops
+#     the whole cache;
+#   * the schema and the validator that applied it ("checked.key": the compiled
+#     validator's key, or the jsonschema release): a changed contract re-validates
+#     every entry; the parse itself is still reused;
+#   * no validator at all: nothing is recorded as checked, so the first run WITH
+#     jsonschema validates everything.
+#
+# An unreadable, malformed or other-version cache file is treated as empty -- the
+# cache is an optimisation, never an input. Records for files no longer present
+# are dropped on write, so the file tracks the seed directory rather than growing
+# with every file that ever passed through it.
+# ---------------------------------------------------------------------------
+
+def code_key():
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def load_cache(path):
+    """The cached records by content hash, or {} for any cache that is not ours."""
+    if path is None:
+        return {}
+    try:
+        doc = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if (not isinstance(doc, dict) or doc.get("version") != CACHE_VERSION
+            or doc.get("code") != code_key() or not isinstance(doc.get("files"), dict)):
+        return {}
+    return {k: v for k, v in doc["files"].items() if isinstance(v, dict)}
+
+
+def save_cache(path, records):
+    """Write atomically, so a killed run leaves the old cache or the new one."""
+    if path is None:
+        return
+    path = Path(path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({"version": CACHE_VERSION, "code": code_key(),
+                                   "files": records}, separators=(",", ":")),
+                       encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as e:
+        # A read-only checkout still publishes; it just parses again next time.
+        print(f"  (seed cache not written: {e})")
+
+
+def parse_seed(data):
+    """A cache record for one seed file's bytes. An unreadable file is a record
+    too (error set, no entries), so it is not re-parsed every run either."""
+    try:
+        d = json.loads(data.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError) as e:
+        return {"game_version": None, "seed": None, "entries": [], "error": str(e)}
+    if not isinstance(d, dict):
+        return {"game_version": None, "seed": None, "entries": [],
+                "error": "top level is not an object"}
+    entries = d.get("entries") or []
+    return {
+        "game_version": (d.get("meta") or {}).get("game_version"),
+        "seed": d.get("seed"),
+        "entries": entries if isinstance(entries, list) else [],
+        "error": None,
+    }
+
+
+class SeedFiles:
+    """Every seed file of one run, each read once and parsed at most once.
+
+    `record(f)` is the cached or freshly parsed record for f; `invalid(f, ...)`
+    is the set of entry indices the schema rejects, checked at most once per
+    (content, schema). `stats` counts what was reused against what was done."""
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.cached = load_cache(cache_path)
+        self.records = {}     # sha256 -> record, for every file seen this run
+        self.by_file = {}     # path -> sha256
+        self.stats = {"reused": 0, "parsed": 0, "validated": 0}
+
+    def record(self, f):
+        sha = self.by_file.get(f)
+        if sha is None:
+            try:
+                data = Path(f).read_bytes()
+            except OSError as e:
+                return {"game_version": None, "seed": None, "entries": [], "error": str(e)}
+            sha = hashlib.sha256(data).hexdigest()
+            self.by_file[f] = sha
+            if sha not in self.records:
+                if sha in self.cached:
+                    self.records[sha] = self.cached[sha]
+                    self.stats["reused"] += 1
+                else:
+                    self.records[sha] = parse_seed(data)
+                    self.stats["parsed"] += 1
+        return self.records[sha]
+
+    def invalid(self, f, validator, key):
+        rec = self.record(f)
+        if validator is None:
+            return set()
+        checked = rec.get("checked")
+        if not (isinstance(checked, dict) and checked.get("key") == key):
+            checked = {"key": key, "invalid": validator.invalid_indices(rec["entries"])}
+            rec["checked"] = checked
+            self.stats["validated"] += 1
+        return set(checked["invalid"])
+
+    def save(self):
+        save_cache(self.cache_path, self.records)
+
+
 def gather_seed_files(input_dir, include_tests):
     files = sorted(glob.glob(str(Path(input_dir) / "seed_leaderboard_*.json")))
     kept = []
@@ -100,20 +303,127 @@ def gather_seed_files(input_dir, include_tests):
     return files, kept
 
 
-def is_publishable(seed_file, deployed_version, include_legacy):
+def is_publishable(record, deployed_version, include_legacy):
     """Live data = entries stamped with the deployed game version. Older/synthetic
     stamps (v1.0.0 dev seeds, v0.4.1 legacy) are NOT published as live unless
     --include-legacy is passed. This is what keeps the board honest and self-healing:
     the day the game exports real v0.11.0 scores, they publish automatically."""
     if include_legacy:
         return True
-    return _seed_version(seed_file) == deployed_version
+    return record["game_version"] == deployed_version
 
 
 def entry_key(e):
     return e.get("entry_uuid") or f"{e.get('player_name')}|{e.get('score')}|{e.get('date')}"
 
 
+def adr_rank(e):
+    """ADR-0002 order (frozen v1 contract): score (turns) DESC, then doom_integral
+    DESC. Used with reverse=True."""
+    return (e.get("score", 0), e.get("doom_integral", 0))
+
+
+def in_rank_order(entries):
+    """True if `entries` is already in ADR-0002 order. One pass, no copy."""
+    ranks = map(adr_rank, entries)
+    prev = next(ranks, None)
+    for rank in ranks:
+        if rank > prev:
+            return False
+        prev = rank
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Aggregation: a k-way merge of ranked seed files.
+#
+# main() used to pour every entry of every publishable file into one dict and
+# sorted() the lot, so the aggregate cost a second copy of all history plus an
+# O(total log total) sort, every run, for a board that mostly repeats last run's.
+# Each seed file is already a ranked board, so the aggregate is a merge of k ranked
+# streams instead: heapq.merge holds one head per file, and entries come out in
+# ADR-0002 order. A file is used as its SeedFiles record holds it once one linear
+# pass (in_rank_order()) confirms the order; only a file that fails is sorted, into
+# a copy of that file alone.
+#
+#   * Dedup by entry_key(), with the old dict's answer: a key held by several
+#     entries publishes its LAST copy -- the later file, and seed files sort by
+#     name, which is by date, so the newer export; within a file, the later row.
+#     That copy is ranked by its own score, and among equal ranks it stands where
+#     the key FIRST appeared, which is where the dict had inserted it. A score
+#     corrected downward in a newer export therefore replaces the stale one, as it
+#     always did, instead of being hidden behind it.
+#   * Ties keep file order, then order within the file -- which is exactly what the
+#     stable sorted() over the insertion-ordered dict produced, and what
+#     heapq.merge gives for free: it breaks ties by stream, and each stream keeps
+#     its own order.
+#   * A last copy that ranks differently from its first cannot be emitted from the
+#     first copy's place without breaking that file's order, so those few are
+#     merged back into that file's stream, by rank and then row.
+#   * limit=N stops after N distinct entries (--top N).
+#
+# Resolving "later wins" needs to know, before the first entry comes out, whether
+# a later file holds the same key: one pass over the inputs numbers every row and
+# records where each key first appeared -- the same dict of every key the old
+# path built, holding a row number instead of the entry.
+# ---------------------------------------------------------------------------
+
+def _row_rank(row_entry):
+    e, row = row_entry
+    return (adr_rank(e), -row)
+
+
+def merge_ranked(streams, limit=None):
+    """Yield the distinct entries of `streams` (each a list in ADR-0002 order, in
+    seed file order) in ADR-0002 order, at most `limit` of them.
+
+    The board is the one the old collect-and-sort published: for a key held by
+    several entries, the last copy wins (see "Aggregation" above)."""
+    if limit is not None and limit <= 0:
+        return
+    # Rows are numbered across all streams in order, so a row number says which
+    # file an entry came from and where in it.
+    starts, first, last, shadowed = [], {}, {}, set()
+    row = 0
+    for stream in streams:
+        starts.append(row)
+        for e in stream:
+            k = entry_key(e)
+            if k in first:
+                shadowed.add(row)     # published, if at all, at the key's first row
+                last[k] = e
+            else:
+                first[k] = row
+            row += 1
+    in_place, moved = {}, [[] for _ in streams]
+    for k, e in last.items():
+        row = first[k]
+        i = bisect.bisect_right(starts, row) - 1
+        if adr_rank(e) == adr_rank(streams[i][row - starts[i]]):
+            in_place[row] = e
+        else:
+            shadowed.add(row)
+            moved[i].append((e, row))
+    del first, last
+
+    def published(i):
+        for row, e in enumerate(streams[i], starts[i]):
+            if row not in shadowed:
+                yield in_place.get(row, e)
+
+    def published_with_moved(i):
+        rows = ((in_place.get(row, e), row)
+                for row, e in enumerate(streams[i], starts[i]) if row not in shadowed)
+        ranked = sorted(moved[i], key=_row_rank, reverse=True)
+        for e, _ in heapq.merge(rows, ranked, key=_row_rank, reverse=True):
+            yield e
+
+    merged = heapq.merge(*((published_with_moved if moved[i] else published)(i)
+                           for i in range(len(streams))),
+                         key=adr_rank, reverse=True)
+    yield from itertools.islice(merged, limit)
+
+
 def main():
     ap = argparse.ArgumentParser(description="Publish website leaderboard.json from seed files")
     ap.add_argument("--input", default=str(LB_DIR), help="dir of seed_leaderboard_*.json")
@@ -121,6 +431,12 @@ def main():
     ap.add_argument("--include-legacy", action="store_true",
                     help="publish entries whose game_version != deployed (marked legacy)")
     ap.add_argument("--output", default=str(LB_DIR / "leaderboard.json"))
+    ap.add_argument("--cache", default=str(CACHE_PATH),
+                    help="seed file cache (default .ingest-cache/seed-files.json)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="parse and validate every seed file; neither read nor write the cache")
+    ap.add_argument("--top", type=int, default=None, metavar="N",
+                    help="publish only the best N distinct entries (meta.top_n records it)")
     args = ap.parse_args()
 
     version = real_game_version()
@@ -133,41 +449,46 @@ def main():
         print("  is indistinguishable from 'nobody is playing'. Nothing was written.")
         print("  Fix public/data/version.json (latest_release.version), then re-run.")
         return 2
-    validator = validate_entry_schema()
+    # The compiled entry validator is kept beside the seed cache and follows its flags.
+    validator = validate_entry_schema(None if args.no_cache else Path(args.cache).parent / "schemas")
+    vkey = validator_key(validator)
+    seeds = SeedFiles(None if args.no_cache else args.cache)
     all_files, seed_files = gather_seed_files(args.input, args.include_tests)
     excluded_test = len(all_files) - len(seed_files)
 
     # excluded_ver is a LIST of (filename, its version, its entry count), not a bare
     # count. "3 seed files excluded" is not actionable; "3 excluded, stamped v0.13.0,
     # deployed is v0.13.1, holding 27 entries" tells you what you are not seeing and why.
-    entries, bad, seeds_used, excluded_ver = {}, 0, [], []
+    streams, bad, seeds_used, excluded_ver = [], 0, [], []
     for f in seed_files:
-        if not is_publishable(f, version, args.include_legacy):
+        rec = seeds.record(f)
+        if not is_publishable(rec, version, args.include_legacy):
             excluded_ver.append({
                 "file": Path(f).name,
-                "game_version": _seed_version(f) or "unstamped",
-                "entries": _seed_entry_count(f),
+                "game_version": rec["game_version"] or "unstamped",
+                "entries": len(rec["entries"]),
             })
             continue
-        try:
-            d = load_json(f)
-        except Exception as e:
-            print(f"  SKIP {Path(f).name}: unreadable ({e})")
+        if rec["error"] is not None:
+            print(f"  SKIP {Path(f).name}: unreadable ({rec['error']})")
             bad += 1
             continue
-        valid_here = 0
-        for e in (d.get("entries") or []):
-            if validator is not None and list(validator.iter_errors(e)):
-                bad += 1
-                continue
-            entries[entry_key(e)] = e  # dedup by uuid/identity
-            valid_here += 1
-        if valid_here:
-            seeds_used.append(d.get("seed") or Path(f).stem)
-
-    # ADR-0002 order (frozen v1 contract): score (turns) DESC, then doom_integral DESC.
-    merged = sorted(entries.values(),
-                    key=lambda e: (e.get("score", 0), e.get("doom_integral", 0)), reverse=True)
+        rejected = seeds.invalid(f, validator, vkey)
+        valid = rec["entries"]
+        if rejected:
+            valid = [e for i, e in enumerate(valid) if i not in rejected]
+            bad += len(rec["entries"]) - len(valid)
+        if valid:
+            # A seed file is a ranked board already: merge the record's own list, and
+            # sort (a copy) only a file that is not.
+            if not in_rank_order(valid):
+                valid = sorted(valid, key=adr_rank, reverse=True)
+            streams.append(valid)
+            seeds_used.append(rec["seed"] or Path(f).stem)
+    seeds.save()
+
+    # ADR-0002 order, deduplicated by uuid/identity: see "Aggregation" above.
+    merged = list(merge_ranked(streams, args.top))
 
     # Honest status: nothing published -> pre-launch; published via --include-legacy -> legacy.
     if not merged:
@@ -189,6 +510,9 @@ def main():
             "total_players": len({e.get("player_name") for e in merged if e.get("player_name")}),
             "total_entries": len(merged),
             "seeds_aggregated": len(seeds_used),
+            # Set only by --top: the board is the best N entries, and the totals above
+            # describe those N, not every entry the seed files hold.
+            **({"top_n": args.top} if args.top is not None else {}),
             "note": "Aggregated + contract-validated by the website. See docs/GAME_UPLIFT_PLAN.md.",
         },
         "exclusions": {
@@ -212,6 +536,7 @@ def main():
     }
     outpath = Path(args.output)
     outpath.write_text(json.dumps(out, indent=2), encoding="utf-8")
+    index = rank_index.write_index(out, outpath)
     try:
         shown = outpath.relative_to(ROOT)
     except ValueError:
@@ -221,6 +546,13 @@ def main():
     print(f"  seeds: {len(seeds_used)} published, {len(excluded_ver)} version-mismatched, "
           f"{excluded_test} test/dev excluded, {bad} invalid entries dropped")
     print(f"  published {len(merged)} entries -> {shown}")
+    print(f"  rank index: top {min(len(merged), rank_index.TOP_N)}, "
+          f"{out['meta']['total_players']} player(s) -> "
+          f"{', '.join(p.name for p in index.values())}")
+    if not args.no_cache:
+        st = seeds.stats
+        print(f"  seed cache: {st['reused']} file(s) reused, {st['parsed']} parsed, "
+              f"{st['validated']} validated")
 
     # Name the mismatch. A silent exclusion is the exact failure this file exists to
     # avoid: the data is right there and the operator is told only that it is absent.
@@ -241,22 +573,6 @@ def main():
           f"actually holds, run scripts/check-board-liveness.py")
 
 
-def _seed_version(f):
-    try:
-        return (load_json(f).get("meta") or {}).get("game_version")
-    except Exception:
-        return None
-
-
-def _seed_entry_count(f):
-    """How many entries an excluded file was holding -- the number that makes an
-    exclusion report actionable rather than merely true."""
-    try:
-        return len(load_json(f).get("entries") or [])
-    except Exception:
-        return 0
-
-
 if __name__ == "__main__":
     # main() returns non-zero only when it REFUSED to publish (see the version guard).
     # A normal publish returns None -> exit 0, which is what test_ingest_scores.py asserts.
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Columnar store of every archived and preserved league entry, with aggregates.
+
+WHY THIS EXISTS
+---------------
+The league pages and get_league_standings() work one week at a time, from one JSON
+file each. A question across weeks -- a player's best score in each ladder epoch,
+how many entries each week drew -- meant opening every file in weekly/archive/ and
+preserved/, and that directory grows by one file a week, forever. So
+weekly-league-manager.py keeps every entry of those files in one store beside the
+archive, and publishes the aggregates the site asks for:
+
+  league-history.json          the store: one array per field, in segment order
+  league-history-players.json  per player: entries, boards, first/last date, and
+                               the best entry in each epoch
+  league-history-epochs.json   per epoch: entries, players, boards, average and
+                               best entry; and every board (week or preserved
+                               capture) in order with its entry and player counts
+
+THE STORE
+---------
+    {"format": 1, "generated": ..., "rows": N,
+     "segments": [{"source": "archive", "file": "2026_W33_league.json",
+                   "sha256": ..., "board": "2026_W33", "seed": ..., "epoch": "L3",
+                   "rows": n}, ...],
+     "dicts":   {"player_name": [...], "board": [...], ...},
+     "columns": {"player_name": [0, 3, ...], "score": [41, ...], ...}}
+
+Every file is one SEGMENT: a contiguous run of rows, in file order, archives
+before preserved boards. The columns in DICT_COLUMNS (player name, board, seed,
+epoch, source, build) hold small integers into `dicts`; the rest hold values. A
+query filters an integer column instead of comparing strings row by row, and the
+file is a fraction of the size of the entries it holds.
+
+`epoch` is the ladder version a board was played under (`L3`, `L4` ...). A week
+opened before the ladder split has none and is labelled with its epoch id,
+`pre-regularisation`. A preserved board keyed by a build version rather than a
+ladder (the pre-split keying) is labelled `build <version>`. Boards from different
+epochs are never ranked against each other here. Every "best" is per epoch.
+
+WHAT IT IS CAREFUL ABOUT
+------------------------
+  * Only changed files are parsed. Each segment records the SHA-256 of its file.
+    build() keeps the rows of every file whose name and hash it already holds,
+    and parses the rest. replace() swaps one segment without touching any other
+    file; archiving a week uses it.
+  * It is derived, never authoritative. Delete the store and the next rebuild
+    recreates it from the files; nothing else reads it to write a league record.
+  * Ranking is ADR-0002's, as everywhere else: score desc, then doom_integral desc.
+    A tie keeps the earlier row.
+
+USAGE
+-----
+    store = league_history.load(path)                      # None if absent/unusable
+    store.where(player_name="Pip", epoch="L3")             # -> [row, ...]
+    store.best_by("epoch", store.where(player_name="Pip")) # -> {epoch: row}
+    store.count_by("board")                                # -> {board: entries}
+    store.row(i)                                           # -> {field: value}
+
+    python scripts/league_history.py --player Pip          # from the published store
+    python scripts/league_history.py --epochs
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+WEEKLY_DIR = ROOT / "public" / "leaderboard" / "data" / "weekly"
+STORE_NAME = "league-history.json"
+FORMAT = 1
+
+DICT_COLUMNS = ("source", "board", "seed", "epoch", "player_name", "game_mode")
+VALUE_COLUMNS = ("score", "doom_integral", "level_reached", "duration_seconds", "date",
+                 "entry_uuid")
+COLUMNS = DICT_COLUMNS + VALUE_COLUMNS
+# Per-entry fields copied from the entry itself; the rest describe its segment.
+ENTRY_FIELDS = ("player_name", "game_mode") + VALUE_COLUMNS
+SEGMENT_FIELDS = ("source", "board", "seed", "epoch")
+
+
+def history_paths(weekly_dir=WEEKLY_DIR):
+    """{"store": ..., "players": ..., "epochs": ...} in the weekly directory."""
+    d = Path(weekly_dir)
+    stem = STORE_NAME[:-len(".json")]
+    return {"store": d / STORE_NAME, "players": d / ("%s-players.json" % stem),
+            "epochs": d / ("%s-epochs.json" % stem)}
+
+
+def _num(v):
+    if isinstance(v, bool):
+        return float("-inf")
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return float("-inf")
+
+
+# ---------------------------------------------------------------------------
+# Reading league files into segments.
+# ---------------------------------------------------------------------------
+
+def archive_segment(doc, name):
+    """(segment fields, entries) for one weekly/archive/*_league.json record."""
+    meta = doc.get("meta") or {}
+    wi = doc.get("week_info") or {}
+    epoch = doc.get("epoch") or wi.get("epoch") or {}
+    label = epoch.get("ladder_version") or epoch.get("id")
+    return ({"source": "archive", "file": name,
+             "board": meta.get("week_id") or wi.get("week_id") or name.split("_league")[0],
+             "seed": doc.get("seed"), "epoch": label},
+            doc.get("entries") if isinstance(doc.get("entries"), list) else [])
+
+
+def preserved_segment(doc, name):
+    """(segment fields, entries) for one preserved/<captured>/<board>.json capture."""
+    version = doc.get("version")
+    if isinstance(version, str) and version.startswith("L"):
+        label = version
+    else:
+        label = "build %s" % version if version else None
+    return ({"source": "preserved", "file": name, "board": name.rsplit(".", 1)[0],
+             "seed": doc.get("seed"), "epoch": label},
+            doc.get("entries") if isinstance(doc.get("entries"), list) else [])
+
+
+READERS = {"archive": archive_segment, "preserved": preserved_segment}
+
+
+def _key(value):
+    """A dictionary key that keeps 1, 1.0, True and "1" apart."""
+    try:
+        hash(value)
+        return (type(value).__name__, value)
+    except TypeError:
+        return ("json", json.dumps(value, sort_keys=True))
+
+
+class HistoryStore:
+    """The columns, their dictionaries and the segments, with the query API."""
+
+    def __init__(self):
+        self.segments = []
+        self.dicts = {c: [] for c in DICT_COLUMNS}
+        self._codes = {c: {} for c in DICT_COLUMNS}
+        self.columns = {c: [] for c in COLUMNS}
+        self._offsets = None
+
+    def __len__(self):
+        return len(self.columns["score"])
+
+    def offsets(self):
+        """The first row of each segment."""
+        if self._offsets is None or len(self._offsets) != len(self.segments):
+            out, start = [], 0
+            for seg in self.segments:
+                out.append(start)
+                start += seg["rows"]
+            self._offsets = out
+        return self._offsets
+
+    # ---- building -------------------------------------------------------
+
+    def _code(self, col, value):
+        codes = self._codes[col]
+        key = _key(value)
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = len(self.dicts[col])
+            self.dicts[col].append(value)
+        return code
+
+    def add_segment(self, fields, sha256, entries):
+        entries = [e for e in entries if isinstance(e, dict)]
+        seg = dict(fields, sha256=sha256, rows=0)
+        # A dictionary holds only values some row uses; an empty week's board and
+        # seed live in its segment alone.
+        const = {c: self._code(c, fields.get(c)) for c in SEGMENT_FIELDS} if entries else {}
+        cols = self.columns
+        for e in entries:
+            for c in SEGMENT_FIELDS:
+                cols[c].append(const[c])
+            for c in ENTRY_FIELDS:
+                v = e.get(c)
+                cols[c].append(self._code(c, v) if c in self._codes else v)
+            seg["rows"] += 1
+        self.segments.append(seg)
+
+    def copy_segment(self, other, index):
+        """Append segment `index` of `other`, re-coding its dictionary columns."""
+        seg = other.segments[index]
+        start = other.offsets()[index]
+        end = start + seg["rows"]
+        for c in COLUMNS:
+            src = other.columns[c][start:end]
+            if c in self._codes:
+                # In row order, so a copied segment is coded exactly as parsing it
+                # again would code it: the same data always makes the same store.
+                values, remap, out = other.dicts[c], {}, []
+                for code in src:
+                    mapped = remap.get(code)
+                    if mapped is None:
+                        mapped = remap[code] = self._code(c, values[code])
+                    out.append(mapped)
+                src = out
+            self.columns[c].extend(src)
+        self.segments.append(dict(seg))
+
+    # ---- queries --------------------------------------------------------
+
+    def value(self, col, i):
+        v = self.columns[col][i]
+        return self.dicts[col][v] if col in self.dicts else v
+
+    def row(self, i, fields=COLUMNS):
+        return {c: self.value(c, i) for c in fields}
+
+    def rows(self, idx, fields=COLUMNS):
+        return [self.row(i, fields) for i in idx]
+
+    def where(self, rows=None, **equals):
+        """Row numbers whose columns equal every given value (within `rows`)."""
+        tests = []
+        for col, want in equals.items():
+            if col in self._codes:
+                code = self._codes[col].get(_key(want))
+                if code is None:
+                    return []
+                tests.append((self.columns[col], code))
+            else:
+                tests.append((self.columns[col], want))
+        if rows is None:
+            if not tests:
+                return list(range(len(self)))
+            first, want = tests.pop(0)
+            rows = [i for i, v in enumerate(first) if v == want]
+        for col, want in tests:
+            rows = [i for i in rows if col[i] == want]
+        return list(rows)
+
+    def count_by(self, col, rows=None):
+        """{value: entries} over `rows` (all rows by default)."""
+        column = self.columns[col]
+        counts = {}
+        for i in (range(len(self)) if rows is None else rows):
+            counts[column[i]] = counts.get(column[i], 0) + 1
+        if col in self.dicts:
+            return {self.dicts[col][k]: n for k, n in counts.items()}
+        return counts
+
+    def best_by(self, col, rows=None):
+        """{value: row number of its best entry} under ADR-0002 (first of a tie)."""
+        column, score, doom = self.columns[col], self.columns["score"], \
+            self.columns["doom_integral"]
+        best = {}
+        for i in (range(len(self)) if rows is None else rows):
+            k = column[i]
+            b = best.get(k)
+            if b is None or (_num(score[i]), _num(doom[i])) > (_num(score[b]), _num(doom[b])):
+                best[k] = i
+        if col in self.dicts:
+            return {self.dicts[col][k]: i for k, i in best.items()}
+        return best
+
+    # ---- serialisation --------------------------------------------------
+
+    def to_json(self, generated):
+        return {"format": FORMAT, "generated": generated, "rows": len(self),
+                "segments": self.segments, "dicts": self.dicts, "columns": self.columns}
+
+    @classmethod
+    def from_json(cls, doc):
+        if (not isinstance(doc, dict) or doc.get("format") != FORMAT
+                or set(doc.get("columns") or ()) != set(COLUMNS)
+                or set(doc.get("dicts") or ()) != set(DICT_COLUMNS)):
+            raise ValueError("not a format-%d league history store" % FORMAT)
+        s = cls()
+        s.segments, s.dicts, s.columns = doc["segments"], doc["dicts"], doc["columns"]
+        s._codes = {c: {_key(v): i for i, v in enumerate(s.dicts[c])}
+                    for c in DICT_COLUMNS}
+        n = sum(seg["rows"] for seg in s.segments)
+        if any(len(s.columns[c]) != n for c in COLUMNS):
+            raise ValueError("league history columns disagree with their segments")
+        return s
+
+
+def load(path):
+    """The store at `path`, or None when it is absent or not one we can reuse."""
+    try:
+        return HistoryStore.from_json(json.loads(Path(path).read_text(encoding="utf-8")))
+    except Exception:
+        return None
+
+
+def _order(seg):
+    return (0 if seg["source"] == "archive" else 1, seg["file"])
+
+
+def build(sources, previous=None):
+    """(store, parsed) for `sources`, a list of (source, name, path).
+
+    A file whose (source, name, sha256) has a segment in `previous` keeps its rows;
+    the rest are read and parsed. An unreadable file is skipped with a warning."""
+    held = {}
+    if previous is not None:
+        held = {(s["source"], s["file"], s["sha256"]): i
+                for i, s in enumerate(previous.segments)}
+    store, parsed = HistoryStore(), 0
+    for source, name, path in sorted(sources, key=lambda t: _order(
+            {"source": t[0], "file": t[1]})):
+        try:
+            raw = Path(path).read_bytes()
+        except OSError as e:
+            print(f"WARNING: league history skips unreadable {path}: {e}")
+            continue
+        digest = hashlib.sha256(raw).hexdigest()
+        if (source, name, digest) in held:
+            store.copy_segment(previous, held[(source, name, digest)])
+            continue
+        try:
+            doc = json.loads(raw.decode("utf-8"))
+        except Exception as e:
+            print(f"WARNING: league history skips unreadable {path}: {e}")
+            continue
+        if not isinstance(doc, dict):
+            continue
+        parsed += 1
+        fields, entries = READERS[source](doc, name)
+        store.add_segment(fields, digest, entries)
+    return store, parsed
+
+
+def replace(previous, source, name, doc, sha256):
+    """A store equal to `previous` with the segment for one file replaced by `doc`
+    (or added); no other file is read."""
+    fields, entries = READERS[source](doc, name)
+    new = {"source": source, "file": name}
+    store, placed = HistoryStore(), False
+    for i, seg in enumerate(previous.segments):
+        if (seg["source"], seg["file"]) == (source, name):
+            continue
+        if not placed and _order(new) < _order(seg):
+            store.add_segment(fields, sha256, entries)
+            placed = True
+        store.copy_segment(previous, i)
+    if not placed:
+        store.add_segment(fields, sha256, entries)
+    return store
+
+
+# ---------------------------------------------------------------------------
+# Aggregates the site publishes.
+# ---------------------------------------------------------------------------
+
+def _best(store, i):
+    return {k: store.value(k, i) for k in ("score", "doom_integral", "player_name",
+                                           "board", "date")}
+
+
+def aggregates(store):
+    """{"players": doc, "epochs": doc} computed from the store."""
+    players = {}
+    for name, rows in _group(store, "player_name").items():
+        if not name:
+            continue
+        dates = sorted(str(d) for d in (store.value("date", i) for i in rows) if d)
+        players[name] = {
+            "entries": len(rows),
+            "boards": len({store.columns["board"][i] for i in rows}),
+            "first_date": dates[0] if dates else None,
+            "last_date": dates[-1] if dates else None,
+            "best": {epoch: {k: v for k, v in _best(store, i).items() if k != "player_name"}
+                     for epoch, i in sorted(store.best_by("epoch", rows).items(),
+                                            key=lambda t: str(t[0]))},
+        }
+    boards = []
+    for seg, start in zip(store.segments, store.offsets()):
+        rows = range(start, start + seg["rows"])
+        boards.append({"board": seg["board"], "source": seg["source"], "epoch": seg["epoch"],
+                       "seed": seg["seed"], "entries": seg["rows"],
+                       "players": len({store.value("player_name", i) for i in rows}
+                                      - {None, ""})})
+    by_epoch = _group(store, "epoch")
+    epochs = {}
+    for epoch in {seg["epoch"] for seg in store.segments}:
+        rows = by_epoch.get(epoch, [])
+        scores = [s for s in (store.columns["score"][i] for i in rows)
+                  if isinstance(s, (int, float)) and not isinstance(s, bool)]
+        best = store.best_by("epoch", rows).get(epoch)
+        epochs[str(epoch)] = {
+            "boards": sum(1 for seg in store.segments if seg["epoch"] == epoch),
+            "entries": len(rows),
+            "players": len({store.value("player_name", i) for i in rows} - {None, ""}),
+            "avg_score": round(sum(scores) / len(scores), 2) if scores else None,
+            "best": _best(store, best) if best is not None else None,
+        }
+    return {
+        "players": {"total_players": len(players), "players": dict(sorted(players.items()))},
+        "epochs": {"epochs": dict(sorted(epochs.items())), "boards": boards},
+    }
+
+
+def _group(store, col):
+    groups = {}
+    for i, code in enumerate(store.columns[col]):
+        groups.setdefault(code, []).append(i)
+    return {store.dicts[col][k]: rows for k, rows in groups.items()}
+
+
+def write(store, weekly_dir, generated):
+    """Write the store and both aggregate files atomically; returns their paths."""
+    paths = history_paths(weekly_dir)
+    agg = aggregates(store)
+    docs = {
+        "store": json.dumps(store.to_json(generated), ensure_ascii=False,
+                            separators=(",", ":")),
+        "players": json.dumps(dict({"generated": generated, "source": STORE_NAME},
+                                   **agg["players"]), indent=2, ensure_ascii=False),
+        "epochs": json.dumps(dict({"generated": generated, "source": STORE_NAME},
+                                  **agg["epochs"]), indent=2, ensure_ascii=False),
+    }
+    for name, path in paths.items():
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(docs[name] + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+    return paths
+
+
+def main():
+    for _s in (sys.stdout, sys.stderr):
+        try:
+            _s.reconfigure(encoding="utf-8", errors="replace")
+        except (AttributeError, ValueError):
+            pass
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--store", default=str(history_paths()["store"]),
+                        help="the store to query (default: the published one)")
+    parser.add_argument("--player", help="a player's entries and best per epoch")
+    parser.add_argument("--epochs", action="store_true", help="entries and best per epoch")
+    parser.add_argument("--boards", action="store_true", help="entries per board, in order")
+    args = parser.parse_args()
+
+    store = load(args.store)
+    if store is None:
+        print(f"No league history at {args.store} -- run "
+              "python scripts/weekly-league-manager.py --rebuild-archive-index")
+        return 1
+    print(f"{len(store)} entries in {len(store.segments)} boards")
+    if args.player:
+        rows = store.where(player_name=args.player)
+        print(f"{args.player}: {len(rows)} entries")
+        for epoch, i in sorted(store.best_by("epoch", rows).items(), key=lambda t: str(t[0])):
+            r = store.row(i)
+            print(f"   {epoch}: best {r['score']} on {r['board']} ({r['date']})")
+    if args.epochs:
+        for epoch, i in sorted(store.best_by("epoch").items(), key=lambda t: str(t[0])):
+            r = store.row(i)
+            n = len(store.where(epoch=epoch))
+            print(f"   {epoch}: {n} entries, best {r['score']} by {r['player_name']}")
+    if args.boards:
+        for seg in store.segments:
+            print(f"   {seg['board']:40s} {seg['epoch'] or '-':20s} {seg['rows']:5d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
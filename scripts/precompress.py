@@ -0,0 +1,333 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Write .gz and .br siblings for every compressible file under public/.
+
+WHY THIS EXISTS
+---------------
+The deploy is `rsync` of public/ as-is, so every HTML page, events.json, the
+leaderboard JSON and the feeds reach DreamHost uncompressed. What a visitor
+then receives depends on mod_deflate compressing the response on every request,
+at a low level, on a shared CPU budget, during exactly the traffic spike the
+.htaccess is written for -- or on nothing at all if the module is off.
+
+This compresses each file ONCE, at build time, at maximum effort: gzip level 9
+and brotli quality 11, both too slow to do per request. On events.json brotli
+11 is 114 KB against gzip -9's 154 KB. public/.htaccess serves `X.br` or `X.gz` in place
+of `X` when the browser accepts it and the sibling exists, and falls back to
+the plain file -- and mod_deflate -- when it does not.
+
+WHAT IT WRITES
+--------------
+For every file under public/ with a COMPRESSIBLE_SUFFIXES suffix and at least
+MIN_BYTES long, outside dot-directories (the sync's staging trees):
+
+  X.gz   gzip -9, mtime 0 and no file name in the header, so it is reproducible
+  X.br   brotli quality 11
+
+A variant that is not smaller than X is not written. Siblings are build output
+for the deploy job: .gitignore keeps them out of the repo. Each sibling takes
+its source's mtime, so rsync's size-and-mtime check sees an unchanged sibling
+as unchanged.
+
+ONLY WHAT CHANGED
+-----------------
+Brotli at quality 11 runs at well under 1 MB/s, and public/ has ~47 MB of
+eligible text. Most of it has not changed since the last deploy. The cache at
+<repo>/.precompress-cache/ (gitignored; the deploy workflows persist it with
+actions/cache) holds:
+
+  manifest.json     {path: sha256 of the source, variants written} from the
+                    last run
+  objects/          compressed bytes keyed by the SOURCE's sha256
+
+A file whose bytes hash to what the manifest recorded, with its siblings still
+on disk as written (the stored object's size, the source's mtime), is not
+touched. A file whose bytes were compressed before -- under
+any name, in any earlier run -- is copied from objects/. Only genuinely new
+content is compressed. Objects no current file uses are pruned.
+
+WHAT IT MUST NEVER DO: LEAVE A SIBLING OF OTHER BYTES
+------------------------------------------------------
+A stale X.gz is worse than none. The browser is served it instead of X, so an
+edit silently never reaches anyone who accepts gzip, and that is everyone. So:
+
+  * the skip decision is taken on the source's CONTENT hash, never its mtime;
+  * a sibling whose source is gone, shrank below MIN_BYTES or stopped being
+    eligible is deleted -- but only `X.gz` / `X.br` where X has one of our
+    suffixes, so a real download like `foo.tar.gz` is never touched;
+  * --gzip-only deletes every .br sibling rather than leave old ones behind;
+  * scripts/check-precompressed.py decompresses EVERY sibling and compares it
+    with its source byte for byte, independent of this file's manifest. The
+    deploy workflows run it between this and the rsync.
+
+Brotli is the `brotli` package, not stdlib. Without it this refuses unless
+given --gzip-only.
+
+Usage:
+    python scripts/precompress.py                 # public/, .gz and .br
+    python scripts/precompress.py --jobs 0        # compress across every CPU
+    python scripts/precompress.py --gzip-only     # no brotli module here
+    python scripts/precompress.py --public DIR --cache DIR
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+PUBLIC = ROOT / "public"
+CACHE = ROOT / ".precompress-cache"
+
+# Keep in step with the precompressed-sibling rules in public/.htaccess, which
+# map each of these back to its content type.
+COMPRESSIBLE_SUFFIXES = frozenset({
+    ".html", ".json", ".xml", ".css", ".js", ".svg", ".txt", ".md", ".webmanifest",
+})
+# Below this the framing eats the saving, and the request is one packet anyway.
+MIN_BYTES = 1024
+VARIANTS = ("gz", "br")
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+# Below this many files to compress, a process pool costs more than it saves.
+MIN_FILES_PER_JOB = 8
+
+
+def load_brotli():
+    """The brotli module, or None when it is not installed."""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def compress(data: bytes, variant: str) -> bytes:
+    if variant == "gz":
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    return load_brotli().compress(data, quality=BROTLI_QUALITY)
+
+
+def decompress(data: bytes, variant: str) -> bytes:
+    if variant == "gz":
+        return gzip.decompress(data)
+    return load_brotli().decompress(data)
+
+
+def eligible(rel: str) -> bool:
+    """True for a public/-relative POSIX path this stage compresses."""
+    parts = rel.split("/")
+    if any(p.startswith(".") for p in parts):
+        return False
+    return os.path.splitext(parts[-1])[1].lower() in COMPRESSIBLE_SUFFIXES
+
+
+def sibling_source(rel: str) -> Optional[Tuple[str, str]]:
+    """(source rel, variant) when `rel` is a sibling this stage owns, else None.
+
+    Ownership is by shape: `X.gz` / `X.br` where X is eligible. Anything else
+    that ends in .gz -- a release archive, say -- is not ours to delete."""
+    for variant in VARIANTS:
+        suffix = "." + variant
+        if rel.endswith(suffix) and eligible(rel[:-len(suffix)]):
+            return rel[:-len(suffix)], variant
+    return None
+
+
+def walk(public: Path) -> Iterator[str]:
+    """Every file under public/, as a relative POSIX path, outside dot-directories."""
+    for dirpath, dirnames, filenames in os.walk(public):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        base = Path(dirpath).relative_to(public).as_posix()
+        for name in sorted(filenames):
+            yield name if base == "." else f"{base}/{name}"
+
+
+def _compress_all(item: Tuple[str, bytes, Tuple[str, ...]]) -> Tuple[str, Dict[str, bytes]]:
+    rel, data, variants = item
+    return rel, {v: compress(data, v) for v in variants}
+
+
+def load_manifest(cache: Path, variants: Tuple[str, ...]) -> Dict[str, dict]:
+    """The last run's {rel: entry}, or {} when it is missing, malformed, from
+    another MANIFEST_VERSION or made for another set of variants."""
+    try:
+        manifest = json.loads((cache / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if (not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION
+            or manifest.get("variants") != list(variants)
+            or not isinstance(manifest.get("files"), dict)):
+        return {}
+    return manifest["files"]
+
+
+def siblings_intact(public: Path, rel: str, source_stat: os.stat_result, stored: Path,
+                    written: List[str], variants: Tuple[str, ...]) -> bool:
+    """True when exactly the `written` siblings exist, each the size of its
+    stored object and stamped with the source's mtime -- i.e. untouched since
+    write_sibling() put it there."""
+    for v in variants:
+        try:
+            stat = (public / f"{rel}.{v}").stat()
+        except FileNotFoundError:
+            if v in written:
+                return False
+            continue
+        if v not in written:
+            return False
+        try:
+            size = stored.with_name(f"{stored.name}.{v}").stat().st_size
+        except FileNotFoundError:
+            return False
+        if stat.st_size != size or stat.st_mtime_ns != source_stat.st_mtime_ns:
+            return False
+    return True
+
+
+def write_sibling(path: Path, data: bytes, source_stat: os.stat_result):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.utime(tmp, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+    os.replace(tmp, path)
+
+
+def precompress(public: Path, cache: Path, variants: Tuple[str, ...], jobs: int = 1) -> dict:
+    """Bring every sibling under `public` up to date. Returns the run's counts."""
+    previous = load_manifest(cache, variants)
+    objects = cache / "objects"
+    objects.mkdir(parents=True, exist_ok=True)
+
+    files: Dict[str, dict] = {}
+    pending: List[Tuple[str, bytes, str, os.stat_result]] = []
+    counts = {"eligible": 0, "unchanged": 0, "from_cache": 0, "compressed": 0,
+              "removed": 0, "source_bytes": 0, "sent_bytes": 0}
+    all_files = set(walk(public))
+
+    for rel in sorted(all_files):
+        if not eligible(rel):
+            continue
+        path = public / rel
+        data = path.read_bytes()
+        if len(data) < MIN_BYTES:
+            continue
+        counts["eligible"] += 1
+        sha = hashlib.sha256(data).hexdigest()
+        entry = previous.get(rel)
+        if isinstance(entry, dict) and entry.get("sha256") == sha and siblings_intact(
+                public, rel, path.stat(), objects / sha, entry.get("variants", []), variants):
+            files[rel] = entry
+            counts["unchanged"] += 1
+            continue
+        stored = {v: objects / f"{sha}.{v}" for v in variants}
+        if all(p.exists() for p in stored.values()):
+            stat = path.stat()
+            for v, obj in stored.items():
+                write_sibling(public / f"{rel}.{v}", obj.read_bytes(), stat)
+            files[rel] = {"sha256": sha, "variants": list(variants)}
+            counts["from_cache"] += 1
+            continue
+        pending.append((rel, data, sha, path.stat()))
+
+    if pending:
+        items = [(rel, data, variants) for rel, data, _, _ in pending]
+        if jobs > 1 and len(items) >= MIN_FILES_PER_JOB * 2:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = dict(pool.map(_compress_all, items,
+                                        chunksize=max(1, len(items) // (jobs * 4))))
+        else:
+            results = dict(map(_compress_all, items))
+        for rel, data, sha, stat in pending:
+            written = []
+            for v, blob in results[rel].items():
+                if len(blob) >= len(data):
+                    continue
+                (objects / f"{sha}.{v}").write_bytes(blob)
+                write_sibling(public / f"{rel}.{v}", blob, stat)
+                written.append(v)
+            files[rel] = {"sha256": sha, "variants": written}
+            counts["compressed"] += 1
+
+    # Siblings that no longer describe a current source, in either direction:
+    # the source went away, or this run decided not to write that variant.
+    for rel in sorted(all_files):
+        owned = sibling_source(rel)
+        if owned is None:
+            continue
+        source, variant = owned
+        entry = files.get(source)
+        if entry is None or variant not in entry["variants"]:
+            (public / rel).unlink()
+            counts["removed"] += 1
+
+    for rel, entry in files.items():
+        size = (public / rel).stat().st_size
+        counts["source_bytes"] += size
+        counts["sent_bytes"] += min([size] + [(public / f"{rel}.{v}").stat().st_size
+                                              for v in entry["variants"]])
+
+    live = {entry["sha256"] for entry in files.values()}
+    for obj in objects.iterdir():
+        if obj.name.split(".", 1)[0] not in live:
+            obj.unlink()
+
+    tmp = cache / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps({"version": MANIFEST_VERSION, "variants": list(variants),
+                               "files": files}, indent=1, sort_keys=True),
+                   encoding="utf-8")
+    os.replace(tmp, cache / MANIFEST_NAME)
+    return counts
+
+
+def resolve_jobs(jobs: int) -> int:
+    return max(1, os.cpu_count() or 1) if jobs == 0 else max(1, jobs)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--public", type=Path, default=PUBLIC, help="tree to compress (default public/)")
+    parser.add_argument("--cache", type=Path, default=CACHE,
+                        help="manifest and object store (default .precompress-cache/)")
+    parser.add_argument("--gzip-only", action="store_true",
+                        help="write .gz only and delete any .br sibling")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="compress across N processes (0 = one per CPU; default 1)")
+    args = parser.parse_args(argv)
+
+    variants = ("gz",) if args.gzip_only else VARIANTS
+    if "br" in variants and load_brotli() is None:
+        print("ERROR: the brotli package is required for .br siblings "
+              "(pip install brotli), or pass --gzip-only", file=sys.stderr)
+        return 2
+    if not args.public.is_dir():
+        print(f"ERROR: {args.public} is not a directory", file=sys.stderr)
+        return 2
+
+    counts = precompress(args.public, args.cache, variants, resolve_jobs(args.jobs))
+    saved = counts["source_bytes"] - counts["sent_bytes"]
+    print(f"precompress: {counts['eligible']} eligible files under {args.public} "
+          f"({'/'.join('.' + v for v in variants)})")
+    print(f"  {counts['unchanged']} unchanged, {counts['from_cache']} restored from the "
+          f"cache, {counts['compressed']} compressed, {counts['removed']} stale "
+          f"sibling(s) removed")
+    print(f"  smallest variant: {counts['sent_bytes']:,} of {counts['source_bytes']:,} "
+          f"bytes ({saved / max(1, counts['source_bytes']):.0%} saved)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
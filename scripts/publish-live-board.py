@@ -63,16 +63,39 @@ WHAT IT WRITES
   public/leaderboard/data/leaderboard.json    the table the page renders
   public/leaderboard/data/published-board.json  which board key the site publishes,
                                                 with provenance
+  public/leaderboard/data/leaderboard-delta.json  the entry-level changes between
+                                                  recent revisions of the first file
+  public/leaderboard/data/leaderboard-{top,players,builds}.json
+                                                the rank index (scripts/rank_index.py)
 
 The second file exists so "the board this site publishes" is an ARTIFACT rather than
 something inferred from weekly/current.json -- which weekly-league-manager.py owns and
 rewrites on rollover. Two writers on one file is how version.json got into trouble.
 check-board-liveness.py prefers this artifact when present.
 
+The third exists so an open leaderboard page can follow a live board without
+downloading it again. Each write of leaderboard.json bumps `meta.revision` and appends
+one delta to the log -- the entries added or changed (`upsert`) and the ones gone
+(`remove`), by `entry_uuid` where the API gave one and by the whole entry where it did
+not. public/assets/js/board-delta.js applies them; a page whose revision the log no
+longer reaches (a new board key, more than MAX_DELTAS revisions behind, a board written
+by another script) reloads leaderboard.json instead.
+
+The rank index is the first file cut the way the page reads it: the top of the board,
+each player's best rank, each build's partition. It is rebuilt from the payload on every
+write, so it can never describe a different revision than the board beside it. A run in
+which no entry changed writes none of these files.
+
 Usage:
   python scripts/publish-live-board.py            # fetch and publish
   python scripts/publish-live-board.py --check    # verify freshness, write nothing
   python scripts/publish-live-board.py --dry-run  # show what would be published
+  python scripts/publish-live-board.py --no-cache # neither read nor write the response cache
+
+Boards are read through check-board-liveness.py's response cache (.board-cache/,
+gitignored), so the winning board's rows come from the read that chose it rather
+than a second GET, and a board whose rows and key have not changed since the last
+publish is not rewritten -- only its `generated` stamp would have moved.
 
 Exit codes: 0 ok / 1 nothing publishable / 2 cannot determine epoch / 3 fetch failed
 """
@@ -95,6 +118,11 @@ ROOT = Path(__file__).resolve().parent.parent
 LB_DIR = ROOT / "public" / "leaderboard" / "data"
 BOARD_JSON = LB_DIR / "leaderboard.json"
 PUBLISHED_JSON = LB_DIR / "published-board.json"
+DELTA_JSON = LB_DIR / "leaderboard-delta.json"
+# Deltas kept in the log. Revisions only happen when an entry changed, so this is
+# days of a busy league night and weeks of a quiet one; a page further behind than
+# this simply reloads the board.
+MAX_DELTAS = 48
 TARGETS_JSON = LB_DIR / "board-probe-targets.json"
 
 # Reuse the probe's derivation instead of copying it. The seed/epoch derivation is
@@ -106,6 +134,7 @@ _spec = importlib.util.spec_from_file_location(
     "check_board_liveness", Path(__file__).resolve().parent / "check-board-liveness.py")
 liveness = importlib.util.module_from_spec(_spec)
 _spec.loader.exec_module(liveness)
+import rank_index  # noqa: E402  (scripts/ is on sys.path via check-board-liveness.py)
 
 
 def now_iso():
@@ -213,12 +242,16 @@ def pick_live_board(epoch, verbose=True):
             print("        (%s, %s) %d entries, last %s"
                   % (c["seed"], c["version"], c["entries"], c.get("last_entry")))
 
-    # Re-fetch the winner to publish the ACTUAL rows. probe_board returns counts only;
-    # publishing from a summary would mean publishing numbers nobody fetched.
-    import urllib.parse
-    q = urllib.parse.urlencode({"seed": winner["seed"], "version": epoch})
-    data, err = liveness.get_json("%s?%s" % (liveness.SCORE_API, q))
-    if err or not isinstance(data, dict) or not data.get("ok"):
+    # Publish the ACTUAL rows. probe_board returns counts only; publishing from a
+    # summary would mean publishing numbers nobody fetched. Through the response cache
+    # they are the body probe_board itself read moments ago -- the very response that
+    # made this board the winner. Without it, the winner is fetched again.
+    data = liveness.fetched_board(winner["seed"], epoch)
+    if data is None:
+        data, err = liveness.get_json(liveness.board_url(winner["seed"], epoch))
+        if err:
+            return None, None, "unreadable"
+    if not isinstance(data, dict) or not data.get("ok"):
         return None, None, "unreadable"
     return winner, (data.get("entries") or []), "ok"
 
@@ -275,10 +308,93 @@ def _pick_empty_fork(epoch, empties, verbose):
     return winner, "ok"
 
 
+def rank_key(e):
+    """ADR-0002 order, as ingest_scores.py ranks: score DESC, then doom_integral DESC.
+    Remaining ties by earliest date, then uuid and name, so the order is a function
+    of the entries alone. board-delta.js ranks with the same key, which is what lets
+    a page that applied deltas show exactly the order a fresh load would."""
+    return (-(e.get("score") or 0), -(e.get("doom_integral") or 0),
+            str(e.get("date") or ""), str(e.get("entry_uuid") or ""),
+            str(e.get("player_name") or ""))
+
+
+def entry_ref(e):
+    """How a delta names an entry: its entry_uuid, or -- for an entry the API gave no
+    uuid -- the whole entry, which board-delta.js matches by content."""
+    uuid = e.get("entry_uuid")
+    return uuid if isinstance(uuid, str) and uuid else e
+
+
+def entry_identity(e):
+    ref = entry_ref(e)
+    return "u:" + ref if isinstance(ref, str) else \
+        "c:" + json.dumps(ref, sort_keys=True, ensure_ascii=False)
+
+
+def _identities(entries):
+    """{identity#occurrence: entry}. The API does not promise a uuid, and two runs
+    with identical fields and no uuid are two entries, not one."""
+    seen, out = {}, {}
+    for e in entries:
+        k = entry_identity(e)
+        seen[k] = seen.get(k, 0) + 1
+        out["%s#%d" % (k, seen[k])] = e
+    return out
+
+
+def board_delta(old_entries, new_entries):
+    """{"upsert": [entry, ...], "remove": [ref, ...]} turning old into new.
+
+    An entry is upserted when it is new or its fields changed under the same uuid,
+    removed when its identity is gone. Ranked, so the log reads like the board."""
+    old, new = _identities(old_entries), _identities(new_entries)
+    upsert = [e for k, e in new.items() if old.get(k) != e]
+    remove = [entry_ref(old[k]) for k in old if k not in new]
+    return {"upsert": sorted(upsert, key=rank_key),
+            "remove": sorted(remove, key=lambda r: r if isinstance(r, str) else
+                             json.dumps(r, sort_keys=True))}
+
+
+def append_delta(cur, payload, delta):
+    """The delta log after this write: `delta` appended when it continues from the
+    revision the log ends on, otherwise a fresh log a page can only load fully."""
+    meta = payload["meta"]
+    log = load_json(DELTA_JSON, {}) or {}
+    cur_rev = (cur.get("meta") or {}).get("revision")
+    continues = (isinstance(cur_rev, int) and log.get("revision") == cur_rev
+                 and log.get("board_key") == meta["board_key"]
+                 and isinstance(log.get("deltas"), list))
+    deltas = list(log["deltas"]) if continues else []
+    oldest = log.get("oldest_base", cur_rev) if continues else meta["revision"]
+    if continues:
+        deltas.append({"revision": meta["revision"], "generated": meta["generated"],
+                       "data_status": payload["data_status"],
+                       "total_entries": meta["total_entries"],
+                       "upsert": delta["upsert"], "remove": delta["remove"]})
+    while len(deltas) > MAX_DELTAS:
+        oldest = deltas.pop(0)["revision"]
+    return delta_log(meta["board_key"], meta["revision"], oldest, deltas)
+
+
+def delta_log(board_key, revision, oldest_base, deltas):
+    """The leaderboard-delta.json document."""
+    return {
+        "_comment": (
+            "Entry-level changes to leaderboard.json, written by publish-live-board.py "
+            "and applied by public/assets/js/board-delta.js. A page holding revision R "
+            "may apply every delta after R when oldest_base <= R <= revision and the "
+            "board_key matches; otherwise it reloads leaderboard.json."),
+        "board_key": board_key,
+        "revision": revision,
+        "oldest_base": oldest_base,
+        "deltas": deltas,
+    }
+
+
 def build_payload(board, entries, epoch):
     players = sorted({e.get("player_name") for e in entries if e.get("player_name")})
     builds = sorted({e.get("game_mode") for e in entries if e.get("game_mode")})
-    ranked = sorted(entries, key=lambda e: -(e.get("score") or 0))
+    ranked = sorted(entries, key=rank_key)
     return {
         "meta": {
             "generated": now_iso(),
@@ -331,6 +447,8 @@ def main():
     ap.add_argument("--check", action="store_true",
                     help="verify the published board is current; write nothing")
     ap.add_argument("--dry-run", action="store_true", help="fetch and report, write nothing")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="read every board in full; neither read nor write the response cache")
     args = ap.parse_args()
 
     targets = load_json(TARGETS_JSON, {}) or {}
@@ -350,7 +468,13 @@ def main():
     print("  current ladder epoch    %s" % epoch)
     print("  epoch source            %s" % epoch_source)
 
+    liveness.BOARD_CACHE = None
+    cache = None if args.no_cache else liveness.open_board_cache()
     board, entries, status = pick_live_board(epoch, verbose=not args.check)
+    if cache is not None:
+        print("  " + cache.summary())
+        if not (args.check or args.dry_run):
+            cache.save()
 
     if board is None:
         # Each refusal says which one it is. "Cannot read" and "nothing to publish" were
@@ -398,7 +522,47 @@ def main():
         print("  --dry-run: nothing written.")
         return 0
 
+    # Nothing changed: same key, no entry added, changed or gone. Rewriting would move
+    # only `generated`, and that one line is a commit, a deploy and a "Last updated"
+    # that claims a change.
+    cur = load_json(BOARD_JSON, {}) or {}
+    pub = load_json(PUBLISHED_JSON, {}) or {}
+    cur_meta = cur.get("meta") or {}
+    delta = board_delta(cur.get("entries") or [], payload["entries"])
+    if (cur_meta.get("board_key") == payload["meta"]["board_key"]
+            and not (delta["upsert"] or delta["remove"])
+            and cur.get("data_status") == payload["data_status"]
+            and (pub.get("seed"), pub.get("ladder_epoch"), pub.get("epoch_source"))
+            == (board["seed"], epoch, epoch_source)):
+        # Unchanged is not complete: the rank index and the delta log sit beside the
+        # board, and a fresh checkout or an older publish can lack them. Write only
+        # what is missing, from the board as published and at its revision (an empty
+        # log), so the board itself is still not rewritten. A board without a revision
+        # gets no log: a page holding it reloads whatever the log says.
+        filled = []
+        if not all(p.exists() for p in rank_index.index_paths(BOARD_JSON).values()):
+            rank_index.write_index(cur, BOARD_JSON)
+            filled.append("rank index")
+        rev = cur_meta.get("revision")
+        if not DELTA_JSON.exists() and isinstance(rev, int):
+            DELTA_JSON.write_text(json.dumps(delta_log(cur_meta["board_key"], rev, rev, []),
+                                             indent=2, ensure_ascii=False) + "\n",
+                                  encoding="utf-8")
+            filled.append("%s (empty)" % DELTA_JSON.name)
+        print("-" * 74)
+        print("  unchanged since %s: same board key, same %d entries. %s"
+              % (cur_meta.get("generated"), len(entries),
+                 "Wrote only the missing %s." % " and ".join(filled) if filled
+                 else "Nothing written."))
+        return 0
+
+    rev = cur_meta.get("revision")
+    payload["meta"]["revision"] = rev + 1 if isinstance(rev, int) else 1
+    log = append_delta(cur, payload, delta)
     BOARD_JSON.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    DELTA_JSON.write_text(json.dumps(log, indent=2, ensure_ascii=False) + "\n",
+                          encoding="utf-8")
+    index = rank_index.write_index(payload, BOARD_JSON)
     PUBLISHED_JSON.write_text(json.dumps({
         "_comment": (
             "The board key this site publishes, written by publish-live-board.py. This is "
@@ -426,6 +590,12 @@ def main():
     print("-" * 74)
     print("  wrote %s" % BOARD_JSON.relative_to(ROOT))
     print("  wrote %s" % PUBLISHED_JSON.relative_to(ROOT))
+    print("  wrote %s: revision %d, %s"
+          % (DELTA_JSON.relative_to(ROOT), payload["meta"]["revision"],
+             "+%d upserted / -%d removed" % (len(delta["upsert"]), len(delta["remove"]))
+             if log["deltas"] and log["deltas"][-1]["revision"] == payload["meta"]["revision"]
+             else "new log (a page at an older revision reloads the board)"))
+    print("  wrote rank index: %s" % ", ".join(p.name for p in index.values()))
     return 0
 
 
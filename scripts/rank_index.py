@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Precomputed rank index for a published leaderboard.json.
+
+WHY THIS EXISTS
+---------------
+Every writer of leaderboard.json -- ingest_scores.py (seed files on disk),
+publish-live-board.py (the live score API) and game-integration.py --export (a
+local game checkout) -- writes one flat, ranked `entries` array, and the leaderboard
+page used to download all of it before it could draw a single row. That is fine at
+thirty entries and not at a league night's thousands: every visitor pays for the
+whole board to look at its first screen. The publisher has already ranked the board,
+so it also writes what the page actually needs, next to the board:
+
+  leaderboard-top.json      the first TOP_N entries, board-shaped (same meta,
+                            data_status, seed ... as leaderboard.json) plus an
+                            `index` block with the full board's totals. The page
+                            renders this and fetches the whole board only when a
+                            visitor searches, filters, re-sorts or asks for it.
+  leaderboard-players.json  player name -> best rank, best score, entry count and
+                            builds: the per-player best and the name -> rank map.
+  leaderboard-builds.json   per build: entry and player counts, the global ranks of
+                            its entries in board order, and its best PARTITION_TOP
+                            entries with their global rank.
+
+WHAT IT IS CAREFUL ABOUT
+------------------------
+  * It never re-ranks. Rank N here is position N in the board the publisher wrote:
+    ingest_scores.py orders by the frozen ADR-0002 key, publish-live-board.py by its
+    rank_key, and an index that sorted again could disagree with the board it indexes.
+  * It carries the board's identity. meta (revision, board_key, generated) is copied
+    verbatim, so the page can tell from the delta log whether its slice is current,
+    and a reader can tell which board an index file describes.
+  * It is derived, never authoritative. Each file is rebuilt whole from the board on
+    every write of the board; nothing reads an old index to make a new one.
+
+USAGE
+-----
+    rank_index.write_index(payload, BOARD_JSON)    # after writing BOARD_JSON
+"""
+
+import json
+from pathlib import Path
+
+TOP_N = 100
+PARTITION_TOP = 10
+SUFFIXES = ("top", "players", "builds")
+
+
+def index_paths(board_path):
+    """{"top": .../leaderboard-top.json, ...}: beside the board, named after it, so a
+    board written with --output somewhere else gets its index there too."""
+    p = Path(board_path)
+    return {s: p.with_name("%s-%s.json" % (p.stem, s)) for s in SUFFIXES}
+
+
+def _num(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def board_stats(entries):
+    """The totals the page shows above the table, over the WHOLE board."""
+    n = len(entries)
+    return {
+        "total_entries": n,
+        "total_players": len({e.get("player_name") for e in entries if e.get("player_name")}),
+        "avg_score": round(sum(_num(e.get("score")) for e in entries) / n, 2) if n else 0,
+        "avg_final_doom": round(sum(_num(e.get("final_doom")) for e in entries) / n, 2)
+        if n else 0,
+    }
+
+
+def build_index(board, top_n=TOP_N, partition_top=PARTITION_TOP):
+    """{"top": doc, "players": doc, "builds": doc} for one board payload.
+
+    Ranks are 1-based positions in board["entries"], which is already ranked."""
+    entries = board.get("entries") or []
+    meta = board.get("meta") or {}
+    head = {k: v for k, v in board.items() if k != "entries"}
+
+    players, builds = {}, {}
+    for rank, e in enumerate(entries, 1):
+        name = e.get("player_name")
+        if name:
+            p = players.get(name)
+            if p is None:
+                # Board order is rank order: the first time a name appears is its best.
+                p = players[name] = {"rank": rank, "score": e.get("score"),
+                                     "entries": 0, "builds": []}
+            p["entries"] += 1
+            if e.get("game_mode") and e["game_mode"] not in p["builds"]:
+                p["builds"].append(e["game_mode"])
+        build = e.get("game_mode") or "unknown"
+        b = builds.setdefault(build, {"entries": 0, "players": set(), "ranks": [], "top": []})
+        b["entries"] += 1
+        if name:
+            b["players"].add(name)
+        b["ranks"].append(rank)
+        if len(b["top"]) < partition_top:
+            b["top"].append({"rank": rank, "entry": e})
+    for b in builds.values():
+        b["players"] = len(b["players"])
+
+    index = {"top_n": top_n, "truncated": len(entries) > top_n,
+             "stats": board_stats(entries), "full": "leaderboard.json"}
+    return {
+        "top": dict(head, index=index, entries=entries[:top_n]),
+        "players": {"meta": meta, "total_players": len(players),
+                    "players": dict(sorted(players.items()))},
+        "builds": {"meta": meta, "partition_top": partition_top,
+                   "builds": dict(sorted(builds.items()))},
+    }
+
+
+def write_index(board, board_path, top_n=TOP_N):
+    """Write the three index files beside `board_path`; returns their paths."""
+    paths = index_paths(board_path)
+    docs = build_index(board, top_n)
+    docs["top"]["index"]["full"] = Path(board_path).name
+    for name, path in paths.items():
+        path.write_text(json.dumps(docs[name], indent=2, ensure_ascii=False) + "\n",
+                        encoding="utf-8")
+    return paths
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""An on-disk cache of JSON responses, revalidated instead of re-read.
+
+WHY THIS EXISTS
+---------------
+Every board-liveness run and every publish-live-board.py run downloaded the full
+entry list of every board it asked about. Almost none of them had changed: a closed
+week's board is frozen, and a board nobody has scored on is the same empty list
+every time. pick_live_board() then downloaded the winning board a SECOND time,
+seconds after probe_board() had read it, just to get its rows.
+
+So each response is kept -- URL, body, and whatever validators the server sent --
+and the next request for that URL is made conditional:
+
+  * VALIDATORS, WHERE THE SERVER SENDS THEM. A stored ETag goes back as
+    If-None-Match, a stored Last-Modified as If-Modified-Since. A `304 Not Modified`
+    costs no body at all, and the stored one is used.
+  * A BODY HASH, WHERE IT DOES NOT. The score API is a PHP script and is not known
+    to send either header. Then the body still crosses the wire, but its SHA-256 is
+    compared with the stored one, and an identical body is "unchanged": anything
+    derived from it last time (see derived()) is reused rather than recomputed.
+
+fetch() says which of those happened -- "new", "changed", "unchanged",
+"not-modified" or "error" -- and summary() turns the counts into the hit-rate line
+the callers print.
+
+WHAT IT IS CAREFUL ABOUT
+------------------------
+  * The cache is an optimisation, never an input. Nothing is ever answered from it
+    without asking the server first: a 304 is the server saying "what you have is
+    current", and an unchanged hash is the server sending it again. An outage is an
+    error, exactly as without the cache -- never a stale body.
+  * An error changes nothing. A failed request neither stores nor evicts, so the
+    next good answer is compared with the last good one.
+  * body(url) is only what was fetched IN THIS PROCESS. A body loaded from disk and
+    not yet revalidated is not offered to anyone.
+  * Derived values are dropped whenever the body changes, and wholesale when the
+    caller's `derived_key` changes -- pass a hash of the code that computes them.
+  * An unreadable or other-version cache file is an empty cache. Entries unused for
+    MAX_IDLE_DAYS are dropped on save, so the file tracks the boards still being
+    asked about rather than every board ever asked about.
+
+USAGE
+-----
+    cache = response_cache.ResponseCache(ROOT / ".board-cache" / "responses.json",
+                                         derived_key=code_hash)
+    got = cache.fetch(url)            # got.state, got.body, got.error
+    data, err = cache.get_json(url)   # the http_client.get_json() contract
+    cache.save()
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import http_client
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+CACHE_VERSION = 1
+MAX_IDLE_DAYS = 30
+STATES = ("new", "changed", "unchanged", "not-modified", "error")
+
+
+class Fetched:
+    """One fetch: `state` (see STATES), the `body` bytes, or an `error` string in
+    http_client's vocabulary ("HTTP <status>" only when the host answered)."""
+
+    __slots__ = ("state", "body", "error")
+
+    def __init__(self, state, body=None, error=None):
+        self.state, self.body, self.error = state, body, error
+
+
+def today():
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+class ResponseCache:
+    """Conditional GETs over one http_client.HttpClient, remembered on disk.
+
+    Thread-safe: probe_all() calls fetch() from several workers at once."""
+
+    def __init__(self, path, client=None, derived_key=None):
+        self.path = Path(path) if path else None
+        self.client = client
+        self.derived_key = derived_key
+        self._lock = threading.Lock()
+        self.entries = self._load()
+        self.seen = {}        # url -> entry, for every URL fetched in this process
+        self.stats = dict.fromkeys(STATES, 0)
+        self.stats.update({"derived": 0, "derived_reused": 0, "bytes": 0})
+
+    # ------------------------------------------------------------ disk
+    def _load(self):
+        if self.path is None:
+            return {}
+        try:
+            doc = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if (not isinstance(doc, dict) or doc.get("version") != CACHE_VERSION
+                or not isinstance(doc.get("responses"), dict)):
+            return {}
+        keep_derived = doc.get("derived_key") == self.derived_key
+        entries = {}
+        for url, e in doc["responses"].items():
+            if isinstance(e, dict) and isinstance(e.get("body"), str) and e.get("sha256"):
+                e["derived"] = e.get("derived") if keep_derived and isinstance(
+                    e.get("derived"), dict) else {}
+                entries[url] = e
+        return entries
+
+    def save(self):
+        """Write atomically; a killed run leaves the old cache or the new one.
+        Nothing is written by a run that fetched nothing."""
+        if self.path is None or not self.seen:
+            return
+        horizon = (datetime.now(timezone.utc).date()
+                   - timedelta(days=MAX_IDLE_DAYS)).isoformat()
+        with self._lock:
+            kept = {u: e for u, e in self.entries.items()
+                    if (e.get("used_at") or "") >= horizon}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(json.dumps({"version": CACHE_VERSION,
+                                       "derived_key": self.derived_key,
+                                       "responses": kept}, separators=(",", ":")),
+                           encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            # A read-only checkout still works; it just revalidates nothing next time.
+            print("  (response cache not written: %s)" % e)
+
+    # ------------------------------------------------------------ fetching
+    def fetch(self, url, headers=None, timeout=None):
+        """GET `url`, conditionally when there is something to revalidate.
+        Never raises; a failure is Fetched("error", error=...)."""
+        with self._lock:
+            held = self.entries.get(url)
+        sent = dict(headers or {})
+        if held:
+            if held.get("etag"):
+                sent["If-None-Match"] = held["etag"]
+            if held.get("last_modified"):
+                sent["If-Modified-Since"] = held["last_modified"]
+        try:
+            resp = (self.client or http_client.default_client()).get(url, sent, timeout)
+            if resp.status == 304 and not held:
+                raise ValueError("304 Not Modified for a response this cache does not hold")
+        except Exception as e:
+            with self._lock:
+                self.stats["error"] += 1
+            return Fetched("error", error=http_client.classify_error(e)[1])
+
+        with self._lock:
+            if resp.status == 304:
+                state, entry = "not-modified", held
+            else:
+                sha = hashlib.sha256(resp.body).hexdigest()
+                state = ("new" if not held else
+                         "unchanged" if held["sha256"] == sha else "changed")
+                self.stats["bytes"] += len(resp.body)
+                try:
+                    text = resp.body.decode("utf-8")
+                except UnicodeDecodeError:
+                    text = None
+                entry = {"etag": resp.headers.get("ETag"),
+                         "last_modified": resp.headers.get("Last-Modified"),
+                         "sha256": sha, "body": text,
+                         "derived": held["derived"] if state == "unchanged" else {}}
+                if text is None:
+                    # Not text, so not kept; the caller still gets the bytes.
+                    self.entries.pop(url, None)
+                    self.stats[state] += 1
+                    return Fetched(state, resp.body)
+                self.entries[url] = entry
+            entry["used_at"] = today()
+            self.seen[url] = entry
+            self.stats[state] += 1
+            return Fetched(state, entry["body"].encode("utf-8"))
+
+    def get_json(self, url, headers=None, timeout=None):
+        """http_client.get_json(), through the cache: (data, error_string)."""
+        got = self.fetch(url, headers, timeout)
+        if got.error:
+            return None, got.error
+        try:
+            return json.loads(got.body.decode("utf-8")), None
+        except Exception as e:
+            return None, http_client.classify_error(e)[1]
+
+    def body(self, url):
+        """The body fetched for `url` in THIS process, or None."""
+        with self._lock:
+            entry = self.seen.get(url)
+        return entry["body"].encode("utf-8") if entry else None
+
+    def derived(self, url, name, compute):
+        """compute(), remembered against the current body of `url`.
+
+        Reused for as long as the body is byte-identical, so an unchanged response
+        is not parsed again. A body this cache does not hold -- one that is not
+        UTF-8 text, or a URL not fetched in this process -- is computed every
+        time and remembered nowhere."""
+        with self._lock:
+            entry = self.seen.get(url)
+            if entry is None:
+                self.stats["derived"] += 1
+            elif name in entry["derived"]:
+                self.stats["derived_reused"] += 1
+                return entry["derived"][name]
+        value = compute()
+        if entry is not None:
+            with self._lock:
+                entry["derived"][name] = value
+                self.stats["derived"] += 1
+        return value
+
+    # ------------------------------------------------------------ reporting
+    def hit_rate(self):
+        """The share of answered requests whose body was already held."""
+        answered = sum(self.stats[s] for s in STATES if s != "error")
+        hits = self.stats["unchanged"] + self.stats["not-modified"]
+        return hits / answered if answered else 0.0
+
+    def summary(self):
+        st = self.stats
+        return ("response cache: %d not modified (304), %d unchanged by hash, %d changed, "
+                "%d new, %d failed -- %.0f%% already held, %d parse(s) skipped, "
+                "%.1f KiB downloaded"
+                % (st["not-modified"], st["unchanged"], st["changed"], st["new"],
+                   st["error"], 100 * self.hit_rate(), st["derived_reused"],
+                   st["bytes"] / 1024))
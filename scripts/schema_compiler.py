@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Compile the JSON Schemas in schemas/ into plain Python validator functions.
+
+WHY THIS EXISTS
+---------------
+Schema validation is the largest per-entry cost of every publish step.
+ingest_scores.py called jsonschema's `iter_errors()` once per entry, and
+validate_data.py builds a fresh Draft7Validator for every data file. jsonschema is
+general: for every keyword of every subschema, on every instance, it looks the
+keyword up, dispatches to its implementation and builds an error iterator, even
+when the answer is "valid". Our contracts use a dozen plain keywords and nearly
+every entry is valid.
+
+So each schema is translated ONCE into straight-line Python -- one function per
+subschema, one `if ...: return False` per keyword -- and that source is kept in
+.schema-cache/ (gitignored), keyed by a hash of the schema files and of this
+compiler. A later run with the same schemas reuses it. It is regenerated when
+either changes. The result answers one question, fast: is this instance valid? A
+batch form answers it for a whole entries array in one call, returning the indices
+of the invalid entries.
+
+WHAT IT IS CAREFUL ABOUT
+------------------------
+  * Same verdicts as jsonschema's Draft7Validator, keyword for keyword:
+    - `integer` accepts 3.0;
+    - a bool is neither `integer` nor `number`;
+    - `$ref` ignores its siblings (draft 7);
+    - `format` is an annotation, because the Draft7Validator the callers used was
+      built without a format checker.
+    scripts/test-schema-compiler.py checks the two agree on the real data and on
+    thousands of mutated instances.
+  * It never guesses. A keyword it does not implement raises Unsupported at
+    compile time, and the caller falls back to jsonschema. A contract that grows a
+    new keyword is therefore still checked, only slower -- never silently waved
+    through.
+  * A verdict, not a report. When something IS invalid and the caller needs to
+    say where and why (validate_data.py), it asks jsonschema for the messages. The
+    compiled path only decides that no report is needed.
+  * An unreadable or other-key cache file is regenerated, not trusted.
+
+USAGE
+-----
+    entry = schema_compiler.load("leaderboard-seed.schema.json", "#/$defs/entry")
+    entry.is_valid(e)                  # -> bool
+    entry.invalid_indices(entries)     # -> [i, ...]
+    entry.key                          # what a cached verdict depends on
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCHEMAS = ROOT / "schemas"
+CACHE_DIR = ROOT / ".schema-cache"
+
+# Keywords with no effect on validity under Draft7Validator (no format checker).
+ANNOTATIONS = {"$schema", "$id", "$comment", "$defs", "definitions", "title",
+               "description", "default", "examples", "format", "readOnly", "writeOnly"}
+TYPE_TESTS = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "string": "isinstance({v}, str)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": ("((isinstance({v}, int) and not isinstance({v}, bool))"
+                " or (isinstance({v}, float) and {v}.is_integer()))"),
+}
+STRING_KW = {"minLength", "maxLength", "pattern"}
+NUMBER_KW = {"minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum"}
+OBJECT_KW = {"required", "properties", "additionalProperties", "minProperties",
+             "maxProperties"}
+ARRAY_KW = {"items", "minItems", "maxItems"}
+SUPPORTED = ANNOTATIONS | STRING_KW | NUMBER_KW | OBJECT_KW | ARRAY_KW | {"type", "enum", "$ref"}
+
+
+class Unsupported(Exception):
+    """The schema uses something this compiler does not implement; use jsonschema."""
+
+
+def _compiler_hash():
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def schema_key(schemas_dir, name, pointer):
+    """Hash of every schema file (a $ref may cross files), this compiler and the root."""
+    h = hashlib.sha256(_compiler_hash().encode())
+    for f in sorted(Path(schemas_dir).glob("*.schema.json")):
+        h.update(b"\0" + f.name.encode() + b"\0" + f.read_bytes())
+    h.update(("\0%s#%s" % (name, pointer or "")).encode())
+    return h.hexdigest()
+
+
+class _Compiler:
+    """Emits Python source for one root schema and everything it $refs."""
+
+    def __init__(self, schemas_dir):
+        self.dir = Path(schemas_dir)
+        self.docs = {}
+        self.by_id = {}
+        for f in sorted(self.dir.glob("*.schema.json")):
+            doc = json.loads(f.read_text(encoding="utf-8"))
+            self.docs[f.name] = doc
+            if isinstance(doc, dict) and doc.get("$id"):
+                self.by_id[doc["$id"]] = f.name
+        self.funcs = {}      # (file, pointer) -> function name
+        self.lines = []
+        self.consts = []
+        self.pending = []
+
+    # ------------------------------------------------------------ resolution
+    def _doc(self, name):
+        name = self.by_id.get(name, name)
+        if name not in self.docs:
+            # An $id-relative reference: .../schemas/x.schema.json -> x.schema.json
+            name = name.rsplit("/", 1)[-1]
+        if name not in self.docs:
+            raise Unsupported("unresolvable $ref target %r" % name)
+        return name
+
+    def _resolve(self, doc_name, pointer):
+        node = self.docs[doc_name]
+        for part in [p for p in (pointer or "").lstrip("/").split("/") if p]:
+            part = part.replace("~1", "/").replace("~0", "~")
+            try:
+                node = node[int(part)] if isinstance(node, list) else node[part]
+            except (KeyError, IndexError, ValueError):
+                raise Unsupported("unresolvable $ref pointer %r in %s" % (pointer, doc_name))
+        return node
+
+    def function_for(self, doc_name, pointer):
+        key = (doc_name, pointer or "")
+        if key not in self.funcs:
+            self.funcs[key] = "_s%d" % len(self.funcs)
+            self.pending.append(key)
+        return self.funcs[key]
+
+    def const(self, expr):
+        """A module-level constant in the generated source; `expr` is its literal."""
+        self.consts.append(expr)
+        return "_C%d" % (len(self.consts) - 1)
+
+    # ------------------------------------------------------------ emission
+    def build(self, doc_name, pointer):
+        root = self.function_for(self._doc(doc_name), pointer)
+        while self.pending:
+            doc, ptr = self.pending.pop(0)
+            self.lines.append("def %s(x0):" % self.funcs[(doc, ptr)])
+            body = []
+            self.emit(self._resolve(doc, ptr), "x0", 1, body, doc)
+            self.lines.extend(body or ["    pass"])
+            self.lines.append("    return True")
+            self.lines.append("")
+        return root
+
+    def emit(self, schema, v, depth, out, doc):
+        pad = "    " * depth
+        if schema is True or schema == {}:
+            return
+        if schema is False:
+            out.append(pad + "return False")
+            return
+        if not isinstance(schema, dict):
+            raise Unsupported("schema node is %s" % type(schema).__name__)
+        if "$ref" in schema:
+            # Draft 7: a $ref's siblings are ignored.
+            ref = schema["$ref"]
+            target, _, ptr = ref.partition("#")
+            fn = self.function_for(self._doc(target) if target else doc, ptr)
+            out.append(pad + "if not %s(%s): return False" % (fn, v))
+            return
+        unknown = set(schema) - SUPPORTED
+        if unknown:
+            raise Unsupported("keyword(s) %s" % ", ".join(sorted(unknown)))
+
+        if "type" in schema:
+            types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            if any(t not in TYPE_TESTS for t in types):
+                raise Unsupported("type %r" % schema["type"])
+            out.append(pad + "if not (%s): return False"
+                       % " or ".join(TYPE_TESTS[t].format(v=v) for t in types))
+        if "enum" in schema:
+            values = schema["enum"]
+            if not all(isinstance(e, str) for e in values):
+                raise Unsupported("enum with non-string values")
+            out.append(pad + "if not (isinstance(%s, str) and %s in %s): return False"
+                       % (v, v, self.const(repr(frozenset(values)))))
+
+        if STRING_KW & set(schema):
+            out.append(pad + "if isinstance(%s, str):" % v)
+            if "minLength" in schema:
+                out.append(pad + "    if len(%s) < %d: return False" % (v, schema["minLength"]))
+            if "maxLength" in schema:
+                out.append(pad + "    if len(%s) > %d: return False" % (v, schema["maxLength"]))
+            if "pattern" in schema:
+                out.append(pad + "    if not %s.search(%s): return False"
+                           % (self.const("re.compile(%r)" % schema["pattern"]), v))
+        if NUMBER_KW & set(schema):
+            out.append(pad + "if " + TYPE_TESTS["number"].format(v=v) + ":")
+            for kw, op in (("minimum", "<"), ("maximum", ">"),
+                           ("exclusiveMinimum", "<="), ("exclusiveMaximum", ">=")):
+                if kw in schema:
+                    out.append(pad + "    if %s %s %r: return False" % (v, op, schema[kw]))
+        if OBJECT_KW & set(schema):
+            out.append(pad + "if isinstance(%s, dict):" % v)
+            inner = pad + "    "
+            for kw, op in (("minProperties", "<"), ("maxProperties", ">")):
+                if kw in schema:
+                    out.append(inner + "if len(%s) %s %d: return False" % (v, op, schema[kw]))
+            for name in schema.get("required", []):
+                out.append(inner + "if %r not in %s: return False" % (name, v))
+            props = schema.get("properties", {})
+            child = "x%d" % depth
+            for name, sub in props.items():
+                block = []
+                self.emit(sub, child, depth + 2, block, doc)
+                if block:
+                    out.append(inner + "%s = %s.get(%r, _MISSING)" % (child, v, name))
+                    out.append(inner + "if %s is not _MISSING:" % child)
+                    out.extend(block)
+            extra = schema.get("additionalProperties", True)
+            if extra is not True and extra != {}:
+                known = self.const(repr(frozenset(props)))
+                block = []
+                self.emit(extra, child, depth + 3, block, doc)
+                if block:
+                    out.append(inner + "for _k, %s in %s.items():" % (child, v))
+                    out.append(inner + "    if _k not in %s:" % known)
+                    out.extend(block)
+        if ARRAY_KW & set(schema):
+            out.append(pad + "if isinstance(%s, list):" % v)
+            for kw, op in (("minItems", "<"), ("maxItems", ">")):
+                if kw in schema:
+                    out.append(pad + "    if len(%s) %s %d: return False" % (v, op, schema[kw]))
+            if "items" in schema:
+                if not isinstance(schema["items"], (dict, bool)):
+                    raise Unsupported("tuple-form items")
+                child = "x%d" % depth
+                block = []
+                self.emit(schema["items"], child, depth + 2, block, doc)
+                if block:
+                    out.append(pad + "    for %s in %s:" % (child, v))
+                    out.extend(block)
+
+    def source(self, root, key):
+        header = ["# Generated by scripts/schema_compiler.py -- do not edit.",
+                  "# key: %s" % key, "import re", "", "_MISSING = object()", "ROOT = %r" % root]
+        header += ["_C%d = %s" % (i, expr) for i, expr in enumerate(self.consts)]
+        return "\n".join(header + [""] + self.lines) + "\n"
+
+
+class CompiledSchema:
+    """A validator compiled from one schema: is_valid() and invalid_indices()."""
+
+    def __init__(self, source, key, label):
+        self.key = key
+        self.label = label
+        self.source = source
+        namespace = {}
+        exec(compile(source, "<schema %s>" % label, "exec"), namespace)
+        self._root = namespace[namespace["ROOT"]]
+
+    def is_valid(self, instance):
+        return self._root(instance)
+
+    def invalid_indices(self, instances):
+        """Indices of the instances that violate the schema, in one call."""
+        check = self._root
+        return [i for i, x in enumerate(instances) if not check(x)]
+
+
+def compile_schema(name, pointer=None, schemas_dir=SCHEMAS, key=""):
+    """Generated source for schema file `name`, rooted at the JSON pointer `pointer`."""
+    c = _Compiler(schemas_dir)
+    return c.source(c.build(name, (pointer or "").lstrip("#")), key)
+
+
+def load(name, pointer=None, schemas_dir=SCHEMAS, cache_dir=CACHE_DIR):
+    """The compiled validator for `name`#`pointer`. Raises Unsupported.
+
+    The source comes from .schema-cache/ when a file there carries this key --
+    unchanged schemas, unchanged compiler -- and is generated and stored otherwise."""
+    key = schema_key(schemas_dir, name, pointer)
+    label = name + (pointer or "")
+    path = None
+    if cache_dir is not None:
+        stem = re.sub(r"[^A-Za-z0-9]+", "-", label).strip("-")
+        path = Path(cache_dir) / ("%s-%s.py" % (stem, key[:16]))
+        try:
+            held = path.read_text(encoding="utf-8")
+        except OSError:
+            held = None
+        if held is not None and ("\n# key: %s\n" % key) in held:
+            try:
+                return CompiledSchema(held, key, label)
+            except Exception:
+                pass   # not ours after all: regenerate it below
+    source = compile_schema(name, pointer, schemas_dir, key)
+    compiled = CompiledSchema(source, key, label)
+    if path is not None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_text(source, encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass   # a read-only checkout validates all the same
+    return compiled
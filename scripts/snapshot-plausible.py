@@ -51,6 +51,21 @@ Missing days are recorded as missing, never interpolated or zero-filled. The
 API skipped inside that span, and which days were genuinely zero. A real zero
 is data; a fabricated zero is a lie that would later be animated as fact.
 
+FETCHING
+--------
+The seven sections are independent queries, so they are fetched concurrently
+(FETCH_WORKERS at a time) over a small pool of keep-alive connections, not
+seven sequential requests each paying a fresh TLS handshake and its own 30 s
+timeout. A slow VPS -- most likely during the spike this exists to capture --
+costs the slowest section, not the sum of all seven.
+
+A transient failure (connection refused or reset, a timeout, HTTP 429/5xx) is
+retried up to RETRY_ATTEMPTS times with jittered exponential backoff, honouring
+a Retry-After. A 4xx such as a revoked key's 401 is not retried: it will not get
+better. Whatever still fails is recorded in `errors` exactly as before, and the
+sections and errors are written in SECTION_NAMES order whatever order the
+answers arrived in, so validate() and the committed file are unchanged.
+
 SETUP (one-time, Pip)
     Create a key at https://analytics.pdoom1.com -> Settings -> API Keys, then
     set PLAUSIBLE_API_KEY (locally: `set PLAUSIBLE_API_KEY=...`; in CI: a repo
@@ -69,12 +84,17 @@ above against a stubbed API -- no key and no network required.
 """
 
 import argparse
+import http.client
+import io
 import json
 import os
+import queue
+import random
 import sys
+import time
 import urllib.error
 import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
@@ -97,6 +117,15 @@ EXIT_CONFIG = 2
 EXIT_FETCH = 3
 EXIT_EMPTY = 4
 
+# Fetching (see FETCHING above). Four at a time is most of the win for seven
+# sections without hitting a struggling VPS with everything at once.
+FETCH_WORKERS = 4
+TIMEOUT = 30
+RETRY_ATTEMPTS = 3
+RETRY_BASE = 1.0        # seconds; attempt n waits up to RETRY_BASE * 2**(n-1)
+RETRY_CAP = 10.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
 for _s in (sys.stdout, sys.stderr):
     try:
         _s.reconfigure(encoding="utf-8", errors="replace")
@@ -113,20 +142,150 @@ def note(level, msg):
         print("::%s::%s" % (level, msg.replace("\n", " ")))
 
 
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections to one host, shared by the fetch threads.
+
+    A connection goes back to the pool after a complete response unless the
+    server said it would close. Errors surface as urllib's would -- a failure
+    to connect or send is a URLError, a non-2xx answer an HTTPError -- so the
+    `errors` a snapshot records read the same as they always have.
+    """
+
+    def __init__(self, base, timeout=None):
+        parts = urllib.parse.urlsplit(base)
+        self.base = base.rstrip("/")
+        self.https = parts.scheme == "https"
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = TIMEOUT if timeout is None else timeout
+        self.idle = queue.LifoQueue()
+
+    def _connect(self):
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return cls(self.netloc, timeout=self.timeout)
+
+    def _exchange(self, conn, path, headers):
+        try:
+            conn.request("GET", self.prefix + path, headers=headers)
+        except OSError as err:
+            raise urllib.error.URLError(err)
+        response = conn.getresponse()
+        return response, response.read()
+
+    def get(self, path, headers):
+        """The body of a 2xx GET of path (query included); raises otherwise."""
+        try:
+            conn, reused = self.idle.get_nowait(), True
+        except queue.Empty:
+            conn, reused = self._connect(), False
+        try:
+            try:
+                response, body = self._exchange(conn, path, headers)
+            except (urllib.error.URLError, ConnectionError) as e:
+                if not reused or not isinstance(getattr(e, "reason", e), ConnectionError):
+                    raise
+                # The server dropped an idle keep-alive connection. That says
+                # nothing about the API, so go again on a fresh one.
+                conn.close()
+                conn = self._connect()
+                response, body = self._exchange(conn, path, headers)
+        except BaseException:
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            self.idle.put(conn)
+        if not 200 <= response.status < 300:
+            raise urllib.error.HTTPError(self.base + path, response.status,
+                                         response.reason, response.headers,
+                                         io.BytesIO(body))
+        return body
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_pool = None
+
+
 def api(path, params, key):
-    url = "%s/api/v1/stats/%s?%s" % (HOST, path, urllib.parse.urlencode(params))
-    req = urllib.request.Request(url, headers={"Authorization": "Bearer %s" % key})
-    with urllib.request.urlopen(req, timeout=30) as r:
-        return json.loads(r.read().decode("utf-8"))
+    query = "/api/v1/stats/%s?%s" % (path, urllib.parse.urlencode(params))
+    pool = _pool if _pool is not None else ConnectionPool(HOST)
+    try:
+        body = pool.get(query, {"Authorization": "Bearer %s" % key})
+    finally:
+        if pool is not _pool:
+            pool.close()
+    return json.loads(body.decode("utf-8"))
+
+
+def transient(exc):
+    """Worth asking again? Network trouble and overload yes; a 4xx, or a 200
+    that is not JSON, will give the same answer next time."""
+    if isinstance(exc, urllib.error.HTTPError):
+        return exc.code in RETRY_STATUSES
+    return isinstance(exc, (urllib.error.URLError, http.client.HTTPException,
+                            ConnectionError, TimeoutError))
+
+
+def retry_delay(attempt, retry_after=None):
+    """Seconds to wait before attempt `attempt + 1`: full jitter, so a batch
+    of sections that failed together does not retry in lockstep."""
+    delay = random.uniform(0, min(RETRY_CAP, RETRY_BASE * 2 ** (attempt - 1)))
+    try:
+        return max(delay, min(RETRY_CAP, float(retry_after)))
+    except (TypeError, ValueError):
+        return delay
+
+
+def fetch(name, path, params, key):
+    """api(), retried on transient errors; the last error propagates."""
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        try:
+            return api(path, params, key)
+        except Exception as e:
+            if attempt == RETRY_ATTEMPTS or not transient(e):
+                raise
+            headers = getattr(e, "headers", None)
+            delay = retry_delay(attempt, headers.get("Retry-After") if headers else None)
+            print("  %s: %s; retrying in %.1fs (attempt %d of %d)"
+                  % (name, getattr(e, "code", type(e).__name__), delay,
+                     attempt + 1, RETRY_ATTEMPTS))
+            time.sleep(delay)
+
+
+# name, endpoint, parameters beyond site_id/period
+SECTIONS = (
+    ("aggregate", "aggregate",
+     {"metrics": "visitors,visits,pageviews,bounce_rate,visit_duration"}),
+    ("timeseries", "timeseries", {"metrics": "visitors,pageviews"}),
+    ("sources", "breakdown",
+     {"property": "visit:source", "metrics": "visitors", "limit": "50"}),
+    ("pages", "breakdown",
+     {"property": "event:page", "metrics": "visitors,pageviews", "limit": "50"}),
+    ("countries", "breakdown",
+     {"property": "visit:country", "metrics": "visitors", "limit": "50"}),
+    ("utm_campaign", "breakdown",
+     {"property": "visit:utm_campaign", "metrics": "visitors", "limit": "50"}),
+    ("goals", "breakdown",
+     {"property": "event:goal", "metrics": "visitors,events", "limit": "50"}),
+)
+SECTION_NAMES = tuple(name for name, _, _ in SECTIONS)
 
 
 def gather(key, period, custom_range=None):
     """Everything worth keeping for one snapshot.
 
-    Each call is defensive so a single failing breakdown does not lose the
-    whole snapshot -- but the errors are RECORDED, and validate() decides
-    whether what survived is still worth committing.
+    Each section is fetched defensively so a single failing breakdown does not
+    lose the whole snapshot -- but the errors are RECORDED, and validate()
+    decides whether what survived is still worth committing.
     """
+    global _pool
     common = {"site_id": SITE_ID, "period": period}
     if custom_range:
         common["date"] = "%s,%s" % custom_range
@@ -142,31 +301,28 @@ def gather(key, period, custom_range=None):
         "errors": {},
     }
 
-    def grab(name, path, extra):
+    def grab(section):
+        name, path, extra = section
         try:
-            out["sections"][name] = api(path, dict(common, **extra), key)
+            return "sections", fetch(name, path, dict(common, **extra), key)
         except urllib.error.HTTPError as e:
             try:
                 detail = e.read().decode("utf-8")[:200]
             except Exception:
                 detail = ""
-            out["errors"][name] = "HTTP %s %s" % (e.code, detail)
+            return "errors", "HTTP %s %s" % (e.code, detail)
         except Exception as e:
-            out["errors"][name] = "%s: %s" % (type(e).__name__, e)
-
-    grab("aggregate", "aggregate",
-         {"metrics": "visitors,visits,pageviews,bounce_rate,visit_duration"})
-    grab("timeseries", "timeseries", {"metrics": "visitors,pageviews"})
-    grab("sources", "breakdown",
-         {"property": "visit:source", "metrics": "visitors", "limit": "50"})
-    grab("pages", "breakdown",
-         {"property": "event:page", "metrics": "visitors,pageviews", "limit": "50"})
-    grab("countries", "breakdown",
-         {"property": "visit:country", "metrics": "visitors", "limit": "50"})
-    grab("utm_campaign", "breakdown",
-         {"property": "visit:utm_campaign", "metrics": "visitors", "limit": "50"})
-    grab("goals", "breakdown",
-         {"property": "event:goal", "metrics": "visitors,events", "limit": "50"})
+            return "errors", "%s: %s" % (type(e).__name__, e)
+
+    _pool = ConnectionPool(HOST)
+    try:
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as workers:
+            # map() yields in SECTIONS order, whichever answer came first.
+            for (name, _, _), (kind, value) in zip(SECTIONS, workers.map(grab, SECTIONS)):
+                out[kind][name] = value
+    finally:
+        _pool.close()
+        _pool = None
     return out
 
 
@@ -292,10 +448,6 @@ def validate(snap, allow_zero=False):
     return EXIT_OK, []
 
 
-SECTION_NAMES = ("aggregate", "timeseries", "sources", "pages", "countries",
-                 "utm_campaign", "goals")
-
-
 def main(argv=None):
     ap = argparse.ArgumentParser(
         description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
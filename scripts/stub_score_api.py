@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""A local stand-in for the PHP score API, for tests that must use real HTTP.
+
+WHY THIS EXISTS
+---------------
+Most board tests replace probe_board() with a function and never open a socket,
+which is right for verdict logic and wrong for anything whose whole point is the
+network: how many boards are in flight at once, whether a run takes the SUM of the
+round trips or the MAX, what a refused connection does to the breaker. Those can
+only be shown against something that answers over TCP with a real delay.
+
+This serves the one endpoint the read side uses --
+
+    GET /score_api.php?seed=<seed>&version=<version>
+        -> {"ok": true, "seed": ..., "version": ..., "entries": [...]}
+
+-- from an in-memory dict, on 127.0.0.1 and an ephemeral port, with a configurable
+per-request latency. It records what it was asked, so a test can assert on the
+traffic and not only on the answers:
+
+  requests        every (seed, version) asked, in arrival order
+  headers         the request headers of each of those, in the same order
+  max_in_flight   the most requests it was serving at the same moment
+  connections     how many TCP connections clients opened -- it speaks HTTP/1.1
+                  keep-alive, so a pooling client opens far fewer than it asks
+  writes          every non-GET request -- this repo is a READ-ONLY consumer of
+                  the score API (pdoom1 PR #679), so a test expects this empty
+
+A board missing from the dict answers with zero entries, as the real API does for
+a key nobody has submitted to. `status` forces an HTTP error for chosen keys, and
+`raw` answers chosen keys with a body that is not JSON. With gzip=True a client
+that sends `Accept-Encoding: gzip` gets a gzip body. With etag=True every answer
+carries an ETag of its body, and a request whose If-None-Match names the current
+one is answered `304 Not Modified` with no body (counted in `not_modified`); the
+real API is not known to send validators, so the default is off. `max_requests_per_connection`
+closes a connection after that many answers without saying so -- what a server
+does to an idle keep-alive connection -- so a pooled client meets a dead socket.
+
+USAGE
+-----
+    from stub_score_api import StubScoreAPI
+    with StubScoreAPI({("weekly-2026-w32", "L4"): [row, ...]}, latency=0.2) as api:
+        liveness.SCORE_API = api.url
+        ...
+        assert api.max_in_flight > 1 and not api.writes
+
+CLI, for poking at a client by hand:
+    python scripts/stub_score_api.py --port 8765 --latency 0.1 [--boards FILE.json]
+    (FILE.json: [{"seed": ..., "version": ..., "entries": [...]}, ...])
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+PATH = "/score_api.php"
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # A client that gave up (a timeout test, a dropped pooled connection) leaves
+        # the handler writing into a closed socket. That is the scenario, not a bug.
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+
+class StubScoreAPI:
+    """Serve `boards` ({(seed, version): [entry, ...]}) until the context exits."""
+
+    def __init__(self, boards=None, latency=0.0, status=None, port=0, raw=None,
+                 gzip=False, max_requests_per_connection=None, etag=False):
+        self.boards = dict(boards or {})
+        self.latency = latency
+        self.status = dict(status or {})       # {(seed, version): http status}
+        self.raw = dict(raw or {})             # {(seed, version): body bytes}
+        self.gzip = gzip
+        self.max_requests_per_connection = max_requests_per_connection
+        self.etag = etag
+        self.requests = []
+        self.headers = []
+        self.writes = []
+        self.connections = 0
+        self.gzipped = 0
+        self.not_modified = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", port), self._handler())
+        self.port = self._server.server_address[1]
+        self.url = "http://127.0.0.1:%d%s" % (self.port, PATH)
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        return False
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            served = 0
+
+            def setup(self):
+                super().setup()
+                with api._lock:
+                    api.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, code, doc):
+                body = doc if isinstance(doc, bytes) else json.dumps(doc).encode("utf-8")
+                tag = None
+                if api.etag and code == 200:
+                    tag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+                    if self.headers.get("If-None-Match") == tag:
+                        with api._lock:
+                            api.not_modified += 1
+                        self.send_response(304)
+                        self.send_header("ETag", tag)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        self._served()
+                        return
+                zipped = api.gzip and "gzip" in (self.headers.get("Accept-Encoding") or "")
+                if zipped:
+                    body = gzip.compress(body)
+                    with api._lock:
+                        api.gzipped += 1
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                if zipped:
+                    self.send_header("Content-Encoding", "gzip")
+                if tag:
+                    self.send_header("ETag", tag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                self._served()
+
+            def _served(self):
+                self.served += 1
+                limit = api.max_requests_per_connection
+                if limit and self.served >= limit:
+                    # Drop the connection WITHOUT `Connection: close`, as a server
+                    # reaping idle keep-alive sockets does.
+                    self.close_connection = True
+
+            def _refuse_write(self):
+                with api._lock:
+                    api.writes.append((self.command, self.path))
+                self._send(405, {"ok": False, "error": "read-only stub"})
+
+            do_POST = do_PUT = do_PATCH = do_DELETE = _refuse_write
+
+            def do_GET(self):
+                url = urllib.parse.urlsplit(self.path)
+                if url.path != PATH:
+                    self._send(404, {"ok": False, "error": "no such endpoint"})
+                    return
+                q = urllib.parse.parse_qs(url.query)
+                key = (q.get("seed", [""])[0], q.get("version", [""])[0])
+                with api._lock:
+                    api.requests.append(key)
+                    api.headers.append(dict(self.headers))
+                    api.in_flight += 1
+                    api.max_in_flight = max(api.max_in_flight, api.in_flight)
+                try:
+                    if api.latency:
+                        time.sleep(api.latency)
+                    if key in api.status:
+                        self._send(api.status[key], {"ok": False, "error": "forced"})
+                    elif key in api.raw:
+                        self._send(200, api.raw[key])
+                    else:
+                        self._send(200, {"ok": True, "seed": key[0], "version": key[1],
+                                         "entries": api.boards.get(key, [])})
+                finally:
+                    with api._lock:
+                        api.in_flight -= 1
+
+        return Handler
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().split("\n", 1)[0])
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    ap.add_argument("--boards", type=Path, help="JSON list of {seed, version, entries}")
+    args = ap.parse_args(argv)
+
+    boards = {}
+    if args.boards:
+        for b in json.loads(args.boards.read_text(encoding="utf-8")):
+            boards[(b["seed"], b["version"])] = b.get("entries") or []
+    with StubScoreAPI(boards, latency=args.latency, port=args.port) as api:
+        print("stub score API on %s (%d board(s), %.3fs latency) -- Ctrl-C to stop"
+              % (api.url, len(boards), args.latency))
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+"""A small compiled template language for pages this repo generates.
+
+WHY THIS EXISTS
+---------------
+sync-events.py built every event page with one 500-line f-string, after first
+running escape_event_for_html() over the WHOLE record -- reaction provenance,
+tags, fields no slot reads -- so that any `{event[...]}` was safe. Every page
+paid for escaping things it never printed, and the markup lived inside a Python
+function where neither an HTML editor nor a reviewer could see it whole.
+
+This moves the markup into a template file and compiles it ONCE per run into an
+ordinary Python function: literal text becomes constant strings, each slot
+becomes one call. Rendering a page is then a single pass of appends with no
+parsing, no dict lookups by slot name and no per-page escaping of unused fields.
+
+ESCAPING IS THE DEFAULT, NOT A DISCIPLINE
+-----------------------------------------
+  {{ expr }}     the value of a Python expression, passed through the escaper
+                 the caller supplies. This is the form to reach for.
+  {{! expr }}    the value as-is. Only for text that is ALREADY safe for its
+                 context: a fragment another escaper produced (meta_text()), or
+                 a URL whose parts went through urllib.parse.quote(). Every use
+                 is a claim a reviewer should be able to check on the line.
+
+The unsafe form is the one with the extra character, so forgetting is safe.
+
+STATEMENTS
+----------
+  {% for target in expr %} ... {% endfor %}
+  {% if expr %} ... {% elif expr %} ... {% else %} ... {% endif %}
+  {% set target = expr %}
+  {# comment #}
+
+Expressions and targets are plain Python, evaluated against the render
+function's parameters plus the namespace handed to compile_template().
+
+WHITESPACE IS LITERAL. A statement tag emits nothing and removes nothing, so the
+output between two tags is exactly the template text between them. That makes
+the template slightly odd to read where a loop must reproduce historical
+whitespace, but it means no rule decides what a page looks like except the
+file itself. The one exception is comments: a {# ... #} alone on its line takes
+its indentation and newline with it, so explanations cost nothing in the output.
+
+A template that does not compile -- an unclosed block, a stray {% endif %}, an
+expression that is not valid Python -- raises TemplateError naming the template
+and line, at compile time, before any page is rendered.
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List
+
+_COMMENT = r"\{#(?:(?!#\}).)*#\}"
+_TOKEN = re.compile(
+    r"(?P<standalone>^[ \t]*" + _COMMENT + r"[ \t]*(?:\n|\Z))"
+    r"|" + _COMMENT
+    + r"|\{\{(?P<raw>!?)(?P<expr>.*?)\}\}"
+    r"|\{%(?P<stmt>.*?)%\}",
+    re.DOTALL | re.MULTILINE,
+)
+_BLOCK_OPENERS = {"for": "endfor", "if": "endif"}
+
+
+class TemplateError(ValueError):
+    """A template that cannot be compiled. Carries the template name and line."""
+
+
+def _check_expr(expr: str, where: str) -> str:
+    expr = expr.strip()
+    if not expr:
+        raise TemplateError(f"{where}: empty expression")
+    try:
+        compile(expr, where, "eval")
+    except SyntaxError as exc:
+        raise TemplateError(f"{where}: {exc.msg}: {expr!r}") from None
+    return expr
+
+
+def translate(source: str, name: str, params: Iterable[str]) -> str:
+    """Python source for `def render(<params>)` equivalent to the template."""
+    lines: List[str] = [f"def render({', '.join(params)}):",
+                        "    _out = []",
+                        "    _w = _out.append"]
+    stack: List[tuple] = []   # (keyword, line) of each open block
+    pending: List[str] = []   # adjacent literal text, emitted as one constant
+    depth = 1
+
+    def emit(code: str):
+        lines.append("    " * depth + code)
+
+    def flush():
+        if pending:
+            emit(f"_w({''.join(pending)!r})")
+            pending.clear()
+
+    pos = 0
+    for m in _TOKEN.finditer(source):
+        if m.start() > pos:
+            pending.append(source[pos:m.start()])
+        pos = m.end()
+        where = f"{name}:{source.count(chr(10), 0, m.start()) + 1}"
+
+        if m.group("expr") is not None:
+            flush()
+            expr = _check_expr(m.group("expr"), where)
+            emit(f"_w({expr})" if m.group("raw") else f"_w(_escape({expr}))")
+            continue
+        if m.group("stmt") is None:
+            continue   # a comment
+
+        stmt = m.group("stmt").strip()
+        keyword, _, rest = stmt.partition(" ")
+        rest = rest.strip()
+        flush()
+        if keyword == "for":
+            target, sep, iterable = rest.partition(" in ")
+            if not sep:
+                raise TemplateError(f"{where}: expected 'for <target> in <expr>'")
+            _check_expr(target, where)
+            emit(f"for {target.strip()} in {_check_expr(iterable, where)}:")
+            stack.append(("for", where))
+            depth += 1
+            emit("pass")
+        elif keyword == "if":
+            emit(f"if {_check_expr(rest, where)}:")
+            stack.append(("if", where))
+            depth += 1
+            emit("pass")
+        elif keyword in ("elif", "else"):
+            if not stack or stack[-1][0] != "if":
+                raise TemplateError(f"{where}: {keyword} outside an if block")
+            depth -= 1
+            emit(f"elif {_check_expr(rest, where)}:" if keyword == "elif" else "else:")
+            depth += 1
+            emit("pass")
+        elif keyword in ("endfor", "endif"):
+            if not stack or _BLOCK_OPENERS[stack[-1][0]] != keyword:
+                raise TemplateError(f"{where}: unexpected {keyword}")
+            stack.pop()
+            depth -= 1
+        elif keyword == "set":
+            target, sep, expr = rest.partition("=")
+            if not sep:
+                raise TemplateError(f"{where}: expected 'set <target> = <expr>'")
+            _check_expr(target, where)
+            emit(f"{target.strip()} = {_check_expr(expr, where)}")
+        else:
+            raise TemplateError(f"{where}: unknown statement {keyword!r}")
+
+    if pos < len(source):
+        pending.append(source[pos:])
+    flush()
+    if stack:
+        keyword, where = stack[-1]
+        raise TemplateError(f"{where}: {keyword} block is never closed")
+    lines.append("    return ''.join(_out)")
+    return "\n".join(lines) + "\n"
+
+
+def compile_template(source: str, name: str, params: Iterable[str],
+                     namespace: Dict[str, Any], escape: Callable[[Any], str]) -> Callable[..., str]:
+    """Compile a template into render(*params) -> str.
+
+    `namespace` supplies every name the template reads besides its parameters;
+    `escape` is what {{ expr }} passes each value through.
+    """
+    code = translate(source, name, params)
+    scope = dict(namespace)
+    scope["_escape"] = escape
+    exec(compile(code, f"<template {name}>", "exec"), scope)
+    return scope["render"]
@@ -7,11 +7,13 @@ This script:
 1. Clones/updates pdoom-data repository
 2. Reads event data from data/serveable/api/timeline_events/
 3. Generates individual event detail pages
-4. Creates events.json for the events index page
+4. Creates events.json, and a sharded copy of it under data/events/ for the
+   events index page
 5. Downloads game icons from pdoom1 repo (optional)
 
 Usage:
     python scripts/sync/sync-events.py [--pdoom-data-path PATH] [--sync-icons]
+                                       [--incremental] [--jobs N] [--stream]
 """
 
 import json
@@ -19,9 +21,12 @@ import os
 import re
 import sys
 import argparse
+import hashlib
 import importlib.util
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from urllib.parse import quote
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
@@ -69,20 +74,30 @@ def log(message: str, level: str = "INFO"):
 
 def ensure_directories():
     """Create necessary directories if they don't exist"""
+    # Before the mkdir: if a --stream swap died between its two renames,
+    # EVENTS_DIR is absent and creating it empty would orphan every page no
+    # generator owns. See "Streaming ingestion".
+    recover_interrupted_swap()
     EVENTS_DIR.mkdir(parents=True, exist_ok=True)
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     ICONS_DIR.mkdir(parents=True, exist_ok=True)
     log(f"Ensured directories exist: {EVENTS_DIR}, {DATA_DIR}, {ICONS_DIR}")
 
 
-def load_events_from_pdoom_data(pdoom_data_path: Path) -> Dict[str, Any]:
-    """Load all events from pdoom-data repository"""
+def events_source_file(pdoom_data_path: Path) -> Path:
+    """all_events.json inside a pdoom-data checkout. Exits if it is absent."""
     events_file = pdoom_data_path / "data" / "serveable" / "api" / "timeline_events" / "all_events.json"
 
     if not events_file.exists():
         log(f"Events file not found: {events_file}", "ERROR")
         log(f"Make sure pdoom-data is cloned at: {pdoom_data_path}", "ERROR")
         sys.exit(1)
+    return events_file
+
+
+def load_events_from_pdoom_data(pdoom_data_path: Path) -> Dict[str, Any]:
+    """Load all events from pdoom-data repository"""
+    events_file = events_source_file(pdoom_data_path)
 
     with open(events_file, 'r', encoding='utf-8') as f:
         events = json.load(f)
@@ -492,21 +507,16 @@ def load_allowlist():
 # (@ 2.20GHz), CSS at-rules (@media, @keyframes) and bare social handles. Every
 # one of those is excluded STRUCTURALLY -- by having no person-shaped local part
 # to the left, or no domain to the right -- never by name.
-_RESIDUE_BIBTEX = re.compile(
-    r"@(?:article|inproceedings|incollection|misc|book|booklet|conference"
-    r"|inbook|manual|mastersthesis|phdthesis|proceedings|techreport"
-    r"|unpublished)\s*\{",
-    re.IGNORECASE,
-)
-_RESIDUE_CSS_AT_RULE = re.compile(
-    r"@(?:media|import|supports|keyframes|font-face|charset|namespace|page"
-    r"|layer|container|property)\b",
-    re.IGNORECASE,
-)
+_BIBTEX_TYPES = (r"(?:article|inproceedings|incollection|misc|book|booklet|conference"
+                 r"|inbook|manual|mastersthesis|phdthesis|proceedings|techreport"
+                 r"|unpublished)\s*\{")
+_CSS_AT_RULES = (r"(?:media|import|supports|keyframes|font-face|charset|namespace|page"
+                 r"|layer|container|property)\b")
 # A domain to the RIGHT of the '@'. Deliberately looser than EMAIL_PATTERN's
-# domain rule -- it has to be able to see what EMAIL_PATTERN cannot.
+# domain rule -- it has to be able to see what EMAIL_PATTERN cannot. Anchored
+# at the character after the '@' (by match()'s pos, see below).
 _RESIDUE_DOMAIN = re.compile(
-    r"^\s{0,2}[A-Za-z0-9][A-Za-z0-9\-]{0,40}"
+    r"\s{0,2}[A-Za-z0-9][A-Za-z0-9\-]{0,40}"
     r"(?:\s{0,2}[.\-]\s{0,2}[A-Za-z0-9\-]{1,40}){0,6}"
     r"\s{0,2}\.\s{0,2}[A-Za-z]{2,24}"
 )
@@ -514,6 +524,33 @@ _RESIDUE_DOMAIN = re.compile(
 # a name carries a separator or real length; pass, Acc, lx, P do not.
 _RESIDUE_LOCAL = re.compile(r"(\{[^{}@]{1,200}\}|[A-Za-z0-9._%+\-]{1,64})\s{0,2}$")
 
+# HOW THE SCAN IS RUN, which is a separate question from WHAT it looks for.
+#
+# The rules above are the definition. The scanner below applies them without
+# copying the text: every window is a (pos, endpos) pair handed to the compiled
+# pattern, which the re module treats exactly as if the string were sliced
+# there, so the 120- and 240-character bounds mean what they always meant.
+# (That is also why the domain rule carries no '^': '^' anchors at the real
+# start of the string, not at `pos`, while match() anchors at `pos` by itself.)
+#
+# Candidates come from ONE finditer over the text: an '@' that is not a BibTeX
+# entry type, not a CSS at-rule, and has something domain-shaped starting to
+# its right. The first two are the excluded families above, as lookaheads; the
+# third is only the first character the domain rule needs, so it can reject
+# without ever changing a verdict -- the full, windowed domain rule still
+# decides.
+#
+# Before the left-hand search runs, the character just left of the '@' (past
+# at most three whitespace characters: the rule's two, plus the newline '$'
+# may stand before) must be one a local part can END in. That too is a
+# necessary condition, never a sufficient one.
+_RESIDUE_CANDIDATE = re.compile(
+    r"@(?!" + _BIBTEX_TYPES + r")(?!" + _CSS_AT_RULES + r")(?=\s{0,2}[A-Za-z0-9])",
+    re.IGNORECASE,
+)
+_LOCAL_END_CHARS = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-}")
+
 
 def _residue_local_is_person_shaped(local: str) -> bool:
     """Does the text left of an '@' look like a person, or like notation?"""
@@ -529,6 +566,31 @@ def _residue_local_is_person_shaped(local: str) -> bool:
     return len(local) >= 5
 
 
+def _local_can_end_before(text: str, i: int) -> bool:
+    """Necessary condition for _RESIDUE_LOCAL to match in text[i - 240:i]."""
+    k = i - 1
+    lo = max(0, i - 4)
+    while k >= lo and text[k].isspace():
+        k -= 1
+    return k >= lo and text[k] in _LOCAL_END_CHARS
+
+
+def _iter_residue_positions(text: str):
+    """Every person-shaped '@', in ascending order. See residue_positions()."""
+    for m in _RESIDUE_CANDIDATE.finditer(text):
+        i = m.start()
+        if not _RESIDUE_DOMAIN.match(text, i + 1, i + 120):
+            continue
+        if not _local_can_end_before(text, i):
+            continue
+        left = _RESIDUE_LOCAL.search(text, max(0, i - 240), i)
+        if not left:
+            continue
+        if not _residue_local_is_person_shaped(left.group(1)):
+            continue
+        yield i
+
+
 def residue_positions(text: str) -> set:
     """The INDEX of every '@' that looks like a real person's address.
 
@@ -548,21 +610,12 @@ def residue_positions(text: str) -> set:
     events-sync-summary.json or prints to CI, and both are public. Reproducing
     the string is how pdoom1#1212 leaked the address it was fixing.
     """
-    found = set()
-    for m in re.finditer("@", text):
-        i = m.start()
-        rest = text[i:]
-        if _RESIDUE_BIBTEX.match(rest) or _RESIDUE_CSS_AT_RULE.match(rest):
-            continue
-        if not _RESIDUE_DOMAIN.match(text[i + 1:i + 120]):
-            continue
-        left = _RESIDUE_LOCAL.search(text[max(0, i - 240):i])
-        if not left:
-            continue
-        if not _residue_local_is_person_shaped(left.group(1)):
-            continue
-        found.add(i)
-    return found
+    return set(_iter_residue_positions(text))
+
+
+def email_spans(text: str) -> List[tuple]:
+    """(start, end) of every EMAIL_PATTERN match, in order and non-overlapping."""
+    return [m.span() for m in EMAIL_PATTERN.finditer(text)]
 
 
 def explained_positions(text: str) -> set:
@@ -572,10 +625,11 @@ def explained_positions(text: str) -> set:
     coordinates as residue_positions() so the two can actually be compared.
     """
     covered = set()
-    for m in EMAIL_PATTERN.finditer(text):
-        for k in range(m.start(), m.end()):
-            if text[k] == "@":
-                covered.add(k)
+    for start, end in email_spans(text):
+        k = text.find("@", start, end)
+        while k != -1:
+            covered.add(k)
+            k = text.find("@", k + 1, end)
     return covered
 
 
@@ -586,8 +640,26 @@ def residue_scan(text: str) -> int:
 
 def unexplained_residue(text: str) -> int:
     """How many person-shaped '@' the independent route sees and EMAIL_PATTERN
-    does NOT cover. Zero means the two agree about this text."""
-    return len(residue_positions(text) - explained_positions(text))
+    does NOT cover. Zero means the two agree about this text.
+
+    Interval arithmetic, not set difference: both lists are ascending, so one
+    merge walk answers "is this '@' inside any match". And the residue goes
+    FIRST -- a full EMAIL_PATTERN pass is by far the dearer of the two, and on
+    the overwhelming majority of files the independent scanner finds nothing,
+    which already means nothing is unexplained.
+    """
+    positions = list(_iter_residue_positions(text))
+    if not positions:
+        return 0
+    spans = email_spans(text)
+    unexplained = 0
+    j = 0
+    for p in positions:
+        while j < len(spans) and spans[j][1] <= p:
+            j += 1
+        if not (j < len(spans) and spans[j][0] <= p):
+            unexplained += 1
+    return unexplained
 
 
 def find_published_emails(rendered: Dict[str, str], is_allowed) -> Dict[str, List[str]]:
@@ -619,6 +691,88 @@ def find_residue_disagreements(rendered: Dict[str, str], is_allowed) -> Dict[str
     return findings
 
 
+# ---------------------------------------------------------------------------
+# Parallel rendering
+#
+# Rendering and both gates are per-page and share nothing, so they shard
+# cleanly: each worker renders a contiguous slice of events and runs
+# find_published_emails() and find_residue_disagreements() over its own pages
+# before handing anything back. The parent merges the slices in input order, so
+# `rendered` -- and therefore the write order and every log line -- is the same
+# whatever the worker count.
+#
+# The "nothing reaches disk until every page passed" rule is unchanged, because
+# workers never write. They return text; the parent holds ALL of it, applies the
+# gate to the merged findings, and only then writes. A worker that crashes
+# raises in the parent before any write, which is a refusal like any other.
+#
+# Each worker loads the allowlist itself (see _init_render_worker): the
+# function load_allowlist() returns lives in a module loaded by path and cannot
+# be pickled across the process boundary.
+#
+# Below a few dozen pages the pool costs more than it saves, so small runs --
+# which with --incremental is most of them -- stay on the serial path.
+MIN_PAGES_PER_JOB = 50
+
+_worker_is_allowed = None
+
+
+def render_and_verify(items: List[tuple], is_allowed) -> tuple:
+    """Render (event_id, event) pairs and run both pre-write gates over them.
+
+    Returns (rendered, leaks, disagreements), keyed by artefact name exactly as
+    main() has always keyed them.
+    """
+    rendered = {
+        f"public/events/{event_id}.html": generate_event_detail_page(event_id, event)
+        for event_id, event in items
+    }
+    return (rendered,
+            find_published_emails(rendered, is_allowed),
+            find_residue_disagreements(rendered, is_allowed))
+
+
+def _init_render_worker():
+    global _worker_is_allowed
+    _worker_is_allowed = load_allowlist()
+
+
+def _render_shard(items: List[tuple]) -> tuple:
+    return render_and_verify(items, _worker_is_allowed)
+
+
+def resolve_jobs(jobs: int) -> int:
+    """--jobs 0 means one worker per CPU."""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def render_pages(items: List[tuple], is_allowed, jobs: int = 1) -> tuple:
+    """render_and_verify() over every item, across up to `jobs` processes."""
+    jobs = min(jobs, len(items) // MIN_PAGES_PER_JOB)
+    if jobs <= 1:
+        return render_and_verify(items, is_allowed)
+
+    # Several shards per worker, so one slow slice (the arXiv abstracts are far
+    # longer than the rest) does not leave the other workers idle at the end.
+    n_shards = jobs * 4
+    size = -(-len(items) // n_shards)
+    shards = [items[i:i + size] for i in range(0, len(items), size)]
+
+    rendered: Dict[str, str] = {}
+    leaks: Dict[str, List[str]] = {}
+    disagreements: Dict[str, int] = {}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_render_worker) as pool:
+        # map() yields in submission order, which is what makes the merge
+        # deterministic.
+        for shard_rendered, shard_leaks, shard_disagreements in pool.map(_render_shard, shards):
+            rendered.update(shard_rendered)
+            leaks.update(shard_leaks)
+            disagreements.update(shard_disagreements)
+    return rendered, leaks, disagreements
+
+
 # ---------------------------------------------------------------------------
 # Markdown image syntax
 #
@@ -724,8 +878,8 @@ def count_markdown_images(value: Any) -> int:
 # ---------------------------------------------------------------------------
 # HTML escaping
 #
-# Every string below reaches a generated page through an f-string, so the page
-# is built by concatenation and the data decides where the markup ends. Event
+# Every string below reaches a generated page through the page template, which
+# is text concatenation, so the data decides where the markup ends. Event
 # descriptions are raw text extracted from paper PDFs -- arXiv accepts uploads
 # from anyone -- so "the data is first-party" is not true of the *contents* of
 # these fields, only of the pipeline that carries them.
@@ -739,10 +893,12 @@ def count_markdown_images(value: Any) -> int:
 #     and turns the rest of the sentence into bogus tag attributes.
 # Both were live on pdoom1.com.
 #
-# escape_event_for_html() mirrors redact_pii(): it walks the WHOLE record rather
-# than a named list of fields, so a field added upstream tomorrow is covered on
-# the day it appears. Fail closed. Non-strings pass through untouched, so ints
-# (year, impact deltas) still render as numbers.
+# The page template escapes every slot by default (html_value(), below), so a
+# field the template starts printing tomorrow is covered on the day it appears
+# without anyone listing it. Fail closed. escape_event_for_html() walks a WHOLE
+# value the same way redact_pii() does, for slots that print a list or dict.
+# Non-strings pass through untouched, so ints (year, impact deltas) still render
+# as numbers.
 def esc(value: Any) -> str:
     """HTML-escape a single value for text OR attribute context.
 
@@ -751,12 +907,12 @@ def esc(value: Any) -> str:
     an injection, not a typo.
 
     The apostrophe is deliberately NOT escaped, which is where this differs from
-    html.escape(s, quote=True). Every attribute in this template is double-quoted
-    (test-sync-events.py asserts that as a rule, so the exemption cannot rot), and
-    inside a double-quoted attribute an apostrophe is an ordinary character. Escaping
-    it anyway would rewrite ~1,194 published pages for no reader-visible change --
-    prose is full of apostrophes -- and burying a real fix in a diff that large is
-    how a real fix stops getting reviewed.
+    html.escape(s, quote=True). Every attribute in the page template is
+    double-quoted (test-sync-events.py asserts that as a rule, so the exemption
+    cannot rot), and inside a double-quoted attribute an apostrophe is an
+    ordinary character. Escaping it anyway would rewrite ~1,194 published pages
+    for no reader-visible change -- prose is full of apostrophes -- and burying
+    a real fix in a diff that large is how a real fix stops getting reviewed.
     """
     return (str(value).replace("&", "&amp;")
                       .replace("<", "&lt;")
@@ -767,10 +923,10 @@ def esc(value: Any) -> str:
 def escape_event_for_html(value: Any) -> Any:
     """Recursively HTML-escape every string in a nested str/list/dict value.
 
-    Deliberately mirrors redact_pii(): whole-record, not a field list. The page
-    template interpolates ~20 distinct expressions off the event dict and gains
-    more over time; enumerating them is how the leaderboard shipped six escaped
-    fields and thirteen unescaped ones.
+    Deliberately mirrors redact_pii(): whole-value, not a field list --
+    enumerating fields is how the leaderboard shipped six escaped fields and
+    thirteen unescaped ones. html_value() uses it for any slot that prints
+    something other than a plain string.
     """
     if isinstance(value, str):
         return esc(value)
@@ -853,91 +1009,212 @@ def sanitize_event_urls(event: Dict[str, Any]) -> Dict[str, Any]:
     return event
 
 
-def generate_event_detail_page(event_id: str, event: Dict[str, Any]) -> str:
-    """Generate HTML for individual event detail page"""
+# ---------------------------------------------------------------------------
+# The fused transform
+#
+# main() used to walk every record five or six times: json.dumps before and
+# after sanitize_event_urls() to detect a change, count_emails() then
+# redact_pii(), count_obfuscated_contacts() twice (once for the total, once for
+# the id list), then count_markdown_images() then strip_markdown_images().
+# transform_event() does the same work in ONE recursive pass, string by string,
+# in the same fixed order:
+#
+#   1. URL sanitising -- only under the fields sanitize_event_urls() names,
+#   2. email redaction,
+#   3. the obfuscated-contact advisory count (AFTER redaction, as before),
+#   4. Markdown image stripping.
+#
+# Every stage is a pure per-string function, so applying all four to one string
+# before moving on gives the same result as applying each to the whole record
+# in turn. The single exception is stage 4: strip_markdown_images_in_text() also
+# trims whitespace, and the old code applied it to EVERY string of a record that
+# carried an image anywhere. Stage 4 therefore records each string slot during
+# the walk and, only if the record had an image, rewrites those slots
+# afterwards -- a flat loop over ~20 slots, not a second tree walk -- so the
+# output stays byte-identical.
+#
+# The per-string helpers above stay the reference definitions, and
+# test-sync-events.py checks this against their composition. Redaction goes
+# through redact_emails_in_text(), so there is still exactly one place that
+# decides what replaces an address.
+URL_SANITIZED_FIELDS = ('description', 'safety_researcher_reaction',
+                        'media_reaction', 'sources')
 
-    # Escape ONCE, at the top, for the whole record -- see escape_event_for_html().
-    # `raw` keeps the unescaped values for the two contexts where escaping would be
-    # wrong: urllib.parse.quote() percent-encodes for a URL (double-escaping would
-    # put "%26amp%3B" in a prefilled GitHub issue title), and the meta-description
-    # truncation must slice the source text BEFORE escaping or it can cut an entity
-    # in half. Everything else below reads the escaped `event`.
-    raw = event
-    event = escape_event_for_html(event)
-    event_id_esc = esc(event_id)
-
-    # Category icons
-    category_icons = {
-        'funding_catastrophe': '💸',
-        'organizational_crisis': '🏢',
-        'technical_research_breakthrough': '🔬',
-        'institutional_decay': '⚠️',
-        'policy_development': '📜',
-        'public_awareness': '📢',
-        'capability_advance': '🚀',
-        'alignment_breakthrough': '🎯',
-        'governance_milestone': '⚖️'
-    }
 
-    rarity_emoji = {
-        'common': '⚪ Common',
-        'rare': '🔵 Rare',
-        'legendary': '✨ Legendary'
-    }
+def transform_event(event: Dict[str, Any]) -> tuple:
+    """Sanitise URLs, redact addresses and strip images in one pass.
 
-    icon = category_icons.get(event['category'], '📌')
-    rarity = rarity_emoji.get(event['rarity'], event['rarity'])
+    Returns (new_record, counts) where counts carries "urls" (0 or 1: did any
+    URL change), "emails", "obfuscated" and "images". The input is not mutated.
+    """
+    counts = {"urls": 0, "emails": 0, "obfuscated": 0, "images": 0}
+    slots: List[tuple] = []
+
+    def text(value: str, sanitize: bool) -> str:
+        if sanitize and "http://" in value:
+            sanitized = sanitize_urls_in_text(value)
+            if sanitized != value:
+                counts["urls"] = 1
+                value = sanitized
+        # Both patterns need an '@' to match at all; most strings have none.
+        if "@" in value:
+            n = len(EMAIL_PATTERN.findall(value))
+            if n:
+                counts["emails"] += n
+                value = redact_emails_in_text(value)
+        counts["obfuscated"] += len(OBFUSCATED_CONTACT_PATTERN.findall(value))
+        if "![" in value:
+            counts["images"] += (len(MARKDOWN_IMAGE_PATTERN.findall(value))
+                                 + len(TRUNCATED_MARKDOWN_IMAGE_PATTERN.findall(value)))
+        return value
+
+    def visit(value: Any, sanitize: bool) -> Any:
+        if isinstance(value, str):
+            return text(value, sanitize)
+        if isinstance(value, list):
+            out = []
+            for v in value:
+                v = visit(v, sanitize)
+                if isinstance(v, str):
+                    slots.append((out, len(out)))
+                out.append(v)
+            return out
+        if isinstance(value, dict):
+            out = {}
+            for k, v in value.items():
+                v = visit(v, sanitize)
+                if isinstance(v, str):
+                    slots.append((out, k))
+                out[k] = v
+            return out
+        return value
+
+    if isinstance(event, dict):
+        record = {}
+        for k, v in event.items():
+            v = visit(v, k in URL_SANITIZED_FIELDS)
+            if isinstance(v, str):
+                slots.append((record, k))
+            record[k] = v
+    else:
+        record = visit(event, False)
+
+    if counts["images"]:
+        for container, key in slots:
+            container[key] = strip_markdown_images_in_text(container[key])
+    return record, counts
+
+
+# ---------------------------------------------------------------------------
+# The page template
+#
+# The page layout lives in templates/event-detail.html.tmpl, compiled ONCE per
+# process by page_template.py into a plain Python function (see that module for
+# the syntax and why). generate_event_detail_page() computes the handful of
+# values that need Python -- the icon and rarity labels, the share-card text,
+# the suggestion URLs -- and hands the raw record to the compiled template,
+# which escapes each field as it prints it.
+#
+# That replaces escaping the WHOLE record up front. escape_event_for_html() is
+# still the definition of what a printed value looks like -- html_value() calls
+# it for anything that is not a plain string, so a list or a number renders
+# exactly as it did through the f-string -- but only values a slot actually
+# prints are escaped, and only once.
+#
+# Output is byte-identical to the f-string this replaced; test-event-template.py
+# holds that function verbatim and compares the two over hostile input and every
+# shipped record. Both files are in generator_fingerprint(), so a template edit
+# re-renders every page under --incremental, as a generator edit always has.
+TEMPLATES_DIR = SCRIPT_DIR / "templates"
+EVENT_PAGE_TEMPLATE = TEMPLATES_DIR / "event-detail.html.tmpl"
+
+CATEGORY_ICONS = {
+    'funding_catastrophe': '💸',
+    'organizational_crisis': '🏢',
+    'technical_research_breakthrough': '🔬',
+    'institutional_decay': '⚠️',
+    'policy_development': '📜',
+    'public_awareness': '📢',
+    'capability_advance': '🚀',
+    'alignment_breakthrough': '🎯',
+    'governance_milestone': '⚖️'
+}
+
+RARITY_LABELS = {
+    'common': '⚪ Common',
+    'rare': '🔵 Rare',
+    'legendary': '✨ Legendary'
+}
+
+# (label, record key) for each reaction block, in page order.
+REACTIONS = (
+    ('🔬 Safety Researcher Reaction:', 'safety_researcher_reaction'),
+    ('📰 Media Reaction:', 'media_reaction'),
+)
+
+_event_page = None
+
+
+def html_value(value: Any) -> str:
+    """What a {{ expr }} slot prints: the value escaped for text or attribute
+    context. Non-strings render as the f-string rendered them -- str() of the
+    value after escape_event_for_html(), so a list slot shows escaped items."""
+    if isinstance(value, str):
+        return esc(value)
+    return str(escape_event_for_html(value))
+
+
+def title_label(value: Any) -> str:
+    """A slug as a label: escaped, underscores to spaces, title-cased.
+
+    Title-cases AFTER escaping because the f-string did, so '&' in a category
+    prints as '&Amp;'. Slugs never carry one; the order is kept so the template
+    swap changed no byte.
+    """
+    return html_value(value).replace('_', ' ').title()
+
+
+def reaction_provenance(event: Dict[str, Any], reaction_key: str) -> tuple:
+    """(type, details) for one reaction. The short form is a bare type string."""
+    reaction_prov = event.get('reaction_provenance', {}).get(reaction_key, 'placeholder')
+    if isinstance(reaction_prov, str):
+        return reaction_prov, {}
+    return reaction_prov.get('type', 'placeholder'), reaction_prov
+
+
+def event_page_template():
+    """The compiled page template, built on first use in each process."""
+    global _event_page
+    if _event_page is None:
+        spec = importlib.util.spec_from_file_location(
+            "page_template", SCRIPT_DIR / "page_template.py")
+        page_template = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(page_template)
+
+        _event_page = page_template.compile_template(
+            EVENT_PAGE_TEMPLATE.read_text(encoding="utf-8"),
+            EVENT_PAGE_TEMPLATE.name,
+            ("event_id", "event", "icon", "rarity", "page_url",
+             "og_title", "og_description", "url_id", "url_title", "suggest"),
+            {"title_label": title_label,
+             "reaction_provenance": reaction_provenance,
+             "REACTIONS": REACTIONS, "OG_IMAGE_URL": OG_IMAGE_URL},
+            html_value,
+        )
+    return _event_page
+
+
+def suggestion_urls(url_id: str, url_title: str, event: Dict[str, Any]) -> Dict[str, str]:
+    """Prefilled "suggest a change" issue URLs, keyed by field.
+
+    quote() is the escaper for a URL context, and its output contains no <, >
+    or " , so these go into href attributes as-is. They read the RAW record:
+    running quote() over HTML-escaped text would prefill the GitHub issue with
+    "%26amp%3B" where the source said "&". `url_id` and `url_title` arrive
+    already quoted; every link carries both, and quote() is the dearest call on
+    the page.
+    """
 
-    # Generate impacts table
-    # VARIANT B, ruled by Pip 2026-07-31 after an A/B: show the DIRECTION, never the
-    # magnitude.
-    #
-    # Why the number goes and the row stays. Of 1,194 events the calculated effects reach
-    # gameplay in one branch -- 7 events. The other 1,174 are flavour, and flavour is
-    # hidden by default. So a precise figure like "-80" was presented on ~2,190 pages for
-    # events that move nothing. Direction is the part that is probably right; magnitude is
-    # the part that is definitely unverified, and precision reads as authority regardless
-    # of the caveat above it. A stamp over a number still shows the number, and the number
-    # was the false part.
-    #
-    # The magnitudes are NOT deleted -- they live in the corpus, and the suggestion links
-    # at the foot of every page go straight there. Nothing is hidden; it is just no longer
-    # asserted here.
-    #
-    # Precedent from the game's own repo (events.gd:290): displayed doom numbers were
-    # removed there for the same reason -- clobbered at resolve, so "every (+/-N doom)
-    # message in event content was a silent lie".
-    impacts_html = ""
-    for impact in event['impacts']:
-        change = impact['change']
-        direction = 'up' if change > 0 else ('down' if change < 0 else 'unchanged')
-        color_class = 'positive' if change > 0 else 'negative'
-        condition_text = f" (if {impact['condition']})" if impact.get('condition') else ""
-
-        impacts_html += f"""
-				<tr>
-					<td>{impact['variable'].replace('_', ' ').title()}</td>
-					<td class="impact-{color_class}">proposed: {direction}</td>
-					<td>{condition_text or 'Always'}</td>
-				</tr>
-		"""
-
-    # Generate sources list
-    sources_html = ""
-    for i, source in enumerate(event['sources'], 1):
-        sources_html += f'<li><a href="{source}" target="_blank" rel="noopener">[{i}] {source}</a></li>\n\t\t\t\t'
-
-    # Generate tags
-    tags_html = " ".join([f'<span class="tag">#{tag}</span>' for tag in event['tags']])
-
-    # Generate metadata suggestion URLs
-    from urllib.parse import quote
-
-    # These read `raw`, not `event`: quote() is the escaper for a URL context, and
-    # running it over already-HTML-escaped text would prefill the GitHub issue with
-    # "%26amp%3B" where the source said "&". The percent-encoding quote() produces
-    # contains no <, > or " , so the finished URL is safe in an href attribute.
-    #
     # ROUTING RULE -- which repo a suggestion is addressed to.
     #
     # A suggest-link is this site letting a stranger author a value in another
@@ -964,631 +1241,42 @@ def generate_event_detail_page(event_id: str, event: Dict[str, Any]) -> str:
     GAME_LABELS = "game-mechanics,event-system,community"
     DATA_NEW = "https://github.com/PipFoweraker/pdoom-data/issues/new"
     GAME_NEW = "https://github.com/PipFoweraker/pdoom1/issues/new"
+    raw = event
 
-    category_suggestion_url = f"{DATA_NEW}?labels={DATA_LABELS}&title=Metadata%3A%20Change%20category%20for%20{quote(event_id)}&body=Event%3A%20{quote(raw['title'])}%0A%0ACurrent%20category%3A%20{quote(raw['category'])}%0A%0ASuggested%20category%3A%20%0A%0AReason%3A%20"
-
-    rarity_suggestion_url = f"{GAME_NEW}?labels={GAME_LABELS}&title=Event%20metadata%3A%20Change%20rarity%20for%20{quote(event_id)}&body=Event%3A%20{quote(raw['title'])}%0A%0AThis%20is%20a%20game-mechanical%20field%20owned%20by%20pdoom1.%0A%0ACurrent%20rarity%3A%20{quote(raw['rarity'])}%0A%0ASuggested%20rarity%3A%20%0A%0AReason%3A%20"
+    return {
+        "category": f"{DATA_NEW}?labels={DATA_LABELS}&title=Metadata%3A%20Change%20category%20for%20{url_id}&body=Event%3A%20{url_title}%0A%0ACurrent%20category%3A%20{quote(raw['category'])}%0A%0ASuggested%20category%3A%20%0A%0AReason%3A%20",
 
-    tags_suggestion_url = f"{DATA_NEW}?labels={DATA_LABELS}&title=Metadata%3A%20Change%20tags%20for%20{quote(event_id)}&body=Event%3A%20{quote(raw['title'])}%0A%0ACurrent%20tags%3A%20{quote(', '.join(raw['tags']))}%0A%0ASuggested%20tags%3A%20%0A%0AReason%3A%20"
+        "rarity": f"{GAME_NEW}?labels={GAME_LABELS}&title=Event%20metadata%3A%20Change%20rarity%20for%20{url_id}&body=Event%3A%20{url_title}%0A%0AThis%20is%20a%20game-mechanical%20field%20owned%20by%20pdoom1.%0A%0ACurrent%20rarity%3A%20{quote(raw['rarity'])}%0A%0ASuggested%20rarity%3A%20%0A%0AReason%3A%20",
 
-    impacts_suggestion_url = f"{GAME_NEW}?labels={GAME_LABELS}&title=Event%20metadata%3A%20Change%20impacts%20for%20{quote(event_id)}&body=Event%3A%20{quote(raw['title'])}%0A%0AThis%20is%20a%20game-balance%20change%20owned%20by%20pdoom1.%0A%0ACurrent%20impacts%3A%20{len(event['impacts'])}%20game%20variable%20changes%0A%0ASuggested%20changes%3A%20%0A-%20Variable%3A%20%0A-%20Change%3A%20%0A%0AReason%3A%20"
+        "tags": f"{DATA_NEW}?labels={DATA_LABELS}&title=Metadata%3A%20Change%20tags%20for%20{url_id}&body=Event%3A%20{url_title}%0A%0ACurrent%20tags%3A%20{quote(', '.join(raw['tags']))}%0A%0ASuggested%20tags%3A%20%0A%0AReason%3A%20",
 
-    pdoom_suggestion_url = f"{GAME_NEW}?labels={GAME_LABELS}&title=Event%20metadata%3A%20Change%20p(doom)%20impact%20for%20{quote(event_id)}&body=Event%3A%20{quote(raw['title'])}%0A%0AThis%20is%20a%20game-balance%20change%20owned%20by%20pdoom1.%0A%0ACurrent%20p(doom)%20impact%3A%20{quote(str(raw.get('pdoom_impact', 'null')))}%0A%0ASuggested%20p(doom)%20impact%3A%20%0A%0AReason%3A%20"
+        "impacts": f"{GAME_NEW}?labels={GAME_LABELS}&title=Event%20metadata%3A%20Change%20impacts%20for%20{url_id}&body=Event%3A%20{url_title}%0A%0AThis%20is%20a%20game-balance%20change%20owned%20by%20pdoom1.%0A%0ACurrent%20impacts%3A%20{len(raw['impacts'])}%20game%20variable%20changes%0A%0ASuggested%20changes%3A%20%0A-%20Variable%3A%20%0A-%20Change%3A%20%0A%0AReason%3A%20",
 
-    # Build reaction provenance badges and source info
-    def build_reaction_html(reaction_text: str, reaction_key: str) -> str:
-        """Build HTML for a reaction with provenance badge and source link"""
-        provenance = event.get('reaction_provenance', {})
-        reaction_prov = provenance.get(reaction_key, 'placeholder')
+        "pdoom": f"{GAME_NEW}?labels={GAME_LABELS}&title=Event%20metadata%3A%20Change%20p(doom)%20impact%20for%20{url_id}&body=Event%3A%20{url_title}%0A%0AThis%20is%20a%20game-balance%20change%20owned%20by%20pdoom1.%0A%0ACurrent%20p(doom)%20impact%3A%20{quote(str(raw.get('pdoom_impact', 'null')))}%0A%0ASuggested%20p(doom)%20impact%3A%20%0A%0AReason%3A%20",
+    }
 
-        # Handle simple string format
-        if isinstance(reaction_prov, str):
-            prov_type = reaction_prov
-            prov_data = {}
-        else:
-            prov_type = reaction_prov.get('type', 'placeholder')
-            prov_data = reaction_prov
-
-        # Build badge HTML
-        badge_html = ""
-        source_html = ""
-
-        if prov_type == "placeholder":
-            badge_html = '<span class="provenance-badge provenance-placeholder">⚠️ Placeholder - Needs Real Quote</span>'
-        elif prov_type == "human_summary":
-            badge_html = '<span class="provenance-badge provenance-summary">ℹ️ Summary (Not Direct Quote)</span>'
-            if prov_data.get('sources'):
-                sources = prov_data['sources'] if isinstance(prov_data['sources'], list) else [prov_data['sources']]
-                source_links = ', '.join([f'<a href="{s}" target="_blank" rel="noopener">source</a>' for s in sources])
-                source_html = f'<span class="quote-source">Summarized from: {source_links}</span>'
-        elif prov_type == "real_quote":
-            badge_html = '<span class="provenance-badge provenance-real">✓ Verified Quote</span>'
-            if prov_data.get('source'):
-                author = prov_data.get('author', 'Unknown')
-                date = prov_data.get('date', '')
-                date_text = f" ({date})" if date else ""
-                source_html = f'<span class="quote-source">— {author}{date_text} (<a href="{prov_data["source"]}" target="_blank" rel="noopener">source</a>)</span>'
-        elif prov_type == "not_applicable":
-            badge_html = '<span class="provenance-badge" style="opacity: 0.5;">N/A</span>'
-
-        return badge_html, source_html
-
-    safety_badge, safety_source = build_reaction_html(event['safety_researcher_reaction'], 'safety_researcher_reaction')
-    media_badge, media_source = build_reaction_html(event['media_reaction'], 'media_reaction')
 
+def generate_event_detail_page(event_id: str, event: Dict[str, Any]) -> str:
+    """Generate HTML for individual event detail page"""
     # Values shared by <meta name="description"> and the OpenGraph / Twitter
-    # card block. Built from `raw`, NOT from the already-escaped `event`:
-    # meta_text() collapses and truncates before escaping (see its docstring),
-    # so handing it a pre-escaped string would double-escape the ampersands and
-    # let a cut land inside an entity. `event_id_esc` is reused rather than
-    # re-derived so the canonical URL and og:url cannot drift apart.
-    page_url = f"{SITE_ORIGIN}/events/{event_id_esc}.html"
-    og_title = meta_text(raw['title'])
-    og_description = meta_text(raw['description'], META_DESCRIPTION_CHARS)
-
-    html_content = f"""<!DOCTYPE html>
-<html lang="en-AU">
-<head>
-	<meta charset="UTF-8">
-	<meta name="viewport" content="width=device-width, initial-scale=1.0">
-	<title>{event['title']} | p(Doom)1 Events</title>
-	<link rel="canonical" href="{page_url}" />
-	<meta name="description" content="{og_description}" />
-
-	<!-- Share cards. Without these an event link pastes as a bare URL. -->
-	<meta property="og:type" content="article" />
-	<meta property="og:site_name" content="p(Doom)1" />
-	<meta property="og:title" content="{og_title}" />
-	<meta property="og:description" content="{og_description}" />
-	<meta property="og:url" content="{page_url}" />
-	<meta property="og:image" content="{OG_IMAGE_URL}" />
-	<meta name="twitter:card" content="summary_large_image" />
-	<meta name="twitter:title" content="{og_title}" />
-	<meta name="twitter:description" content="{og_description}" />
-	<!-- twitter:site intentionally omitted until the handle is finalized,
-	     matching public/index.html. -->
-
-	<!-- Analytics consent shim. MUST stay above the deferred tracker below:
-	     this tag is parser-blocking, so it sets localStorage.plausible_ignore
-	     (from Do-Not-Track or an explicit opt-out) before the deferred script
-	     runs and fires its pageview. Without it on this page, a deep-linked
-	     visitor is counted before the privacy page's promise can be honoured.
-	     It never injects a tracker -- see public/assets/js/analytics.js. -->
-	<script src="/assets/js/analytics.js"></script>
-
-	<!-- Plausible Analytics -->
-	<script defer data-domain="pdoom1.com" src="https://analytics.pdoom1.com/js/script.file-downloads.outbound-links.pageview-props.tagged-events.js"></script>
-
-	<link rel="stylesheet" href="/css/site.css">
-	<link rel="stylesheet" href="/css/stamp.css">
-	<style>
-		:root {{
-			/* Palette derived from the game's shipped art: amber-dominant CRT chrome
-			   with a teal counterpoint over warm near-black. Green is demoted to
-			   --phosphor (OK-state / terminal flourish only), matching
-			   godot/scripts/ui/terminal_theme.gd: amber = PLAN register, green = WATCH. */
-			--bg-primary: #12100F;
-			--bg-secondary: #1C1917;
-			--bg-tertiary: #262220;
-			--text-primary: #E9F2F2;
-			--text-secondary: #CFC7BB;
-			--text-muted: #A79E92;
-			--accent-primary: #F6A800;
-			--accent-secondary: #2FD4C2;
-			--accent-danger: #E2524A;
-			--border-color: #3A342E;
-			--success-color: #4FB37A;
-			--radius-md: 6px;
-			/* extended semantic tokens */
-			--border-strong: #574E44;
-			--accent-alt: #2FD4C2;
-			--phosphor: #5BE87A;
-			--warning: #E9752E;
-		}}
-
-		body {{
-			font-family: 'Courier New', monospace;
-			background: var(--bg-primary);
-			color: var(--text-primary);
-			line-height: 1.6;
-			margin: 0;
-			padding: 0;
-		}}
-
-		header {{
-			background: rgba(28, 25, 23, 0.95);
-			border-bottom: 2px solid var(--accent-primary);
-			padding: 1rem 0;
-		}}
-
-		nav {{
-			max-width: 1200px;
-			margin: 0 auto;
-			padding: 0 1rem;
-			display: flex;
-			justify-content: space-between;
-			align-items: center;
-		}}
-
-		.breadcrumb {{
-			color: var(--text-muted);
-			font-size: 0.9rem;
-		}}
-
-		.breadcrumb a {{
-			color: var(--accent-primary);
-			text-decoration: none;
-		}}
-
-		main {{
-			max-width: 900px;
-			margin: 2rem auto;
-			padding: 0 1rem;
-		}}
-
-		.event-header {{
-			background: linear-gradient(135deg, var(--bg-secondary), var(--bg-tertiary));
-			border: 1px solid var(--border-color);
-			border-radius: var(--radius-md);
-			padding: 2rem;
-			margin-bottom: 2rem;
-		}}
-
-		.event-icon {{
-			font-size: 4rem;
-			margin-bottom: 1rem;
-		}}
-
-		.event-title {{
-			font-size: 2.5rem;
-			color: var(--accent-primary);
-			margin-bottom: 1rem;
-		}}
-
-		.event-meta {{
-			display: flex;
-			gap: 1.5rem;
-			flex-wrap: wrap;
-			margin-bottom: 1.5rem;
-			font-size: 0.95rem;
-		}}
-
-		.meta-item {{
-			display: flex;
-			align-items: center;
-			gap: 0.5rem;
-		}}
-
-		.category-badge {{
-			background: var(--accent-secondary);
-			color: var(--bg-primary);
-			padding: 0.3rem 0.8rem;
-			border-radius: 4px;
-			font-weight: bold;
-			text-transform: uppercase;
-			font-size: 0.85rem;
-		}}
-
-		.rarity-badge {{
-			background: var(--bg-tertiary);
-			color: var(--text-primary);
-			padding: 0.3rem 0.8rem;
-			border-radius: 4px;
-			border: 1px solid var(--border-color);
-		}}
-
-		.section {{
-			background: var(--bg-secondary);
-			border: 1px solid var(--border-color);
-			border-radius: var(--radius-md);
-			padding: 1.5rem;
-			margin-bottom: 1.5rem;
-		}}
-
-		.section h2 {{
-			color: var(--accent-secondary);
-			margin-bottom: 1rem;
-			font-size: 1.5rem;
-		}}
-
-		.description {{
-			font-size: 1.1rem;
-			line-height: 1.8;
-			color: var(--text-secondary);
-		}}
-
-		.impacts-table {{
-			width: 100%;
-			border-collapse: collapse;
-		}}
-
-		.impacts-table th {{
-			background: var(--bg-tertiary);
-			padding: 0.8rem;
-			text-align: left;
-			color: var(--accent-primary);
-			border-bottom: 2px solid var(--border-color);
-		}}
-
-		.impacts-table td {{
-			padding: 0.8rem;
-			border-bottom: 1px solid var(--border-color);
-		}}
-
-		.impact-positive {{
-			/* phosphor = the demoted terminal green, kept for live OK-state readouts */
-			color: var(--phosphor);
-			font-weight: bold;
-		}}
-
-		.impact-negative {{
-			color: var(--accent-danger);
-			font-weight: bold;
-		}}
-
-		.quote {{
-			background: var(--bg-tertiary);
-			border-left: 4px solid var(--accent-primary);
-			padding: 1rem 1.5rem;
-			margin: 1.5rem 0;
-			font-style: italic;
-		}}
-
-		.quote-label {{
-			font-weight: bold;
-			color: var(--accent-primary);
-			font-style: normal;
-			display: block;
-			margin-bottom: 0.5rem;
-		}}
-
-		.sources {{
-			list-style: none;
-			padding: 0;
-		}}
-
-		.sources li {{
-			margin-bottom: 0.8rem;
-		}}
-
-		.sources a {{
-			color: var(--accent-primary);
-			text-decoration: none;
-			word-break: break-all;
-		}}
-
-		.sources a:hover {{
-			text-decoration: underline;
-		}}
-
-		.tags {{
-			display: flex;
-			gap: 0.5rem;
-			flex-wrap: wrap;
-		}}
-
-		.tag {{
-			background: var(--bg-primary);
-			padding: 0.4rem 0.8rem;
-			border-radius: 4px;
-			font-size: 0.9rem;
-			color: var(--text-muted);
-		}}
-
-		.metadata-section {{
-			background: var(--bg-secondary);
-			border: 1px solid var(--border-color);
-			border-radius: var(--radius-md);
-			padding: 1.5rem;
-			margin-bottom: 1.5rem;
-		}}
-
-		.metadata-grid {{
-			display: grid;
-			grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-			gap: 1rem;
-			margin-top: 1rem;
-		}}
-
-		.metadata-item {{
-			background: var(--bg-tertiary);
-			padding: 1rem;
-			border-radius: 4px;
-			border: 1px solid var(--border-color);
-		}}
-
-		.metadata-label {{
-			font-weight: bold;
-			color: var(--accent-primary);
-			font-size: 0.85rem;
-			display: block;
-			margin-bottom: 0.5rem;
-		}}
-
-		.metadata-value {{
-			color: var(--text-secondary);
-			font-size: 0.95rem;
-		}}
-
-		.suggest-link {{
-			display: inline-block;
-			margin-top: 0.5rem;
-			color: var(--accent-secondary);
-			text-decoration: none;
-			font-size: 0.85rem;
-			transition: color 0.3s;
-		}}
-
-		.suggest-link:hover {{
-			color: var(--accent-primary);
-			text-decoration: underline;
-		}}
-
-		.provenance-badge {{
-			display: inline-block;
-			padding: 0.25rem 0.6rem;
-			border-radius: 4px;
-			font-size: 0.75rem;
-			font-weight: bold;
-			margin-left: 0.5rem;
-			vertical-align: middle;
-		}}
-
-		/* Tint alpha is 0.12, not 0.20: the badge text sits on the *blended* tint,
-		   and at 0.20 the warning variant only reaches 4.36:1 (WCAG AA fail).
-		   At 0.12 the three variants measure 4.97 / 7.55 / 5.61. */
-		.provenance-placeholder {{
-			background: rgba(233, 117, 46, 0.12);
-			border: 1px solid var(--warning);
-			color: var(--warning);
-		}}
-
-		.provenance-summary {{
-			background: rgba(47, 212, 194, 0.12);
-			border: 1px solid var(--accent-alt);
-			color: var(--accent-alt);
-		}}
-
-		.provenance-real {{
-			background: rgba(79, 179, 122, 0.12);
-			border: 1px solid var(--success-color);
-			color: var(--success-color);
-		}}
-
-		.quote-source {{
-			display: block;
-			margin-top: 0.5rem;
-			font-size: 0.85rem;
-			color: var(--text-muted);
-		}}
-
-		.quote-source a {{
-			color: var(--accent-secondary);
-			text-decoration: none;
-		}}
-
-		.quote-source a:hover {{
-			text-decoration: underline;
-		}}
-
-		.suggest-quote-button {{
-			display: inline-block;
-			margin-top: 0.75rem;
-			padding: 0.5rem 1rem;
-			background: rgba(47, 212, 194, 0.1);
-			border: 1px solid var(--accent-secondary);
-			border-radius: 4px;
-			color: var(--accent-secondary);
-			text-decoration: none;
-			font-size: 0.85rem;
-			transition: all 0.3s;
-		}}
-
-		.suggest-quote-button:hover {{
-			background: var(--accent-secondary);
-			color: var(--bg-primary);
-			transform: translateY(-2px);
-		}}
-
-		.contribute-section {{
-			background: linear-gradient(135deg, var(--bg-secondary), rgba(47, 212, 194, 0.1));
-			border: 1px solid var(--accent-secondary);
-			border-radius: var(--radius-md);
-			padding: 1.5rem;
-			text-align: center;
-		}}
-
-		.cta-button {{
-			display: inline-block;
-			background: var(--accent-secondary);
-			color: var(--bg-primary);
-			padding: 0.8rem 1.5rem;
-			text-decoration: none;
-			border-radius: 4px;
-			font-weight: bold;
-			margin: 0.5rem;
-			transition: transform 0.3s;
-		}}
-
-		.cta-button:hover {{
-			transform: translateY(-2px);
-		}}
-
-		footer {{
-			background: var(--bg-secondary);
-			border-top: 2px solid var(--accent-primary);
-			text-align: center;
-			padding: 2rem 1rem;
-			margin-top: 4rem;
-			color: var(--text-muted);
-		}}
-	</style>
-</head>
-<body>
-	<header>
-		<nav>
-			<div class="breadcrumb">
-				<a href="/">Home</a> / <a href="/events/">Events</a> / {event['title']}
-			</div>
-		</nav>
-	</header>
-
-	<main>
-		<div class="event-header">
-			<div class="event-icon">{icon}</div>
-			<h1 class="event-title">{event['title']}</h1>
-
-			<div class="event-meta">
-				<div class="meta-item">
-					<span>📅</span>
-					<span><strong>{event['year']}</strong></span>
-				</div>
-				<div class="meta-item">
-					<span class="category-badge">{event['category'].replace('_', ' ')}</span>
-				</div>
-				<div class="meta-item">
-					<span class="rarity-badge">{rarity}</span>
-				</div>
-			</div>
-
-			<div class="tags">
-				{tags_html}
-			</div>
-		</div>
-
-		<div class="section">
-			<h2>📖 Description</h2>
-			<p class="description">{event['description']}</p>
-		</div>
-
-		<div class="section stamp-block">
-			<h2>📊 Game Impacts</h2>
-			<span class="stamp stamp--restricted stamp--sm">Not verified in game</span>
-			<p class="stamp-body">
-				Which variables this event was <em>proposed</em> to move, and in which
-				direction. The magnitudes are held in the corpus but are not shown here,
-				because they have not been verified against the shipped game. They come from
-				<a href="https://github.com/PipFoweraker/pdoom-data" target="_blank" rel="noopener">pdoom-data</a>.
-				They describe what an event was <em>proposed</em> to do, not what the
-				shipped game does with it. <strong>Most events in the corpus are flavour:
-				they are shown for colour and do not move any game variable.</strong> Only a
-				small minority reach the systems below, and several of the variables listed
-				here are not read by the game at all yet.
-				Treat this table as a design proposal under review, not as a measurement of
-				play. Corrections and arguments are welcome &mdash; the suggestion links at
-				the foot of this page go straight to the data repo.
-			</p>
-			<table class="impacts-table">
-				<thead>
-					<tr>
-						<th>Variable</th>
-						<th>Direction</th>
-						<th>Condition</th>
-					</tr>
-				</thead>
-				<tbody>
-					{impacts_html}
-				</tbody>
-			</table>
-		</div>
-
-		<div class="section">
-			<h2>💭 Reactions</h2>
-
-			<div class="quote">
-				<span class="quote-label">🔬 Safety Researcher Reaction:</span>
-				{safety_badge}
-				<br>
-				"{event['safety_researcher_reaction']}"
-				{safety_source}
-			</div>
-
-			<div class="quote">
-				<span class="quote-label">📰 Media Reaction:</span>
-				{media_badge}
-				<br>
-				"{event['media_reaction']}"
-				{media_source}
-			</div>
-
-			<a href="/events/suggest-quote.html?event={quote(event_id)}" class="suggest-quote-button">
-				💡 Found a Real Quote? Suggest it here
-			</a>
-		</div>
-
-		<div class="section">
-			<h2>🔗 Sources</h2>
-			<ul class="sources">
-				{sources_html}
-			</ul>
-		</div>
-
-		<div class="metadata-section">
-			<h2>🏷️ Event Metadata</h2>
-			<p style="color: var(--text-muted); margin-bottom: 1rem;">
-				Think this event's metadata could be improved? Category and tags describe the real-world event and are maintained in <a href="https://github.com/PipFoweraker/pdoom-data" target="_blank" rel="noopener">pdoom-data</a>. Rarity, game impacts and p(doom) effects are game-mechanical values owned by <a href="https://github.com/PipFoweraker/pdoom1" target="_blank" rel="noopener">pdoom1</a>. Each link below goes to the repository that decides that field.
-			</p>
-
-			<div class="metadata-grid">
-				<div class="metadata-item">
-					<span class="metadata-label">📁 Category</span>
-					<span class="metadata-value">{event['category'].replace('_', ' ').title()}</span>
-					<a href="{category_suggestion_url}" class="suggest-link" target="_blank">→ Suggest different category</a>
-				</div>
-
-				<div class="metadata-item">
-					<span class="metadata-label">⭐ Rarity</span>
-					<span class="metadata-value">{rarity}</span>
-					<a href="{rarity_suggestion_url}" class="suggest-link" target="_blank">→ Suggest different rarity</a>
-				</div>
-
-				<div class="metadata-item">
-					<span class="metadata-label">🏷️ Tags ({len(event['tags'])})</span>
-					<span class="metadata-value">{', '.join(event['tags'])}</span>
-					<a href="{tags_suggestion_url}" class="suggest-link" target="_blank">→ Suggest tag changes</a>
-				</div>
-
-				<div class="metadata-item">
-					<span class="metadata-label">📊 Game Impacts ({len(event['impacts'])})</span>
-					<span class="metadata-value">{len(event['impacts'])} variable changes</span>
-					<a href="{impacts_suggestion_url}" class="suggest-link" target="_blank">→ Suggest impact changes</a>
-				</div>
-
-				<div class="metadata-item">
-					<span class="metadata-label">☢️ p(Doom) Impact</span>
-					<span class="metadata-value">{event.get('pdoom_impact') if event.get('pdoom_impact') is not None else 'No direct impact'}</span>
-					<a href="{pdoom_suggestion_url}" class="suggest-link" target="_blank">→ Suggest p(doom) change</a>
-				</div>
-
-				<div class="metadata-item">
-					<span class="metadata-label">📝 General Metadata</span>
-					<span class="metadata-value">Year, description, reactions</span>
-					<a href="/events/suggest-metadata.html?event={quote(event_id)}" class="suggest-link">→ Comprehensive review</a>
-				</div>
-			</div>
-		</div>
-
-		<div class="contribute-section">
-			<h2>🤝 Found an Issue?</h2>
-			<p>This event data is sourced from the pdoom-data repository. If you notice errors or want to suggest improvements:</p>
-			<a href="https://github.com/PipFoweraker/pdoom-data/issues/new?title=Event%20Issue:%20{quote(event_id)}" class="cta-button" target="_blank">GitHub Issue (Preferred)</a>
-			<a href="mailto:team@pdoom1.com?subject=Event%20Data%20Issue:%20{quote(event_id)}&amp;body=Event:%20{quote(raw['title'])}%0A%0AWhat's wrong:%20%0A%0ASuggested fix:%20" class="cta-button">📧 Email (No GitHub)</a>
-		</div>
-
-		<div style="text-align: center; margin-top: 2rem;">
-			<a href="/events/" style="color: var(--accent-primary); text-decoration: none;">← Back to All Events</a>
-		</div>
-	</main>
-
-	<footer>
-		<p>&copy; 2025 p(Doom)1 | <a href="https://github.com/PipFoweraker/pdoom1" style="color: var(--accent-primary);">GitHub</a></p>
-		<p style="margin-top: 0.5rem; font-size: 0.9rem;">Event data from <a href="https://github.com/PipFoweraker/pdoom-data" target="_blank" style="color: var(--accent-secondary);">pdoom-data</a></p>
-	</footer>
-</body>
-</html>
-"""
-
-    return html_content
+    # card block. meta_text() collapses and truncates before escaping (see its
+    # docstring), so it is handed the raw value and its result goes into a
+    # {{! }} slot. page_url is one value so the canonical URL and og:url cannot
+    # drift apart.
+    url_id = quote(event_id)
+    url_title = quote(event['title'])
+    return event_page_template()(
+        event_id,
+        event,
+        CATEGORY_ICONS.get(event['category'], '📌'),
+        RARITY_LABELS.get(event['rarity'], event['rarity']),
+        f"{SITE_ORIGIN}/events/{event_id}.html",
+        meta_text(event['title']),
+        meta_text(event['description'], META_DESCRIPTION_CHARS),
+        url_id,
+        url_title,
+        suggestion_urls(url_id, url_title, event),
+    )
 
 
 def render_events_json(events: Dict[str, Any]) -> str:
@@ -1605,159 +1293,582 @@ def write_events_json(text: str):
     """Write events.json for the events index page"""
     output_file = DATA_DIR / "events.json"
 
-    with open(output_file, 'w', encoding='utf-8', newline='\n') as f:
-        f.write(text)
+    if write_if_changed(output_file, text):
+        log(f"Wrote events index to {output_file}")
+    else:
+        log(f"Events index unchanged: {output_file}")
 
-    log(f"Wrote events index to {output_file}")
 
+# ---------------------------------------------------------------------------
+# Sharded events data
+#
+# events.json is one ~1.2 MB file, and /events/ downloads and parses all of it
+# before it can show a single row -- on a phone that is the slowest first paint
+# on the site. The table only needs six short fields per event; descriptions,
+# sources and reactions are read only once somebody types into the search box.
+#
+# So alongside events.json (which every other consumer still reads, unchanged)
+# the sync writes public/data/events/:
+#
+#   catalog.json            the one mutable entry point: names every file below
+#   index.<hash>.json       {"fields": [...], "rows": [[...], ...]}, one short row
+#                           per event (INDEX_FIELDS), in the order /events/
+#                           lists them
+#   year-<year>.<hash>.json full records for one year, shaped like events.json
+#   page-<nnn>.<hash>.json  SHARD_PAGE_SIZE full records in the same order,
+#                           {"page", "pages", "events": [[id, record], ...]}
+#
+# Every file but the catalog is named by a hash of its own bytes, so its content
+# can never change under that name and .htaccess lets browsers and proxies keep
+# it for a year. Only catalog.json needs the short JSON expiry. Content-addressed
+# also means an unchanged shard keeps its name from run to run, so it is neither
+# rewritten, committed nor re-uploaded.
+#
+# Display order is the order /events/ sorts into -- year descending, then
+# legendary / rare / common, then events.json order -- with a non-integer year
+# last. The index, the pages and each year's records all follow it.
+#
+# The files are built from the SAME records as events.json, after the whole
+# transform chain, and each piece of text is put through both pre-write gates
+# before it is staged, exactly like --stream's events.json. Nothing reaches
+# public/data/events/ until the run has passed; a refusal deletes the staging
+# directory.
+#
+# Records are spooled to disk per (year, rarity) bucket as they arrive and the
+# artefacts are then written in one pass over the buckets in display order, so
+# --stream's memory stays flat: at any moment one record, one open shard and one
+# open page are in flight, never a year or the corpus.
+#
+# The files the PREVIOUS catalog named survive one more run. A reader whose
+# cached catalog predates a deploy by a few minutes still finds what it points
+# at; two runs later they are pruned. Only names of the shape below are ever
+# deleted, so nothing else put in that directory is at risk.
+SHARDS_DIRNAME = "events"
+SHARDS_STAGING_NAME = ".events-shards-staging"
+CATALOG_NAME = "catalog.json"
+CATALOG_VERSION = 1
+SHARD_PAGE_SIZE = 100
+CONTENT_HASH_CHARS = 16
+INDEX_FIELDS = ("id", "title", "year", "category", "rarity", "impacts")
+RARITY_ORDER = {"legendary": 3, "rare": 2, "common": 1}
+HASHED_SHARD_NAME = re.compile(
+    r"^(?:index|year-(?:\d+|unknown)|page-\d{3,})\.[0-9a-f]{%d}\.json$" % CONTENT_HASH_CHARS)
+
+_COMPACT = (",", ":")
+
+
+def shards_dir() -> Path:
+    return DATA_DIR / SHARDS_DIRNAME
+
+
+def gate_text(name: str, text: str, is_allowed, leaks: Dict[str, List[str]],
+              disagreements: Dict[str, int]):
+    """Run both pre-write gates over one piece of an artefact written piecewise,
+    adding any finding to the run's totals under the artefact's name."""
+    hits = [m for m in EMAIL_PATTERN.findall(text) if not is_allowed(m)]
+    if hits:
+        leaks.setdefault(name, []).extend(hits)
+    unexplained = unexplained_residue(text)
+    if unexplained:
+        disagreements[name] = disagreements.get(name, 0) + unexplained
+
+
+def shard_year(event: Dict[str, Any]) -> str:
+    """The year shard an event belongs to: its year, or "unknown"."""
+    year = event.get("year")
+    if isinstance(year, int) and not isinstance(year, bool):
+        return str(year)
+    return "unknown"
+
+
+def index_row(event_id: str, event: Dict[str, Any]) -> list:
+    """One INDEX_FIELDS row. "impacts" is a count; the table shows no more."""
+    impacts = event.get("impacts")
+    return [event_id, event.get("title"), event.get("year"), event.get("category"),
+            event.get("rarity"), len(impacts) if isinstance(impacts, list) else 0]
+
+
+class HashedArtefact:
+    """One content-addressed output, written piecewise into the staging
+    directory and gated piece by piece; named by its hash on close()."""
+
+    def __init__(self, staging: Path, stem: str, gate):
+        self.staging = staging
+        self.stem = stem
+        self.label = f"public/data/{SHARDS_DIRNAME}/{stem}.json"
+        self.gate = gate
+        self.path = staging / f"{stem}.partial"
+        self.f = open(self.path, 'w', encoding='utf-8', newline='\n')
+        self.digest = hashlib.sha256()
+
+    def write(self, text: str):
+        self.gate(self.label, text)
+        self.f.write(text)
+        self.digest.update(text.encode("utf-8"))
+
+    def close(self) -> str:
+        self.f.close()
+        name = f"{self.stem}.{self.digest.hexdigest()[:CONTENT_HASH_CHARS]}.json"
+        os.replace(self.path, self.staging / name)
+        return name
+
+
+class EventShards:
+    """Collects published records and builds public/data/events/ from them.
+
+    add() every record in events.json order, build() once every record is in,
+    then publish() after the run has passed its gates -- or discard()."""
+
+    def __init__(self):
+        self.staging = DATA_DIR / SHARDS_STAGING_NAME
+        if self.staging.exists():
+            shutil.rmtree(self.staging)
+        self.staging.mkdir(parents=True)
+        self.buckets: Dict[tuple, Any] = {}
+        self.count = 0
+        self.artefacts = 0
+        self.catalog: Optional[Dict[str, Any]] = None
+
+    def add(self, event_id: str, record: Dict[str, Any]):
+        year = shard_year(record)
+        rank = RARITY_ORDER.get(record.get("rarity"), 0)
+        bucket = self.buckets.get((year, rank))
+        if bucket is None:
+            bucket = self.buckets[(year, rank)] = open(
+                self.staging / f"bucket-{year}-{rank}.jsonl", 'w', encoding='utf-8', newline='\n')
+        bucket.write(json.dumps([event_id, record]) + "\n")
+        self.count += 1
+
+    def _display_order(self) -> List[tuple]:
+        return sorted(self.buckets, key=lambda k: (k[0] == "unknown",
+                                                   -int(k[0]) if k[0] != "unknown" else 0,
+                                                   -k[1]))
+
+    def build(self, gate):
+        """Write the index, year shards and pages into the staging directory,
+        passing every piece of text to gate(name, text) first."""
+        for bucket in self.buckets.values():
+            bucket.close()
+        pages_total = -(-self.count // SHARD_PAGE_SIZE)
+        files: List[str] = []
+        shards: Dict[str, str] = {}
+        pages: List[str] = []
+
+        index = HashedArtefact(self.staging, "index", gate)
+        index.write(json.dumps({"fields": list(INDEX_FIELDS)}, separators=_COMPACT)[:-1]
+                    + ',"rows":[')
+        shard = page = None
+        shard_key = None
+        in_shard = in_page = position = 0
+        for key in self._display_order():
+            year = key[0]
+            if year != shard_key:
+                if shard is not None:
+                    shard.write("}")
+                    shards[shard_key] = shard.close()
+                shard = HashedArtefact(self.staging, f"year-{year}", gate)
+                shard.write("{")
+                shard_key, in_shard = year, 0
+            bucket_path = self.staging / f"bucket-{year}-{key[1]}.jsonl"
+            with open(bucket_path, encoding='utf-8') as f:
+                for line in f:
+                    event_id, record = json.loads(line)
+                    if page is None:
+                        page = HashedArtefact(self.staging, f"page-{len(pages) + 1:03d}", gate)
+                        page.write(f'{{"page":{len(pages) + 1},"pages":{pages_total},"events":[')
+                        in_page = 0
+                    index.write(("\n" if position == 0 else ",\n")
+                                + json.dumps(index_row(event_id, record), separators=_COMPACT))
+                    shard.write(("" if in_shard == 0 else ",")
+                                + json.dumps({event_id: record}, separators=_COMPACT)[1:-1])
+                    page.write(("" if in_page == 0 else ",")
+                               + json.dumps([event_id, record], separators=_COMPACT))
+                    position += 1
+                    in_shard += 1
+                    in_page += 1
+                    if in_page == SHARD_PAGE_SIZE:
+                        page.write("]}")
+                        pages.append(page.close())
+                        page = None
+            bucket_path.unlink()
+        if shard is not None:
+            shard.write("}")
+            shards[shard_key] = shard.close()
+        if page is not None:
+            page.write("]}")
+            pages.append(page.close())
+        index.write("\n]}" if position else "]}")
+        files.append(index.close())
+
+        self.catalog = {
+            "version": CATALOG_VERSION,
+            "events": self.count,
+            "page_size": SHARD_PAGE_SIZE,
+            "index": files[0],
+            "shards": shards,
+            "pages": pages,
+        }
+        gate(f"public/data/{SHARDS_DIRNAME}/{CATALOG_NAME}", self.catalog_text())
+        self.artefacts = 2 + len(shards) + len(pages)
+
+    def catalog_text(self) -> str:
+        return json.dumps(self.catalog, indent=2) + "\n"
+
+    def _named(self, catalog: Dict[str, Any]) -> set:
+        names = {catalog.get("index")}
+        names.update((catalog.get("shards") or {}).values())
+        names.update(catalog.get("pages") or [])
+        return {n for n in names if isinstance(n, str)}
+
+    def publish(self):
+        """Move the staged files into public/data/events/, write the catalog
+        last, and prune what neither this catalog nor the previous one names."""
+        dest = shards_dir()
+        dest.mkdir(parents=True, exist_ok=True)
+        catalog_file = dest / CATALOG_NAME
+        try:
+            previous = self._named(json.loads(catalog_file.read_text(encoding="utf-8")))
+        except (OSError, ValueError, AttributeError):
+            previous = set()
+
+        current = self._named(self.catalog)
+        added = 0
+        for name in sorted(current):
+            if not (dest / name).exists():
+                os.replace(self.staging / name, dest / name)
+                added += 1
+        write_if_changed(catalog_file, self.catalog_text())
+
+        pruned = 0
+        for path in sorted(dest.iterdir()):
+            if (HASHED_SHARD_NAME.match(path.name)
+                    and path.name not in current and path.name not in previous):
+                path.unlink()
+                pruned += 1
+        self.discard()
+        log(f"Events shards: {len(current)} files in {dest} "
+            f"({added} new, {pruned} pruned)")
+
+    def discard(self):
+        for bucket in self.buckets.values():
+            if not bucket.closed:
+                bucket.close()
+        if self.staging.exists():
+            shutil.rmtree(self.staging)
 
-def sync_icons(pdoom1_path: Path):
-    """Sync game icons from pdoom1 repository"""
-    icons_source = pdoom1_path / "art_generated" / "game_icons" / "v1"
 
-    if not icons_source.exists():
-        log(f"Icons directory not found: {icons_source}", "WARN")
-        log("Skipping icon sync", "WARN")
-        return
+# ---------------------------------------------------------------------------
+# Incremental rebuilds
+#
+# A full sync rewrites every page under public/events/ and re-runs the whole
+# sanitise/redact/strip/verify chain over every record, even when pdoom-data
+# changed three events. The daily job, the commit and the rsync deploy that
+# follows all scale with files TOUCHED, so a full-site rewrite is a full-site
+# deploy.
+#
+# The manifest is this generator's record of what it wrote and from what: one
+# hash per INPUT record (the raw upstream dict, before any transform) plus a
+# fingerprint of the code that turns a record into a page. A page is re-rendered
+# when its input hash changed, when its file is missing, or when the fingerprint
+# changed -- a generator edit invalidates every page at once, because the
+# template, the escaper and the redaction patterns all live in this file.
+#
+# The allowlist checker is part of the fingerprint too. It does not change what
+# a page says, but it changes what the gate accepts, and a page verified under
+# an old gate has not been verified under the new one.
+#
+# Unchanged records are taken from the PREVIOUS events.json, which already holds
+# exactly the transformed record for every id. That keeps events.json
+# byte-identical to a full run without re-running the chain over records that
+# did not move. events.json itself is always re-verified -- it is one file, and
+# it carries every record.
+#
+# The manifest also decides DELETION. Only ids the manifest says this generator
+# wrote are ever removed; the ~1,000 alignmentforum_* pages no generator owns
+# (docs/TECH_DEBT.md E-0) are never in it, so they are never touched. rsync
+# --delete makes a deletion a production removal, so that bound matters.
+#
+# It lives beside the pages rather than under public/data/ so that every test
+# that redirects EVENTS_DIR into a temp dir redirects the manifest with it, and
+# so the sync workflow's `git add public/events/` carries it between runs.
+# deploy-excludes.txt keeps it off the server.
+MANIFEST_NAME = ".sync-manifest.json"
+MANIFEST_VERSION = 1
 
-    # Copy 128px versions of event-related icons
-    icon_patterns = [
-        "*funding*_128.png",
-        "*crisis*_128.png",
-        "*research*_128.png",
-        "*breakthrough*_128.png",
-    ]
 
-    copied = 0
-    for pattern in icon_patterns:
-        for icon_file in icons_source.glob(pattern):
-            dest = ICONS_DIR / icon_file.name
-            shutil.copy2(icon_file, dest)
-            copied += 1
+def manifest_path() -> Path:
+    """Where the manifest lives. A function, so a redirected EVENTS_DIR wins."""
+    return EVENTS_DIR / MANIFEST_NAME
 
-    log(f"Synced {copied} event icons from pdoom1")
 
+def generator_fingerprint() -> str:
+    """Hash of the code that decides what a page looks like and what may ship."""
+    h = hashlib.sha256()
+    h.update(f"manifest-v{MANIFEST_VERSION}\n".encode("utf-8"))
+    for path in (Path(__file__), SCRIPT_DIR / "page_template.py", EVENT_PAGE_TEMPLATE,
+                 SCRIPT_DIR.parent / "check-published-emails.py"):
+        h.update(path.name.encode("utf-8"))
+        h.update(path.read_bytes() if path.exists() else b"<missing>")
+    return h.hexdigest()
 
-def main():
-    parser = argparse.ArgumentParser(description="Sync events from pdoom-data to pdoom1-website")
-    parser.add_argument(
-        "--pdoom-data-path",
-        type=Path,
-        default=DEFAULT_PDOOM_DATA,
-        help=f"Path to pdoom-data repository (default: {DEFAULT_PDOOM_DATA})"
-    )
-    parser.add_argument(
-        "--pdoom1-path",
-        type=Path,
-        default=DEFAULT_PDOOM1,
-        help=f"Path to pdoom1 repository (default: {DEFAULT_PDOOM1})"
-    )
-    parser.add_argument(
-        "--sync-icons",
-        action="store_true",
-        help="Also sync game icons from pdoom1 repository"
-    )
 
-    args = parser.parse_args()
+def event_input_hash(event_id: str, event: Dict[str, Any]) -> str:
+    """Stable hash of one RAW input record. Keys sorted, so upstream reordering
+    a dict is not a change."""
+    payload = json.dumps([event_id, event], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
-    log("=" * 60)
-    log("Starting events sync from pdoom-data")
-    log("=" * 60)
 
-    # Ensure directories exist
-    ensure_directories()
+def load_manifest() -> Optional[Dict[str, Any]]:
+    """The previous run's manifest, or None if absent or unreadable.
 
-    # Load events
-    all_events = load_events_from_pdoom_data(args.pdoom_data_path)
+    An unreadable manifest is treated as no manifest -- the cost is one full
+    rebuild, never a skipped page.
+    """
+    path = manifest_path()
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as exc:
+        log(f"Ignoring unreadable manifest {path}: {exc}", "WARN")
+        return None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("events"), dict):
+        log(f"Ignoring malformed manifest {path}", "WARN")
+        return None
+    return manifest
+
+
+def load_previous_events_json() -> Dict[str, Any]:
+    """The transformed records the last run published, keyed by id."""
+    path = DATA_DIR / "events.json"
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def plan_incremental(hashes: Dict[str, str], manifest: Optional[Dict[str, Any]],
+                     fingerprint: str, previous: Dict[str, Any]) -> List[str]:
+    """Ids whose page must be re-rendered. Everything else is reused as-is."""
+    if manifest is None:
+        log("Incremental: no manifest yet, rebuilding every page")
+        return list(hashes)
+    if manifest.get("fingerprint") != fingerprint:
+        log("Incremental: generator or allowlist changed, rebuilding every page")
+        return list(hashes)
+    recorded = manifest["events"]
+    changed = []
+    for event_id, digest in hashes.items():
+        entry = recorded.get(event_id)
+        if (not isinstance(entry, dict)
+                or entry.get("hash") != digest
+                or event_id not in previous
+                or not (EVENTS_DIR / f"{event_id}.html").exists()):
+            changed.append(event_id)
+    return changed
+
+
+def write_manifest(fingerprint: str, entries: Dict[str, Dict[str, Any]],
+                   path: Optional[Path] = None):
+    """Record what this run published. Only called after the gate passed.
+
+    `path` defaults to manifest_path(); --stream writes it into the staging
+    directory so it is swapped in with the pages it describes.
+    """
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "fingerprint": fingerprint,
+        "events": entries,
+    }
+    with open(path or manifest_path(), 'w', encoding='utf-8', newline='\n') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+        f.write("\n")
 
-    # Filter events (exclude newsletters and explicitly excluded)
-    events = filter_events(all_events)
 
-    # Sanitize HTTP URLs to HTTPS
-    log("Sanitizing HTTP URLs to HTTPS...")
-    url_changes = 0
-    for event_id, event in events.items():
-        before = json.dumps(event)
-        events[event_id] = sanitize_event_urls(event)
-        after = json.dumps(events[event_id])
-        if before != after:
-            url_changes += 1
-    if url_changes > 0:
-        log(f"Sanitized URLs in {url_changes} events")
-
-    # Redact third-party email addresses harvested out of paper PDFs.
-    # Runs AFTER the URL pass so the https rewrite still sees whole strings,
-    # and BEFORE page generation and write_events_json() so neither surface
-    # can publish one. See redact_pii() for why it walks the whole record.
-    log("Redacting third-party email addresses...")
-    emails_found = 0
-    events_with_emails = 0
-    for event_id, event in events.items():
-        n = count_emails(event)
-        if n:
-            emails_found += n
-            events_with_emails += 1
-            events[event_id] = redact_pii(event)
-    if emails_found:
-        log(f"Redacted {emails_found} email addresses across {events_with_emails} events")
-    else:
-        log("No email addresses found in event data")
-
-    # ADVISORY: address-shaped strings EMAIL_PATTERN cannot match. Never blocks;
-    # see OBFUSCATED_CONTACT_PATTERN for why the alternative is a noisy gate.
-    obfuscated_count = sum(count_obfuscated_contacts(e) for e in events.values())
-    obfuscated_events = sorted(
-        event_id for event_id, event in events.items()
-        if count_obfuscated_contacts(event)
-    )
-    if obfuscated_count:
-        log(
-            f"ADVISORY: {obfuscated_count} obfuscated contact string(s) across "
-            f"{len(obfuscated_events)} event(s) were NOT redacted -- "
-            f"EMAIL_PATTERN does not match forms like 'name [at] domain.edu'. "
-            f"Events: {', '.join(obfuscated_events[:20])}"
-            + (" ..." if len(obfuscated_events) > 20 else ""),
-            "WARN",
-        )
-    else:
-        log("No obfuscated contact strings detected")
-
-    # Replace Markdown image syntax with a marker. Upstream descriptions are
-    # Markdown; neither <p class="description"> nor a <meta content="..."> slot
-    # renders it, so an image arrives as a literal CDN URL in the reader's face.
-    # Runs AFTER redaction (so an address inside an image title is still caught
-    # by the address pass) and BEFORE page generation and write_events_json(),
-    # so neither surface can publish one. See strip_markdown_images().
-    log("Stripping Markdown image syntax from event text...")
-    images_found = 0
-    events_with_images = 0
-    for event_id, event in events.items():
-        n = count_markdown_images(event)
-        if n:
-            images_found += n
-            events_with_images += 1
-            events[event_id] = strip_markdown_images(event)
-    if images_found:
-        log(f"Replaced {images_found} Markdown images across {events_with_images} events")
-    else:
-        log("No Markdown image syntax found in event data")
+def write_if_changed(path: Path, text: str) -> bool:
+    """Write `text` only when it differs from what is on disk.
 
-    # Render EVERYTHING to memory first. Nothing touches disk until the
-    # verification below has passed -- see the "Pre-write verification" block.
-    log("Generating event detail pages...")
-    rendered: Dict[str, str] = {}
-    for event_id, event in events.items():
-        rendered[f"public/events/{event_id}.html"] = generate_event_detail_page(event_id, event)
+    An identical rewrite still bumps the mtime, and the rsync deploy compares
+    mtime and size, so a no-op write is a re-upload.
+    """
+    data = text.encode("utf-8")
+    if path.exists() and path.read_bytes() == data:
+        return False
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
 
-    events_json_text = render_events_json(events)
-    rendered["public/data/events.json"] = events_json_text
 
-    # THE GATE. Refuse to publish rather than publish-and-alert: an address that
-    # reaches public/ has already been committed, deployed and crawled by the
-    # time any detector speaks up.
+# ---------------------------------------------------------------------------
+# Run tallies and the refusal
+#
+# Both the in-memory run and --stream report the same log lines, refuse in the
+# same words and write the same events-sync-summary.json. The stream never holds
+# the corpus, so the summary cannot be computed from `events.values()` at the
+# end; SyncTally accumulates it one record at a time instead, and the in-memory
+# run feeds it the same way so the two cannot drift.
+
+
+def quote_bucket(event: Dict[str, Any]) -> str:
+    """Which quote_quality_stats bucket one record counts towards."""
+    def get_provenance_type(reaction_key: str) -> str:
+        """Get the provenance type for a reaction"""
+        prov = event.get('reaction_provenance', {}).get(reaction_key, 'placeholder')
+        if isinstance(prov, str):
+            return prov
+        return prov.get('type', 'placeholder')
+
+    safety_type = get_provenance_type('safety_researcher_reaction')
+    media_type = get_provenance_type('media_reaction')
+
+    # Count based on "best" provenance type for the event
+    if safety_type == 'real_quote' or media_type == 'real_quote':
+        return 'real_quotes'
+    if safety_type == 'human_summary' or media_type == 'human_summary':
+        return 'human_summaries'
+    if safety_type == 'not_applicable' and media_type == 'not_applicable':
+        return 'not_applicable'
+    return 'placeholders'
+
+
+class SyncTally:
+    """Everything the logs and the summary report, accumulated per record."""
+
+    def __init__(self):
+        self.source = 0
+        self.status = {"newsletter_archive": 0, "excluded": 0,
+                       "review_needed": 0, "included": 0}
+        self.included = 0
+        self.categories = set()
+        self.rarity: Dict[str, int] = {}
+        self.year_min = self.year_max = None
+        self.quotes = {'real_quotes': 0, 'human_summaries': 0,
+                       'placeholders': 0, 'not_applicable': 0}
+        self.url_changes = 0
+        self.emails = 0
+        self.events_with_emails = 0
+        self.obfuscated = 0
+        self.obfuscated_ids: List[str] = []
+        self.images = 0
+        self.events_with_images = 0
+
+    def add_source(self, raw: Dict[str, Any]):
+        """One record as it arrived from pdoom-data, before filtering."""
+        self.source += 1
+        status = raw.get('event_status')
+        if status in ('newsletter_archive', 'excluded'):
+            self.status[status] += 1
+
+    def add_included(self, event_id: str, record: Dict[str, Any], stats: Dict[str, Any]):
+        """One record that will be published, after transform_event()."""
+        self.included += 1
+        self.categories.add(record['category'])
+        self.rarity[record['rarity']] = self.rarity.get(record['rarity'], 0) + 1
+        year = record['year']
+        self.year_min = year if self.year_min is None else min(self.year_min, year)
+        self.year_max = year if self.year_max is None else max(self.year_max, year)
+        if record.get('event_status') == 'review_needed':
+            self.status["review_needed"] += 1
+        if record.get('event_status', 'included') == 'included':
+            self.status["included"] += 1
+        self.quotes[quote_bucket(record)] += 1
+
+        self.url_changes += stats["urls"]
+        self.emails += stats["emails"]
+        self.events_with_emails += 1 if stats["emails"] else 0
+        self.obfuscated += stats["obfuscated"]
+        if stats["obfuscated"]:
+            self.obfuscated_ids.append(event_id)
+        self.images += stats["images"]
+        self.events_with_images += 1 if stats["images"] else 0
+
+    def log_transform(self):
+        """The per-run transform counts, worded as they always have been."""
+        if self.url_changes > 0:
+            log(f"Sanitized URLs in {self.url_changes} events")
+
+        if self.emails:
+            log(f"Redacted {self.emails} email addresses across {self.events_with_emails} events")
+        else:
+            log("No email addresses found in event data")
+
+        # ADVISORY: address-shaped strings EMAIL_PATTERN cannot match. Never blocks;
+        # see OBFUSCATED_CONTACT_PATTERN for why the alternative is a noisy gate.
+        if self.obfuscated:
+            obfuscated_events = sorted(self.obfuscated_ids)
+            log(
+                f"ADVISORY: {self.obfuscated} obfuscated contact string(s) across "
+                f"{len(obfuscated_events)} event(s) were NOT redacted -- "
+                f"EMAIL_PATTERN does not match forms like 'name [at] domain.edu'. "
+                f"Events: {', '.join(obfuscated_events[:20])}"
+                + (" ..." if len(obfuscated_events) > 20 else ""),
+                "WARN",
+            )
+        else:
+            log("No obfuscated contact strings detected")
+
+        if self.images:
+            log(f"Replaced {self.images} Markdown images across {self.events_with_images} events")
+        else:
+            log("No Markdown image syntax found in event data")
+
+    def summary(self, pages: Dict[str, Any]) -> Dict[str, Any]:
+        """events-sync-summary.json, key for key."""
+        return {
+            "sync_timestamp": datetime.now().isoformat(),
+            "total_events_in_source": self.source,
+            "included_events": self.included,
+            "excluded_events": self.source - self.included,
+            "categories": len(self.categories),
+            "pages": pages,
+            # Counts only, never the strings or the event ids: this file is written
+            # under public/ and is served from pdoom1.com, so naming which events
+            # carry a contact string would republish a pointer to the thing that was
+            # just redacted. The ids go to the job log, which is not a web page.
+            "pii": {
+                "emails_redacted": self.emails,
+                "events_with_emails": self.events_with_emails,
+                "obfuscated_contact_suspects": self.obfuscated,
+                "_note": (
+                    "emails_redacted are addresses EMAIL_PATTERN matched and replaced. "
+                    "obfuscated_contact_suspects are address-shaped strings it cannot "
+                    "match (e.g. 'name [at] domain.edu') and therefore did NOT redact -- "
+                    "advisory, non-blocking, see pdoom1-website#240."
+                ),
+            },
+            "events_by_rarity": {
+                rarity: self.rarity.get(rarity, 0)
+                for rarity in ['common', 'rare', 'legendary']
+            },
+            "year_range": [self.year_min, self.year_max],
+            "event_status_breakdown": dict(self.status),
+            "quote_quality_stats": {
+                "events_with_real_quotes": self.quotes['real_quotes'],
+                "events_with_summaries": self.quotes['human_summaries'],
+                "events_with_placeholders": self.quotes['placeholders'],
+                "events_not_applicable": self.quotes['not_applicable'],
+                "completion_percentage": round((self.quotes['real_quotes'] / self.included) * 100, 1) if self.included > 0 else 0.0,
+                "goal_q1_2025": 50,
+                "goal_q2_2025": 100,
+                "goal_end_2025": 300
+            }
+        }
+
+
+def refuse_if_unsafe(leaks: Dict[str, List[str]], disagreements: Dict[str, int]):
+    """THE GATE. Exits 1, writing nothing, on any finding from either check.
+
+    Refuse to publish rather than publish-and-alert: an address that reaches
+    public/ has already been committed, deployed and crawled by the time any
+    detector speaks up.
+    """
     log("Verifying no third party's email address reached the rendered output...")
-    is_allowed = load_allowlist()
-    leaks = find_published_emails(rendered, is_allowed)
     if leaks:
         distinct = {a for hits in leaks.values() for a in hits}
         log("=" * 60, "ERROR")
@@ -1792,7 +1903,6 @@ def main():
     # This BLOCKS. An unexplained residue means the shared definition has a hole
     # in it, and the entire history of this file says that a hole in the shared
     # definition is how addresses reach production.
-    disagreements = find_residue_disagreements(rendered, is_allowed)
     if disagreements:
         total = sum(disagreements.values())
         log("=" * 60, "ERROR")
@@ -1817,27 +1927,485 @@ def main():
         log("=" * 60, "ERROR")
         sys.exit(1)
 
-    log(f"Verified {len(rendered)} rendered artefacts: no disallowed addresses, "
-        f"and the independent scanner agrees")
 
-    # Verification passed. Only now does anything reach disk.
-    for name, html_content in rendered.items():
-        if not name.startswith("public/events/"):
-            continue
-        output_file = EVENTS_DIR / Path(name).name
+# ---------------------------------------------------------------------------
+# Streaming ingestion (--stream)
+#
+# The default path json.load()s the whole of all_events.json, keeps the raw
+# dict, the filtered dict and every transformed record, and then holds every
+# rendered page in `rendered` until the gate has run. Peak memory is corpus size
+# times page size, and pdoom-data only grows.
+#
+# --stream keeps the same guarantee -- NOTHING under public/ changes unless
+# every artefact passed both checks -- with memory that does not grow with the
+# corpus:
+#
+#   * iter_json_object() yields one (id, record) at a time off the file;
+#   * records are transformed, rendered and verified in batches of
+#     STREAM_BATCH_PAGES (through render_pages(), so --jobs still applies), and
+#     each batch is written to a STAGING directory beside public/events/ and
+#     dropped;
+#   * events.json is serialised record by record into a staging file, each
+#     chunk verified as it is written;
+#   * only when the whole corpus has passed is the staging directory swapped in
+#     for public/events/ and the staging events.json renamed over the old one.
+#     On any refusal, or any exception, the staging copies are deleted and
+#     public/ is exactly as it was.
+#
+# What still grows with the corpus is bookkeeping: one manifest entry (a hash
+# and four counters) per id, and the summary tallies. No record and no page is
+# held past its batch.
+#
+# The staging directory starts as a hard-link farm of the live one, so pages
+# this run does not rewrite -- including the ~1,000 alignmentforum_* pages no
+# generator owns -- keep their inode and mtime, and the rsync deploy sees them
+# as untouched. A page whose new bytes equal the live ones is linked, not
+# rewritten, for the same reason write_if_changed() exists.
+#
+# Verifying events.json chunk by chunk finds exactly what verifying it whole
+# would: the text between two records is `},\n  "` plus the next key, and no
+# address or residue shape can run across a '}' or a '"'. test-sync-events.py
+# checks a stream run against a full one, refusals included.
+#
+# THE SWAP is two renames -- live -> PREVIOUS_NAME, staging -> live -- because
+# no portable call exchanges two non-empty directories. A crash between them
+# leaves public/events/ absent and the previous tree beside it;
+# recover_interrupted_swap() puts it back before anything else reads the
+# directory, on the next run of either mode.
+#
+# Duplicate ids are refused. json.load() silently keeps the LAST value for a
+# repeated key; a stream has already rendered the first by then, and guessing
+# which one upstream meant is not this generator's call.
+STREAM_CHUNK_CHARS = 1 << 16
+STREAM_BATCH_PAGES = 256
+STAGING_NAME = ".events-staging"
+PREVIOUS_NAME = ".events-previous"
+EVENTS_JSON_STAGING_NAME = ".events.json.staging"
+
+_JSON_WS = re.compile(r"[ \t\n\r]*")
+_JSON_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+def iter_json_object(f, chunk_chars: int = STREAM_CHUNK_CHARS):
+    """Yield (key, value) from a text file holding one top-level JSON object.
+
+    Values are decoded by json's own decoder, so each one is exactly what
+    json.load() would have produced for it. At most one value plus one read
+    chunk is buffered. A value is accepted only once a character that cannot
+    continue it has been read (or the file has ended), so a number cut off at a
+    chunk boundary is never taken for a shorter one.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def more():
+        nonlocal buf, pos, eof
+        # Grow the read with the pending text, so one very large value costs a
+        # logarithmic number of re-parses, not a linear one.
+        data = f.read(max(chunk_chars, len(buf) - pos))
+        if not data:
+            eof = True
+        buf, pos = buf[pos:] + data, 0
+
+    def peek() -> str:
+        nonlocal pos
+        while True:
+            pos = _JSON_WS.match(buf, pos).end()
+            if pos < len(buf):
+                return buf[pos]
+            if eof:
+                return ""
+            more()
+
+    def value() -> Any:
+        nonlocal pos
+        while True:
+            try:
+                v, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                more()
+                continue
+            # "-0." or "1e" decodes as a shorter number; only a character that
+            # cannot continue one proves the value is whole.
+            if eof or (end < len(buf) and buf[end] not in _JSON_NUMBER_CHARS):
+                pos = end
+                return v
+            more()
+
+    def expect(char: str):
+        nonlocal pos
+        found = peek()
+        if found != char:
+            raise ValueError(f"expected {char!r} in events file, found {found or 'end of file'!r}")
+        pos += 1
+
+    expect("{")
+    if peek() == "}":
+        pos += 1
+    else:
+        while True:
+            peek()
+            key = value()
+            if not isinstance(key, str):
+                raise ValueError("events file: object key is not a string")
+            expect(":")
+            peek()
+            yield key, value()
+            if peek() == ",":
+                pos += 1
+                continue
+            expect("}")
+            break
+    if peek():
+        raise ValueError("events file: extra data after the top-level object")
 
-        # newline='\n' pins LF output. Without it, a Windows run writes CRLF;
-        # git's autocrlf clean filter silently REFUSES to normalise any file
-        # that already contains a lone CR (one arXiv description does), so that
-        # page alone would be committed with CRLF and show up as a whole-file
-        # rewrite in every future diff.
-        with open(output_file, 'w', encoding='utf-8', newline='\n') as f:
-            f.write(html_content)
 
-    log(f"Generated {len(events)} event detail pages")
+def iter_events_from_pdoom_data(pdoom_data_path: Path):
+    """(event_id, raw_event) pairs off all_events.json, one at a time."""
+    events_file = events_source_file(pdoom_data_path)
+    seen = set()
+    with open(events_file, 'r', encoding='utf-8') as f:
+        for event_id, event in iter_json_object(f):
+            if event_id in seen:
+                log(f"Duplicate event id in {events_file}: {event_id}", "ERROR")
+                log("Refusing to guess which record upstream meant.", "ERROR")
+                sys.exit(1)
+            seen.add(event_id)
+            yield event_id, event
+
 
-    # Write events.json for index page
-    write_events_json(events_json_text)
+def staging_dir() -> Path:
+    """Where --stream builds the next public/events/. Functions, like
+    manifest_path(), so a redirected EVENTS_DIR moves these with it."""
+    return EVENTS_DIR.parent / STAGING_NAME
+
+
+def previous_dir() -> Path:
+    return EVENTS_DIR.parent / PREVIOUS_NAME
+
+
+def recover_interrupted_swap():
+    """Undo or finish a --stream swap that a crash interrupted."""
+    previous = previous_dir()
+    if previous.exists():
+        if EVENTS_DIR.exists():
+            # Both renames happened; only the cleanup was lost.
+            shutil.rmtree(previous)
+        else:
+            # Died between the renames. The previous tree is complete and
+            # matches the events.json still on disk, so it goes back.
+            os.replace(previous, EVENTS_DIR)
+            log(f"Restored {EVENTS_DIR} from an interrupted --stream swap", "WARN")
+    staging = staging_dir()
+    if staging.exists():
+        shutil.rmtree(staging)
+
+
+def open_staging() -> Path:
+    staging = staging_dir()
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+    return staging
+
+
+def stage_page(staging: Path, name: str, text: str) -> bool:
+    """Write a page into staging unless the live copy already has these bytes
+    (fill_staging() then links the live file, mtime and all)."""
+    data = text.encode("utf-8")
+    live = EVENTS_DIR / name
+    if live.exists() and live.read_bytes() == data:
+        return False
+    with open(staging / name, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def fill_staging(staging: Path, skip: set):
+    """Hard-link every live file into staging that this run did not stage and
+    is not deleting (`skip`, relative paths). Falls back to a copy where links
+    are unsupported."""
+    for dirpath, _, filenames in os.walk(EVENTS_DIR):
+        rel_dir = Path(dirpath).relative_to(EVENTS_DIR)
+        for name in filenames:
+            rel = (rel_dir / name).as_posix()
+            target = staging / rel
+            if rel in skip or target.exists():
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(Path(dirpath) / name, target)
+            except OSError:
+                shutil.copy2(Path(dirpath) / name, target)
+    shutil.copystat(EVENTS_DIR, staging)
+
+
+def swap_in_staging(staging: Path):
+    previous = previous_dir()
+    os.replace(EVENTS_DIR, previous)
+    os.replace(staging, EVENTS_DIR)
+    shutil.rmtree(previous)
+
+
+def discard_staging():
+    for path in (staging_dir(), DATA_DIR / EVENTS_JSON_STAGING_NAME):
+        if path.is_dir():
+            shutil.rmtree(path)
+        elif path.exists():
+            path.unlink()
+
+
+class EventsJsonStream:
+    """Writes events.json record by record, byte-identical to
+    render_events_json() over the same records, into a staging file."""
+
+    def __init__(self):
+        self.path = DATA_DIR / EVENTS_JSON_STAGING_NAME
+        self.f = open(self.path, 'w', encoding='utf-8', newline='\n')
+        self.digest = hashlib.sha256()
+        self.count = 0
+
+    def _write(self, text: str):
+        self.f.write(text)
+        self.digest.update(text.encode("utf-8"))
+
+    def add(self, event_id: str, record: Dict[str, Any]) -> str:
+        """Append one record; returns the exact text written, for the gate."""
+        # json.dumps({k: v}, indent=2) is '{\n  "k": ...\n}'; the middle is
+        # what a whole-dict dump writes for this entry at this depth.
+        chunk = json.dumps({event_id: record}, indent=2)[2:-2]
+        text = ("{\n" if self.count == 0 else ",\n") + chunk
+        self._write(text)
+        self.count += 1
+        return text
+
+    def close(self):
+        self._write("\n}" if self.count else "{}")
+        self.f.close()
+
+    def publish(self):
+        """Rename over events.json, unless the bytes are unchanged."""
+        output_file = DATA_DIR / "events.json"
+        if output_file.exists():
+            current = hashlib.sha256()
+            with open(output_file, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    current.update(block)
+            if current.digest() == self.digest.digest():
+                self.path.unlink()
+                log(f"Events index unchanged: {output_file}")
+                return
+        os.replace(self.path, output_file)
+        log(f"Wrote events index to {output_file}")
+
+
+def sync_streaming(args, tally: "SyncTally", fingerprint: str,
+                   manifest: Optional[Dict[str, Any]], is_allowed, jobs: int) -> Dict[str, Any]:
+    """The --stream run. Returns the "pages" block of the summary."""
+    recorded = manifest["events"] if manifest else {}
+    rebuild_all = True
+    if args.incremental:
+        if manifest is None:
+            log("Incremental: no manifest yet, rebuilding every page")
+        elif manifest.get("fingerprint") != fingerprint:
+            log("Incremental: generator or allowlist changed, rebuilding every page")
+        else:
+            rebuild_all = False
+
+    batch_size = max(STREAM_BATCH_PAGES, jobs * MIN_PAGES_PER_JOB)
+    log("Streaming events: transforming, rendering and verifying in batches of "
+        f"{batch_size}" + (f" across up to {jobs} processes..." if jobs > 1 else "..."))
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    leaks: Dict[str, List[str]] = {}
+    disagreements: Dict[str, int] = {}
+    batch: List[tuple] = []
+    rendered = written = loaded = 0
+
+    def flush():
+        nonlocal rendered, written
+        if not batch:
+            return
+        pages, batch_leaks, batch_disagreements = render_pages(batch, is_allowed, jobs)
+        rendered += len(pages)
+        leaks.update(batch_leaks)
+        disagreements.update(batch_disagreements)
+        # After a finding nothing more is staged: the run is already refused,
+        # and verifying the rest is only for the counts in the refusal.
+        if not leaks and not disagreements:
+            for name, html_content in pages.items():
+                if stage_page(staging, Path(name).name, html_content):
+                    written += 1
+        batch.clear()
+
+    def gate(name, text):
+        gate_text(name, text, is_allowed, leaks, disagreements)
+
+    staging = open_staging()
+    json_out = shards = None
+    try:
+        json_out = EventsJsonStream()
+        shards = EventShards()
+        json_name = "public/data/events.json"
+        for event_id, raw in iter_events_from_pdoom_data(args.pdoom_data_path):
+            loaded += 1
+            tally.add_source(raw)
+            if not should_include_event(raw):
+                continue
+            record, stats = transform_event(raw)
+            tally.add_included(event_id, record, stats)
+            entries[event_id] = {"hash": event_input_hash(event_id, raw), **stats}
+
+            gate(json_name, json_out.add(event_id, record))
+            shards.add(event_id, record)
+
+            entry = recorded.get(event_id)
+            if (rebuild_all or not isinstance(entry, dict)
+                    or entry.get("hash") != entries[event_id]["hash"]
+                    or not (EVENTS_DIR / f"{event_id}.html").exists()):
+                batch.append((event_id, record))
+                if len(batch) >= batch_size:
+                    flush()
+        flush()
+        json_out.close()
+        shards.build(gate)
+
+        log(f"Loaded {loaded} events from pdoom-data")
+        if tally.source - tally.included > 0:
+            log(f"Filtered out {tally.source - tally.included} excluded/newsletter events")
+        removed_ids = sorted(event_id for event_id in recorded if event_id not in entries)
+        if args.incremental:
+            log(f"Incremental: {rendered} changed, "
+                f"{len(entries) - rendered} unchanged, {len(removed_ids)} removed")
+        tally.log_transform()
+
+        if leaks or disagreements:
+            discard_staging()
+            shards.discard()
+        refuse_if_unsafe(leaks, disagreements)
+        log(f"Verified {rendered + 1 + shards.artefacts} rendered artefacts: no "
+            f"disallowed addresses, and the independent scanner agrees")
+
+        # Verification passed. Only now does anything under public/ change.
+        skip = {f"{event_id}.html" for event_id in removed_ids} | {MANIFEST_NAME}
+        fill_staging(staging, skip)
+        write_manifest(fingerprint, entries, staging / MANIFEST_NAME)
+        swap_in_staging(staging)
+        if removed_ids:
+            log(f"Removed {len(removed_ids)} page(s) for events no longer in the corpus")
+        log(f"Generated {len(entries)} event detail pages "
+            f"({rendered} rendered, {written} rewritten)")
+        json_out.publish()
+        shards.publish()
+    except BaseException:
+        if json_out is not None and not json_out.f.closed:
+            json_out.f.close()
+        if shards is not None:
+            shards.discard()
+        discard_staging()
+        raise
+
+    return {
+        "mode": ("incremental" if args.incremental else "full") + "+stream",
+        "rendered": rendered,
+        "rewritten": written,
+        "unchanged": len(entries) - rendered,
+        "removed": len(removed_ids),
+    }
+
+
+def sync_icons(pdoom1_path: Path):
+    """Sync game icons from pdoom1 repository"""
+    icons_source = pdoom1_path / "art_generated" / "game_icons" / "v1"
+
+    if not icons_source.exists():
+        log(f"Icons directory not found: {icons_source}", "WARN")
+        log("Skipping icon sync", "WARN")
+        return
+
+    # Copy 128px versions of event-related icons
+    icon_patterns = [
+        "*funding*_128.png",
+        "*crisis*_128.png",
+        "*research*_128.png",
+        "*breakthrough*_128.png",
+    ]
+
+    copied = 0
+    for pattern in icon_patterns:
+        for icon_file in icons_source.glob(pattern):
+            dest = ICONS_DIR / icon_file.name
+            shutil.copy2(icon_file, dest)
+            copied += 1
+
+    log(f"Synced {copied} event icons from pdoom1")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync events from pdoom-data to pdoom1-website")
+    parser.add_argument(
+        "--pdoom-data-path",
+        type=Path,
+        default=DEFAULT_PDOOM_DATA,
+        help=f"Path to pdoom-data repository (default: {DEFAULT_PDOOM_DATA})"
+    )
+    parser.add_argument(
+        "--pdoom1-path",
+        type=Path,
+        default=DEFAULT_PDOOM1,
+        help=f"Path to pdoom1 repository (default: {DEFAULT_PDOOM1})"
+    )
+    parser.add_argument(
+        "--sync-icons",
+        action="store_true",
+        help="Also sync game icons from pdoom1 repository"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-render, re-verify and rewrite pages whose input record "
+             "changed since the last run (see MANIFEST_NAME)"
+    )
+
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Render and verify pages across N processes (0 = one per CPU; "
+             "default 1, serial)"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read all_events.json incrementally and build public/events/ in a "
+             "staging directory swapped in only once every page passed, so "
+             "memory does not grow with the corpus (see \"Streaming ingestion\")"
+    )
+
+    args = parser.parse_args()
+
+    log("=" * 60)
+    log("Starting events sync from pdoom-data")
+    log("=" * 60)
+
+    # Ensure directories exist
+    ensure_directories()
+
+    fingerprint = generator_fingerprint()
+    manifest = load_manifest()
+    tally = SyncTally()
+
+    if args.stream:
+        # The allowlist first, as below: a run that cannot be verified refuses
+        # before it has staged anything.
+        is_allowed = load_allowlist()
+        pages = sync_streaming(args, tally, fingerprint, manifest, is_allowed,
+                               resolve_jobs(args.jobs))
+    else:
+        pages = sync_in_memory(args, tally, fingerprint, manifest)
 
     # Optionally sync icons
     if args.sync_icons:
@@ -1845,88 +2413,15 @@ def main():
         sync_icons(args.pdoom1_path)
 
     log("=" * 60)
-    log(f"✅ Sync complete! {len(events)} events processed")
+    log(f"✅ Sync complete! {tally.included} events processed")
     log("=" * 60)
     log(f"Events index: {EVENTS_DIR / 'index.html'}")
     log(f"Events data: {DATA_DIR / 'events.json'}")
+    log(f"Events shards: {shards_dir() / CATALOG_NAME}")
     log(f"Event pages: {EVENTS_DIR}/*.html")
 
-    # Analyze quote quality
-    def get_provenance_type(event: Dict[str, Any], reaction_key: str) -> str:
-        """Get the provenance type for a reaction"""
-        prov = event.get('reaction_provenance', {}).get(reaction_key, 'placeholder')
-        if isinstance(prov, str):
-            return prov
-        return prov.get('type', 'placeholder')
-
-    quote_stats = {
-        'real_quotes': 0,
-        'human_summaries': 0,
-        'placeholders': 0,
-        'not_applicable': 0
-    }
-
-    for event in events.values():
-        safety_type = get_provenance_type(event, 'safety_researcher_reaction')
-        media_type = get_provenance_type(event, 'media_reaction')
-
-        # Count based on "best" provenance type for the event
-        if safety_type == 'real_quote' or media_type == 'real_quote':
-            quote_stats['real_quotes'] += 1
-        elif safety_type == 'human_summary' or media_type == 'human_summary':
-            quote_stats['human_summaries'] += 1
-        elif safety_type == 'not_applicable' and media_type == 'not_applicable':
-            quote_stats['not_applicable'] += 1
-        else:
-            quote_stats['placeholders'] += 1
-
     # Create summary report
-    summary = {
-        "sync_timestamp": datetime.now().isoformat(),
-        "total_events_in_source": len(all_events),
-        "included_events": len(events),
-        "excluded_events": len(all_events) - len(events),
-        "categories": len(set(e['category'] for e in events.values())),
-        # Counts only, never the strings or the event ids: this file is written
-        # under public/ and is served from pdoom1.com, so naming which events
-        # carry a contact string would republish a pointer to the thing that was
-        # just redacted. The ids go to the job log, which is not a web page.
-        "pii": {
-            "emails_redacted": emails_found,
-            "events_with_emails": events_with_emails,
-            "obfuscated_contact_suspects": obfuscated_count,
-            "_note": (
-                "emails_redacted are addresses EMAIL_PATTERN matched and replaced. "
-                "obfuscated_contact_suspects are address-shaped strings it cannot "
-                "match (e.g. 'name [at] domain.edu') and therefore did NOT redact -- "
-                "advisory, non-blocking, see pdoom1-website#240."
-            ),
-        },
-        "events_by_rarity": {
-            rarity: len([e for e in events.values() if e['rarity'] == rarity])
-            for rarity in ['common', 'rare', 'legendary']
-        },
-        "year_range": [
-            min(e['year'] for e in events.values()),
-            max(e['year'] for e in events.values())
-        ],
-        "event_status_breakdown": {
-            "newsletter_archive": len([e for e in all_events.values() if e.get('event_status') == 'newsletter_archive']),
-            "excluded": len([e for e in all_events.values() if e.get('event_status') == 'excluded']),
-            "review_needed": len([e for e in events.values() if e.get('event_status') == 'review_needed']),
-            "included": len([e for e in events.values() if e.get('event_status', 'included') == 'included'])
-        },
-        "quote_quality_stats": {
-            "events_with_real_quotes": quote_stats['real_quotes'],
-            "events_with_summaries": quote_stats['human_summaries'],
-            "events_with_placeholders": quote_stats['placeholders'],
-            "events_not_applicable": quote_stats['not_applicable'],
-            "completion_percentage": round((quote_stats['real_quotes'] / len(events)) * 100, 1) if len(events) > 0 else 0.0,
-            "goal_q1_2025": 50,
-            "goal_q2_2025": 100,
-            "goal_end_2025": 300
-        }
-    }
+    summary = tally.summary(pages)
 
     summary_file = DATA_DIR / "events-sync-summary.json"
     with open(summary_file, 'w', encoding='utf-8', newline='\n') as f:
@@ -1935,5 +2430,149 @@ def main():
     log(f"Summary report: {summary_file}")
 
 
+def sync_in_memory(args, tally: SyncTally, fingerprint: str,
+                   manifest: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The default run: the whole corpus in memory, one gate, then the writes.
+    Returns the "pages" block of the summary."""
+    # Load events
+    all_events = load_events_from_pdoom_data(args.pdoom_data_path)
+    for raw in all_events.values():
+        tally.add_source(raw)
+
+    # Filter events (exclude newsletters and explicitly excluded)
+    events = filter_events(all_events)
+
+    # Decide which records need the transform chain and a fresh page. A full
+    # run is simply the plan where every id has changed; both modes share the
+    # code below, so incremental output cannot drift from a full rebuild.
+    hashes = {event_id: event_input_hash(event_id, event)
+              for event_id, event in events.items()}
+    if args.incremental:
+        previous = load_previous_events_json()
+        changed_ids = plan_incremental(hashes, manifest, fingerprint, previous)
+    else:
+        previous = {}
+        changed_ids = list(events)
+    changed = set(changed_ids)
+    recorded = manifest["events"] if manifest else {}
+    removed_ids = sorted(event_id for event_id in recorded if event_id not in events)
+    if args.incremental:
+        log(f"Incremental: {len(changed)} changed, "
+            f"{len(events) - len(changed)} unchanged, {len(removed_ids)} removed")
+
+    # Per-event counters, so an incremental run reports the same totals as a
+    # full one without re-scanning the records it skipped.
+    stats: Dict[str, Dict[str, Any]] = {}
+    for event_id in events:
+        if event_id not in changed:
+            stats[event_id] = {k: recorded[event_id].get(k, 0)
+                               for k in ("urls", "emails", "obfuscated", "images")}
+            events[event_id] = previous[event_id]
+
+    # ONE pass per changed record: URL sanitising, then redaction of
+    # third-party email addresses harvested out of paper PDFs, then the
+    # obfuscated-contact count, then Markdown image stripping. The order is the
+    # safety property and is fixed inside transform_event():
+    #   * URLs first, so the https rewrite still sees whole strings;
+    #   * redaction BEFORE page generation and write_events_json(), so neither
+    #     surface can publish an address -- see redact_pii() for why the whole
+    #     record is walked;
+    #   * the advisory count AFTER redaction, so it reports only what
+    #     EMAIL_PATTERN could not take;
+    #   * images AFTER redaction, so an address inside an image title is still
+    #     caught by the address pass. Neither <p class="description"> nor a
+    #     <meta content="..."> slot renders Markdown, so an image would arrive
+    #     as a literal CDN URL in the reader's face.
+    log("Sanitizing URLs, redacting third-party email addresses and stripping "
+        "Markdown image syntax...")
+    for event_id in changed_ids:
+        events[event_id], stats[event_id] = transform_event(events[event_id])
+    for event_id, event in events.items():
+        tally.add_included(event_id, event, stats[event_id])
+    tally.log_transform()
+
+    # Render EVERYTHING to memory first. Nothing touches disk until the
+    # verification below has passed -- see the "Pre-write verification" block.
+    # In incremental mode "everything" is every CHANGED page plus events.json;
+    # an unchanged page was verified by the run that wrote it, under the same
+    # fingerprint.
+    #
+    # The allowlist is loaded BEFORE rendering so a missing checker refuses
+    # up front, and so --jobs workers are never started for a run that cannot
+    # be verified.
+    is_allowed = load_allowlist()
+    jobs = resolve_jobs(args.jobs)
+    log(f"Generating event detail pages"
+        + (f" across up to {jobs} processes..." if jobs > 1 else "..."))
+    rendered, leaks, disagreements = render_pages(
+        [(event_id, events[event_id]) for event_id in changed_ids], is_allowed, jobs)
+
+    events_json_text = render_events_json(events)
+    json_artefact = {"public/data/events.json": events_json_text}
+    rendered.update(json_artefact)
+    leaks.update(find_published_emails(json_artefact, is_allowed))
+    disagreements.update(find_residue_disagreements(json_artefact, is_allowed))
+
+    # The sharded copy of the same records, staged and gated piece by piece.
+    shards = EventShards()
+    for event_id, event in events.items():
+        shards.add(event_id, event)
+    shards.build(lambda name, text: gate_text(name, text, is_allowed, leaks, disagreements))
+
+    # Both checks already ran inside render_pages(), per shard; this is where
+    # their merged findings decide.
+    if leaks or disagreements:
+        shards.discard()
+    refuse_if_unsafe(leaks, disagreements)
+
+    log(f"Verified {len(rendered) + shards.artefacts} rendered artefacts: no "
+        f"disallowed addresses, and the independent scanner agrees")
+
+    # Verification passed. Only now does anything reach disk.
+    written = 0
+    for name, html_content in rendered.items():
+        if not name.startswith("public/events/"):
+            continue
+        output_file = EVENTS_DIR / Path(name).name
+
+        # newline='\n' pins LF output. Without it, a Windows run writes CRLF;
+        # git's autocrlf clean filter silently REFUSES to normalise any file
+        # that already contains a lone CR (one arXiv description does), so that
+        # page alone would be committed with CRLF and show up as a whole-file
+        # rewrite in every future diff. write_if_changed() writes the encoded
+        # bytes directly, which is the same guarantee.
+        if write_if_changed(output_file, html_content):
+            written += 1
+
+    # Pages for events that left the corpus (or were excluded upstream). Only
+    # ids the manifest records are candidates -- see "Incremental rebuilds".
+    for event_id in removed_ids:
+        stale = EVENTS_DIR / f"{event_id}.html"
+        if stale.exists():
+            stale.unlink()
+    if removed_ids:
+        log(f"Removed {len(removed_ids)} page(s) for events no longer in the corpus")
+
+    log(f"Generated {len(events)} event detail pages "
+        f"({len(changed)} rendered, {written} rewritten)")
+
+    # Write events.json for index page, then its sharded copy
+    write_events_json(events_json_text)
+    shards.publish()
+
+    write_manifest(fingerprint, {
+        event_id: {"hash": hashes[event_id], **stats[event_id]}
+        for event_id in events
+    })
+
+    return {
+        "mode": "incremental" if args.incremental else "full",
+        "rendered": len(changed),
+        "rewritten": written,
+        "unchanged": len(events) - len(changed),
+        "removed": len(removed_ids),
+    }
+
+
 if __name__ == "__main__":
     main()
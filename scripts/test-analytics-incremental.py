@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for incremental, checkpointed log ingestion (extract_analytics.py --incremental).
+
+WHY THIS EXISTS
+---------------
+An incremental run reads only the bytes appended to each log since the last run,
+by an offset stored per file (scripts/analytics_store.py), and reports the window
+from stored per-day aggregates. Getting an offset wrong does not crash anything:
+it silently counts a day twice, or never. So every step of a rotating log's life
+is checked against a full read of every line written so far:
+
+  1. a first run counts everything; a second run with nothing new reads nothing;
+     appended lines are read once, and a half-written last line only when whole;
+  2. rotation: a renamed log resumes where it stopped and keeps what nginx wrote
+     to it after the rename; a compressed one is not read again; a copytruncate
+     starts over; the order the files are listed in does not matter;
+  3. over SSH (run here through `sh -c`, the same shell commands): the probe
+     agrees with the local one, and a file swapped between probe and read is
+     left alone;
+  4. nothing counted twice or lost: a run that dies part way saves nothing, and
+     the next one gets the same answer; a damaged or foreign state is set aside;
+     old days and files are pruned; no address is stored in the clear;
+  5. main() --incremental end to end;
+  6. cost: a run after a small append parses only the appended lines.
+
+Every path is a temp dir; nothing touches the network or the repo's data.
+
+Run:  python scripts/test-analytics-incremental.py     (exit 0 = pass)
+"""
+
+import gzip
+import importlib.util
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+_spec = importlib.util.spec_from_file_location(
+    "extract_analytics", ROOT / "scripts" / "extract_analytics.py")
+ea = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(ea)
+store = ea.analytics_store
+
+TODAY = "2025-11-30"
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+def quiet(fn, *a, **kw):
+    with redirect_stdout(io.StringIO()) as out:
+        r = fn(*a, **kw)
+    return r, out.getvalue()
+
+
+AGENTS = ["Mozilla/5.0 (X11; Linux x86_64)", "Googlebot/2.1", "Mozilla/5.0 (iPhone)"]
+PATHS = ["/", "/index.html", "/blog/", "/blog/post.html", "/assets/app.js", "/leaderboard/"]
+REFS = ["-", "https://google.com/", "https://pdoom1.com/", "https://reddit.com/r/x"]
+_rng = random.Random(5)
+
+
+def lines(n, days=(1, 30), when=None):
+    """n combined-format lines on Nov 2025 days (or on the dates in `when`)."""
+    out = []
+    for i in range(n):
+        if i % 50 == 49:
+            out.append("not a log line")
+            continue
+        d = _rng.choice(when) if when else date(2025, 11, _rng.randint(*days))
+        out.append('10.1.%d.%d - - [%s:%02d:%02d:%02d +0000] "GET %s HTTP/1.1" %d %d "%s" "%s"'
+                   % (_rng.randrange(4), _rng.randrange(60), d.strftime("%d/%b/%Y"),
+                      _rng.randrange(24), _rng.randrange(60), _rng.randrange(60),
+                      _rng.choice(PATHS), _rng.choice([200, 200, 304, 404]),
+                      _rng.randrange(9000), _rng.choice(REFS), _rng.choice(AGENTS)))
+    return out
+
+
+def text(ls):
+    return "".join(l + "\n" for l in ls)
+
+
+def append(path, ls, tail=""):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text(ls) + tail)
+
+
+def normal(a):
+    """Published analytics, minus the timestamp and the order ties happen to take."""
+    a = json.loads(json.dumps(a))
+    a.get("metadata", {}).pop("generated_at", None)
+    for k, key in (("top_pages", "path"), ("top_referrers", "domain")):
+        if k in a:
+            a[k] = sorted(a[k], key=lambda r: r[key])
+    return a
+
+
+def full(ex, ls, start=None, end=None):
+    return normal(quiet(ex.analyze_logs, iter(ls), start, end)[0])
+
+
+def run(ex, state, files, remote=False):
+    """One incremental run over `files`; returns (new lines, output)."""
+    sources = [ea.RemoteLog(ex, str(f)) if remote else ea.LocalLog(f) for f in files]
+    _, out = quiet(ex.ingest, sources, state, TODAY)
+    return ex.lines_fetched, out
+
+
+def reported(ex, state, start=None, end=None):
+    return normal(quiet(ex.analyze_days, state.days, start, end)[0])
+
+
+def lifecycle(ex, d, remote=False):
+    """Walk one log through appends and rotations; yield (label, ok) checks."""
+    state = store.IngestState(d / "state.json")
+    log, log1, log2 = d / "access.log", d / "access.log.1", d / "access.log.2.gz"
+    written = []
+
+    a = lines(800, days=(1, 10))
+    append(log, a)
+    written += a
+    n, _ = run(ex, state, [log, log1, log2], remote)
+    yield "first run counts every line", n == len(a) and reported(ex, state) == full(ex, written)
+
+    n, _ = run(ex, state, [log, log1, log2], remote)
+    yield "a run with nothing new reads nothing", n == 0 and reported(ex, state) == full(ex, written)
+
+    b = lines(300, days=(10, 14))
+    append(log, b, tail=b[0][:40])  # the last line is half-written
+    n, _ = run(ex, state, [log], remote)
+    written += b
+    yield "appended lines are read once, a half-written one is not", (
+        n == len(b) and reported(ex, state) == full(ex, written))
+    c = lines(200, days=(14, 16))
+    with open(log, "a", encoding="utf-8") as f:
+        f.write(b[0][40:] + "\n")
+    append(log, c)
+    n, _ = run(ex, state, [log], remote)
+    written += [b[0]] + c
+    yield "and the finished line is read whole, with what followed", (
+        n == len(c) + 1 and reported(ex, state) == full(ex, written))
+
+    # logrotate renames; nginx keeps writing the renamed file until it reopens
+    os.rename(log, log1)
+    late = lines(50, days=(16, 17))
+    append(log1, late)
+    e = lines(400, days=(17, 20))
+    append(log, e)
+    written += late + e
+    n, out = run(ex, state, [log, log1, log2], remote)
+    yield "rename: the old log resumes at its offset, the new one starts at 0", (
+        n == len(late) + len(e) and reported(ex, state) == full(ex, written))
+    yield "and the rotation is reported", "access.log.1 was " in out and "(rotated)" in out
+
+    with open(log1, "rb") as src, gzip.open(log2, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    log1.unlink()
+    os.rename(log, log1)
+    f_ = lines(300, days=(20, 24))
+    append(log, f_)
+    written += f_
+    n, _ = run(ex, state, [log2, log, log1], remote)
+    yield "compress + rename in any order: only the new log is read", (
+        n == len(f_) and reported(ex, state) == full(ex, written))
+
+    g = lines(150, days=(24, 26))
+    with open(log, "w", encoding="utf-8") as fh:  # copytruncate
+        fh.write(text(g))
+    written += g
+    n, _ = run(ex, state, [log, log1, log2], remote)
+    yield "copytruncate: the truncated log is read from its start", (
+        n == len(g) and reported(ex, state) == full(ex, written))
+    yield "a window is reported from the stored days", (
+        reported(ex, state, "2025-11-05", "2025-11-18")
+        == full(ex, written, "2025-11-05", "2025-11-18"))
+    yield "state", (state, written)
+
+
+tmp = Path(tempfile.mkdtemp())
+cwd = os.getcwd()
+os.chdir(tmp)  # AnalyticsExtractor creates its output dir relative to the cwd
+try:
+    ex = ea.AnalyticsExtractor("unused.pem")
+
+    # =================================================================== 1-2
+    print("\n1-2. One log through appends and rotations (local files)")
+    (tmp / "local").mkdir()
+    for label, ok in lifecycle(ex, tmp / "local"):
+        if label == "state":
+            local_state, local_written = ok
+            continue
+        check(ok, label)
+    local_state.save(TODAY)
+    again = store.IngestState.load(tmp / "local" / "state.json")
+    check(reported(ex, again) == full(ex, local_written) and again.files == local_state.files,
+          "saved and loaded, the state reports the same and resumes at the same offsets")
+
+    # =================================================================== 3
+    print("\n3. The same over SSH (a local shell standing in for the VPS)")
+    ex_remote = ea.AnalyticsExtractor("unused.pem")
+    ex_remote.ssh_argv = lambda cmd: ["sh", "-c", cmd]
+    (tmp / "remote").mkdir()
+    for label, ok in lifecycle(ex_remote, tmp / "remote", remote=True):
+        if label != "state":
+            check(ok, "ssh: " + label)
+    plain, packed = tmp / "remote" / "access.log.1", tmp / "remote" / "access.log.2.gz"
+    r_plain = ea.RemoteLog(ex_remote, str(plain)).probe()
+    r_packed = ea.RemoteLog(ex_remote, str(packed)).probe()
+    check(r_plain == ea.LocalLog(plain).probe(),
+          "the remote probe of a plain log matches the local one (inode, size, first line)")
+    with gzip.open(packed, "rb") as fh:
+        unpacked = len(fh.read())
+    check(r_packed[0] == os.stat(packed).st_ino and r_packed[1] == unpacked
+          and r_packed[2] == ea.LocalLog(packed).probe()[2],
+          "and of a .gz: its uncompressed size and the same fingerprint")
+    got, out = quiet(list, ea.RemoteLog(ex_remote, str(plain)).lines(0, r_plain[0] + 1))
+    check(got == [] and "Could not fetch" in out,
+          "a file that is no longer the inode probed is not read")
+    check(ea.RemoteLog(ex_remote, str(tmp / "remote" / "missing.log")).probe() is None,
+          "a missing log probes as unreadable")
+
+    # =================================================================== 4
+    print("\n4. Nothing counted twice, nothing lost")
+    d = tmp / "crash"
+    d.mkdir()
+    log = d / "access.log"
+    first = lines(500, days=(1, 5))
+    append(log, first)
+    state = store.IngestState(d / "state.json")
+    run(ex, state, [log])
+    state.save(TODAY)
+    saved = (d / "state.json").read_bytes()
+    more = lines(500, days=(5, 9))
+    append(log, more)
+    real_parse, calls = ex.parse_log_line, [0]
+
+    def dying(line):
+        calls[0] += 1
+        if calls[0] == 200:
+            raise KeyboardInterrupt("killed mid-run")
+        return real_parse(line)
+
+    ex.parse_log_line = dying
+    state = store.IngestState.load(d / "state.json")
+    try:
+        quiet(ex.ingest, [ea.LocalLog(log)], state, TODAY)
+    except KeyboardInterrupt:
+        pass
+    ex.parse_log_line = real_parse
+    check((d / "state.json").read_bytes() == saved, "a run that dies part way saves nothing")
+    state = store.IngestState.load(d / "state.json")
+    n, _ = run(ex, state, [log])
+    check(n == len(more) and reported(ex, state) == full(ex, first + more),
+          "and the next run reads the same bytes and gets the full answer")
+
+    (d / "state.json").write_text("{not json", encoding="utf-8")
+    state, out = quiet(store.IngestState.load, d / "state.json")
+    check(not state.files and not state.days.days and "unusable" in out
+          and (d / "state.json.unusable").exists() and not (d / "state.json").exists(),
+          "a damaged state is moved aside and every log is read from the start")
+    (d / "state.json").write_text(json.dumps({"format": 99, "files": {}, "days": {}}),
+                                  encoding="utf-8")
+    state, out = quiet(store.IngestState.load, d / "state.json")
+    check(not state.files and "format 99" in out, "so is a state of another format")
+
+    state = store.IngestState(d / "state.json")
+    old = lines(100, when=[date(2025, 7, 1)])
+    recent = lines(100, when=[date(2025, 11, 20)])
+    (d / "old.log").write_text(text(old), encoding="utf-8")
+    (d / "recent.log").write_text(text(recent), encoding="utf-8")
+    quiet(ex.ingest, [ea.LocalLog(d / "old.log")], state, "2025-07-02")
+    quiet(ex.ingest, [ea.LocalLog(d / "recent.log")], state, TODAY)
+    state.save(TODAY)
+    kept = store.IngestState.load(d / "state.json")
+    check(sorted(kept.days.days) == ["2025-11-20"]
+          and [r["name"] for r in kept.files.values()] == [str(d / "recent.log")],
+          "days and files older than RETAIN_DAYS (%d) are pruned on save" % store.RETAIN_DAYS)
+    body = (d / "state.json").read_text(encoding="utf-8")
+    check("10.1." not in body, "no address is stored in the clear, only its hash")
+
+    # =================================================================== 5
+    print("\n5. main() --incremental")
+    d = tmp / "main"
+    d.mkdir()
+    today = date.today()
+    recent_days = [today - timedelta(days=k) for k in range(1, 4)]
+    log = d / "access.log"
+    everything = lines(600, when=recent_days)
+    append(log, everything)
+    argv = sys.argv
+    out_file = tmp / "public/data/analytics/dreamhost/inc.json"
+    try:
+        base = ["extract_analytics.py", "--incremental", "--state", str(d / "state.json"),
+                "--log-file", str(log), "--days", "7", "--output", "inc.json"]
+        sys.argv = base
+        rc, out = quiet(ea.main)
+        first_doc = normal(json.loads(out_file.read_text(encoding="utf-8")))
+        start = (today - timedelta(days=7)).isoformat()
+        check(rc == 0 and first_doc == full(ex, everything, start, today.isoformat()),
+              "the first run writes the analytics of the whole log")
+        rc, out = quiet(ea.main)
+        check(rc == 0 and "Read 0 new lines" in out
+              and normal(json.loads(out_file.read_text(encoding="utf-8"))) == first_doc,
+              "the second reads nothing and writes the same numbers")
+        extra = lines(100, when=recent_days)
+        append(log, extra)
+        rc, out = quiet(ea.main)
+        check(rc == 0 and "Read %d new lines" % len(extra) in out
+              and normal(json.loads(out_file.read_text(encoding="utf-8")))
+              == full(ex, everything + extra, start, today.isoformat()),
+              "the third reads only what was appended")
+        sys.argv = base[:5] + [str(d / "nowhere.log")] + base[6:]
+        rc, out = quiet(ea.main)
+        check(rc == 1 and "No logs fetched" in out, "no readable log at all: exit 1")
+    finally:
+        sys.argv = argv
+
+    # =================================================================== 6
+    print("\n6. Cost follows the append, not the log")
+    d = tmp / "cost"
+    d.mkdir()
+    log = d / "access.log"
+    append(log, lines(40000, days=(1, 28)))
+    state = store.IngestState(d / "state.json")
+    parsed = [0]
+    ex.parse_log_line = lambda line: (parsed.__setitem__(0, parsed[0] + 1), real_parse(line))[1]
+    t0 = time.perf_counter()
+    run(ex, state, [log])
+    cold = time.perf_counter() - t0
+    append(log, lines(400, days=(28, 29)))
+    parsed[0] = 0
+    t0 = time.perf_counter()
+    n, _ = run(ex, state, [log])
+    warm = time.perf_counter() - t0
+    ex.parse_log_line = real_parse
+    check(n == 400 and parsed[0] == 400, "after a 400-line append, 400 lines are parsed")
+    print("    40k-line log: %.0f ms to read it all, %.0f ms for the append"
+          % (cold * 1e3, warm * 1e3))
+finally:
+    os.chdir(cwd)
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+print()
+if failures:
+    print("%d FAILURE(S)" % len(failures))
+    for f in failures:
+        print("  - " + f)
+    sys.exit(1)
+print("OK: incremental runs read only appended bytes, follow rotation, and always")
+print("    match a full read of every line written.")
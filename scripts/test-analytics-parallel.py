@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for parallel log parsing (extract_analytics.py --jobs N).
+
+WHY THIS EXISTS
+---------------
+--jobs cuts each log into byte ranges, parses them in worker processes and
+merges the partial aggregates in the parent. The promise is not "about the
+same": it is the serial output, byte for byte, including which page wins a tie
+in a top list. A chunk boundary one byte off drops or doubles a line and still
+prints plausible numbers, so this checks:
+
+  1. chunks: every range starts on a line, they tile the file exactly, and read
+     back they are the serial read's lines -- CRLF endings, invalid UTF-8 and a
+     last line without its newline included; a .gz, a small or a missing file
+     is one chunk;
+  2. merge: aggregators of consecutive slices, merged in order, ARE the
+     aggregator of the whole, ties and all -- and merged out of order they are
+     not, which is why the parent keeps the order;
+  3. bit-identical: across 1 to 4 processes and several chunk sizes, over plain,
+     CRLF and .gz logs with junk and a date window, the analytics match the
+     serial analyze_logs(fetch_logs()) exactly;
+  4. the memoised parser: each field is parsed as strptime / SHA-256 / urlparse
+     would, a bad timestamp or referrer is handled as before, and on a
+     time-ordered log a timestamp is parsed once per distinct second;
+  5. main() --jobs writes the same file as a serial run, and logs fetched over
+     SSH (here through `sh -c`) are spooled unchanged and give the same result.
+
+Every path is a temp dir; nothing touches the network or the repo's data.
+
+Run:  python scripts/test-analytics-parallel.py     (exit 0 = pass)
+"""
+
+import gzip
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlparse
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+_spec = importlib.util.spec_from_file_location(
+    "extract_analytics", ROOT / "scripts" / "extract_analytics.py")
+ea = importlib.util.module_from_spec(_spec)
+# Workers find _aggregate_chunk and LogAggregator by module name when results
+# cross the process boundary, as they would under `python extract_analytics.py`.
+sys.modules["extract_analytics"] = ea
+_spec.loader.exec_module(ea)
+
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+def quiet(fn, *a, **kw):
+    with redirect_stdout(io.StringIO()) as out:
+        r = fn(*a, **kw)
+    return r, out.getvalue()
+
+
+AGENTS = ["Mozilla/5.0 (X11; Linux x86_64)", "Googlebot/2.1", "Mozilla/5.0 (iPhone)",
+          "curl/8.4.0"]
+PATHS = ["/", "/index.html", "/blog/", "/blog/post.html", "/assets/app.js",
+         "/leaderboard/", "/events/%d.html"]
+REFS = ["-", "-", "https://google.com/", "https://pdoom1.com/", "https://reddit.com/r/x",
+        "http://[broken", "not a url"]
+
+
+def log_lines(n, seed, day=1, zones=("+0000", "+0000", "-0500", "+0130")):
+    """n time-ordered lines from `day` on, with junk, blanks and odd bytes."""
+    rng = random.Random(seed)
+    t = day * 86400
+    for i in range(n):
+        t += rng.choice((0, 0, 0, 1, 2, 7))
+        if i % 89 == 0:
+            yield rng.choice(["", "   ", "garbage line",
+                              '1.2.3.4 - - [bad date] "GET / HTTP/1.1" 200 1 "-" "x"'])
+            continue
+        path = rng.choice(PATHS)
+        if "%d" in path:
+            path %= rng.randrange(60)
+        d, s = divmod(t, 86400)
+        yield ('10.0.%d.%d - - [%02d/Nov/2025:%02d:%02d:%02d %s] "GET %s HTTP/1.1" %d %d "%s" "%s"'
+               % (rng.randrange(4), rng.randrange(250), min(d, 30), s // 3600, s // 60 % 60,
+                  s % 60, rng.choice(zones), path,
+                  rng.choice((200, 200, 200, 304, 404)), rng.randrange(50000),
+                  rng.choice(REFS), rng.choice(AGENTS)))
+
+
+def write(path, lines, newline="\n", tail=True, extra=b""):
+    body = newline.join(lines).encode("utf-8") + extra + (newline.encode() if tail else b"")
+    if str(path).endswith(".gz"):
+        with gzip.open(path, "wb") as f:
+            f.write(body)
+    else:
+        Path(path).write_bytes(body)
+    return path
+
+
+def comparable(analytics):
+    analytics = json.loads(json.dumps(analytics))
+    analytics.get("metadata", {}).pop("generated_at", None)
+    return json.dumps(analytics, indent=1)
+
+
+def serial(ex, files, start=None, end=None):
+    return comparable(ex.analyze_logs(ex.fetch_logs(log_files=files), start, end))
+
+
+def oracle_parse(line):
+    """parse_log_line() as it was before memoisation, field for field."""
+    match = ea.LOG_PATTERN.match(line)
+    if not match:
+        return None
+    data = match.groupdict()
+    try:
+        dt = datetime.strptime(data['timestamp'], '%d/%b/%Y:%H:%M:%S %z')
+    except ValueError:
+        return None
+    data.update(datetime=dt, date=dt.date().isoformat(), hour=dt.hour)
+    data['ip_hash'] = hashlib.sha256(data.pop('ip').encode()).hexdigest()[:16]
+    data['status'], data['size'] = int(data['status']), int(data['size'])
+    if data['referrer'] == '-':
+        data['referrer'] = None
+    else:
+        try:
+            data['referrer_domain'] = urlparse(data['referrer']).netloc
+        except ValueError:
+            data['referrer_domain'] = None
+    ua = data['user_agent'].lower()
+    data['is_bot'] = any(b in ua for b in ['bot', 'crawler', 'spider', 'scraper', 'curl', 'wget'])
+    return data
+
+
+tmp = Path(tempfile.mkdtemp())
+cwd = os.getcwd()
+os.chdir(tmp)  # AnalyticsExtractor creates its output dir relative to the cwd
+try:
+    ex = ea.AnalyticsExtractor("unused.pem")
+    ea.MIN_CHUNK_BYTES = 16 * 1024  # small logs, many chunks
+
+    plain = write(tmp / "access.log", list(log_lines(6000, seed=1, day=20)))
+    crlf = write(tmp / "crlf.log", list(log_lines(3000, seed=2, day=12)), newline="\r\n",
+                 tail=False)
+    odd = write(tmp / "odd.log", list(log_lines(2500, seed=3, day=9)),
+                extra=b"\n10.0.0.9 - - [09/Nov/2025:23:59:59 +0000] \"GET /caf\xc3\xa9/ HTTP/1.1\" "
+                      b"200 5 \"-\" \"bad \xff\xfe bytes\"")
+    rotated = write(tmp / "access.log.2.gz", list(log_lines(4000, seed=4, day=2)))
+    tiny = write(tmp / "tiny.log", list(log_lines(20, seed=5, day=1)))
+    logs = [str(p) for p in (plain, crlf, odd, rotated, tiny)]
+
+    # =================================================================== 1
+    print("\n1. Chunks")
+    ok_tile, ok_lines, counts = True, True, []
+    for path in (plain, crlf, odd):
+        data = path.read_bytes()
+        chunks = ea.plan_chunks(str(path), 4)
+        counts.append(len(chunks))
+        ok_tile = ok_tile and (
+            chunks[0][1] == 0 and chunks[-1][2] == len(data)
+            and all(a[2] == b[1] for a, b in zip(chunks, chunks[1:]))
+            and all(data[lo - 1:lo] == b"\n" for _, lo, _ in chunks[1:])
+            and all(lo < hi for _, lo, hi in chunks))
+        pieces = []
+        for _, lo, hi in chunks:
+            with ea.open_log_range(str(path), lo, hi) as f:
+                pieces.extend(f)
+        with ea.open_log(str(path)) as f:
+            ok_lines = ok_lines and pieces == list(f)
+    check(all(n == 16 for n in counts) and ok_tile,
+          "4 jobs -> 16 ranges per file, each starting on a line, tiling the file: %s" % counts)
+    check(ok_lines, "read back in order they are the serial read's lines "
+                    "(CRLF, invalid UTF-8, no final newline)")
+    check([len(ea.plan_chunks(str(p), 4)) for p in (rotated, tiny, tmp / "missing.log")]
+          == [1, 1, 1] and ea.plan_chunks(str(rotated), 4)[0][2] is None,
+          "a .gz, a file under two chunks and a missing file are one chunk each")
+    check(len(ea.plan_chunks(str(plain), 1)) == 4,
+          "even one job gets several chunks, so nothing is special about --jobs 1")
+
+    # =================================================================== 2
+    print("\n2. Merge")
+    lines = list(log_lines(4000, seed=6, day=3))
+    # a tie for first place, the two pages first seen in different slices
+    lines[10:10] = ['10.0.0.1 - - [03/Nov/2025:00:00:01 +0000] "GET /tie-b/ HTTP/1.1" 200 1 "-" "x"'] * 999
+    lines[3000:3000] = ['10.0.0.1 - - [03/Nov/2025:00:00:01 +0000] "GET /tie-a/ HTTP/1.1" 200 1 "-" "x"'] * 999
+
+    def aggregate(part):
+        agg = ea.LogAggregator("2025-11-03", "2025-11-20")
+        for line in part:
+            entry = ea.parse_log_line(line) if line.strip() else None
+            if entry:
+                agg.add(entry)
+        return agg
+
+    whole = comparable(aggregate(lines).result())
+    slices = [lines[i:i + 700] for i in range(0, len(lines), 700)]
+    merged = ea.LogAggregator("2025-11-03", "2025-11-20")
+    for part in slices:
+        merged.merge(aggregate(part))
+    check(comparable(merged.result()) == whole,
+          "%d slices merged in order are the aggregate of the whole" % len(slices))
+    backwards = ea.LogAggregator("2025-11-03", "2025-11-20")
+    for part in reversed(slices):
+        backwards.merge(aggregate(part))
+    top = [p["path"] for p in json.loads(whole)["top_pages"][:2]]
+    rtop = [p["path"] for p in backwards.result()["top_pages"][:2]]
+    check(top == ["/tie-b/", "/tie-a/"] and rtop == ["/tie-a/", "/tie-b/"],
+          "merged out of order, a tie goes the other way (%s vs %s): order matters" % (top, rtop))
+    empty = ea.LogAggregator().merge(ea.LogAggregator())
+    check(empty.result() == {"error": "No valid log entries found"}
+          and comparable(aggregate(lines).merge(ea.LogAggregator()).result()) == whole,
+          "merging an empty aggregator changes nothing")
+
+    # =================================================================== 3
+    print("\n3. Bit-identical to the serial path")
+    reference, out = quiet(serial, ex, logs)
+    ref_lines = ex.lines_fetched
+    fetched = sorted(l for l in out.splitlines() if "Fetched" in l)
+    ok, seen = True, []
+    for jobs in (1, 2, 3, 4):
+        for chunk_kb in (16, 64):
+            ea.MIN_CHUNK_BYTES = chunk_kb * 1024
+            got, out = quiet(ex.analyze_files, logs, jobs=jobs)
+            same = (comparable(got) == reference and ex.lines_fetched == ref_lines
+                    and sorted(l for l in out.splitlines() if "Fetched" in l) == fetched)
+            seen.append("%d/%dk%s" % (jobs, chunk_kb, "" if same else " DIFFERS"))
+            ok = ok and same
+    check(ok, "same analytics, line count and per-file counts at every jobs/chunk size: "
+              + ", ".join(seen))
+    ea.MIN_CHUNK_BYTES = 16 * 1024
+    window, _ = quiet(serial, ex, logs, "2025-11-09", "2025-11-21")
+    got, out = quiet(ex.analyze_files, logs, "2025-11-09", "2025-11-21", jobs=4)
+    check(comparable(got) == window and "across 4 processes" in out,
+          "and with a date window, across 4 processes")
+    got, out = quiet(ex.analyze_files, logs + [str(tmp / "missing.log")], jobs=3)
+    check(comparable(got) == reference and "Error reading %s" % (tmp / "missing.log") in out,
+          "a missing file warns and leaves the rest as they were")
+
+    # =================================================================== 4
+    print("\n4. The memoised parser")
+    sample = list(log_lines(3000, seed=7, day=15)) + [
+        '10.0.0.1 - - [31/Nov/2025:00:00:00 +0000] "GET / HTTP/1.1" 200 1 "-" "x"',
+        '10.0.0.1 - - [01/Nov/2025:00:00:00 +0000] "GET / HTTP/1.1" 200 1 "http://[::1" "x"']
+    check(all(ea.parse_log_line(l) == oracle_parse(l) for l in sample),
+          "every field as strptime, SHA-256, urlparse and the bot scan give it "
+          "(a 31 November and an unparseable referrer included)")
+    rng = random.Random(11)
+    stamps = ["%02d/%s/%04d:%02d:%02d:%02d %s%02d%02d"
+              % (rng.randint(0, 32), rng.choice(list(ea.MONTHS) + ["NOV", "Sept"]),
+                 rng.choice((2024, 2025, 0)), rng.randint(0, 25), rng.randint(0, 61),
+                 rng.randint(0, 61), rng.choice("+-"), rng.randint(0, 25), rng.randint(0, 61))
+              for _ in range(3000)] + ["01/Nov/2025:00:00:00 Z", "1/Nov/2025:1:2:3 +01:30"]
+
+    def strptime(stamp):
+        try:
+            dt = datetime.strptime(stamp, '%d/%b/%Y:%H:%M:%S %z')
+        except ValueError:
+            return None
+        return dt, dt.date().isoformat(), dt.hour, dt.utcoffset()
+
+    got = [ea.parse_timestamp(t) for t in stamps]
+    got = [g and g + (g[0].utcoffset(),) for g in got]
+    check(got == [strptime(t) for t in stamps] and None in got and any(got),
+          "%d fuzzed timestamps (impossible days, hours, seconds and zones among them) "
+          "parse exactly as strptime parses them" % len(stamps))
+    ea.parse_timestamp.cache_clear()
+    ordered = list(log_lines(5000, seed=8, day=4, zones=("+0000",)))
+    for l in ordered:
+        ea.parse_log_line(l)
+    seconds = len({m.group("timestamp") for m in map(ea.LOG_PATTERN.match, ordered) if m})
+    info = ea.parse_timestamp.cache_info()
+    check(info.misses == seconds and info.hits > info.misses,
+          "timestamps parsed %d times for %d distinct seconds in %d lines"
+          % (info.misses, seconds, len(ordered)))
+    check(ex.anonymize_ip("10.0.0.1") == hashlib.sha256(b"10.0.0.1").hexdigest()[:16]
+          and ex.parse_log_line(sample[1]) == ea.parse_log_line(sample[1]),
+          "the extractor's methods are the module's parser")
+
+    # =================================================================== 5
+    print("\n5. main() --jobs, and over SSH")
+    argv = sys.argv
+    written = {}
+    try:
+        for jobs in ("1", "3"):
+            sys.argv = ["extract_analytics.py", "--month", "2025-11", "--jobs", jobs,
+                        "--output", "jobs-%s.json" % jobs] + sum((["--log-file", f] for f in logs), [])
+            rc, out = quiet(ea.main)
+            written[jobs] = (rc, json.loads((ex.output_dir / ("jobs-%s.json" % jobs))
+                                            .read_text(encoding="utf-8")))
+    finally:
+        sys.argv = argv
+    check(written["1"][0] == written["3"][0] == 0
+          and comparable(written["1"][1]) == comparable(written["3"][1]),
+          "main() --jobs 3 writes exactly what --jobs 1 does")
+
+    remote = ea.AnalyticsExtractor("unused.pem")
+    remote.ssh_argv = lambda cmd: ["sh", "-c", cmd]
+    remote.remote_log_files = lambda days: [str(plain), str(rotated), str(tmp / "gone.log")]
+    over_ssh, _ = quiet(lambda: comparable(remote.analyze_logs(remote.fetch_logs(30))))
+    spool = tmp / "spool"
+    spool.mkdir()
+    spooled, out = quiet(remote.spool_logs, 30, spool)
+    check(list(spooled.values()) == [str(plain), str(rotated), str(tmp / "gone.log")]
+          and (spool / "access.log").read_bytes() == plain.read_bytes()
+          and (spool / "access.log.2.gz").read_bytes() == rotated.read_bytes()
+          and "Could not fetch %s" % (tmp / "gone.log") in out,
+          "remote logs are spooled byte for byte (.gz still compressed); a missing one warns")
+    got, out = quiet(remote.analyze_files, list(spooled), jobs=4, labels=spooled)
+    check(comparable(got) == over_ssh and "Fetched 6000 lines from %s" % plain in out,
+          "and analysed in parallel they give the streamed result, under their remote names")
+
+    # ------------------------------------------------------------------ cost
+    ea.MIN_CHUNK_BYTES = 1024 * 1024
+    big = write(tmp / "big.log", list(log_lines(60000, seed=9, day=1)))
+    t0 = time.perf_counter()
+    one, _ = quiet(serial, ex, [str(big)])
+    t1 = time.perf_counter()
+    many, _ = quiet(ex.analyze_files, [str(big)], jobs=os.cpu_count() or 1)
+    t2 = time.perf_counter()
+    print("    60,000 lines: serial %.2f s, --jobs %d %.2f s (%d CPU)"
+          % (t1 - t0, os.cpu_count() or 1, t2 - t1, os.cpu_count() or 1))
+    check(comparable(many) == one, "same result on a larger log with one chunk per CPU")
+finally:
+    os.chdir(cwd)
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+print()
+if failures:
+    print("%d FAILURE(S)" % len(failures))
+    for f in failures:
+        print("  - " + f)
+    sys.exit(1)
+print("OK: parallel parsing reads every line once and merges to exactly the")
+print("    serial analytics, whatever the worker count or chunk size.")
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the HyperLogLog visitor sketches in scripts/analytics_store.py.
+
+WHY THIS EXISTS
+---------------
+Unique visitors used to be a set of hashed addresses per day, plus one for the
+whole window. They are now HyperLogLog sketches: one per day, and one per day for
+each page, merged to answer any range. A sketch that is quietly wrong still prints
+a plausible number, so this pins down what the numbers are allowed to be:
+
+  1. accuracy: from 0 to 100,000 visitors the estimate is within three standard
+     errors of the exact count (and exact-ish when there are only a handful);
+  2. merging IS union: the merge of two sketches is register for register the
+     sketch of the combined visitors, in any order, any number of times; sketches
+     of different precision refuse to merge;
+  3. bounded: a sketch is the same size at 100 visitors or 100,000, and its
+     serialised form round-trips; a damaged one is refused;
+  4. ranges: site and per-page uniques over any span of stored days, from the
+     sketches alone, match the exact distinct count -- and are not the sum of the
+     daily numbers, which is why the sketches are kept;
+  5. the state holds no address hash, a pre-sketch (format 1) state is set aside
+     and reread, and `analytics_store.py --from/--to/--path` reports a range.
+
+Run:  python scripts/test-analytics-sketch.py     (exit 0 = pass)
+"""
+
+import io
+import json
+import random
+import shutil
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+import analytics_store as store  # noqa: E402
+
+failures = []
+SE = {12: 1.04 / 64, 10: 1.04 / 32}  # 1.04 / sqrt(2**p)
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+def quiet(fn, *a, **kw):
+    with redirect_stdout(io.StringIO()) as out:
+        r = fn(*a, **kw)
+    return r, out.getvalue()
+
+
+def anonymize(ip):
+    """The extractor's hash, without constructing an extractor."""
+    import hashlib
+    return hashlib.sha256(ip.encode()).hexdigest()[:16]
+
+
+def addresses(n, seed=0):
+    rng = random.Random(seed)
+    seen = set()
+    while len(seen) < n:
+        seen.add("%d.%d.%d.%d" % (rng.randint(1, 223), rng.randrange(256),
+                                  rng.randrange(256), rng.randrange(1, 255)))
+    return [anonymize(ip) for ip in sorted(seen)]
+
+
+def sketch(hashes, p=store.VISITOR_PRECISION):
+    sk = store.HyperLogLog(p)
+    for h in hashes:
+        sk.add(h)
+    return sk
+
+
+def near(est, exact, p=store.VISITOR_PRECISION):
+    return abs(est - exact) <= max(2, 3 * SE[p] * exact)
+
+
+tmp = Path(tempfile.mkdtemp())
+try:
+    # =================================================================== 1
+    print("\n1. Accuracy")
+    pool = addresses(100000)
+    rows = []
+    for n in (0, 1, 5, 40, 300, 2000, 10000, 100000):
+        est = sketch(pool[:n]).count()
+        rows.append((n, est))
+    check(all(near(est, n) for n, est in rows),
+          "site sketch within 3 standard errors (%.1f%%) at every size: %s"
+          % (300 * SE[12], ", ".join("%d~%d" % r for r in rows)))
+    check(rows[0][1] == 0 and rows[1][1] == 1 and rows[2][1] == 5,
+          "no visitors counts 0, and a handful count exactly")
+    page = sketch(pool[:5000], store.PAGE_PRECISION).count()
+    check(near(page, 5000, store.PAGE_PRECISION),
+          "page sketch (precision 10): 5000 visitors ~ %d" % page)
+    dupes = sketch(pool[:1000] * 20).count()
+    check(dupes == sketch(pool[:1000]).count(), "a visitor seen 20 times counts once")
+
+    # =================================================================== 2
+    print("\n2. Merging is union")
+    a, b = pool[:30000], pool[20000:45000]
+    merged = sketch(a).merge(sketch(b))
+    check(merged == sketch(a + b), "merge(A, B) is exactly the sketch of A and B together")
+    check(sketch(b).merge(sketch(a)) == merged and merged.copy().merge(merged) == merged,
+          "in either order, and merging a sketch into itself changes nothing")
+    check(near(merged.count(), 45000), "overlap counted once: %d for 45000" % merged.count())
+    try:
+        sketch(a).merge(sketch(b, store.PAGE_PRECISION))
+        refused = False
+    except ValueError:
+        refused = True
+    check(refused, "sketches of different precision refuse to merge")
+
+    # =================================================================== 3
+    print("\n3. Bounded, and round-trips")
+    small, big = sketch(pool[:100]), sketch(pool)
+    check(len(small.registers) == len(big.registers) == 4096,
+          "4096 registers at 100 visitors and at 100,000")
+    check(len(big.to_json()) < 4096 * 4 // 3 + 16 and len(small.to_json()) < 400,
+          "serialised: %d bytes at 100,000, %d at 100" % (len(big.to_json()),
+                                                           len(small.to_json())))
+    check(store.HyperLogLog.from_json(big.to_json()) == big
+          and store.HyperLogLog.from_json(small.to_json()) == small, "and round-trips exactly")
+    bad = []
+    for text in ("12:not base64!", "12:" + small.to_json().split(":")[1][:-8],
+                 "10:" + small.to_json().split(":")[1], "x:"):
+        try:
+            store.HyperLogLog.from_json(text)
+        except ValueError:
+            bad.append(text)
+    check(len(bad) == 4, "a damaged, truncated or mislabelled sketch is refused")
+
+    # =================================================================== 4
+    print("\n4. Uniques over any range, from sketches alone")
+    rng = random.Random(3)
+    days = store.DailyAggregates()
+    exact_days, exact_pages = {}, {}
+    start = date(2025, 11, 1)
+    for k in range(30):
+        d = (start + timedelta(days=k)).isoformat()
+        regulars = pool[:3000]           # come back every day
+        passing = pool[3000 + k * 1500: 3000 + (k + 1) * 1500]
+        visitors = rng.sample(regulars, 800) + passing
+        exact_days[d] = set(visitors)
+        for h in visitors:
+            path = rng.choice(["/", "/blog/", "/leaderboard/"])
+            exact_pages.setdefault((d, path), set()).add(h)
+            days.add({"date": d, "is_bot": False, "ip_hash": h, "size": 100,
+                      "status": 200, "path": path, "hour": 1})
+    ok = True
+    for lo, hi in (("2025-11-01", "2025-11-01"), ("2025-11-01", "2025-11-07"),
+                   ("2025-11-10", "2025-11-24"), (None, None)):
+        exact = set().union(*(v for d, v in exact_days.items()
+                              if (not lo or d >= lo) and (not hi or d <= hi)))
+        est = days.visitors(lo, hi).count()
+        ok = ok and near(est, len(exact))
+        print("    %s..%s: %d exact, %d estimated" % (lo or "first", hi or "last", len(exact), est))
+    check(ok, "site uniques for a day, a week, a fortnight and everything")
+    exact = set().union(*(v for (d, p), v in exact_pages.items()
+                          if p == "/blog/" and "2025-11-08" <= d <= "2025-11-21"))
+    est = days.page_visitors("/blog/", "2025-11-08", "2025-11-21").count()
+    check(near(est, len(exact), store.PAGE_PRECISION),
+          "per-page uniques over a range: /blog/ %d exact, %d estimated" % (len(exact), est))
+    summed = sum(days.visitors(d, d).count() for d in exact_days)
+    check(summed > 1.3 * days.visitors().count(),
+          "and not additive: the daily estimates sum to %d for %d distinct visitors"
+          % (summed, days.visitors().count()))
+    check(days.page_visitors("/nowhere/").count() == 0, "a page never seen has no visitors")
+
+    # =================================================================== 5
+    print("\n5. The state file")
+    state = store.IngestState(tmp / "state.json")
+    state.days = days
+    state.save("2025-11-30")
+    body = (tmp / "state.json").read_text(encoding="utf-8")
+    check(not any(h in body for h in pool[:4000]), "no address hash is stored, only sketches")
+    loaded = store.IngestState.load(tmp / "state.json")
+    check(loaded.days.visitors().count() == days.visitors().count()
+          and loaded.days.page_visitors("/blog/") == days.page_visitors("/blog/"),
+          "saved and loaded, every range gives the same answer")
+    (tmp / "old.json").write_text(json.dumps(
+        {"format": 1, "files": {}, "days": {"2025-11-01": {"visitors": pool[:3]}}}),
+        encoding="utf-8")
+    old, out = quiet(store.IngestState.load, tmp / "old.json")
+    check(not old.days.days and "format 1" in out and (tmp / "old.json.unusable").exists(),
+          "a format-1 state (visitor sets) is set aside and the logs are reread")
+    argv = sys.argv
+    try:
+        sys.argv = ["analytics_store.py", "--state", str(tmp / "state.json"),
+                    "--from", "2025-11-08", "--to", "2025-11-21", "--path", "/blog/"]
+        rc, out = quiet(store.main)
+        check(rc == 0 and "2025-11-08 to 2025-11-21 (14 stored days)" in out
+              and "unique visitors: %d" % days.visitors("2025-11-08", "2025-11-21").count() in out
+              and "/blog/: %d" % est in out,
+              "the CLI reports a range's site and page uniques")
+    finally:
+        sys.argv = argv
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+print()
+if failures:
+    print("%d FAILURE(S)" % len(failures))
+    for f in failures:
+        print("  - " + f)
+    sys.exit(1)
+print("OK: visitor sketches are accurate, merge as unions, stay small, and answer")
+print("    any range of days without the hashes that built them.")
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the live board's delta log: publish-live-board.py writes it,
+public/assets/js/board-delta.js applies it.
+
+WHY THIS EXISTS
+---------------
+Two programs in two languages have to agree about one board. The publisher computes
+what changed between two revisions of leaderboard.json; an open leaderboard page
+applies those changes to the revision it loaded. If they disagree by a single entry,
+the page shows a board nobody published -- and it looks exactly like a real one. So
+the property is checked the only way that proves it: publish a sequence of real
+revisions, then have node apply the log to EVERY earlier revision and compare the
+result with the board a fresh load would get.
+
+  1. the delta: new, changed (same uuid), removed and uuid-less duplicate entries are
+     each named; a run with no change writes nothing and does not bump the revision,
+     but restores a missing log (empty, at the board's revision);
+  2. the log: it continues across revisions, restarts on a new board key or on a
+     board written without a revision, and is trimmed to MAX_DELTAS with
+     oldest_base moving up;
+  3. agreement: from every revision the log reaches, node's applyBoardDelta() yields
+     exactly the published board; from anywhere else, or after tampering, it says
+     "reload" (null) rather than guessing;
+  4. size: one new score on a 400-entry board is a delta of a few KB.
+
+The network is never used: probe_board and get_json are stubs, and every path the
+publisher writes is redirected into a temp dir. Section 3 needs node; CI has it.
+
+Run:  python scripts/test-board-delta.py     (exit 0 = pass)
+"""
+
+import importlib.util
+import io
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+_spec = importlib.util.spec_from_file_location(
+    "publish_live_board", ROOT / "scripts" / "publish-live-board.py")
+pub = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pub)
+DELTA_JS = ROOT / "public" / "assets" / "js" / "board-delta.js"
+
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+def row(n, score, **extra):
+    e = {"score": score, "player_name": "P%d" % (n % 7), "date": "2026-08-%02dT10:00:00"
+         % (1 + n % 28), "game_mode": "v0.14.%d" % (n % 2), "entry_uuid": "u-%04d" % n,
+         "doom_integral": round((n * 37 % 11) / 4, 2)}
+    e.update(extra)
+    return e
+
+
+class Board:
+    """The live API, as the publisher sees it: one board per (seed, epoch)."""
+
+    def __init__(self, tmp):
+        self.rows = {}
+        self.saved = {k: getattr(pub, k) for k in
+                      ("ROOT", "BOARD_JSON", "PUBLISHED_JSON", "TARGETS_JSON", "DELTA_JSON")}
+        self.saved_live = {k: getattr(pub.liveness, k) for k in
+                           ("probe_board", "get_json", "derive_targets", "CACHE_PATH")}
+        pub.ROOT = tmp
+        pub.BOARD_JSON = tmp / "leaderboard.json"
+        pub.PUBLISHED_JSON = tmp / "published-board.json"
+        pub.TARGETS_JSON = tmp / "board-probe-targets.json"
+        pub.DELTA_JSON = tmp / "leaderboard-delta.json"
+        pub.liveness.CACHE_PATH = tmp / ".board-cache" / "responses.json"
+        self.epoch("L4")
+        pub.liveness.probe_board = self.probe
+        pub.liveness.get_json = self.get_json
+        pub.liveness.derive_targets = lambda a, b: (sorted({s for s, _ in self.rows}), [], [])
+
+    def epoch(self, value):
+        pub.TARGETS_JSON.write_text(json.dumps(
+            {"current_ladder_epoch": {"value": value, "source": "test"}}), encoding="utf-8")
+
+    def probe(self, seed, version):
+        rows = self.rows.get((seed, version), [])
+        return {"seed": seed, "version": version, "key_shape": "epoch", "entries": len(rows),
+                "players": 1, "player_names": [], "builds_seen": [],
+                "last_entry": max((r["date"] for r in rows), default=None)}
+
+    def get_json(self, url, headers=None, timeout=20):
+        import urllib.parse as up
+        q = up.parse_qs(up.urlparse(url).query)
+        return {"ok": True, "entries": list(self.rows.get((q["seed"][0], q["version"][0]), []))}, None
+
+    def restore(self):
+        for k, v in self.saved.items():
+            setattr(pub, k, v)
+        for k, v in self.saved_live.items():
+            setattr(pub.liveness, k, v)
+
+
+def publish():
+    sys.argv = ["publish-live-board.py", "--no-cache"]
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        code = pub.main()
+    return code, buf.getvalue()
+
+
+def read(path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def node_apply(cases):
+    """[(board, log)] -> [result board or None], through the shipped board-delta.js."""
+    script = ("const {applyBoardDelta} = require(%s);"
+              "const cases = JSON.parse(require('fs').readFileSync(0, 'utf8'));"
+              "process.stdout.write(JSON.stringify(cases.map(([b, l]) => {"
+              "  const r = applyBoardDelta(b, l); return r && r.board; })));"
+              % json.dumps(str(DELTA_JS)))
+    out = subprocess.run(["node", "-e", script], input=json.dumps(cases), text=True,
+                         encoding="utf-8", capture_output=True, check=True)
+    return json.loads(out.stdout)
+
+
+def comparable(board):
+    m = board["meta"]
+    return (board["entries"], board["data_status"], m["revision"], m["total_entries"],
+            m["total_players"], m["builds_seen"], m["board_key"])
+
+
+tmp = Path(tempfile.mkdtemp())
+api = Board(tmp)
+try:
+    KEY = ("weekly-2026-w33", "L4")
+
+    # =================================================================== 1
+    print("\n1. The delta")
+    api.rows[KEY] = [row(i, 100 - i) for i in range(5)]
+    publish()
+    boards = {1: read(pub.BOARD_JSON)}
+    log = read(pub.DELTA_JSON)
+    check(boards[1]["meta"]["revision"] == 1 and log["deltas"] == []
+          and log["oldest_base"] == 1, "the first publish is revision 1 with an empty log")
+
+    code, out = publish()
+    check(read(pub.BOARD_JSON) == boards[1] and "Nothing written" in out,
+          "no change: nothing written, revision still 1")
+    pub.DELTA_JSON.unlink()
+    code, out = publish()
+    check(read(pub.BOARD_JSON) == boards[1]
+          and pub.DELTA_JSON.exists() and read(pub.DELTA_JSON) == log
+          and "Wrote only the missing" in out,
+          "no change but no log: the empty log at revision 1 is written, the board is not")
+
+    api.rows[KEY] = (api.rows[KEY][1:]                                   # u-0000 gone
+                     + [row(9, 250)]                                       # new
+                     + [{"score": 7, "player_name": "anon", "date": "2026-08-09"}] * 2)
+    api.rows[KEY][0] = dict(api.rows[KEY][0], score=120)                  # u-0001 changed
+    publish()
+    boards[2] = read(pub.BOARD_JSON)
+    d = read(pub.DELTA_JSON)["deltas"][-1]
+    ups = {e.get("entry_uuid") for e in d["upsert"]}
+    check(d["revision"] == 2 and d["remove"] == ["u-0000"],
+          "a vanished entry is removed by its uuid")
+    check(ups == {"u-0009", "u-0001", None} and len(d["upsert"]) == 4,
+          "new, changed and two identical uuid-less entries are upserted (%d)"
+          % len(d["upsert"]))
+    check(d["total_entries"] == len(boards[2]["entries"]) == 7, "and the total is stated")
+
+    api.rows[KEY] = api.rows[KEY][:-1]                                    # one duplicate gone
+    publish()
+    boards[3] = read(pub.BOARD_JSON)
+    d = read(pub.DELTA_JSON)["deltas"][-1]
+    check(d["upsert"] == [] and d["remove"] == [{"score": 7, "player_name": "anon",
+                                                  "date": "2026-08-09"}],
+          "one of two identical uuid-less entries removed: named by content, once")
+
+    # =================================================================== 2
+    print("\n2. The log")
+    for i in range(10, 10 + pub.MAX_DELTAS):
+        api.rows[KEY] = api.rows[KEY] + [row(i, i // 3)]             # score ties
+        publish()
+        boards[read(pub.BOARD_JSON)["meta"]["revision"]] = read(pub.BOARD_JSON)
+    log = read(pub.DELTA_JSON)
+    last = log["revision"]
+    check(last == 3 + pub.MAX_DELTAS and len(log["deltas"]) == pub.MAX_DELTAS,
+          "the log keeps the newest %d deltas (revision %d)" % (pub.MAX_DELTAS, last))
+    check(log["oldest_base"] == last - pub.MAX_DELTAS,
+          "and oldest_base moved up to %d" % log["oldest_base"])
+    check([x["revision"] for x in log["deltas"]] == list(range(log["oldest_base"] + 1, last + 1)),
+          "deltas are contiguous and in order")
+    ranked = boards[last]["entries"]
+    order = [(-(e.get("score") or 0), -(e.get("doom_integral") or 0)) for e in ranked]
+    check(order == sorted(order) and len(set(e["score"] for e in ranked)) < len(ranked),
+          "tied scores are ranked by doom_integral DESC (ADR-0002) before date")
+
+    # =================================================================== 3
+    print("\n3. Python and JavaScript agree")
+    have_node = shutil.which("node") is not None
+    check(have_node, "node is available")
+    if have_node:
+        final = boards[last]
+        reachable = [r for r in sorted(boards) if r >= log["oldest_base"]]
+        results = node_apply([[boards[r], log] for r in reachable])
+        bad = [r for r, got in zip(reachable, results)
+               if got is None or comparable(got) != comparable(final)]
+        check(not bad, "from each of %d reachable revisions the page ends on the published "
+              "board, order included (wrong from: %s)" % (len(reachable), bad))
+        behind = [r for r in boards if r < log["oldest_base"]]
+        check(all(x is None for x in node_apply([[boards[r], log] for r in behind])),
+              "a page older than oldest_base is told to reload (%d revisions)" % len(behind))
+        tampered = json.loads(json.dumps(log))
+        tampered["deltas"][-1]["total_entries"] += 1
+        gap = json.loads(json.dumps(log))
+        del gap["deltas"][len(gap["deltas"]) // 2]
+        other = dict(log, board_key={"seed": "other", "ladder_epoch": "L4"})
+        bare = dict(boards[reachable[0]], meta=dict(boards[reachable[0]]["meta"]))
+        del bare["meta"]["revision"]
+        got = node_apply([[boards[reachable[0]], tampered], [boards[reachable[0]], gap],
+                          [boards[reachable[0]], other], [bare, log]])
+        check(got == [None] * 4,
+              "a wrong total, a gap, another board key or no revision: reload, never guess")
+        same = node_apply([[final, log]])[0]
+        check(same == final, "a page already current is left exactly as it is")
+
+    # A board another script wrote (no revision) restarts the log.
+    doc = read(pub.BOARD_JSON)
+    del doc["meta"]["revision"]
+    pub.BOARD_JSON.write_text(json.dumps(doc), encoding="utf-8")
+    api.rows[KEY] = api.rows[KEY] + [row(99, 1)]
+    publish()
+    log = read(pub.DELTA_JSON)
+    check(log["deltas"] == [] and log["revision"] == log["oldest_base"] == 1,
+          "a board written without a revision restarts the log")
+    # A new board key restarts it too.
+    api.rows[("weekly-2026-w34", "L5")] = [row(500, 3)]
+    api.epoch("L5")
+    publish()
+    log = read(pub.DELTA_JSON)
+    check(log["board_key"] == {"seed": "weekly-2026-w34", "ladder_epoch": "L5"}
+          and log["deltas"] == [] and log["oldest_base"] == log["revision"] == 2,
+          "and so does a new board key")
+
+    # =================================================================== 4
+    print("\n4. Size")
+    api.rows[("weekly-2026-w34", "L5")] = [row(1000 + i, i) for i in range(400)]
+    publish()
+    api.rows[("weekly-2026-w34", "L5")].append(row(2000, 10 ** 6))
+    publish()
+    full = pub.BOARD_JSON.stat().st_size
+    delta = len(json.dumps(read(pub.DELTA_JSON)["deltas"][-1]))
+    check(delta < full / 50, "one new score: a %d-byte delta against a %d-byte board"
+          % (delta, full))
+finally:
+    api.restore()
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+print()
+if failures:
+    print("%d FAILURE(S)" % len(failures))
+    for f in failures:
+        print("  - " + f)
+    sys.exit(1)
+print("OK: the publisher names every changed entry, writes nothing when none changed,")
+print("    and the page's applier reproduces the published board or asks to reload.")
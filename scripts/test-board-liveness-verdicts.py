@@ -93,7 +93,8 @@ class Sandbox:
         self.tmp = Path(tempfile.mkdtemp())
         self._saved = {k: getattr(liveness, k) for k in (
             "ROOT", "PUBLIC", "LB_DIR", "VERSION_JSON", "WEEKLY_JSON", "PUBLISHED_JSON",
-            "SNAPSHOT_JSON", "PRESERVED_DIR", "TARGETS_JSON", "OUT_JSON")}
+            "SNAPSHOT_JSON", "PRESERVED_DIR", "TARGETS_JSON", "OUT_JSON", "HISTORY_JSON",
+            "CACHE_PATH")}
         self._saved_fns = {k: getattr(liveness, k) for k in
                            ("probe_board", "get_json", "derive_targets")}
 
@@ -110,6 +111,8 @@ class Sandbox:
         liveness.PRESERVED_DIR = lb / "preserved"
         liveness.TARGETS_JSON = lb / "board-probe-targets.json"
         liveness.OUT_JSON = lb / "board-liveness.json"
+        liveness.HISTORY_JSON = lb / "board-probe-history.json"
+        liveness.CACHE_PATH = self.tmp / ".board-cache" / "responses.json"
 
         liveness.PUBLISHED_JSON.write_text(json.dumps(self.published), encoding="utf-8")
         liveness.TARGETS_JSON.write_text(json.dumps({
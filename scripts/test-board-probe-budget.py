@@ -23,7 +23,9 @@ case below constructs the state rather than waiting for it.
 
 Case 3 is the one that matters most: it proves the circuit breaker was NOT bought
 by making the probe give up on ordinary errors. An HTTP status is a real answer
-from a living host and must never trip it.
+from a living host and must never trip it. Case 6 makes the probe itself raise:
+that board is an error, and a worker that dies anyway leaves the run marked
+incomplete rather than short and silent.
 
 HOW IT ISOLATES
 ---------------
@@ -61,34 +63,12 @@ def check(cond, msg):
         failures.append(msg)
 
 
-def run_loop(probe, seeds, versions, budget_s, streak):
-    """Re-implementation of the guarded loop, driven by a stubbed probe.
-
-    Kept in step with check-board-liveness.py by asserting the two constants
-    exist there (case 4); the loop body itself is short enough that duplicating
-    it here is cheaper than exporting it and safer than not testing it at all.
-    """
-    results, budget_hit, unreachable_streak = [], False, 0
-    started = time.monotonic()
-    for s in seeds:
-        for v in versions:
-            if time.monotonic() - started > budget_s:
-                budget_hit = "budget"
-                break
-            if unreachable_streak >= streak:
-                budget_hit = "unreachable"
-                break
-            r = probe(s, v)
-            err = r.get("error") or ""
-            if err:
-                unreachable_streak = (unreachable_streak + 1
-                                      if not err.startswith("HTTP ") else 0)
-            else:
-                unreachable_streak = 0
-            results.append(r)
-        if budget_hit:
-            break
-    return results, budget_hit
+def run_loop(probe, seeds, versions, budget_s, streak, workers=1):
+    """The REAL guarded loop -- check-board-liveness.probe_all -- driven by a
+    stubbed probe. With workers=1 it is the serial loop this file was written
+    against; case 5 repeats the forced states with boards probed concurrently."""
+    pairs = [(s, v) for s in seeds for v in versions]
+    return liveness.probe_all(pairs, probe, workers=workers, budget_s=budget_s, streak=streak)
 
 
 SEEDS = ["s%02d" % i for i in range(9)]
@@ -145,6 +125,64 @@ check("PROBE INCOMPLETE" in src,
       "a truncated probe SAYS it was truncated -- silence would report 'live' having not asked")
 print()
 
+# --- 5. the same bounds with boards probed concurrently ----------------------
+print("5. CONCURRENT PROBING KEEPS EVERY BOUND -- one breaker, seen by all workers")
+W = liveness.PROBE_WORKERS
+res5, hit5 = run_loop(lambda s, v: {"seed": s, "version": v, "error": "URLError: timed out"},
+                      SEEDS, VERSIONS, budget_s=600, streak=8, workers=W)
+check(hit5 == "unreachable" and len(res5) < 8 + W,
+      "a dead host still stops the run after the streak, plus at most what was already "
+      "in flight (asked %d with %d workers)" % (len(res5), W))
+res6, hit6 = run_loop(slow_ok, SEEDS, VERSIONS, budget_s=0.25, streak=8, workers=W)
+check(hit6 == "budget" and 0 < len(res6) < TOTAL,
+      "the wall-clock budget stops concurrent workers too (%d of %d)" % (len(res6), TOTAL))
+res7, hit7 = run_loop(lambda s, v: {"seed": s, "version": v, "error": "HTTP 404"},
+                      SEEDS, VERSIONS, budget_s=600, streak=8, workers=W)
+check(hit7 is False and [(r["seed"], r["version"]) for r in res7]
+      == [(s, v) for s in SEEDS for v in VERSIONS],
+      "HTTP errors still do not trip it, and results come back in seed-major order")
+print()
+
+# --- 6. a probe that raises -------------------------------------------------
+print("6. A PROBE THAT RAISES IS AN ERROR FOR ITS BOARD -- never a silently short run")
+
+
+def crashy(s, v):
+    if v.endswith("7"):
+        raise KeyError("https://api.example/leaderboard?seed=%s&version=%s" % (s, v))
+    return {"seed": s, "version": v, "entries": 0}
+
+
+res8, hit8 = run_loop(crashy, SEEDS, VERSIONS, budget_s=600, streak=8, workers=W)
+crashed = [r for r in res8 if (r.get("error") or "").startswith("probe failed: KeyError")]
+check(len(res8) == TOTAL and hit8 is False,
+      "every board is still asked when some probes raise (%d of %d, %r)" % (len(res8), TOTAL, hit8))
+check(len(crashed) == sum(1 for v in VERSIONS if v.endswith("7")) * len(SEEDS)
+      and all(r["entries"] is None for r in crashed),
+      "each raising board is reported as an error of its own (%d)" % len(crashed))
+
+
+class WorkerKilled(BaseException):
+    """Stands in for whatever still escapes a worker -- it must not go unreported."""
+
+
+def fatal(s, v):
+    if (s, v) == (SEEDS[0], VERSIONS[3]):
+        raise WorkerKilled()
+    return {"seed": s, "version": v, "entries": 0}
+
+
+saved_hook = liveness.threading.excepthook
+liveness.threading.excepthook = lambda args: None      # the thread's death is the point
+try:
+    res9, hit9 = run_loop(fatal, SEEDS, VERSIONS, budget_s=600, streak=8, workers=1)
+finally:
+    liveness.threading.excepthook = saved_hook
+check(hit9 == "incomplete" and len(res9) < TOTAL,
+      "a worker that dies leaves the run marked incomplete, not clean (%r, %d of %d)"
+      % (hit9, len(res9), TOTAL))
+print()
+
 if failures:
     print("FAILED:")
     for f in failures:
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""The board probe, concurrently, against a real (local) HTTP score API.
+
+WHY THIS EXISTS
+---------------
+check-board-liveness.py asks the score API about every candidate board -- 2,070
+of them as of 2026-08-21 -- and each GET is a few hundred bytes whose cost is
+almost entirely round trip. Asked one at a time, a healthy sweep takes the SUM of
+those round trips. probe_all() keeps PROBE_WORKERS in flight, so it should take
+roughly the sum divided by the worker count, and never report anything different.
+
+test-board-probe-budget.py proves the stop conditions with a stubbed probe_board.
+This one goes through the real probe_board() and get_json(), over TCP, against
+scripts/stub_score_api.py, because the claims here are about the network:
+
+  1. concurrency buys wall clock: a sweep takes a fraction of the serial time,
+     and the stub really did serve several requests at once;
+  2. the limit is a limit: never more in flight than --workers;
+  3. nothing else changes: the concurrent results equal the serial ones, field
+     for field, in seed-major order, and populated boards report their entries;
+  4. the shared breaker still sees a dead host: a refused connection on every
+     board stops the run after the streak, with concurrent workers;
+  5. an HTTP error is an answer, not an outage, concurrently as well;
+  6. it only ever reads: the stub saw no request but GET.
+
+Everything runs on 127.0.0.1. Nothing here can reach api.pdoom1.com.
+
+Run:  python scripts/test-board-probe-concurrency.py     (exit 0 = pass)
+"""
+
+import importlib.util
+import socket
+import sys
+import time
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+from stub_score_api import StubScoreAPI  # noqa: E402
+
+_spec = importlib.util.spec_from_file_location(
+    "check_board_liveness", ROOT / "scripts" / "check-board-liveness.py")
+liveness = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(liveness)
+
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+ROW = {"score": 12, "player_name": "Ada", "date": "2026-08-08T09:00:00", "game_mode": "v0.14.0"}
+SEEDS = ["weekly-2026-w%02d" % w for w in range(30, 34)]
+VERSIONS = ["L%d" % n for n in range(1, 7)]
+PAIRS = [(s, v) for s in SEEDS for v in VERSIONS]
+BOARDS = {("weekly-2026-w32", "L4"): [ROW, dict(ROW, player_name="Bo", score=9)],
+          ("weekly-2026-w31", "L3"): [ROW]}
+LATENCY = 0.1
+
+
+def sweep(api, workers):
+    liveness.SCORE_API = api.url
+    started = time.monotonic()
+    results, hit = liveness.probe_all(PAIRS, liveness.probe_board, workers=workers)
+    return results, hit, time.monotonic() - started
+
+
+def closed_port():
+    """A localhost port with nothing listening: connections are refused at once."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+print("Board probe concurrency -- real HTTP against a local stub score API")
+print("=" * 74)
+print("  %d boards, %.2fs per request" % (len(PAIRS), LATENCY))
+print()
+
+print("1. Concurrency buys wall clock")
+with StubScoreAPI(BOARDS, latency=LATENCY) as api:
+    serial, serial_hit, serial_s = sweep(api, workers=1)
+    serial_peak = api.max_in_flight
+with StubScoreAPI(BOARDS, latency=LATENCY) as api:
+    concurrent, concurrent_hit, concurrent_s = sweep(api, workers=liveness.PROBE_WORKERS)
+    peak, writes = api.max_in_flight, list(api.writes)
+check(serial_s >= len(PAIRS) * LATENCY and serial_peak == 1,
+      "one worker takes the SUM of the round trips (%.2fs)" % serial_s)
+check(concurrent_s < serial_s / 3,
+      "%d workers take a fraction of it (%.2fs vs %.2fs)"
+      % (liveness.PROBE_WORKERS, concurrent_s, serial_s))
+print()
+
+print("2. The limit is a limit")
+check(1 < peak <= liveness.PROBE_WORKERS,
+      "the stub served up to %d at once, never more than %d"
+      % (peak, liveness.PROBE_WORKERS))
+with StubScoreAPI(BOARDS, latency=LATENCY) as api:
+    sweep(api, workers=3)
+    check(api.max_in_flight <= 3, "--workers 3 keeps 3 in flight (%d)" % api.max_in_flight)
+print()
+
+print("3. Nothing else changes")
+check(serial_hit is False and concurrent_hit is False, "neither sweep was cut short")
+check(concurrent == serial, "concurrent results equal the serial ones, field for field")
+check([(r["seed"], r["version"]) for r in concurrent] == PAIRS,
+      "in seed-major order, not completion order")
+busy = next(r for r in concurrent if (r["seed"], r["version"]) == ("weekly-2026-w32", "L4"))
+check(busy["entries"] == 2 and busy["player_names"] == ["Ada", "Bo"],
+      "a populated board reports its entries and players")
+print()
+
+print("4. The shared breaker still sees a dead host")
+liveness.SCORE_API = "http://127.0.0.1:%d/score_api.php" % closed_port()
+dead, dead_hit = liveness.probe_all(PAIRS, liveness.probe_board,
+                                    workers=liveness.PROBE_WORKERS)
+check(dead_hit == "unreachable"
+      and len(dead) < liveness.UNREACHABLE_STREAK + liveness.PROBE_WORKERS,
+      "refused connections stop the run after the streak (asked %d of %d)"
+      % (len(dead), len(PAIRS)))
+print()
+
+print("5. An HTTP error is an answer")
+with StubScoreAPI(BOARDS, status={p: 500 for p in PAIRS}) as api:
+    errs, errs_hit, _ = sweep(api, workers=liveness.PROBE_WORKERS)
+check(errs_hit is False and len(errs) == len(PAIRS)
+      and all(r["error"] == "HTTP 500" for r in errs),
+      "a host answering 500 everywhere is asked about every board")
+print()
+
+print("6. Read-only")
+check(not writes, "the stub saw no request but GET")
+print()
+
+if failures:
+    print("FAILED:")
+    for f in failures:
+        print("  - " + f)
+    sys.exit(1)
+print("OK: concurrent probing takes a fraction of the serial time, stays within its")
+print("    limit, returns the same results in the same order, and keeps the breaker.")
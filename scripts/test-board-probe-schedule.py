@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Forced-state tests for the board probe's schedule (adaptive probe pruning).
+
+WHY THIS EXISTS
+---------------
+check-board-liveness.py no longer asks every candidate board every run. Boards
+that have answered empty for a long time are asked less and less often, down to
+once per FULL_CYCLE_RUNS runs. That is a trade, and the only acceptable version
+of it is one where the probe gets cheaper and NOTHING GOES UNSEEN for longer
+than a cycle. Skipping a board is exactly how an orphan could hide, so the
+properties below are proved by construction rather than assumed:
+
+  1. cost: over hundreds of simulated runs, while the candidate set keeps growing
+     the way derive_targets() grows it, a run asks a small fraction of the
+     candidates -- close to the floor of one ask per board per cycle, plus the
+     hot boards;
+  2. coverage: once backed off, no board goes more than FULL_CYCLE_RUNS runs
+     without being asked;
+  3. detection: scores appearing on a board that has been empty for a hundred
+     runs are found within one cycle, and from then on that board is asked every
+     run;
+  4. hot boards -- the site's seed on the epochs a live score lands on -- are
+     asked every run;
+  5. an error is not an observation: it does not advance a board's backoff;
+  6. end to end through main(): the first run sweeps everything and writes the
+     history, the next one skips, --full asks everything, --check writes nothing,
+     and board-liveness.json still lists what was asked in seed-major order.
+
+Nothing here issues an HTTP request: probe_board is a stub, and every path the
+module writes is redirected into a temp dir.
+
+Run:  python scripts/test-board-probe-schedule.py     (exit 0 = pass)
+"""
+
+import importlib.util
+import io
+import json
+import shutil
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+_spec = importlib.util.spec_from_file_location(
+    "check_board_liveness", ROOT / "scripts" / "check-board-liveness.py")
+liveness = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(liveness)
+
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+C = liveness.FULL_CYCLE_RUNS
+
+
+def answer(seed, version, populated=(), broken=()):
+    r = {"seed": seed, "version": version, "key_shape": liveness.key_shape(version)}
+    if (seed, version) in broken:
+        r.update({"error": "URLError: timed out", "entries": None})
+    else:
+        r["entries"] = 3 if (seed, version) in populated else 0
+    return r
+
+
+def simulate(runs, populated_from=None):
+    """Run the schedule `runs` times over a candidate set that grows like the real
+    one: a new weekly seed every 4 runs, a new ladder epoch every 40. Returns
+    per-run (asked, candidates), the run each key was asked on, and the history."""
+    history = {"run": 0, "keys": {}}
+    asked_on, per_run = {}, []
+    for run in range(1, runs + 1):
+        seeds = ["weekly-w%03d" % w for w in range(1 + run // 4)]
+        highest = 2 + run // 40
+        versions = ["v0.11.0"] + ["L%d" % n for n in range(1, highest + liveness.EPOCH_LOOKAHEAD + 1)]
+        candidates = [(s, v) for s in seeds for v in versions]
+        hot = liveness.hot_versions(versions, ("L%d" % highest,))
+        hot_pairs = {(s, v) for s, v in candidates if s == seeds[-1] and v in hot}
+        if history["keys"]:
+            pairs, _ = liveness.schedule(candidates, history, run, hot_pairs)
+        else:
+            pairs = candidates
+        populated = {k for k, start in (populated_from or {}).items() if run >= start}
+        results = [answer(s, v, populated) for s, v in pairs]
+        liveness.record_history(history, results, run)
+        for p in pairs:
+            asked_on.setdefault(p, []).append(run)
+        per_run.append((len(pairs), len(candidates), hot_pairs))
+    return per_run, asked_on, history
+
+
+# ======================================================================= 1
+print("\n1. Cost tends to one ask per board per cycle")
+RUNS = 400
+per_run, asked_on, history = simulate(RUNS)
+first_asked, first_cand = per_run[0][:2]
+late = per_run[-C:]
+late_asked = sum(a for a, _, _ in late) / len(late)
+late_cand = sum(c for _, c, _ in late) / len(late)
+print("    run 1: %d of %d;  run %d: %.0f of %.0f per run"
+      % (first_asked, first_cand, RUNS, late_asked, late_cand))
+check(first_asked == first_cand, "the first run, with no history, asks every board")
+check(late_asked < late_cand / 4,
+      "by run %d a run asks under a quarter of the candidates (%.0f of %.0f)"
+      % (RUNS, late_asked, late_cand))
+floor = late_cand / C + len(per_run[-1][2])
+check(late_asked < 2 * floor,
+      "within twice the floor of candidates/cycle + hot (%.0f asked, floor %.0f)"
+      % (late_asked, floor))
+
+# ======================================================================= 2
+print("\n2. Coverage: nothing goes unasked for longer than a cycle")
+worst = max((b - a for runs in asked_on.values() for a, b in zip(runs, runs[1:])),
+            default=0)
+check(worst <= C, "the longest gap between two asks of one board is %d runs (cycle %d)"
+      % (worst, C))
+never = [k for k, runs in asked_on.items() if runs[-1] < RUNS - C]
+check(not never, "every board was asked within the last cycle (%d were not)" % len(never))
+
+# ======================================================================= 3
+print("\n3. Detection: scores on a long-dead board are found within a cycle")
+dead = ("weekly-w001", "v0.11.0")
+per_run3, asked3, history3 = simulate(300, populated_from={dead: 200})
+found = next(r for r in asked3[dead] if r >= 200)
+check(found - 200 < C, "found on run %d, %d runs after it filled (cycle %d)"
+      % (found, found - 200, C))
+check(all(r in asked3[dead] for r in range(found, 301)),
+      "and asked on every run after that")
+check(history3["keys"][dead][0] == 300 and history3["keys"][dead][1] == 0,
+      "its history records it populated, with no empty streak")
+
+# ======================================================================= 4
+print("\n4. Hot boards are asked every run")
+missed = [(run, p) for run, (n, _, hot_pairs) in enumerate(per_run, 1)
+          for p in hot_pairs if run not in asked_on.get(p, [])]
+check(not missed, "the current seed on the live epochs, every run (%d misses)" % len(missed))
+
+# ======================================================================= 5
+print("\n5. An error is not an observation")
+hist = {"run": 0, "keys": {}}
+key = ("weekly-w000", "L1")
+for run in range(1, 8):
+    liveness.record_history(hist, [answer(*key)], run)
+streak_before = hist["keys"][key][1]
+liveness.record_history(hist, [answer(*key, broken={key})], 8)
+check(hist["keys"][key][1] == streak_before and hist["keys"][key][2] == 7,
+      "a failed ask leaves the streak and the last-asked run untouched")
+due, _ = liveness.schedule([key], hist, 9, set())
+check(due == [] or due == [key], "(the board is scheduled on its backoff, as before)")
+interval = liveness.probe_interval(streak_before)
+due_later, _ = liveness.schedule([key], hist, 7 + interval, set())
+check(due_later == [key], "and is due again %d run(s) after its last REAL answer" % interval)
+
+
+# ======================================================================= 6
+print("\n6. End to end through main()")
+PATHS = ("ROOT", "PUBLIC", "LB_DIR", "VERSION_JSON", "WEEKLY_JSON", "PUBLISHED_JSON",
+         "SNAPSHOT_JSON", "PRESERVED_DIR", "TARGETS_JSON", "OUT_JSON", "HISTORY_JSON",
+         "CACHE_PATH")
+saved = {k: getattr(liveness, k) for k in PATHS + ("probe_board", "derive_targets")}
+tmp = Path(tempfile.mkdtemp())
+try:
+    lb = tmp / "public" / "leaderboard" / "data"
+    (lb / "preserved").mkdir(parents=True)
+    liveness.ROOT, liveness.PUBLIC, liveness.LB_DIR = tmp, tmp / "public", lb
+    liveness.VERSION_JSON = tmp / "public" / "data" / "version.json"
+    liveness.WEEKLY_JSON = lb / "weekly" / "current.json"
+    liveness.PUBLISHED_JSON = lb / "published-board.json"
+    liveness.SNAPSHOT_JSON = lb / "leaderboard.json"
+    liveness.PRESERVED_DIR = lb / "preserved"
+    liveness.TARGETS_JSON = lb / "board-probe-targets.json"
+    liveness.OUT_JSON = lb / "board-liveness.json"
+    liveness.HISTORY_JSON = lb / "board-probe-history.json"
+    liveness.CACHE_PATH = tmp / ".board-cache" / "responses.json"
+    liveness.PUBLISHED_JSON.write_text(json.dumps({"seed": "s00", "ladder_epoch": "L6"}),
+                                       encoding="utf-8")
+    (liveness.PRESERVED_DIR / "old__v0.11.0.json").write_text("{}", encoding="utf-8")
+
+    SEEDS = ["s%02d" % i for i in range(12)]
+    VERSIONS = ["v0.11.0"] + ["L%d" % n for n in range(1, 9)]
+    asked = []
+
+    def probe(seed, version):
+        asked.append((seed, version))
+        return answer(seed, version, populated={("s00", "L6")})
+
+    liveness.probe_board = probe
+    liveness.derive_targets = lambda a, b: (list(SEEDS), list(VERSIONS), [])
+
+    def run(*argv):
+        asked.clear()
+        sys.argv = ["check-board-liveness.py", *argv]
+        with redirect_stdout(io.StringIO()):
+            liveness.main()
+        return list(asked)
+
+    total = len(SEEDS) * len(VERSIONS)
+    check(len(run()) == total and liveness.HISTORY_JSON.exists(),
+          "the first run asks all %d boards and writes the history" % total)
+    for _ in range(6):
+        later = run()
+    check(0 < len(later) < total / 2,
+          "a few runs later it asks %d of %d" % (len(later), total))
+    check(("s00", "L6") in later, "the published board is among them")
+    record = json.loads(liveness.OUT_JSON.read_text(encoding="utf-8"))
+    order = [(b["seed"], b["version"]) for b in record["boards"]]
+    check(order == sorted(order, key=lambda p: (SEEDS.index(p[0]), VERSIONS.index(p[1]))),
+          "board-liveness.json lists what was asked in seed-major order")
+    check(record["probe"]["boards_candidate"] == total
+          and record["probe"]["boards_scheduled_later"] == total - len(later),
+          "and says how many boards were left for a later run")
+    before = liveness.HISTORY_JSON.read_text(encoding="utf-8")
+    check(len(run("--check")) < total and liveness.HISTORY_JSON.read_text(encoding="utf-8") == before,
+          "--check follows the schedule and writes no history")
+    check(len(run("--full")) == total, "--full asks every board")
+    liveness.HISTORY_JSON.write_text("{ not json", encoding="utf-8")
+    check(len(run()) == total, "an unreadable history means a full sweep, never a skip")
+finally:
+    for k, v in saved.items():
+        setattr(liveness, k, v)
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+print()
+if failures:
+    print("%d FAILURE(S)" % len(failures))
+    for f in failures:
+        print("  - " + f)
+    sys.exit(1)
+print("OK: the probe asks a small fraction of a growing candidate set, every board at")
+print("    least once a cycle, hot boards every run, and a filled dead board within a cycle.")
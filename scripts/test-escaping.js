@@ -83,7 +83,13 @@ const GUARDED = [
     safeHelpers: ['identityHTML', 'devBadgeHTML'],
     fetches: ['/leaderboard/data/weekly/current.json', '/data/ladder-epochs.json',
               '/design/tokens.json', '/leaderboard/data/preserved/',
-              'data/leaderboard.json', '/leaderboard/data/seed_'],
+              'data/leaderboard.json', '/leaderboard/data/seed_',
+              // Applied to the loaded board by board-delta.js; its entries are then
+              // rendered through the same `entry` templates as the full file.
+              'data/leaderboard-delta.json',
+              // The first TOP_N rows of the board (scripts/rank_index.py), rendered
+              // through the same `entry` templates until the full board is needed.
+              'data/leaderboard-top.json'],
   },
   {
     page: 'public/dashboard/index.html',
@@ -425,7 +431,9 @@ console.log('\n4. the root list cannot rot: every fetch is declared');
 // the test until whoever added it declares where its result lands.
 for (const g of GUARDED) {
   const src = read(g.page);
-  const urls = [...src.matchAll(/\bfetch\(\s*[`'"]([^`'"$]*)/g)]
+  // fetchBoard() is the leaderboard page's fetch-or-null wrapper; a URL passed to it
+  // is fetched all the same, so it must be declared all the same.
+  const urls = [...src.matchAll(/\b(?:fetch|fetchBoard)\(\s*[`'"]([^`'"$]*)/g)]
     .map((m) => m[1])
     .filter(Boolean)
     // fetch(window.location.origin) and friends carry no literal to match.
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""The compiled page template renders the SAME bytes as the f-string it replaced.
+
+WHY THIS EXISTS
+---------------
+Event pages are now rendered by templates/event-detail.html.tmpl, compiled once
+per run by scripts/sync/page_template.py, instead of a 500-line f-string over a
+pre-escaped copy of the record. The swap was for speed. A speed-up that moves a
+byte is not a speed-up: the daily sync commits every page that differs, the
+rsync deploy re-uploads it, and a moved byte inside an attribute is how this
+repo has shipped broken markup before.
+
+So the template is held to the pages the f-string wrote, byte for byte, on:
+
+  1. every record in the shipped public/data/events.json, against its committed
+     page in public/events/ -- the sync's own output, so the expected page for a
+     real record already exists and moves with the data -- and every backup
+     corpus under scripts/sync/backups/;
+  2. the hostile payloads test-sync-events.py section 3 uses, in every string
+     slot AND as the event id;
+  3. the record shapes the template branches on -- bare-string provenance,
+     a non-list sources value, missing conditions, zero and negative impacts,
+     an absent or null p(doom) impact, unknown categories and rarities, and
+     non-string values where strings are expected.
+
+It also pins the template language itself: escaping by default, the explicit
+raw form, literal whitespace, standalone comments, and compile errors that name
+the line.
+
+The backups and cases 2 and 3 have no page on disk, so their expected pages are
+kept in GOLDEN (scripts/fixtures/event-pages.json.gz), rendered by the f-string
+before it was retired. The f-string itself stays in git history, in the parent
+of the commit that added templates/event-detail.html.tmpl; bench-event-render.py
+loads it from there. If a page change is ever INTENDED, change the template,
+re-run the sync, and rewrite GOLDEN in the same commit, deliberately:
+
+    python scripts/test-event-template.py --regenerate
+
+Run:  python scripts/test-event-template.py     (exit 0 = pass)
+"""
+
+import copy
+import gzip
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+se = load("sync_events", ROOT / "scripts" / "sync" / "sync-events.py")
+pt = load("page_template", ROOT / "scripts" / "sync" / "page_template.py")
+
+GOLDEN = ROOT / "scripts" / "fixtures" / "event-pages.json.gz"
+REGENERATE = "--regenerate" in sys.argv[1:]
+golden = {} if REGENERATE else json.loads(gzip.decompress(GOLDEN.read_bytes()))
+
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+def rendered(event_id, event):
+    """The page, or the exception's name: the f-string crashing is a fact to match."""
+    try:
+        return se.generate_event_detail_page(event_id, copy.deepcopy(event))
+    except Exception as exc:
+        return {"raises": type(exc).__name__}
+
+
+def differs(event_id, got, want):
+    """None if the template rendered the expected page, else where they part."""
+    if got == want:
+        return None
+    if isinstance(got, str) and isinstance(want, str):
+        i = next((i for i, (a, b) in enumerate(zip(got, want)) if a != b),
+                 min(len(got), len(want)))
+        return f"{event_id}: first difference at char {i}: {got[i - 30:i + 30]!r}"
+    return f"{event_id}: {got!r} vs {want!r}"
+
+
+def on_disk(event_id, event):
+    """Against the committed page. Read as bytes: universal newlines would fold a
+    lone \r that the page really holds."""
+    page = se.EVENTS_DIR / f"{event_id}.html"
+    if not page.exists():
+        return f"{event_id}: no page in public/events/"
+    got = rendered(event_id, event)
+    return differs(event_id, got.encode("utf-8") if isinstance(got, str) else got,
+                   page.read_bytes())
+
+
+def against_golden(key, event_id, event):
+    """Against GOLDEN[key]; under --regenerate, record the page instead."""
+    got = rendered(event_id, event)
+    if REGENERATE:
+        golden[key] = got
+        return None
+    if key not in golden:
+        return f"{key}: no golden page (a new case needs --regenerate)"
+    return differs(event_id, got, golden[key])
+
+
+def make_event(text, **over):
+    """Same shape as test-sync-events.py's: `text` in every string slot."""
+    e = {
+        "title": text,
+        "description": text,
+        "year": 2024,
+        "category": text,
+        "rarity": text,
+        "tags": [text, text + "-two"],
+        "sources": ["https://example.com/" + text, text],
+        "safety_researcher_reaction": text,
+        "media_reaction": text,
+        "pdoom_impact": 3,
+        "impacts": [{"variable": text, "change": 2, "condition": text}],
+        "reaction_provenance": {
+            "safety_researcher_reaction": {
+                "type": "real_quote", "source": "https://example.com/" + text,
+                "author": text, "date": text,
+            },
+            "media_reaction": {
+                "type": "human_summary", "sources": ["https://example.com/" + text],
+            },
+        },
+        "future_field_added_upstream": {"nested": [{"deep": text}]},
+    }
+    e.update(over)
+    return e
+
+
+# =========================================================================== 1
+print("\n1. Every shipped record renders byte-identically")
+
+published = ROOT / "public" / "data" / "events.json"
+if published.exists() and not REGENERATE:
+    corpus = json.loads(published.read_text(encoding="utf-8"))
+    bad = [d for d in (on_disk(k, v) for k, v in corpus.items()) if d]
+    check(corpus and not bad, f"public/data/events.json: {len(corpus)} pages identical to "
+                              f"public/events/ (first difference: {bad[:1]})")
+for backup in sorted((ROOT / "scripts" / "sync" / "backups").glob("all_events_backup_*.json")):
+    raw = json.loads(backup.read_text(encoding="utf-8"))
+    # Backups are the RAW upstream records; publish them the way the sync would.
+    corpus = {k: se.transform_event(v)[0] for k, v in raw.items() if se.should_include_event(v)}
+    bad = [d for d in (against_golden(f"{backup.name}/{k}", k, v) for k, v in corpus.items())
+           if d]
+    check(corpus and not bad,
+          f"{backup.name}: {len(corpus)} pages identical (first difference: {bad[:1]})")
+
+
+# =========================================================================== 2
+print("\n2. Hostile text, in every slot and as the id")
+
+HOSTILE_PAYLOADS = [
+    '<script>alert(1)</script>',
+    '"><img src=x onerror=alert(1)>',
+    "' onmouseover='alert(1)",
+    '</p></div><div class="injected">',
+    '<<number to be assigned>>',
+    'Kott, "Cybertrust: From Explainable' + " x" * 200,
+    'Arts & Sciences',
+    '&lt;already escaped&gt;',
+    "under_score & Ampersand_slug",
+    "{{ event['title'] }} {% if %} {# #}",   # template syntax in DATA is just text
+    "line one\nline two\r\n\tthree",
+    "émigré — “quoted” 🚀",
+]
+bad = []
+for i, payload in enumerate(HOSTILE_PAYLOADS):
+    bad += [d for d in (against_golden(f"hostile/{i}/slots", "evt_hostile", make_event(payload)),
+                        against_golden(f"hostile/{i}/id", payload, make_event("ordinary")))
+            if d]
+check(not bad, f"{len(HOSTILE_PAYLOADS)} payloads, identical in every field and "
+               f"as the id (first difference: {bad[:1]})")
+page = se.generate_event_detail_page("evt", make_event("{{ event['title'] }}"))
+check("{{ event['title'] }}" in page,
+      "template syntax inside a record is printed, never evaluated")
+
+
+# =========================================================================== 3
+print("\n3. Every shape the template branches on")
+
+SHAPES = {
+    "string provenance": {"reaction_provenance": {
+        "safety_researcher_reaction": "real_quote", "media_reaction": "not_applicable"}},
+    "no provenance at all": {"reaction_provenance": {}},
+    "provenance without type": {"reaction_provenance": {
+        "safety_researcher_reaction": {"source": "https://a.example"}}},
+    "unknown provenance type": {"reaction_provenance": {
+        "safety_researcher_reaction": {"type": "rumour"}, "media_reaction": "hearsay"}},
+    "summary with a bare source string": {"reaction_provenance": {
+        "media_reaction": {"type": "human_summary", "sources": "https://a.example/<x>"}}},
+    "summary with no sources": {"reaction_provenance": {
+        "media_reaction": {"type": "human_summary", "sources": []}}},
+    "quote without author or date": {"reaction_provenance": {
+        "safety_researcher_reaction": {"type": "real_quote", "source": "https://a.example"}}},
+    "quote with empty date": {"reaction_provenance": {
+        "safety_researcher_reaction": {"type": "real_quote", "source": "s", "date": ""}}},
+    "quote without source": {"reaction_provenance": {
+        "safety_researcher_reaction": {"type": "real_quote", "author": "A"}}},
+    "impacts: zero, negative, no condition": {"impacts": [
+        {"variable": "doom_level", "change": 0},
+        {"variable": "cash", "change": -5, "condition": ""},
+        {"variable": "staff_morale", "change": 1.5, "condition": None}]},
+    "no impacts, no tags, no sources": {"impacts": [], "tags": [], "sources": []},
+    "p(doom) impact null": {"pdoom_impact": None},
+    "p(doom) impact zero": {"pdoom_impact": 0},
+    "known category and rarity": {"category": "capability_advance", "rarity": "legendary"},
+    "non-string condition and source": {
+        "impacts": [{"variable": "x", "change": 1, "condition": ["a & b", 'c "d"']}],
+        "sources": [12, None]},
+    "numeric year as a string": {"year": "c. 2024"},
+}
+for label, over in SHAPES.items():
+    event = make_event("ordinary text")
+    event.update(over)
+    d = against_golden(f"shape/{label}", "evt_shape", event)
+    check(d is None, f"{label}" + (f" -- {d}" if d else ""))
+
+no_pdoom = make_event("ordinary text")
+del no_pdoom["pdoom_impact"]
+d = against_golden("shape/p(doom) impact absent", "evt_shape", no_pdoom)
+check(d is None, "p(doom) impact absent" + (f" -- {d}" if d else ""))
+
+
+# =========================================================================== 4
+print("\n4. The template language")
+
+
+def render(source, **values):
+    fn = pt.compile_template(source, "t", tuple(values), {}, se.html_value)
+    return fn(*values.values())
+
+
+check(render("<p>{{ x }}</p>", x='<b>"&') == "<p>&lt;b&gt;&quot;&amp;</p>",
+      "{{ x }} escapes by default")
+check(render("<p>{{! x }}</p>", x="<b>") == "<p><b></p>",
+      "{{! x }} is the explicit, visible exception")
+check(render("{{ x }}", x=["a&b", 3]) == "['a&amp;b', 3]",
+      "a non-string slot prints as the f-string printed it")
+check(render("a\n\t{# gone #}\nb {# inline #}c") == "a\nb c",
+      "a comment alone on its line takes its line with it; an inline one leaves the text")
+check(render("[{% for i in xs %}\n\t{{ i }},{% endfor %}\n]", xs=[1, 2])
+      == "[\n\t1,\n\t2,\n]",
+      "statement tags emit nothing and remove nothing")
+check(render("{% if a %}A{% elif b %}B{% else %}C{% endif %}", a=0, b=1) == "B",
+      "if / elif / else")
+check(render("{% set p, q = pair %}{{ q }}{{ p }}", pair=("x", "y")) == "yx",
+      "set binds a local, tuple targets included")
+
+for source, needle in [
+    ("a\n{% if x %}\nb", "t:2: if block is never closed"),
+    ("{% endif %}", "t:1: unexpected endif"),
+    ("{% for x in y %}{% endif %}", "t:1: unexpected endif"),
+    ("\n\n{{ 1 + }}", "t:3:"),
+    ("{% else %}", "t:1: else outside an if block"),
+    ("{% include 'x' %}", "unknown statement 'include'"),
+    ("{% for x of y %}{% endfor %}", "expected 'for <target> in <expr>'"),
+]:
+    try:
+        pt.compile_template(source, "t", (), {}, str)
+        check(False, f"{source!r} is refused")
+    except pt.TemplateError as exc:
+        check(needle in str(exc), f"{source!r} is refused with {str(exc)!r}")
+
+check(se.event_page_template() is se.event_page_template(),
+      "the page template is compiled once per process, not once per page")
+fingerprint_inputs = Path(se.__file__).read_text(encoding="utf-8")
+check("EVENT_PAGE_TEMPLATE" in fingerprint_inputs.split("def generator_fingerprint", 1)[1][:600],
+      "the template is part of generator_fingerprint(), so editing it re-renders "
+      "every page under --incremental")
+
+
+if REGENERATE:
+    GOLDEN.parent.mkdir(parents=True, exist_ok=True)
+    blob = json.dumps(golden, ensure_ascii=False, sort_keys=True, indent=0).encode("utf-8")
+    GOLDEN.write_bytes(gzip.compress(blob, 9, mtime=0))
+    print(f"\nWrote {len(golden)} expected pages to {GOLDEN.relative_to(ROOT)}")
+
+print()
+if failures:
+    print(f"{len(failures)} FAILURE(S)")
+    for f in failures:
+        print("  -", f)
+    sys.exit(1)
+print("OK: the compiled template renders exactly the bytes the f-string did, on "
+      "every shipped record and every hostile or odd shape tried.")
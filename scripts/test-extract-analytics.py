@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the streaming log pipeline in scripts/extract_analytics.py.
+
+WHY THIS EXISTS
+---------------
+extract_analytics.py used to read every log into a list of lines and then a list
+of parsed dicts before counting anything. It now folds each line into a
+LogAggregator as it arrives and keeps nothing per line. The published numbers are
+what a reader sees, so the streaming path has to give exactly the answer the
+list-based one gave, on every input the old one handled:
+
+  1. the same analytics as the materialised reference (a copy of the old
+     analyze_logs) -- bots, junk and blank lines, logs newest-file-first, date
+     filters, ties in the top lists, and the "no entries" error. Unique visitors
+     are HyperLogLog estimates now, so those are held to the exact count within
+     the sketch's error, and everything else to the last digit;
+  2. every source yields the same lines: a local file, a .gz, a command's pipe,
+     a gzipped pipe, CRLF line endings;
+  3. a failing command, a stalled one, a truncated .gz and an abandoned read all
+     end with a warning and a reaped process, never a hang or a traceback;
+  4. memory: eight times the lines under the same traffic mix costs no more
+     peak memory -- the old path grew with every line;
+  5. main() end to end on --log-file, and its "No logs fetched" exit.
+
+Nothing here touches the network or the repo's data: every path is a temp dir.
+
+Run:  python scripts/test-extract-analytics.py     (exit 0 = pass)
+"""
+
+import gzip
+import importlib.util
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import redirect_stdout
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+_spec = importlib.util.spec_from_file_location(
+    "extract_analytics", ROOT / "scripts" / "extract_analytics.py")
+ea = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(ea)
+
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+def quiet(fn, *a, **kw):
+    with redirect_stdout(io.StringIO()) as out:
+        r = fn(*a, **kw)
+    return r, out.getvalue()
+
+
+AGENTS = ["Mozilla/5.0 (X11; Linux x86_64)", "Mozilla/5.0 (iPhone)",
+          "Googlebot/2.1", "curl/8.4.0", "Mozilla/5.0 (Windows NT 10.0)"]
+PATHS = ["/", "/index.html", "/blog/", "/blog/post.html", "/assets/app.js",
+         "/leaderboard/", "/data/version.json", "/events/42.html"]
+REFS = ["-", "https://google.com/search", "https://pdoom1.com/", "https://news.ycombinator.com/x",
+        "https://reddit.com/r/x", "-", "not a url"]
+
+
+def line(rng, day, ips=300):
+    return ('10.0.%d.%d - - [%02d/Nov/2025:%02d:%02d:%02d +0000] "%s %s HTTP/1.1" %d %d "%s" "%s"'
+            % (rng.randrange(ips) // 250, rng.randrange(ips) % 250, day, rng.randrange(24),
+               rng.randrange(60), rng.randrange(60), rng.choice(["GET", "GET", "POST"]),
+               rng.choice(PATHS), rng.choice([200, 200, 200, 304, 404]),
+               rng.randrange(50000), rng.choice(REFS), rng.choice(AGENTS)))
+
+
+def log_lines(n, seed=1, days=(1, 30), junk=True, ips=300):
+    """n synthetic lines, a sprinkling of junk and blanks among them."""
+    rng = random.Random(seed)
+    for i in range(n):
+        if junk and i % 97 == 0:
+            yield rng.choice(["", "   ", "garbage line", '1.2.3.4 - - [bad date] "GET / HTTP/1.1" 200 1 "-" "x"'])
+        else:
+            yield line(rng, rng.randint(*days), ips)
+
+
+def materialised(ex, log_lines, start_date=None, end_date=None):
+    """The list-based analyze_logs() this pipeline replaced, kept as the oracle."""
+    parsed_entries = []
+    for l in log_lines:
+        if not l.strip():
+            continue
+        entry = ex.parse_log_line(l)
+        if entry:
+            if start_date and entry['date'] < start_date:
+                continue
+            if end_date and entry['date'] > end_date:
+                continue
+            parsed_entries.append(entry)
+    if not parsed_entries:
+        return {"error": "No valid log entries found"}
+    analytics = {"metadata": {
+        "period_start": min(e['date'] for e in parsed_entries),
+        "period_end": max(e['date'] for e in parsed_entries),
+        "total_requests": len(parsed_entries),
+        "anonymization": "IP addresses hashed (SHA-256)",
+        "privacy": "No PII collected"}}
+    daily_stats = defaultdict(lambda: {'requests': 0, 'unique_visitors': set(),
+                                       'page_views': 0, 'bandwidth_bytes': 0})
+    path_stats, status_codes, referrer_domains, hourly = Counter(), Counter(), Counter(), Counter()
+    for entry in parsed_entries:
+        date = entry['date']
+        if not entry['is_bot']:
+            daily_stats[date]['requests'] += 1
+            daily_stats[date]['unique_visitors'].add(entry['ip_hash'])
+            daily_stats[date]['bandwidth_bytes'] += entry['size']
+            if entry['status'] == 200 and (entry['path'].endswith('.html') or
+                                           entry['path'].endswith('/') or entry['path'] == '/'):
+                daily_stats[date]['page_views'] += 1
+                path_stats[entry['path']] += 1
+        status_codes[entry['status']] += 1
+        hourly[entry['hour']] += 1
+        if entry.get('referrer_domain') and entry['referrer_domain']:
+            referrer_domains[entry['referrer_domain']] += 1
+    analytics['daily'] = {
+        d: {'requests': s['requests'], 'unique_visitors': len(s['unique_visitors']),
+            'page_views': s['page_views'],
+            'bandwidth_mb': round(s['bandwidth_bytes'] / (1024 * 1024), 2)}
+        for d, s in sorted(daily_stats.items())}
+    total_unique = len(set(e['ip_hash'] for e in parsed_entries if not e['is_bot']))
+    analytics['summary'] = {
+        'total_unique_visitors': total_unique,
+        'total_page_views': sum(s['page_views'] for s in daily_stats.values()),
+        'total_bandwidth_mb': round(
+            sum(s['bandwidth_bytes'] for s in daily_stats.values()) / (1024 * 1024), 2),
+        'avg_daily_visitors': round(total_unique / len(daily_stats), 1),
+        'avg_daily_page_views': round(
+            sum(s['page_views'] for s in daily_stats.values()) / len(daily_stats), 1)}
+    analytics['top_pages'] = [{"path": p, "views": c} for p, c in path_stats.most_common(20)]
+    analytics['status_codes'] = dict(status_codes)
+    analytics['top_referrers'] = [{"domain": d, "count": c}
+                                  for d, c in referrer_domains.most_common(20)
+                                  if 'pdoom1.com' not in d]
+    analytics['hourly_distribution'] = {str(h): hourly.get(h, 0) for h in range(24)}
+    return analytics
+
+
+def same(a, b):
+    """Equal as published: generated_at is a timestamp, and key order is JSON order."""
+    a = json.loads(json.dumps(a))
+    b = json.loads(json.dumps(b))
+    a.get("metadata", {}).pop("generated_at", None)
+    b.get("metadata", {}).pop("generated_at", None)
+    return json.dumps(a) == json.dumps(b)
+
+
+def uniques_close(streamed, reference):
+    """Every visitor estimate in `streamed` within 3 standard errors of the exact count."""
+    def near(est, exact, rel=3 * 0.0163):
+        return abs(est - exact) <= max(2, rel * exact)
+    if "error" in reference:
+        return True
+    return (all(near(streamed["daily"][d]["unique_visitors"], v["unique_visitors"])
+                for d, v in reference["daily"].items())
+            and near(streamed["summary"]["total_unique_visitors"],
+                     reference["summary"]["total_unique_visitors"]))
+
+
+def without_uniques(a):
+    """The analytics minus every visitor count, which the reference holds exactly."""
+    a = json.loads(json.dumps(a))
+    a.get("metadata", {}).pop("unique_visitors", None)
+    for day in a.get("daily", {}).values():
+        day.pop("unique_visitors")
+    for k in ("total_unique_visitors", "avg_daily_visitors"):
+        a.get("summary", {}).pop(k, None)
+    for page in a.get("top_pages", []):
+        page.pop("unique_visitors", None)
+    return a
+
+
+COPY = [sys.executable, "-c",
+        "import shutil, sys; shutil.copyfileobj(open(sys.argv[1], 'rb'), sys.stdout.buffer)"]
+
+tmp = Path(tempfile.mkdtemp())
+cwd = os.getcwd()
+os.chdir(tmp)  # AnalyticsExtractor creates its output dir relative to the cwd
+try:
+    ex = ea.AnalyticsExtractor("unused.pem")
+
+    # =================================================================== 1
+    print("\n1. The same answer as the materialised analysis")
+    newer = list(log_lines(6000, seed=1, days=(20, 30)))
+    older = list(log_lines(6000, seed=2, days=(1, 21)))
+    both = newer + older  # access.log first, then access.log.1: newest file first
+    cases = [
+        ("two files, newest first", both, None, None),
+        ("a date window", both, "2025-11-05", "2025-11-24"),
+        ("an open-ended start", both, "2025-11-25", None),
+        ("a window with no traffic", both, "2026-01-01", "2026-01-31"),
+        ("only junk", ["", "junk", "  "], None, None),
+        ("a handful of lines (top-list ties)", both[:40], None, None),
+    ]
+    for label, lines, start, end in cases:
+        streamed, _ = quiet(ex.analyze_logs, iter(lines), start, end)
+        reference = materialised(ex, lines, start, end)
+        check(same(without_uniques(streamed), without_uniques(reference))
+              and uniques_close(streamed, reference),
+              "%s: identical analytics" % label)
+    streamed, out = quiet(ex.analyze_logs, iter(both))
+    check("top_pages" in streamed and streamed["metadata"]["total_requests"]
+          == len([l for l in both if l.strip() and ex.parse_log_line(l)])
+          and "Parsed %d valid log entries" % streamed["metadata"]["total_requests"] in out,
+          "every valid line is counted once, and the count is reported")
+
+    # =================================================================== 2
+    print("\n2. Every source yields the same lines")
+    plain = tmp / "access.log"
+    plain.write_text("\n".join(both) + "\n", encoding="utf-8")
+    packed = tmp / "access.log.2.gz"
+    with gzip.open(packed, "wt", encoding="utf-8") as f:
+        f.write("\n".join(both) + "\n")
+    crlf = tmp / "access-crlf.log"
+    crlf.write_bytes(("\r\n".join(both) + "\r\n").encode("utf-8"))
+    want = [l + "\n" for l in both]
+    check(list(ex.read_log_file(plain)) == want, "a local file, line by line")
+    check(list(ex.read_log_file(packed)) == want, "a .gz, decompressed as it is read")
+    check(list(ex.read_log_file(crlf)) == want, "CRLF line endings read as plain lines")
+    got, _ = quiet(list, ex.stream_command(COPY + [str(plain)], "pipe"))
+    check(got == want, "a command's stdout, as it is written")
+    got, _ = quiet(list, ex.stream_command(COPY + [str(packed)], "pipe.gz", gz=True))
+    check(got == want, "a gzipped pipe, decompressed locally")
+    reference, _ = quiet(ex.analyze_logs, iter(both))
+    streamed, out = quiet(ex.analyze_logs, ex.fetch_logs(log_files=[str(plain), str(packed)]))
+    check(same(streamed, quiet(ex.analyze_logs, iter(both + both))[0])
+          and ex.lines_fetched == 2 * len(both),
+          "fetch_logs(log_files=...) chains the files and counts every line")
+    check(("Fetched %d lines from %s" % (len(both), packed)) in out,
+          "and reports each file as it finishes")
+
+    # =================================================================== 3
+    print("\n3. Failures end with a warning and a reaped process")
+    got, out = quiet(list, ex.stream_command(
+        [sys.executable, "-c", "print('one'); print('two'); raise SystemExit(3)"], "failing"))
+    check(got == ["one\n", "two\n"] and "Could not fetch failing" in out,
+          "a non-zero exit keeps what it wrote and warns")
+    t0 = time.monotonic()
+    got, out = quiet(list, ex.stream_command(
+        [sys.executable, "-c", "import time; print('one', flush=True); time.sleep(60)"],
+        "stalled", idle_timeout=1))
+    took = time.monotonic() - t0
+    check(got == ["one\n"] and "Timeout reading stalled" in out and took < 10,
+          "a stalled command is killed after the idle timeout (%.1f s)" % took)
+    cut = tmp / "cut.log.gz"
+    cut.write_bytes(packed.read_bytes()[: packed.stat().st_size // 2])
+    got, out = quiet(list, ex.read_log_file(cut))
+    check(0 < len(got) < len(both) and "Error reading" in out,
+          "a truncated .gz yields what it holds, then warns")
+    got, out = quiet(list, ex.stream_command(COPY + [str(cut)], "cut.gz", gz=True))
+    check(0 < len(got) < len(both) and "Error reading cut.gz" in out,
+          "so does a truncated gzipped pipe")
+    spawned = []
+    real_popen = ea.subprocess.Popen
+    ea.subprocess.Popen = lambda *a, **kw: spawned.append(real_popen(*a, **kw)) or spawned[-1]
+    try:
+        gen = ex.stream_command(
+            [sys.executable, "-c", "import time\nwhile True: print('x', flush=True); time.sleep(0.01)"],
+            "endless")
+        next(gen)
+        gen.close()
+    finally:
+        ea.subprocess.Popen = real_popen
+    check(len(spawned) == 1 and spawned[0].returncode is not None,
+          "an abandoned read kills and reaps the command")
+
+    # =================================================================== 4
+    print("\n4. Memory does not grow with the log")
+
+    # A small, fixed audience over one week: by the smaller size every day has
+    # seen every visitor, so all that grows from here is the number of lines.
+    def peak(n):
+        tracemalloc.start()
+        quiet(ex.analyze_logs, log_lines(n, seed=3, days=(1, 7), junk=False, ips=40))
+        p = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return p
+
+    def peak_materialised(n):
+        tracemalloc.start()
+        materialised(ex, list(log_lines(n, seed=3, days=(1, 7), junk=False, ips=40)))
+        p = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return p
+
+    # The parser's memo caches are bounded, not per line; fill them first so
+    # both sizes are measured against caches already at capacity.
+    peak(40000)
+    small, large = peak(5000), peak(40000)
+    check(large < small * 1.25,
+          "40k lines peak at %.2f MB, 5k at %.2f MB: flat" % (large / 2 ** 20, small / 2 ** 20))
+    old = peak_materialised(40000)
+    check(old > large * 5, "the materialised path needed %.1f MB for the same 40k lines"
+          % (old / 2 ** 20))
+
+    # =================================================================== 5
+    print("\n5. main() end to end")
+    argv = sys.argv
+    try:
+        sys.argv = ["extract_analytics.py", "--log-file", str(plain), "--log-file", str(packed),
+                    "--month", "2025-11", "--output", "nov.json"]
+        rc, out = quiet(ea.main)
+        written = json.loads((tmp / "public/data/analytics/dreamhost/nov.json")
+                             .read_text(encoding="utf-8"))
+        check(rc == 0 and same(written, quiet(ex.analyze_logs, iter(both + both),
+                                              "2025-11-01", "2025-11-30")[0]),
+              "--log-file --month writes the analytics of those files")
+        check("DreamHost Analytics Report" in out, "and prints the report")
+        empty = tmp / "empty.log"
+        empty.write_text("", encoding="utf-8")
+        sys.argv = ["extract_analytics.py", "--log-file", str(empty), "--output", "none.json"]
+        rc, out = quiet(ea.main)
+        check(rc == 1 and "No logs fetched" in out
+              and not (tmp / "public/data/analytics/dreamhost/none.json").exists(),
+              "no lines at all: exit 1 and nothing written")
+    finally:
+        sys.argv = argv
+finally:
+    os.chdir(cwd)
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+print()
+if failures:
+    print("%d FAILURE(S)" % len(failures))
+    for f in failures:
+        print("  - " + f)
+    sys.exit(1)
+print("OK: analytics stream line by line from files, .gz and pipes, in memory that")
+print("    does not grow with the log, with the same numbers as before.")
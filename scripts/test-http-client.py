@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for scripts/http_client.py, the shared read-only HTTP client.
+
+WHY THIS EXISTS
+---------------
+Four scripts read the score API, GitHub and Plausible through http_client.py. It
+replaced four copies of a urlopen() call whose ONE property everything depended
+on was its error contract: (data, error_string), never an exception, and an
+error string that starts "HTTP " only when the host actually answered. The
+liveness breaker counts every other kind as "the host is down". So a pool that
+is faster but blurs that line would turn a 404 storm into a false outage, or a
+dead host into 2,000 patient timeouts.
+
+Everything here runs over real sockets against scripts/stub_score_api.py on
+127.0.0.1, because pooling is a property of connections and cannot be shown
+with a mocked urlopen. It asserts:
+
+  1. keep-alive: many requests to one host share a handful of connections;
+  2. the per-host limit caps requests in flight, however many threads ask;
+  3. gzip bodies are asked for and decoded;
+  4. a pooled connection the server dropped is retried once, transparently;
+  5. the error vocabulary: HTTP statuses, refused connections, timeouts and
+     bodies that are not JSON each map to the kind and message the callers
+     rely on, and get_json() never raises;
+  6. redirects are followed, and a credential does not follow one to another
+     host;
+  7. the four callers use it, rather than carrying their own urlopen.
+
+Run:  python scripts/test-http-client.py     (exit 0 = pass)
+"""
+
+import socket
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+import http_client  # noqa: E402
+from stub_score_api import StubScoreAPI  # noqa: E402
+
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+ROW = {"score": 12, "player_name": "Ada", "date": "2026-08-08T09:00:00", "game_mode": "v0.14.0"}
+BOARDS = {("weekly-2026-w32", "L4"): [ROW] * 40}
+
+
+def board_url(api, seed="weekly-2026-w32", version="L4"):
+    return "%s?seed=%s&version=%s" % (api.url, seed, version)
+
+
+def hammer(client, url, threads, each):
+    """`threads` threads, `each` GETs apiece; returns every (data, err)."""
+    out, lock = [], threading.Lock()
+
+    def run():
+        for _ in range(each):
+            r = client.get_json(url)
+            with lock:
+                out.append(r)
+
+    ts = [threading.Thread(target=run) for _ in range(threads)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    return out
+
+
+print("HTTP client -- pooled keep-alive, against a local stub")
+print("=" * 74)
+
+# ======================================================================= 1
+print("\n1. Keep-alive")
+with StubScoreAPI(BOARDS) as api:
+    client = http_client.HttpClient()
+    results = [client.get_json(board_url(api)) for _ in range(50)]
+    check(all(err is None and len(data["entries"]) == 40 for data, err in results),
+          "50 sequential GETs all answered")
+    check(api.connections == 1 and client.stats["reused"] == 49,
+          "over ONE connection (%d opened, %d reuses)" % (api.connections,
+                                                          client.stats["reused"]))
+    client.close()
+
+# ======================================================================= 2
+print("\n2. The per-host limit")
+with StubScoreAPI(BOARDS, latency=0.05) as api:
+    client = http_client.HttpClient(per_host=3)
+    results = hammer(client, board_url(api), threads=10, each=3)
+    check(len(results) == 30 and all(err is None for _, err in results),
+          "10 threads x 3 GETs all answered")
+    check(api.max_in_flight <= 3, "never more than 3 in flight (%d)" % api.max_in_flight)
+    check(api.connections <= 3, "and never more than 3 connections (%d)" % api.connections)
+    client.close()
+
+# ======================================================================= 3
+print("\n3. Gzip")
+with StubScoreAPI(BOARDS, gzip=True) as api:
+    client = http_client.HttpClient()
+    data, err = client.get_json(board_url(api))
+    check(err is None and api.gzipped == 1 and data["entries"][0] == ROW,
+          "a gzip body was requested, sent and decoded")
+    client.close()
+
+# ======================================================================= 4
+print("\n4. A pooled connection the server dropped")
+with StubScoreAPI(BOARDS, max_requests_per_connection=1) as api:
+    client = http_client.HttpClient()
+    results = [client.get_json(board_url(api)) for _ in range(5)]
+    check(all(err is None for _, err in results),
+          "every GET answered, though each connection died after one response "
+          "(%s)" % [err for _, err in results if err])
+    check(client.stats["retried"] >= 1, "by retrying on a fresh connection "
+          "(%d retries)" % client.stats["retried"])
+    client.close()
+
+# ======================================================================= 5
+print("\n5. The error vocabulary")
+with StubScoreAPI(BOARDS, status={("gone", "L4"): 404, ("broken", "L4"): 500},
+                  raw={("garbled", "L4"): b"<html>maintenance</html>"}) as api:
+    client = http_client.HttpClient()
+    data, err = client.get_json(board_url(api, "gone"))
+    check(data is None and err == "HTTP 404", "a 404 is exactly 'HTTP 404' (%r)" % err)
+    data, err = client.get_json(board_url(api, "broken"))
+    check(err == "HTTP 500", "a 500 is exactly 'HTTP 500' (%r)" % err)
+    data, err = client.get_json(board_url(api, "garbled"))
+    check(data is None and err and not err.startswith("HTTP "),
+          "a body that is not JSON is an error, not an HTTP answer (%r)" % err)
+    ok, err = client.get_json(board_url(api))
+    check(err is None, "and the pool still works after all three (%r)" % err)
+    client.close()
+
+with socket.socket() as s:
+    s.bind(("127.0.0.1", 0))
+    dead_port = s.getsockname()[1]
+client = http_client.HttpClient()
+data, err = client.get_json("http://127.0.0.1:%d/score_api.php" % dead_port)
+try:
+    client.get("http://127.0.0.1:%d/score_api.php" % dead_port)
+    kind = None
+except Exception as exc:
+    kind = http_client.classify_error(exc)[0]
+check(data is None and err.startswith("ConnectionRefusedError") and kind == "connection",
+      "a refused connection is a 'connection' error, never 'HTTP ...' (%r)" % err)
+
+with StubScoreAPI(BOARDS, latency=1.0) as api:
+    client = http_client.HttpClient(timeout=0.2)
+    try:
+        client.get(board_url(api))
+        kind = None
+    except Exception as exc:
+        kind = http_client.classify_error(exc)[0]
+    data, err = client.get_json(board_url(api))
+    check(kind == "timeout" and data is None and not err.startswith("HTTP "),
+          "a slow host times out as 'timeout' (%r)" % err)
+    client.close()
+
+data, err = http_client.HttpClient().get_json("ftp://example.invalid/x")
+check(data is None and err.startswith("ValueError"), "get_json() never raises (%r)" % err)
+
+
+# ======================================================================= 6
+print("\n6. Redirects")
+
+
+def redirector(target, seen):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *a):
+            pass
+
+        def do_GET(self):
+            seen.append(self.headers.get("Authorization"))
+            self.send_response(302)
+            self.send_header("Location", target)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+with StubScoreAPI(BOARDS) as api:
+    seen = []
+    # "localhost" vs "127.0.0.1": the same machine, but a different host to a client.
+    server = redirector(board_url(api).replace("127.0.0.1", "localhost"), seen)
+    try:
+        client = http_client.HttpClient()
+        data, err = client.get_json("http://127.0.0.1:%d/latest" % server.server_address[1],
+                                    {"Authorization": "Bearer secret"})
+        check(err is None and len(data["entries"]) == 40,
+              "a 302 to another host is followed to the board (%r)" % err)
+        check(seen == ["Bearer secret"], "the first host got the credential it was sent")
+        check(len(api.headers) == 1 and "Authorization" not in api.headers[0],
+              "and the host it redirected to did not")
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    check(not api.writes, "and nothing but GET was ever sent")
+
+
+# ======================================================================= 7
+print("\n7. The callers use it")
+for name in ("check-board-liveness.py", "check-epoch-drift.py", "alpha-watch.py",
+             "publish-live-board.py"):
+    src = (ROOT / "scripts" / name).read_text(encoding="utf-8")
+    check("urlopen" not in src, "%s carries no urlopen of its own" % name)
+    check("http_client" in src or "liveness.get_json" in src,
+          "%s reads through http_client" % name)
+
+
+print()
+if failures:
+    print("%d FAILURE(S)" % len(failures))
+    for f in failures:
+        print("  - " + f)
+    sys.exit(1)
+print("OK: one pooled, keep-alive, gzip-aware client; the limit holds, a dropped "
+      "connection is retried, and 'HTTP ...' still means only that the host answered.")
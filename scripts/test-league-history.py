@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for scripts/league_history.py and the manager that keeps it.
+
+WHY THIS EXISTS
+---------------
+The league history is a columnar copy of every archived and preserved entry, and
+the per-player and per-epoch aggregates the site publishes come from it rather than
+from the files. A store that drops a row, mis-decodes a name or mixes up epochs would
+publish a wrong "best in L3" that looks exactly like a right one. So everything is
+checked against a brute-force pass over the raw files:
+
+  1. every entry of every real archive and preserved board is in the store, in file
+     order, with the same values, and the dictionaries hold each value once;
+  2. where / count_by / best_by agree with a naive scan on a random 20,000-entry
+     history, ADR-0002 tiebreak and all;
+  3. the published aggregates agree with the naive scan, including boards with no
+     entries, and no "best" ever mixes two epochs;
+  4. rebuilding parses only new or changed files, replace() swaps one file without
+     reading any other, and both equal a full build; a store of another format is
+     not trusted;
+  5. the manager keeps it: a rebuild writes it, archiving a week updates it
+     without a rebuild, and the result equals a full build;
+  6. speed: a player's best per epoch over 500 archived weeks from the store,
+     against opening every archive.
+
+Every path the manager writes is in a temp dir; the real data is only read.
+
+Run:  python scripts/test-league-history.py     (exit 0 = pass)
+"""
+
+import importlib.util
+import io
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+import league_history as lh  # noqa: E402
+
+_spec = importlib.util.spec_from_file_location(
+    "weekly_league_manager", ROOT / "scripts" / "weekly-league-manager.py")
+wlm = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(wlm)
+
+REAL = ROOT / "public" / "leaderboard" / "data"
+NOW = datetime(2026, 8, 17, 12, 0, tzinfo=timezone.utc)
+
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+def quiet(fn, *a, **kw):
+    with redirect_stdout(io.StringIO()) as out:
+        r = fn(*a, **kw)
+    return r, out.getvalue()
+
+
+def sandbox(tmp):
+    """A manager whose every path is under tmp, seeded with the real archive."""
+    data = tmp / "leaderboard" / "data"
+    shutil.copytree(REAL / "weekly" / "archive", data / "weekly" / "archive",
+                    ignore=shutil.ignore_patterns("index.json"))
+    if (REAL / "preserved").exists():
+        shutil.copytree(REAL / "preserved", data / "preserved")
+    m = wlm.WeeklyLeagueManager.__new__(wlm.WeeklyLeagueManager)
+    m.website_dir = ROOT
+    m.version_file = ROOT / "public" / "data" / "version.json"
+    m.league_data_dir = data / "weekly"
+    m.current_league_file = m.league_data_dir / "current.json"
+    m.archive_dir = m.league_data_dir / "archive"
+    m.config_file = tmp / "weekly-league-config.json"
+    m.config = m.load_config()
+    return m
+
+
+def naive(sources):
+    """Every entry of every source, flattened the slow way, in store order."""
+    out = []
+    for source, name, path in sorted(sources, key=lambda t: (t[0] != "archive", t[1])):
+        doc = json.loads(Path(path).read_text(encoding="utf-8"))
+        fields, entries = lh.READERS[source](doc, name)
+        for e in entries:
+            if isinstance(e, dict):
+                out.append(dict({c: e.get(c) for c in lh.ENTRY_FIELDS},
+                                **{c: fields[c] for c in lh.SEGMENT_FIELDS}))
+    return out
+
+
+def adr(e):
+    return (lh._num(e["score"]), lh._num(e["doom_integral"]))
+
+
+def naive_best(rows, col):
+    best = {}
+    for i, e in enumerate(rows):
+        if e[col] not in best or adr(e) > adr(rows[best[e[col]]]):
+            best[e[col]] = i
+    return best
+
+
+def same(a, b):
+    """Two stores equal in content (the generation stamp aside)."""
+    return a.to_json("") == b.to_json("")
+
+
+def synthetic(directory, weeks, per_week, seed=7):
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    for w in range(weeks):
+        epoch = "L%d" % (2 + w * 3 // weeks)
+        entries = [{"player_name": "P%d" % rng.randint(0, 150),
+                    "score": rng.randint(0, 60), "doom_integral": rng.choice([1.0, 2.0, 3.5]),
+                    "date": "2027-01-%02d" % (1 + w % 28), "game_mode": "v0.%d" % rng.randint(1, 4),
+                    "level_reached": rng.randint(1, 9), "duration_seconds": 60.0,
+                    "entry_uuid": "u-%d-%d" % (w, i)} for i in range(per_week)]
+        (directory / ("2040_W%03d_league.json" % w)).write_text(json.dumps({
+            "meta": {"week_id": "2040_W%03d" % w}, "seed": "weekly_2040_W%03d" % w,
+            "epoch": {"id": "regularised", "ladder_version": epoch},
+            "entries": entries}), encoding="utf-8")
+    return [("archive", p.name, p) for p in sorted(directory.glob("*_league.json"))]
+
+
+tmp = Path(tempfile.mkdtemp())
+try:
+    # =================================================================== 1
+    print("\n1. Every real entry, in order")
+    m = sandbox(tmp / "a")
+    sources = m.history_sources()
+    store, parsed = quiet(lh.build, sources)[0]
+    want = naive(sources)
+    got = [store.row(i, lh.ENTRY_FIELDS + lh.SEGMENT_FIELDS) for i in range(len(store))]
+    check(parsed == len(sources) and got == want,
+          "%d entries from %d files (%d archived weeks, %d preserved boards), values equal"
+          % (len(want), len(sources), sum(s[0] == "archive" for s in sources),
+             sum(s[0] == "preserved" for s in sources)))
+    check(all(len(store.dicts[c]) == len({lh._key(v) for v in store.dicts[c]})
+              and all(isinstance(x, int) for x in store.columns[c])
+              for c in lh.DICT_COLUMNS),
+          "dictionary columns hold integer codes, each value once")
+    check([s["rows"] for s in store.segments] == [
+        len([e for e in (lh.READERS[src](json.loads(Path(p).read_text(encoding="utf-8")),
+                                           n)[1]) if isinstance(e, dict)])
+        for src, n, p in sorted(sources, key=lambda t: (t[0] != "archive", t[1]))],
+        "one segment per file, empty weeks included")
+    epochs = {s["epoch"] for s in store.segments}
+    check("pre-regularisation" in epochs and any(str(e).startswith("build ") for e in epochs)
+          and any(str(e).startswith("L") for e in epochs),
+          "epochs are labelled: %s" % ", ".join(sorted(map(str, epochs))))
+
+    # =================================================================== 2
+    print("\n2. Queries agree with a naive scan")
+    syn_sources = synthetic(tmp / "syn", 50, 400)
+    syn, _ = quiet(lh.build, syn_sources)[0]
+    rows = naive(syn_sources)
+    rng = random.Random(3)
+    ok = True
+    for _ in range(40):
+        p, ep = "P%d" % rng.randint(0, 160), "L%d" % rng.randint(1, 5)
+        if syn.where(player_name=p) != [i for i, e in enumerate(rows) if e["player_name"] == p]:
+            ok = False
+        if syn.where(player_name=p, epoch=ep) != [
+                i for i, e in enumerate(rows) if e["player_name"] == p and e["epoch"] == ep]:
+            ok = False
+    check(ok, "where() on one and two columns, names and epochs present and absent")
+    check(syn.where(score=60) == [i for i, e in enumerate(rows) if e["score"] == 60],
+          "where() on a value column")
+    check(syn.count_by("board") == {b: sum(e["board"] == b for e in rows)
+                                    for b in {e["board"] for e in rows}},
+          "count_by(board) = entries per week")
+    nb = naive_best(rows, "epoch")
+    check(syn.best_by("epoch") == nb, "best_by(epoch): ADR-0002 and first-of-a-tie (%s)"
+          % ", ".join("%s=%d" % (k, rows[v]["score"]) for k, v in sorted(nb.items())))
+    sub = syn.where(player_name="P7")
+    check(syn.best_by("epoch", sub) == {
+              k: sub[v] for k, v in naive_best([rows[i] for i in sub], "epoch").items()},
+          "best_by within a subset (a player's best per epoch)")
+
+    # =================================================================== 3
+    print("\n3. Aggregates")
+    agg = lh.aggregates(store)
+    players, ep = agg["players"]["players"], agg["epochs"]
+    ok = True
+    for name in {e["player_name"] for e in want if e["player_name"]}:
+        mine = [e for e in want if e["player_name"] == name]
+        p = players.get(name) or {}
+        best = naive_best(mine, "epoch")
+        if (p.get("entries") != len(mine)
+                or set(p.get("best", {})) != set(best)
+                or any(p["best"][k]["score"] != mine[i]["score"]
+                       or p["best"][k]["board"] != mine[i]["board"] for k, i in best.items())):
+            ok = False
+    check(ok and len(players) == len({e["player_name"] for e in want if e["player_name"]}),
+          "%d players: entries and best per epoch, each best from its own epoch" % len(players))
+    ok = True
+    for label, e in ep["epochs"].items():
+        mine = [x for x in want if str(x["epoch"]) == label]
+        if e["entries"] != len(mine) or e["boards"] != sum(
+                str(s["epoch"]) == label for s in store.segments):
+            ok = False
+        if mine and e["best"]["score"] != mine[naive_best(mine, "epoch")[mine[0]["epoch"]]]["score"]:
+            ok = False
+    check(ok, "%d epochs: entries, boards and best entry" % len(ep["epochs"]))
+    check([b["entries"] for b in ep["boards"]] == [s["rows"] for s in store.segments]
+          and any(b["entries"] == 0 for b in ep["boards"]),
+          "the board timeline lists every week, the empty ones too (%d boards)"
+          % len(ep["boards"]))
+
+    # =================================================================== 4
+    print("\n4. Incremental")
+    again, parsed = quiet(lh.build, sources, store)[0]
+    check(parsed == 0 and same(again, store), "a rebuild with nothing changed parses nothing")
+    edited = next(p for s, n, p in sources if s == "preserved"
+                  and json.loads(p.read_text(encoding="utf-8")).get("entries"))
+    doc = json.loads(edited.read_text(encoding="utf-8"))
+    doc["entries"].append({"player_name": "Newcomer", "score": 999, "doom_integral": 1})
+    edited.write_text(json.dumps(doc), encoding="utf-8")
+    inc, parsed = quiet(lh.build, sources, store)[0]
+    full, _ = quiet(lh.build, sources)[0]
+    check(parsed == 1 and same(inc, full) and inc.where(player_name="Newcomer"),
+          "an edited file is the only one parsed, and the result equals a full build")
+    name = "2040_W999_league.json"
+    week = {"meta": {"week_id": "2040_W99"}, "seed": "s", "epoch": {"ladder_version": "L9"},
+            "entries": [{"player_name": "Late", "score": 5}]}
+    (m.archive_dir / name).write_text(json.dumps(week), encoding="utf-8")
+    opened = []
+    real_read = Path.read_bytes
+    Path.read_bytes = lambda self: (opened.append(self.name), real_read(self))[1]
+    try:
+        swapped = lh.replace(full, "archive", name, week, "h")
+    finally:
+        Path.read_bytes = real_read
+    rebuilt, _ = quiet(lh.build, m.history_sources())[0]
+    check(opened == [] and [s["file"] for s in swapped.segments]
+          == [s["file"] for s in rebuilt.segments]
+          and swapped.to_json("")["columns"] == rebuilt.to_json("")["columns"],
+          "replace() adds a week in its place without reading any file, as a build would")
+    (m.archive_dir / name).unlink()
+    bad = lh.history_paths(tmp)["store"]
+    bad.write_text(json.dumps(dict(store.to_json(""), format=0)), encoding="utf-8")
+    check(lh.load(bad) is None and lh.load(tmp / "missing.json") is None,
+          "a store of another format, or none, is not reused")
+    lopsided = store.to_json("")
+    lopsided["columns"]["score"] = lopsided["columns"]["score"][:-1]
+    bad.write_text(json.dumps(lopsided), encoding="utf-8")
+    check(lh.load(bad) is None, "nor one whose columns disagree with its segments")
+
+    # =================================================================== 5
+    print("\n5. The manager keeps it")
+    m = sandbox(tmp / "b")
+    ok, out = quiet(m.rebuild_archive_index, NOW)
+    paths = lh.history_paths(m.league_data_dir)
+    check(ok and all(p.exists() for p in paths.values()),
+          "a rebuild writes the store and both aggregate files")
+    ok, out = quiet(m.rebuild_archive_index, NOW)
+    check("(parsed 0)" in out, "and the next one parses nothing for it")
+    current = json.loads(sorted(m.archive_dir.glob("*_league.json"))[-1]
+                         .read_text(encoding="utf-8"))
+    current["meta"] = dict(current.get("meta") or {}, week_id="2026_W40")
+    current["week_info"] = dict(current.get("week_info") or {}, week_id="2026_W40")
+    current["entries"] = [{"player_name": "Rollover", "score": 12, "doom_integral": 3}]
+    m.current_league_file.write_text(json.dumps(current), encoding="utf-8")
+    builds = []
+    real_build = lh.build
+    lh.build = lambda *a, **kw: (builds.append(1), real_build(*a, **kw))[1]
+    try:
+        ok, out = quiet(m.archive_current_week, NOW)
+    finally:
+        lh.build = real_build
+    held = lh.load(paths["store"])
+    fresh, _ = quiet(lh.build, m.history_sources())[0]
+    check(ok and builds == [] and held is not None and same(held, fresh),
+          "archiving a week updates it without a rebuild, equal to a full build")
+    pl = json.loads(paths["players"].read_text(encoding="utf-8"))
+    check(pl["players"]["Rollover"]["best"] == {
+        str(current["epoch"].get("ladder_version") or current["epoch"]["id"]): {
+            "score": 12, "doom_integral": 3, "board": "2026_W40", "date": None}},
+        "and the published aggregates follow it")
+
+    # =================================================================== 6
+    print("\n6. Speed")
+    big = synthetic(tmp / "big", 500, 400, seed=11)
+    t0 = time.perf_counter()
+    scan = {}
+    for _, _, p in big:
+        d = json.loads(p.read_text(encoding="utf-8"))
+        for e in d["entries"]:
+            if e["player_name"] == "P42":
+                k = d["epoch"]["ladder_version"]
+                if k not in scan or adr(e) > adr(scan[k]):
+                    scan[k] = e
+    scan_s = time.perf_counter() - t0
+    bs, _ = quiet(lh.build, big)[0]
+    path = tmp / "big-store.json"
+    path.write_text(json.dumps(bs.to_json("")), encoding="utf-8")
+    t0 = time.perf_counter()
+    loaded = lh.load(path)
+    load_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    best = loaded.best_by("epoch", loaded.where(player_name="P42"))
+    query_s = time.perf_counter() - t0
+    check({k: loaded.row(i)["entry_uuid"] for k, i in best.items()}
+          == {k: e["entry_uuid"] for k, e in scan.items()},
+          "200,000 entries in 500 weeks: the store gives the scan's answer")
+    check(query_s < scan_s / 10,
+          "query %.1f ms against %.0f ms opening every archive (store load %.0f ms, once)"
+          % (query_s * 1e3, scan_s * 1e3, load_s * 1e3))
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+print()
+if failures:
+    print("%d FAILURE(S)" % len(failures))
+    for f in failures:
+        print("  - " + f)
+    sys.exit(1)
+print("OK: the league history holds every archived and preserved entry, answers")
+print("    as a full scan would, and is kept current one file at a time.")
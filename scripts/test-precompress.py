@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for scripts/precompress.py and scripts/check-precompressed.py.
+
+WHY THIS EXISTS
+---------------
+A precompressed sibling is served INSTEAD of its source, so the two failure
+modes that matter are both silent: a sibling left behind after its source
+changed (readers get the old page), and a skip that never recompresses (every
+deploy after the first ships stale bytes). The incremental cache exists to skip
+work, which is exactly what makes both possible.
+
+So this builds a small public/ tree in a temp dir and asserts:
+
+  1. what gets a sibling: eligible suffix, at least MIN_BYTES, outside
+     dot-directories, and only when the variant is actually smaller;
+  2. the bytes: every sibling decompresses to its source, gzip output is
+     reproducible, and a sibling carries its source's mtime;
+  3. incrementality: an unchanged tree is not touched, an edit recompresses
+     exactly one file, a renamed file is restored from the cache;
+  4. deletion: siblings of deleted, shrunk or no-longer-eligible sources are
+     removed, and a `.tar.gz` that is not ours survives;
+  5. the checker, by FORCED FAILURE: a stale sibling, a corrupt one and an
+     orphan each fail it, and a clean tree passes.
+
+The .br half needs the brotli package. Without it those checks are reported as
+SKIP, and the run still covers .gz end to end.
+
+Run:  python scripts/test-precompress.py     (exit 0 = pass)
+"""
+
+import gzip
+import importlib.util
+import io
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+pc = load("precompress", ROOT / "scripts" / "precompress.py")
+sys.modules["precompress"] = pc
+checker = load("check_precompressed", ROOT / "scripts" / "check-precompressed.py")
+
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+HAVE_BROTLI = pc.load_brotli() is not None
+VARIANTS = pc.VARIANTS if HAVE_BROTLI else ("gz",)
+if not HAVE_BROTLI:
+    print("  SKIP  brotli is not installed: .br checks are skipped (pip install brotli)")
+
+PAGE = ("<p>The same paragraph, many times over, compresses very well. </p>\n" * 80).encode()
+DATA = ('{"events": [' + ", ".join('{"id": %d, "title": "event"}' % i for i in range(200))
+        + "]}").encode()
+
+
+def build(public):
+    files = {
+        "index.html": PAGE,
+        "events/a.html": PAGE + b"<p>a</p>",
+        "events/b.html": PAGE + b"<p>b</p>",
+        "data/events.json": DATA,
+        "tiny.json": b'{"small": true}',
+        "assets/logo.png": PAGE,                     # not an eligible suffix
+        ".events-staging/c.html": PAGE,              # a dot-directory: sync scratch
+        "downloads/release.tar.gz": gzip.compress(b"x" * 5000),   # not ours
+        "data/noise.json": os.urandom(4096),         # incompressible
+    }
+    for rel, data in files.items():
+        (public / rel).parent.mkdir(parents=True, exist_ok=True)
+        (public / rel).write_bytes(data)
+
+
+def run(public, cache, *extra):
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        code = pc.main(["--public", str(public), "--cache", str(cache), *extra]
+                       + ([] if HAVE_BROTLI else ["--gzip-only"]))
+    return code, buf.getvalue()
+
+
+def siblings(public):
+    return sorted(rel for rel in pc.walk(public) if pc.sibling_source(rel))
+
+
+def verdict(public):
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        code = checker.main(["--public", str(public)])
+    return code, buf.getvalue()
+
+
+tmp = Path(tempfile.mkdtemp())
+try:
+    public, cache = tmp / "public", tmp / "cache"
+    build(public)
+
+    # ======================================================================= 1
+    print("\n1. What gets a sibling")
+    code, out = run(public, cache)
+    want = sorted(f"{rel}.{v}" for rel in ("index.html", "events/a.html", "events/b.html",
+                                           "data/events.json") for v in VARIANTS)
+    check(code == 0 and siblings(public) == want,
+          f"eligible files of at least MIN_BYTES get {'/'.join(VARIANTS)}; tiny, "
+          f"non-text, dot-directory and incompressible files do not (got {siblings(public)})")
+    check((public / "downloads" / "release.tar.gz").exists()
+          and not (public / ".events-staging" / "c.html.gz").exists(),
+          "a release archive is not mistaken for a sibling, and sync scratch is left alone")
+
+    # ======================================================================= 2
+    print("\n2. The bytes")
+    wrong = [rel for rel in siblings(public)
+             if pc.decompress((public / rel).read_bytes(), rel.rsplit(".", 1)[1])
+             != (public / pc.sibling_source(rel)[0]).read_bytes()]
+    check(not wrong, f"every sibling decompresses to its source ({wrong})")
+    check((public / "index.html.gz").read_bytes() == pc.compress(PAGE, "gz"),
+          "gzip output is reproducible: no timestamp, no file name in the header")
+    check((public / "index.html.gz").stat().st_mtime_ns
+          == (public / "index.html").stat().st_mtime_ns,
+          "a sibling carries its source's mtime, so rsync sees it unchanged when it is")
+    if HAVE_BROTLI:
+        check(len((public / "data/events.json.br").read_bytes())
+              < len((public / "data/events.json.gz").read_bytes()),
+              "brotli 11 beats gzip -9 on JSON")
+
+    # ======================================================================= 3
+    print("\n3. Only what changed")
+    before = {rel: ((public / rel).stat().st_ino, (public / rel).stat().st_mtime_ns)
+              for rel in siblings(public)}
+    code, out = run(public, cache)
+    check("5 unchanged, 0 restored from the cache, 0 compressed" in out,
+          f"a second run over the same tree compresses nothing ({out.splitlines()[1].strip()})")
+    check(before == {rel: ((public / rel).stat().st_ino, (public / rel).stat().st_mtime_ns)
+                     for rel in siblings(public)},
+          "and rewrites no sibling")
+
+    (public / "events/a.html").write_bytes(PAGE + b"<p>a, edited</p>")
+    code, out = run(public, cache)
+    check("4 unchanged, 0 restored from the cache, 1 compressed" in out,
+          "an edit recompresses exactly the edited file")
+    check(gzip.decompress((public / "events/a.html.gz").read_bytes()).endswith(b"edited</p>"),
+          "and its sibling now carries the edit")
+
+    # Same bytes under a new name: the object store already has them.
+    (public / "events/b.html").rename(public / "events/b2.html")
+    code, out = run(public, cache)
+    check("1 restored from the cache, 0 compressed" in out,
+          "a moved file is restored from the cache, not recompressed")
+
+    # A stale sibling the manifest cannot know about: the manifest matches but
+    # the sibling is gone, so it is rebuilt rather than trusted.
+    (public / "index.html.gz").unlink()
+    code, out = run(public, cache)
+    check((public / "index.html.gz").exists(),
+          "a sibling deleted behind the manifest's back is put back")
+
+    # ======================================================================= 4
+    print("\n4. Siblings of sources that went away")
+    check(not (public / "events/b.html.gz").exists(),
+          "the moved file's old siblings were removed")
+    (public / "data/events.json").write_bytes(b"{}")
+    (public / "events/a.html").unlink()
+    code, out = run(public, cache)
+    gone = [rel for rel in ("data/events.json.gz", "events/a.html.gz") if (public / rel).exists()]
+    check(not gone, f"siblings of a deleted and a shrunk source are removed (left: {gone})")
+    check((public / "downloads" / "release.tar.gz").exists(), "the release archive survives")
+    live = {p.name.split(".", 1)[0] for p in (cache / "objects").iterdir()}
+    check(len(live) == 2, f"the object store keeps only what current files use ({len(live)})")
+
+    if HAVE_BROTLI:
+        code, out = run(public, cache, "--gzip-only")
+        check(code == 0 and not [r for r in siblings(public) if r.endswith(".br")]
+              and (public / "index.html.gz").exists(),
+              "--gzip-only removes every .br rather than leave old ones served")
+        run(public, cache)
+
+    saved = pc.load_brotli
+    pc.load_brotli = lambda: None
+    try:
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            code = pc.main(["--public", str(public), "--cache", str(cache)])
+        check(code == 2, "without brotli it refuses instead of quietly skipping .br")
+    finally:
+        pc.load_brotli = saved
+
+    # ======================================================================= 5
+    print("\n5. The checker, by forced failure")
+    code, out = verdict(public)
+    check(code == 0, f"a tree precompress.py just wrote passes ({out.strip()})")
+
+    index = public / "index.html"
+    index.write_bytes(PAGE + b"<p>edited after precompression</p>")
+    code, out = verdict(public)
+    check(code == 1 and "index.html.gz" in out,
+          "a source edited after precompression fails: its sibling would serve the old page")
+    run(public, cache)
+
+    (public / "events/b2.html.gz").write_bytes(b"not gzip at all")
+    code, out = verdict(public)
+    check(code == 1 and "does not decompress" in out, "a corrupt sibling fails")
+    run(public, cache)
+
+    shutil.copy(public / "index.html.gz", public / "ghost.html.gz")
+    code, out = verdict(public)
+    check(code == 1 and "ghost.html does not exist" in out,
+          "a sibling with no source fails: a deleted page would still be served")
+    (public / "ghost.html.gz").unlink()
+
+    if HAVE_BROTLI:
+        pc.load_brotli = lambda: None
+        try:
+            code, out = verdict(public)
+        finally:
+            pc.load_brotli = saved
+        check(code == 1 and "cannot be verified" in out,
+              "a .br sibling that cannot be verified is a failure, not a pass")
+
+    code, out = verdict(public)
+    check(code == 0, f"and once repaired, the tree passes again ({out.strip()})")
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
+
+print()
+if failures:
+    print(f"{len(failures)} FAILURE(S)")
+    for f in failures:
+        print("  -", f)
+    sys.exit(1)
+print("OK: precompressed siblings match their sources, the cache skips only what is "
+      "unchanged, and the checker fails on every stale, corrupt or orphaned sibling.")
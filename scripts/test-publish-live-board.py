@@ -15,6 +15,8 @@ properties:
   4. never publishes a board from a different epoch
   5. never guesses which empty board is real: with zero rows every wrong key looks
      exactly like the right one, so an undecidable choice is refused, not made
+  6. rewrites nothing when nothing changed: same key and same rows leave both files
+     byte-identical, so a quiet board is not a commit and a deploy every run
 
 Those were assertions in prose. CLAUDE.md's testing discipline says a claimed safety
 property needs a FORCED failure, because a docstring is documentation and not evidence.
@@ -100,15 +102,18 @@ class Sandbox:
     def __enter__(self):
         self.tmp = Path(tempfile.mkdtemp())
         self._saved = {k: getattr(pub, k) for k in
-                       ("BOARD_JSON", "PUBLISHED_JSON", "TARGETS_JSON", "ROOT")}
+                       ("BOARD_JSON", "PUBLISHED_JSON", "TARGETS_JSON", "DELTA_JSON", "ROOT")}
         self._saved_probe = pub.liveness.probe_board
         self._saved_get = pub.liveness.get_json
         self._saved_derive = pub.liveness.derive_targets
+        self._saved_cache_path = pub.liveness.CACHE_PATH
 
         pub.ROOT = self.tmp
         pub.BOARD_JSON = self.tmp / "leaderboard.json"
         pub.PUBLISHED_JSON = self.tmp / "published-board.json"
+        pub.DELTA_JSON = self.tmp / "leaderboard-delta.json"
         pub.TARGETS_JSON = self.tmp / "board-probe-targets.json"
+        pub.liveness.CACHE_PATH = self.tmp / ".board-cache" / "responses.json"
 
         if self.seed_board:
             pub.BOARD_JSON.write_text(json.dumps(GOOD_BOARD), encoding="utf-8")
@@ -157,6 +162,7 @@ class Sandbox:
         pub.liveness.probe_board = self._saved_probe
         pub.liveness.get_json = self._saved_get
         pub.liveness.derive_targets = self._saved_derive
+        pub.liveness.CACHE_PATH = self._saved_cache_path
         shutil.rmtree(self.tmp, ignore_errors=True)
         return False
 
@@ -297,7 +303,23 @@ with Sandbox(epoch="L3", boards={
     check(code == 0 and board_on_disk() == GOOD_BOARD, "--dry-run left the board alone")
     check(not pub.PUBLISHED_JSON.exists(), "--dry-run wrote no published-board.json")
 
-print("\n9. No fallback literals: a refusal must not invent a board key")
+print("\n9. Nothing changed -> nothing rewritten")
+with Sandbox(epoch="L3", boards={
+        ("weekly-2026-w30", "L3"): {"rows": ROWS * 3, "last_entry": "2026-07-30T09:36:29"}}):
+    run()
+    first = (pub.BOARD_JSON.read_bytes(), pub.PUBLISHED_JSON.read_bytes())
+    code, out = run()
+    check(code == 0 and (pub.BOARD_JSON.read_bytes(), pub.PUBLISHED_JSON.read_bytes()) == first,
+          "same key, same rows: both files byte-identical, `generated` included")
+    check("Nothing written" in out, "and it says so")
+with Sandbox(epoch="L3", boards={
+        ("weekly-2026-w30", "L3"): {"rows": ROWS * 3, "last_entry": "2026-07-30T09:36:29"}}) as sb:
+    run()
+    sb.boards[("weekly-2026-w30", "L3")]["rows"] = ROWS * 4
+    code, out = run()
+    check(len(board_on_disk()["entries"]) == 4, "one new row and the board is rewritten")
+
+print("\n10. No fallback literals: a refusal must not invent a board key")
 with Sandbox(epoch=None, boards={}):
     run()
     check(not pub.PUBLISHED_JSON.exists(),
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for scripts/rank_index.py and every publisher that writes it.
+
+WHY THIS EXISTS
+---------------
+The leaderboard page now draws the top of the board from leaderboard-top.json and
+fetches leaderboard.json only when a visitor needs more. That is safe for exactly as
+long as the index says what the board says: a top slice in a different order, a
+player shown at a rank they do not hold, or a build partition that drops a row would
+all look like real standings. So every property is checked against the board itself:
+
+  1. the top slice is the board's first TOP_N rows, in the board's order, with every
+     other field of the board unchanged and the WHOLE board's totals beside it;
+  2. players: each name maps to the rank of its first (best) row, with its score,
+     row count and builds;
+  3. builds: the partitions' ranks cover 1..N exactly once, and each partition's top
+     rows are its first rows in board order;
+  4. it never re-ranks: a board in ingest_scores.py's ADR-0002 order is indexed in
+     that order, not in publish-live-board.py's;
+  5. every writer of leaderboard.json writes it beside the board it wrote, from the
+     same revision, and a publish that changed nothing leaves it alone (or writes it,
+     from the published board, if it is missing) -- checked by
+     running each one, and by a scan that fails on a new writer that does not;
+  6. size: on a 5,000-entry board the top slice is a small fraction of the board.
+
+The network is never used and every path a publisher writes is in a temp dir.
+
+Run:  python scripts/test-rank-index.py     (exit 0 = pass)
+"""
+
+import importlib.util
+import io
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+import rank_index  # noqa: E402
+
+_spec = importlib.util.spec_from_file_location(
+    "publish_live_board", ROOT / "scripts" / "publish-live-board.py")
+pub = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pub)
+
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+def row(n, score):
+    return {"score": score, "player_name": "P%d" % (n % 37), "final_doom": n % 90,
+            "date": "2026-08-%02dT10:00:00" % (1 + n % 28),
+            "game_mode": "v0.14.%d" % (n % 3), "entry_uuid": "u-%05d" % n}
+
+
+def ranked_board(n):
+    entries = sorted((row(i, (i * 7919) % 1000) for i in range(n)), key=pub.rank_key)
+    return {"meta": {"generated": "2026-08-17T12:00:00+00:00", "revision": 7,
+                     "board_key": {"seed": "weekly-2026-w33", "ladder_epoch": "L4"}},
+            "data_status": "live", "legacy": False, "seed": "weekly-2026-w33",
+            "economic_model": "unknown", "entries": entries}
+
+
+# ======================================================================= 1
+print("\n1. The top slice")
+board = ranked_board(250)
+idx = rank_index.build_index(board, top_n=100)
+top = idx["top"]
+check(top["entries"] == board["entries"][:100], "the first 100 rows, in board order")
+check({k: v for k, v in top.items() if k not in ("entries", "index")}
+      == {k: v for k, v in board.items() if k != "entries"},
+      "every other field of the board is carried unchanged (meta, status, seed ...)")
+st = top["index"]["stats"]
+check(top["index"]["truncated"] and st["total_entries"] == 250
+      and st["total_players"] == len({e["player_name"] for e in board["entries"]}),
+      "it says it is truncated and gives the whole board's totals (%d entries, %d players)"
+      % (st["total_entries"], st["total_players"]))
+check(st["avg_score"] == round(sum(e["score"] for e in board["entries"]) / 250, 2),
+      "the average is over all 250 rows, not the 100 shown")
+small = rank_index.build_index(ranked_board(30), top_n=100)["top"]
+check(not small["index"]["truncated"] and len(small["entries"]) == 30,
+      "a board shorter than TOP_N is all there, and says so")
+empty = rank_index.build_index(dict(board, entries=[], data_status="live-empty"))
+check(empty["top"]["entries"] == [] and empty["top"]["index"]["stats"]["total_entries"] == 0
+      and empty["top"]["data_status"] == "live-empty",
+      "an empty board indexes to an empty slice with its honest status")
+
+# ======================================================================= 2
+print("\n2. Players")
+players = idx["players"]["players"]
+first = {}
+for r, e in enumerate(board["entries"], 1):
+    first.setdefault(e["player_name"], (r, e["score"]))
+check({n: (p["rank"], p["score"]) for n, p in players.items()} == first,
+      "each of %d names maps to the rank and score of its best row" % len(players))
+check(sum(p["entries"] for p in players.values()) == 250,
+      "row counts add up to the board")
+p0 = [e for e in board["entries"] if e["player_name"] == "P0"]
+check(sorted(players["P0"]["builds"]) == sorted({e["game_mode"] for e in p0}),
+      "and each player's builds are the builds of their rows")
+check(idx["players"]["meta"] == board["meta"], "the file names the board it indexes")
+
+# ======================================================================= 3
+print("\n3. Builds")
+builds = idx["builds"]["builds"]
+ranks = sorted(r for b in builds.values() for r in b["ranks"])
+check(ranks == list(range(1, 251)), "the partitions' ranks cover 1..250 exactly once")
+check(all(board["entries"][r - 1]["game_mode"] == name
+          for name, b in builds.items() for r in b["ranks"]),
+      "every rank in a partition is a row of that build")
+check(all([t["rank"] for t in b["top"]] == b["ranks"][:rank_index.PARTITION_TOP]
+          and all(board["entries"][t["rank"] - 1] == t["entry"] for t in b["top"])
+          for b in builds.values()),
+      "each partition's top rows are its first %d rows, with their global rank"
+      % rank_index.PARTITION_TOP)
+
+# ======================================================================= 4
+print("\n4. It never re-ranks")
+# ADR-0002 (ingest_scores.py): score desc, then doom_integral desc. Two rows tie on
+# score; the publisher's rank_key would put the earlier date first, ADR-0002 does not.
+adr = {"meta": {}, "entries": [
+    {"score": 50, "doom_integral": 9, "player_name": "Late", "date": "2026-08-09"},
+    {"score": 50, "doom_integral": 1, "player_name": "Early", "date": "2026-08-01"}]}
+i4 = rank_index.build_index(adr)
+check([e["player_name"] for e in i4["top"]["entries"]] == ["Late", "Early"]
+      and i4["players"]["players"]["Late"]["rank"] == 1,
+      "a board in ADR-0002 order is indexed in that order")
+
+# ======================================================================= 5
+print("\n5. Every writer of leaderboard.json writes it")
+tmp = Path(tempfile.mkdtemp())
+try:
+    # ---- ingest_scores.py, as a subprocess with every path in tmp
+    deployed = json.loads((ROOT / "public" / "data" / "version.json")
+                          .read_text(encoding="utf-8"))["latest_release"]["version"]
+    indir = tmp / "in"
+    indir.mkdir()
+    seed_entries = [{"score": 40 - i, "doom_integral": 1.0, "player_name": "S%d" % (i % 3),
+                     "date": "2026-01-01", "level_reached": 40 - i, "game_mode": "standard",
+                     "duration_seconds": 300.0, "entry_uuid": "s-%d" % i} for i in range(6)]
+    (indir / "seed_leaderboard_weekly-2026-w01.json").write_text(json.dumps({
+        "meta": {"generated": "2026-01-01T00:00:00Z", "game_version": deployed,
+                 "total_players": 3, "export_source": "test-rank-index.py"},
+        "seed": "weekly-2026-w01", "economic_model": "Bootstrap_test",
+        "entries": seed_entries}), encoding="utf-8")
+    out = tmp / "ingest" / "leaderboard.json"
+    out.parent.mkdir()
+    r = subprocess.run([sys.executable, str(ROOT / "scripts" / "ingest_scores.py"),
+                        "--input", str(indir), "--output", str(out), "--no-cache"],
+                       capture_output=True, text=True, encoding="utf-8", errors="replace")
+    paths = rank_index.index_paths(out)
+    ok = r.returncode == 0 and all(p.exists() for p in paths.values())
+    check(ok, "ingest_scores.py writes the three files beside --output (%s)"
+          % ", ".join(p.name for p in paths.values()))
+    if ok:
+        doc = json.loads(out.read_text(encoding="utf-8"))
+        itop = json.loads(paths["top"].read_text(encoding="utf-8"))
+        check(itop["entries"] == doc["entries"][:rank_index.TOP_N]
+              and itop["meta"] == doc["meta"] and itop["index"]["full"] == "leaderboard.json",
+              "and its slice is that board's, meta and all")
+
+    # ---- publish-live-board.py, in-process with the API stubbed
+    saved = {k: getattr(pub, k) for k in
+             ("ROOT", "BOARD_JSON", "PUBLISHED_JSON", "TARGETS_JSON", "DELTA_JSON")}
+    saved_live = {k: getattr(pub.liveness, k) for k in
+                  ("probe_board", "get_json", "derive_targets", "CACHE_PATH")}
+    rows = [row(i, 1000 - i) for i in range(3)]
+    try:
+        pub.ROOT = tmp
+        pub.BOARD_JSON = tmp / "leaderboard.json"
+        pub.PUBLISHED_JSON = tmp / "published-board.json"
+        pub.TARGETS_JSON = tmp / "board-probe-targets.json"
+        pub.DELTA_JSON = tmp / "leaderboard-delta.json"
+        pub.liveness.CACHE_PATH = tmp / ".board-cache" / "responses.json"
+        pub.TARGETS_JSON.write_text(json.dumps(
+            {"current_ladder_epoch": {"value": "L4", "source": "test"}}), encoding="utf-8")
+        pub.liveness.probe_board = lambda s, v: {
+            "seed": s, "version": v, "key_shape": "epoch", "entries": len(rows),
+            "players": 1, "player_names": [], "builds_seen": [], "last_entry": "2026-08-09"}
+        pub.liveness.get_json = lambda url, headers=None, timeout=20: (
+            {"ok": True, "entries": list(rows)}, None)
+        pub.liveness.derive_targets = lambda a, b: (["weekly-2026-w33"], [], [])
+
+        def publish():
+            sys.argv = ["publish-live-board.py", "--no-cache"]
+            with redirect_stdout(io.StringIO()):
+                return pub.main()
+
+        publish()
+        lpaths = rank_index.index_paths(pub.BOARD_JSON)
+        live = json.loads(pub.BOARD_JSON.read_text(encoding="utf-8"))
+        ltop = json.loads(lpaths["top"].read_text(encoding="utf-8"))
+        check(ltop["entries"] == live["entries"] and ltop["meta"]["revision"] == 1,
+              "publish-live-board.py writes it, at the board's revision")
+        before = {n: p.read_text(encoding="utf-8") for n, p in lpaths.items()}
+        publish()
+        check({n: p.read_text(encoding="utf-8") for n, p in lpaths.items()} == before,
+              "a publish that changed nothing leaves the index alone")
+        board_before = pub.BOARD_JSON.read_text(encoding="utf-8")
+        lpaths["players"].unlink()
+        publish()
+        check(all(p.exists() for p in lpaths.values())
+              and {n: p.read_text(encoding="utf-8") for n, p in lpaths.items()} == before
+              and pub.BOARD_JSON.read_text(encoding="utf-8") == board_before,
+              "a publish that changed nothing restores a missing index, not the board")
+        rows.append(row(9, 5000))
+        publish()
+        ltop = json.loads(lpaths["top"].read_text(encoding="utf-8"))
+        lpl = json.loads(lpaths["players"].read_text(encoding="utf-8"))
+        check(ltop["meta"]["revision"] == 2 and ltop["entries"][0]["entry_uuid"] == "u-00009"
+              and lpl["players"]["P9"]["rank"] == 1,
+              "a new top score moves the slice and the player map with the board")
+    finally:
+        for k, v in saved.items():
+            setattr(pub, k, v)
+        for k, v in saved_live.items():
+            setattr(pub.liveness, k, v)
+
+    # ---- game-integration.py --export, in-process with the game checkout stubbed
+    _gspec = importlib.util.spec_from_file_location(
+        "game_integration", ROOT / "scripts" / "game-integration.py")
+    gi_mod = importlib.util.module_from_spec(_gspec)
+    _gspec.loader.exec_module(gi_mod)
+    gi = gi_mod.GameRepositoryIntegration()
+    gi.leaderboard_output = tmp / "game" / "leaderboard.json"
+    gi.integration_config = tmp / "game-integration-config.json"
+    gi.game_repo_path = tmp
+    exported = ranked_board(7)
+    gi.get_game_leaderboard_data = lambda: exported
+    gpaths = rank_index.index_paths(gi.leaderboard_output)
+    gi.leaderboard_output.parent.mkdir()
+    stale = rank_index.build_index(ranked_board(3))
+    for n, p in gpaths.items():
+        p.write_text(json.dumps(stale[n]), encoding="utf-8")
+    with redirect_stdout(io.StringIO()):
+        exported_ok = gi.export_game_data()
+    gtop = json.loads(gpaths["top"].read_text(encoding="utf-8"))
+    check(exported_ok and gtop["entries"] == exported["entries"]
+          and gtop["index"]["stats"]["total_entries"] == 7,
+          "game-integration.py --export rewrites an index left from the previous board")
+
+    # ---- and no other script writes leaderboard.json without it. A script that
+    # names the file and writes anything at all must call write_index, or say here
+    # why it does not.
+    READS_ONLY = {
+        "alpha-watch.py": "reads the board; writes its own annotations file",
+        "check-board-liveness.py": "reads the snapshot; writes board-liveness.json",
+        "validate_data.py": "reads the board to validate it; writes its report",
+        "rank_index.py": "is the index",
+    }
+    names_board = ("leaderboard.json", '"leaderboard" / "data" / "leaderboard')
+    writes = ("json.dump(", "write_text(", "'w'", '"w"')
+    unindexed = []
+    for path in sorted((ROOT / "scripts").rglob("*.py")):
+        if path.name.startswith("test") or path.name in READS_ONLY:
+            continue
+        src = path.read_text(encoding="utf-8", errors="replace")
+        if (any(n in src for n in names_board) and any(w in src for w in writes)
+                and "rank_index.write_index(" not in src):
+            unindexed.append(path.relative_to(ROOT).as_posix())
+    check(not unindexed, "every script that writes leaderboard.json refreshes the index "
+                         "(missing: %s)" % (unindexed or "none"))
+
+    # =================================================================== 6
+    print("\n6. Size")
+    big = ranked_board(5000)
+    full = len(json.dumps(big, indent=2))
+    sizes = {n: len(json.dumps(d, indent=2)) for n, d in rank_index.build_index(big).items()}
+    check(sizes["top"] < full / 20, "the top slice is %d bytes against a %d-byte board"
+          % (sizes["top"], full))
+    print("    players %d bytes, builds %d bytes" % (sizes["players"], sizes["builds"]))
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+print()
+if failures:
+    print("%d FAILURE(S)" % len(failures))
+    for f in failures:
+        print("  - " + f)
+    sys.exit(1)
+print("OK: the rank index ranks exactly as the board it indexes, and every publisher")
+print("    keeps it beside the board it wrote.")
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""The rewritten residue scanner gives the SAME answers as the one it replaced.
+
+WHY THIS EXISTS
+---------------
+residue_positions() is the independent half of the email gate: it runs on every
+sync over every rendered page, and check-published-emails.py runs it over every
+file under public/. It was rewritten for speed -- one combined candidate pattern
+instead of a bare '@' walk plus two anchored regexes per hit, (pos, endpos)
+windows instead of `text[i:]` copies, and interval arithmetic against
+EMAIL_PATTERN's spans instead of a per-character set.
+
+A speed-up of a safety check is only acceptable if it changes NOTHING about the
+verdicts, and "I reasoned about the regex semantics" is documentation, not
+evidence. So this keeps the previous implementation VERBATIM below, as the
+reference, and requires the two to agree position for position on:
+
+  1. every scannable file under public/ -- the real tree the guard runs on;
+  2. a fixed set of edge cases aimed at the exact places a rewrite can drift:
+     the 120- and 240-character windows, '$' before a trailing newline, the
+     '^' anchor, brace groups, BibTeX and CSS at-rules, Unicode whitespace;
+  3. a few thousand seeded random strings built from the characters the rules
+     turn on, so the comparison is not limited to shapes someone thought of.
+
+If the rules themselves ever change, change the reference below IN THE SAME
+COMMIT, deliberately. A disagreement here is never something to "fix" by
+editing the reference to match.
+
+Run:  python scripts/test-residue-scanner.py     (exit 0 = pass)
+"""
+
+import importlib.util
+import random
+import re
+import sys
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_spec = importlib.util.spec_from_file_location(
+    "sync_events", ROOT / "scripts" / "sync" / "sync-events.py")
+se = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(se)
+
+# Same set check-published-emails.py scans.
+SCAN_SUFFIXES = {".html", ".json", ".md", ".xml", ".txt"}
+
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+# --------------------------------------------------------------------------- reference
+# The scanner exactly as it stood before the rewrite. Do not tidy it.
+REF_BIBTEX = re.compile(
+    r"@(?:article|inproceedings|incollection|misc|book|booklet|conference"
+    r"|inbook|manual|mastersthesis|phdthesis|proceedings|techreport"
+    r"|unpublished)\s*\{",
+    re.IGNORECASE,
+)
+REF_CSS_AT_RULE = re.compile(
+    r"@(?:media|import|supports|keyframes|font-face|charset|namespace|page"
+    r"|layer|container|property)\b",
+    re.IGNORECASE,
+)
+REF_DOMAIN = re.compile(
+    r"^\s{0,2}[A-Za-z0-9][A-Za-z0-9\-]{0,40}"
+    r"(?:\s{0,2}[.\-]\s{0,2}[A-Za-z0-9\-]{1,40}){0,6}"
+    r"\s{0,2}\.\s{0,2}[A-Za-z]{2,24}"
+)
+REF_LOCAL = re.compile(r"(\{[^{}@]{1,200}\}|[A-Za-z0-9._%+\-]{1,64})\s{0,2}$")
+
+
+def ref_person_shaped(local):
+    local = local.split("mailto:", 1)[-1].strip()
+    if not re.search(r"[A-Za-z]", local):
+        return False
+    if "{" in local:
+        return True
+    if len(local) >= 4 and re.search(r"[._%+\-]", local):
+        return True
+    return len(local) >= 5
+
+
+def ref_residue_positions(text):
+    found = set()
+    for m in re.finditer("@", text):
+        i = m.start()
+        rest = text[i:]
+        if REF_BIBTEX.match(rest) or REF_CSS_AT_RULE.match(rest):
+            continue
+        if not REF_DOMAIN.match(text[i + 1:i + 120]):
+            continue
+        left = REF_LOCAL.search(text[max(0, i - 240):i])
+        if not left:
+            continue
+        if not ref_person_shaped(left.group(1)):
+            continue
+        found.add(i)
+    return found
+
+
+def ref_explained_positions(text):
+    covered = set()
+    for m in se.EMAIL_PATTERN.finditer(text):
+        for k in range(m.start(), m.end()):
+            if text[k] == "@":
+                covered.add(k)
+    return covered
+
+
+def ref_unexplained(text):
+    return len(ref_residue_positions(text) - ref_explained_positions(text))
+
+
+def agree(text):
+    """None if the two implementations agree on `text`, else what differed."""
+    if se.residue_positions(text) != ref_residue_positions(text):
+        return "residue_positions"
+    if se.unexplained_residue(text) != ref_unexplained(text):
+        return "unexplained_residue"
+    return None
+
+
+# =========================================================================== 1
+print("\n1. Every scannable file under public/")
+
+files = [p for p in sorted((ROOT / "public").rglob("*"))
+         if p.is_file() and p.suffix.lower() in SCAN_SUFFIXES]
+disagreed = []
+ats = 0
+for path in files:
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        text = f.read()
+    if "@" not in text:
+        continue
+    ats += text.count("@")
+    what = agree(text)
+    if what:
+        disagreed.append(f"{path.relative_to(ROOT).as_posix()} ({what})")
+check(len(files) > 100, f"walked {len(files)} files carrying {ats} '@' characters")
+check(not disagreed, f"identical positions and counts on every file (differ: {disagreed[:3]})")
+
+
+# =========================================================================== 2
+print("\n2. The edges a rewrite drifts on")
+
+LONG_LABEL = "a" * 40
+EDGES = {
+    "ordinary address": "jane.doe@example.edu",
+    "brace group": "{alpha,bravo,charlie}@example.edu",
+    "brace group, spaced": "{alpha, bravo} @ example . edu",
+    "short local (footer shape)": "team@pdoom1.com",
+    "mailto prefix": "mailto:jane.doe@example.edu",
+    "BibTeX": "@article{x, author={a}} jane.doe@article{y}",
+    "BibTeX, mixed case and space": "jane.doe@InProceedings {z}",
+    "CSS at-rule": "}@media (x) { a.b@media.org }",
+    "CSS prefix of a longer word": "jane.doe@mediabank.org",
+    "'$' before a trailing newline": "jane.doe\n@example.edu",
+    "two spaces then newline": "jane.doe  \n@example.edu",
+    "three spaces": "jane.doe   @example.edu",
+    "Unicode whitespace": "jane.doe @ example.edu",
+    "local past the 240 window": "x" * 300 + "@example.edu",
+    "brace past the 240 window": "{" + "a," * 130 + "b}@example.edu",
+    "domain near the 120 window": "jane.doe@" + ".".join([LONG_LABEL] * 3) + ".edu",
+    "domain past the 120 window": "jane.doe@" + "-".join(["1" * 40] * 4) + ".edu",
+    "'@' at the very start": "@example.edu",
+    "'@' at the very end": "jane.doe@",
+    "notation": "pass@k and Acc@100, Xeon @ 2.20GHz",
+    "glued TLD": "madry@mit.eduAleksandar",
+    "adjacent addresses": "a.b@c.de,e.f@g.hi;{j,k}@l.mn",
+    "address inside a brace group's reach": "{note: see jane.doe} @example.edu",
+}
+for label, text in EDGES.items():
+    what = agree(text)
+    check(what is None, f"{label}" + (f" -- {what} differs" if what else ""))
+
+
+# =========================================================================== 3
+print("\n3. Seeded random strings over the characters the rules turn on")
+
+rng = random.Random(20260815)
+ALPHABET = ("abcdeXYZ019" + "._%+-" + "@@@@" + "{},:" + "  \n\t "
+            + "<>\"'/" + "mailto")
+WORDS = ["media", "article", "edu", "org", "mailto:", "jane.doe", "{a,b}",
+         "example", ". edu", " @ ", "@", "\n", "x" * 70, "y" * 250]
+fuzz_disagreed = []
+for n in range(4000):
+    parts = []
+    for _ in range(rng.randint(1, 40)):
+        if rng.random() < 0.3:
+            parts.append(rng.choice(WORDS))
+        else:
+            parts.append("".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 8))))
+    text = "".join(parts)
+    if agree(text) or se.explained_positions(text) != ref_explained_positions(text):
+        fuzz_disagreed.append(repr(text[:60]))
+check(not fuzz_disagreed,
+      f"4000 random strings, no disagreement (first: {fuzz_disagreed[:2]})")
+
+
+print()
+if failures:
+    print(f"{len(failures)} FAILURE(S)")
+    for f in failures:
+        print("  -", f)
+    sys.exit(1)
+print("OK: the rewritten residue scanner returns exactly the positions the "
+      "previous one did, on the whole public/ tree and on every edge tried.")
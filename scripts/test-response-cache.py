@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for scripts/response_cache.py and the board reads that go through it.
+
+WHY THIS EXISTS
+---------------
+The response cache sits between the board probe and the score API, and a cache
+in that position has one way to be dangerous: answering from memory when it
+should have asked. A stale board presented as live is precisely the "nobody is
+playing" lie this subsystem exists to prevent. So besides proving that it saves
+work, everything below checks that it never stands in for the server.
+
+Real sockets against scripts/stub_score_api.py on 127.0.0.1. It asserts:
+
+  1. validators: with an ETag the second read is a 304 with no body, and what
+     comes back is the held body;
+  2. without validators (the real API today) an identical body is recognised by
+     hash, a changed one is not, and a derived value is recomputed only on change;
+  3. the disk: a saved cache revalidates in the next process; a corrupt or
+     other-version file is an empty cache; a changed derived_key drops derived
+     values but keeps bodies; idle entries are pruned; a run that fetched nothing
+     writes nothing;
+  4. an error is an error: never a cached body, and it leaves the entry alone;
+  5. the board probe reads through it with results identical to the uncached
+     probe, and an unchanged board is not parsed again; a body that is not
+     UTF-8 is an error for that board, never a lost result;
+  6. the publisher takes the winner's rows from the probe's own read -- one GET
+     per board, none twice.
+
+Run:  python scripts/test-response-cache.py     (exit 0 = pass)
+"""
+
+import importlib.util
+import json
+import shutil
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+import http_client  # noqa: E402
+import response_cache  # noqa: E402
+from stub_score_api import StubScoreAPI  # noqa: E402
+
+_spec = importlib.util.spec_from_file_location(
+    "publish_live_board", ROOT / "scripts" / "publish-live-board.py")
+pub = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pub)
+liveness = pub.liveness
+
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+ROW = {"score": 12, "player_name": "Ada", "date": "2026-08-08T09:00:00", "game_mode": "v0.14.0"}
+KEY = ("weekly-2026-w32", "L4")
+
+
+def url_of(api, seed=KEY[0], version=KEY[1]):
+    return "%s?seed=%s&version=%s" % (api.url, seed, version)
+
+
+tmp = Path(tempfile.mkdtemp())
+try:
+    print("Response cache -- conditional reads, against a local stub")
+    print("=" * 74)
+
+    # =================================================================== 1
+    print("\n1. Validators: a 304 costs no body")
+    with StubScoreAPI({KEY: [ROW] * 5}, etag=True) as api:
+        cache = response_cache.ResponseCache(tmp / "etag.json", http_client.HttpClient())
+        first = cache.fetch(url_of(api))
+        second = cache.fetch(url_of(api))
+        check(first.state == "new" and second.state == "not-modified",
+              "first read is new, the second is not modified (%s, %s)"
+              % (first.state, second.state))
+        check(api.not_modified == 1 and "If-None-Match" in api.headers[1],
+              "because the held ETag went back as If-None-Match")
+        check(second.body == first.body and json.loads(second.body)["entries"] == [ROW] * 5,
+              "and the held body is what the caller gets")
+
+    # =================================================================== 2
+    print("\n2. No validators: the body hash decides")
+    boards = {KEY: [ROW]}
+    with StubScoreAPI(boards) as api:
+        cache = response_cache.ResponseCache(tmp / "hash.json", http_client.HttpClient())
+        computed = []
+
+        def derive(url):
+            return cache.derived(url, "n", lambda: computed.append(1) or len(computed))
+
+        states = []
+        for rows in ([ROW], [ROW], [ROW, ROW], [ROW, ROW]):
+            api.boards[KEY] = rows
+            states.append(cache.fetch(url_of(api)).state)
+            derive(url_of(api))
+        check(states == ["new", "unchanged", "changed", "unchanged"],
+              "new, unchanged, changed, unchanged (%s)" % states)
+        check(not any("If-None-Match" in h or "If-Modified-Since" in h for h in api.headers),
+              "no validator is invented when the server sent none")
+        check(len(computed) == 2 and cache.stats["derived_reused"] == 2,
+              "a derived value is computed once per distinct body (%d computes)"
+              % len(computed))
+        check(cache.hit_rate() == 0.5 and "50% already held" in cache.summary(),
+              "and the hit rate says so: %s" % cache.summary())
+        cache.save()
+
+    # =================================================================== 3
+    print("\n3. The disk")
+    with StubScoreAPI({KEY: [ROW, ROW]}) as api:
+        path = tmp / "hash.json"
+        # The stub's port changed, so re-key the saved entry onto this server's URL.
+        doc = json.loads(path.read_text(encoding="utf-8"))
+        doc["responses"] = {url_of(api): e for e in doc["responses"].values()}
+        path.write_text(json.dumps(doc), encoding="utf-8")
+
+        again = response_cache.ResponseCache(path, http_client.HttpClient())
+        check(again.fetch(url_of(api)).state == "unchanged",
+              "a saved cache recognises an unchanged body in the next process")
+        check(again.derived(url_of(api), "n", lambda: "recomputed") == 2,
+              "and keeps the derived value computed last time")
+        other = response_cache.ResponseCache(path, http_client.HttpClient(), derived_key="v2")
+        other.fetch(url_of(api))
+        check(other.derived(url_of(api), "n", lambda: "recomputed") == "recomputed",
+              "a different derived_key drops derived values ...")
+        check(other.stats["unchanged"] == 1, "... but not the body")
+
+        for bad in ("{ not json", json.dumps({"version": 99, "responses": doc["responses"]})):
+            path.write_text(bad, encoding="utf-8")
+            c = response_cache.ResponseCache(path, http_client.HttpClient())
+            check(c.entries == {} and c.fetch(url_of(api)).state == "new",
+                  "an unreadable or other-version file is an empty cache (%s...)" % bad[:12])
+
+        c.entries[url_of(api)]["used_at"] = (
+            date.today() - timedelta(days=response_cache.MAX_IDLE_DAYS + 1)).isoformat()
+        c.entries["http://127.0.0.1:1/idle"] = dict(c.entries[url_of(api)])
+        c.save()
+        saved = json.loads(path.read_text(encoding="utf-8"))["responses"]
+        check(list(saved) == [], "entries idle for more than %d days are dropped on save"
+              % response_cache.MAX_IDLE_DAYS)
+        quiet = tmp / "quiet.json"
+        response_cache.ResponseCache(quiet).save()
+        check(not quiet.exists(), "a run that fetched nothing writes nothing")
+
+    # =================================================================== 4
+    print("\n4. An error is an error")
+    with StubScoreAPI({KEY: [ROW]}) as api:
+        cache = response_cache.ResponseCache(None, http_client.HttpClient())
+        cache.fetch(url_of(api))
+        api.status[KEY] = 503
+        failed = cache.fetch(url_of(api))
+        check(failed.state == "error" and failed.error == "HTTP 503" and failed.body is None,
+              "a 503 is 'HTTP 503' with no body, never the held one (%r)" % failed.error)
+        data, err = cache.get_json(url_of(api))
+        check(data is None and err == "HTTP 503", "get_json() keeps the same contract")
+        del api.status[KEY]
+        check(cache.fetch(url_of(api)).state == "unchanged",
+              "and the entry was left alone: the next good read compares with the last")
+    with StubScoreAPI({}) as api:
+        dead = api.url
+    c = response_cache.ResponseCache(None, http_client.HttpClient())
+    data, err = c.get_json(dead + "?seed=s&version=L4")
+    check(data is None and err and not err.startswith("HTTP "),
+          "a host that is gone is a connection error (%r)" % err)
+
+    # =================================================================== 5
+    print("\n5. The board probe, through the cache")
+    boards = {KEY: [ROW, dict(ROW, player_name="Bo", date="2026-08-09T10:00:00")]}
+    pairs = [(s, v) for s in ("weekly-2026-w31", KEY[0]) for v in ("L3", "L4")]
+    saved_api, saved_path = liveness.SCORE_API, liveness.CACHE_PATH
+    try:
+        liveness.CACHE_PATH = tmp / ".board-cache" / "responses.json"
+        with StubScoreAPI(boards) as api:
+            liveness.SCORE_API = api.url
+            liveness.BOARD_CACHE = None
+            plain, _ = liveness.probe_all(pairs, liveness.probe_board)
+            cache = liveness.open_board_cache()
+            cold, _ = liveness.probe_all(pairs, liveness.probe_board)
+            warm, _ = liveness.probe_all(pairs, liveness.probe_board)
+            check(plain == cold == warm,
+                  "uncached, cold and warm probes agree field for field")
+            check(cache.stats["unchanged"] == len(pairs)
+                  and cache.stats["derived_reused"] == len(pairs),
+                  "the warm probe parsed none of the %d unchanged boards" % len(pairs))
+            cache.save()
+            check(liveness.CACHE_PATH.exists(), "and the cache lands where CACHE_PATH says")
+
+            # A body that is not UTF-8 is not held, so there is no entry to
+            # remember a summary against; the probe must still answer for it.
+            api.raw[KEY] = b"\xff\xfe\x00not text"
+            cache = liveness.open_board_cache()
+            odd, budget_hit = liveness.probe_all(pairs, liveness.probe_board)
+            bad = [r for r in odd if (r["seed"], r["version"]) == KEY]
+            check(len(odd) == len(pairs) and not budget_hit,
+                  "a non-UTF-8 body still yields all %d results (%d)" % (len(pairs), len(odd)))
+            check(len(bad) == 1 and bad[0]["error"] and bad[0]["entries"] is None,
+                  "and that board is an error, not a crash (%r)" % (bad and bad[0]["error"]))
+            check([r for r in odd if r not in bad]
+                  == [r for r in cold if (r["seed"], r["version"]) != KEY],
+                  "the other boards read as before")
+            url = liveness.board_url(*KEY)
+            twice = [cache.derived(url, "summary", lambda: "x") for _ in range(2)]
+            check(twice == ["x", "x"] and "summary" not in cache.seen.get(url, {}).get("derived", {}),
+                  "derived() on a body the cache does not hold computes, uncached")
+            del api.raw[KEY]
+
+            # =========================================================== 6
+            print("\n6. The publisher reads each board once")
+            api.requests.clear()
+            liveness.open_board_cache()
+            saved_derive = liveness.derive_targets
+            liveness.derive_targets = lambda a, b: ([s for s, _ in pairs[::2]], ["L4"], [])
+            try:
+                board, entries, status = pub.pick_live_board("L4", verbose=False)
+            finally:
+                liveness.derive_targets = saved_derive
+            check(status == "ok" and board["seed"] == KEY[0] and entries == boards[KEY],
+                  "the winner's rows are the board's rows")
+            check(sorted(api.requests) == sorted(set(api.requests)) and len(api.requests) == 2,
+                  "two boards, two GETs: the winner was not fetched again (%s)"
+                  % api.requests)
+            check(not api.writes, "and nothing but GET was sent")
+    finally:
+        liveness.SCORE_API, liveness.CACHE_PATH = saved_api, saved_path
+        liveness.BOARD_CACHE = None
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+print()
+if failures:
+    print("%d FAILURE(S)" % len(failures))
+    for f in failures:
+        print("  - " + f)
+    sys.exit(1)
+print("OK: unchanged responses are recognised by 304 or by hash, never served in")
+print("    place of the server, and the publisher reads the winning board once.")
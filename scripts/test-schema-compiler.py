@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for scripts/schema_compiler.py: the compiled validators say what jsonschema says.
+
+WHY THIS EXISTS
+---------------
+ingest_scores.py and validate_data.py now take their schema verdicts from Python
+generated out of schemas/ instead of from jsonschema. A validator that is fast and
+wrong is worse than none: it would publish an entry the contract rejects, or drop
+a real score. So the compiled verdict is checked against jsonschema's
+Draft7Validator -- the reference the callers used before -- instance by instance:
+
+  1. every schema (and every $def the callers use) compiles, and agrees with
+     jsonschema on every real data file and entry in the tree;
+  2. thousands of mutated instances -- a field deleted, added, or replaced by a
+     value of another type or out of range -- get the same verdict from both;
+  3. the corners where a hand-written validator usually drifts: 3.0 is an
+     integer, a bool is not a number, $ref ignores its siblings, `format` is not
+     asserted, `pattern` searches rather than anchors, enums are typed;
+  4. a keyword the compiler does not implement is refused at compile time, never
+     skipped;
+  5. the cache: generated once, reused while the schemas are unchanged, replaced
+     when a schema changes, regenerated when the file is damaged;
+  6. the batch call returns exactly the indices jsonschema rejects.
+
+Needs jsonschema (the reference); CI installs it.
+
+Run:  python scripts/test-schema-compiler.py     (exit 0 = pass)
+"""
+
+import json
+import random
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+import schema_compiler  # noqa: E402
+
+import jsonschema  # noqa: E402
+from referencing import Registry, Resource  # noqa: E402
+
+SCHEMAS = ROOT / "schemas"
+LB = ROOT / "public" / "leaderboard" / "data"
+
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+def reference(schemas_dir, name, pointer=None):
+    """jsonschema's Draft7Validator for name#pointer, cross-file $refs resolved."""
+    docs = {f.name: json.loads(f.read_text(encoding="utf-8"))
+            for f in Path(schemas_dir).glob("*.schema.json")}
+    registry = Registry().with_resources(
+        [(d.get("$id", n), Resource.from_contents(d)) for n, d in docs.items()])
+    base = docs[name].get("$id", name)
+    return jsonschema.Draft7Validator({"$ref": base + (pointer or "")}, registry=registry)
+
+
+def load_json(p):
+    return json.loads(Path(p).read_text(encoding="utf-8"))
+
+
+POOL = [None, True, False, 0, 1, -1, 3.0, 2.5, -0.5, 10 ** 6, "", "x", "x" * 70,
+        "2026_W07", "2026-W07", "rare", [], [1], {}, {"a": 1}]
+
+
+def mutate(x, rng):
+    """A copy of x with one change somewhere inside it; only the path is copied."""
+    if isinstance(x, dict) and x and rng.random() < 0.7:
+        k = rng.choice(list(x))
+        return dict(x, **{k: mutate(x[k], rng)})
+    if isinstance(x, list) and x and rng.random() < 0.7:
+        i = rng.randrange(len(x))
+        return x[:i] + [mutate(x[i], rng)] + x[i + 1:]
+    roll = rng.random()
+    if isinstance(x, dict) and x and roll < 0.3:
+        k = rng.choice(list(x))
+        return {kk: v for kk, v in x.items() if kk != k}
+    if isinstance(x, dict) and roll < 0.5:
+        return dict(x, **{rng.choice(["extra", "score", "player_name", "seed"]):
+                          rng.choice(POOL)})
+    return rng.choice(POOL)
+
+
+# The schemas the callers validate, and the real files each one describes.
+seed_files = sorted(LB.glob("seed_leaderboard_*.json"))
+entries = [e for f in seed_files for e in (load_json(f).get("entries") or [])]
+preserved = [load_json(f) for f in sorted((LB / "preserved").rglob("*.json"))]
+entries += [e for p in preserved if isinstance(p, list) for e in p]
+entries += [e for p in preserved if isinstance(p, dict)
+            for e in (p.get("entries") or []) if isinstance(p.get("entries"), list)]
+events = load_json(ROOT / "public" / "data" / "events.json")
+TARGETS = [
+    ("events.schema.json", None, [events]),
+    ("events.schema.json", "#/$defs/event", list(events.values())),
+    ("leaderboard-weekly.schema.json", None,
+     [load_json(LB / "weekly" / "current.json")]
+     + [load_json(f) for f in sorted((LB / "weekly" / "archive").glob("*.json"))]),
+    ("leaderboard-seed.schema.json", None, [load_json(f) for f in seed_files]),
+    ("leaderboard-seed.schema.json", "#/$defs/entry", entries),
+    ("leaderboard-api.schema.json", "#/$defs/get_response",
+     [p for p in preserved if isinstance(p, dict)]),
+    ("leaderboard-api.schema.json", "#/$defs/board_file",
+     [p for p in preserved if isinstance(p, list)] + [entries]),
+]
+
+tmp = Path(tempfile.mkdtemp())
+try:
+    # =================================================================== 1
+    print("\n1. Every schema compiles and agrees on the real data")
+    compiled = {}
+    for name, ptr, real in TARGETS:
+        label = name + (ptr or "")
+        try:
+            compiled[label] = schema_compiler.load(name, ptr, cache_dir=None)
+        except schema_compiler.Unsupported as e:
+            check(False, "%s compiles (%s)" % (label, e))
+            continue
+        ref = reference(SCHEMAS, name, ptr)
+        got = [compiled[label].is_valid(x) for x in real]
+        want = [ref.is_valid(x) for x in real]
+        check(got == want, "%s: %d real instance(s), %d valid, same verdicts"
+              % (label, len(real), sum(want)))
+
+    # =================================================================== 2
+    print("\n2. Mutated instances get jsonschema's verdict")
+    rng = random.Random(2026)
+    for name, ptr, real in TARGETS:
+        label = name + (ptr or "")
+        if label not in compiled or not real:
+            continue
+        ref = reference(SCHEMAS, name, ptr)
+        # jsonschema takes a fifth of a second over the whole events map; its
+        # events are fuzzed one by one under #/$defs/event instead.
+        n = 40 if label == "events.schema.json" else 1500
+        cases = [mutate(rng.choice(real), rng) for _ in range(n)]
+        want = [ref.is_valid(c) for c in cases]
+        bad = [c for c, w in zip(cases, want) if compiled[label].is_valid(c) != w]
+        rejected = want.count(False)
+        check(not bad, "%s: %d mutants (%d rejected), %d disagreement(s)%s"
+              % (label, n, rejected, len(bad), (": %r" % bad[0])[:200] if bad else ""))
+
+    # =================================================================== 3
+    print("\n3. The corners")
+    corners = tmp / "corners"
+    corners.mkdir()
+    (corners / "c.schema.json").write_text(json.dumps({
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "$id": "https://example.test/c.schema.json",
+        "$defs": {"n": {"type": "integer", "minimum": 0}},
+        "type": "object",
+        "properties": {
+            "i": {"type": "integer"},
+            "n": {"type": "number", "maximum": 5},
+            "ref": {"$ref": "#/$defs/n", "type": "string"},
+            "when": {"type": "string", "format": "date-time"},
+            "pat": {"type": "string", "pattern": "W[0-9]"},
+            "kind": {"enum": ["a", "b"]},
+            "any": True,
+            "never": False,
+        },
+        "additionalProperties": {"type": "string"},
+    }), encoding="utf-8")
+    c = schema_compiler.load("c.schema.json", schemas_dir=corners, cache_dir=None)
+    ref = reference(corners, "c.schema.json")
+    probes = [{"i": 3.0}, {"i": 3.5}, {"i": True}, {"n": True}, {"n": 5}, {"n": 5.01},
+              {"ref": 2}, {"ref": "s"}, {"ref": -1}, {"when": "not a date"},
+              {"pat": "2026_W07"}, {"pat": "2026"}, {"kind": "a"}, {"kind": 1},
+              {"any": None}, {"never": None}, {"x": "ok"}, {"x": 1}, [], "s"]
+    got = [(p, c.is_valid(p)) for p in probes]
+    want = [(p, ref.is_valid(p)) for p in probes]
+    check(got == want, "20 corner probes agree%s"
+          % ("" if got == want else ": %s" % [g for g, w in zip(got, want) if g != w]))
+    check(c.is_valid({"i": 3.0}) and not c.is_valid({"n": True})
+          and c.is_valid({"ref": 2}) and c.is_valid({"when": "not a date"})
+          and c.is_valid({"pat": "2026_W07"}) and not c.is_valid({"kind": 1}),
+          "3.0 is an integer, a bool is not a number, $ref drops its siblings, format "
+          "is not asserted, pattern searches, an enum is typed")
+
+    # =================================================================== 4
+    print("\n4. Unknown keywords are refused")
+    odd = tmp / "odd"
+    odd.mkdir()
+    for kw, schema in (("oneOf", {"oneOf": [{"type": "string"}, {"type": "integer"}]}),
+                       ("patternProperties", {"patternProperties": {"^x": {}}}),
+                       ("dependencies", {"properties": {"a": {"dependencies": {}}}})):
+        (odd / "o.schema.json").write_text(json.dumps(schema), encoding="utf-8")
+        try:
+            schema_compiler.load("o.schema.json", schemas_dir=odd, cache_dir=None)
+            check(False, "%s is refused at compile time" % kw)
+        except schema_compiler.Unsupported as e:
+            check(kw in str(e), "%s is refused at compile time (%s)" % (kw, e))
+
+    # =================================================================== 5
+    print("\n5. The cache")
+    sdir, cdir = tmp / "schemas", tmp / "cache"
+    shutil.copytree(SCHEMAS, sdir)
+    generated = []
+    real_compile = schema_compiler.compile_schema
+
+    def counting(*a, **kw):
+        generated.append(a[0])
+        return real_compile(*a, **kw)
+
+    schema_compiler.compile_schema = counting
+    try:
+        first = schema_compiler.load("leaderboard-seed.schema.json", "#/$defs/entry", sdir, cdir)
+        files = list(cdir.glob("*.py"))
+        again = schema_compiler.load("leaderboard-seed.schema.json", "#/$defs/entry", sdir, cdir)
+        check(len(files) == 1 and len(generated) == 1 and again.key == first.key,
+              "generated once and stored (%s); the second load reuses it"
+              % (files[0].name if files else "nothing"))
+        seed = sdir / "leaderboard-seed.schema.json"
+        doc = json.loads(seed.read_text(encoding="utf-8"))
+        doc["$defs"]["entry"]["properties"]["player_name"]["maxLength"] = 8
+        seed.write_text(json.dumps(doc), encoding="utf-8")
+        edited = schema_compiler.load("leaderboard-seed.schema.json", "#/$defs/entry", sdir, cdir)
+        long_name = {"score": 1, "player_name": "x" * 20}
+        check(edited.key != first.key and len(generated) == 2
+              and not edited.is_valid(long_name) and first.is_valid(long_name),
+              "a schema edit is a new key and a new validator that enforces it")
+        stored = sorted(cdir.glob("*.py"), key=lambda p: p.stat().st_mtime)[-1]
+        stored.write_text("#\n# key: %s\nthis is not python(\n" % edited.key, encoding="utf-8")
+        repaired = schema_compiler.load("leaderboard-seed.schema.json", "#/$defs/entry",
+                                        sdir, cdir)
+        check(len(generated) == 3 and not repaired.is_valid(long_name)
+              and "def _s0" in stored.read_text(encoding="utf-8"),
+              "a damaged cache file is regenerated and rewritten, not trusted")
+    finally:
+        schema_compiler.compile_schema = real_compile
+
+    # =================================================================== 6
+    print("\n6. The batch call")
+    entry = compiled["leaderboard-seed.schema.json#/$defs/entry"]
+    ref = reference(SCHEMAS, "leaderboard-seed.schema.json", "#/$defs/entry")
+    batch = entries + [mutate(rng.choice(entries), rng) for _ in range(500)]
+    want = [i for i, e in enumerate(batch) if not ref.is_valid(e)]
+    check(entry.invalid_indices(batch) == want,
+          "%d entries in one call: the same %d invalid indices as jsonschema"
+          % (len(batch), len(want)))
+    check(entry.invalid_indices([]) == [], "an empty array has none")
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+print()
+if failures:
+    print("%d FAILURE(S)" % len(failures))
+    for f in failures:
+        print("  - " + f)
+    sys.exit(1)
+print("OK: the compiled validators give jsonschema's verdict on every real and mutated")
+print("   instance, refuse what they cannot compile, and regenerate when a schema changes.")
@@ -6,6 +6,13 @@ so the only place the real path runs is CI. That makes the failure behaviour
 untestable by hand -- which is exactly how a backup ends up green for months
 while writing nothing. This stubs the Stats API and asserts each exit code.
 
+The fetcher itself -- sections fetched concurrently over pooled keep-alive
+connections, transient errors retried with jittered backoff -- runs against a
+local fake Plausible server: it must be faster than one section after another,
+reuse its connections, give up when it should, and leave exactly the `errors`
+the old one-request-at-a-time urllib client left, so validate() cannot tell
+the difference.
+
 It also asserts two things about .github/workflows/snapshot-analytics.yml that
 no unit test of the script could catch, both of which have burned this repo:
 
@@ -27,12 +34,18 @@ import io
 import json
 import os
 import shutil
+import socket
 import stat
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 import urllib.error
+import urllib.parse
+import urllib.request
 from contextlib import redirect_stdout, redirect_stderr
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 for _s in (sys.stdout, sys.stderr):
@@ -285,6 +298,244 @@ def test_script():
               "got %s" % code)
 
 
+# ------------------------------------------------------- fake Plausible
+SECTION_OF = {
+    "visit:source": "sources",
+    "event:page": "pages",
+    "visit:country": "countries",
+    "visit:utm_campaign": "utm_campaign",
+    "event:goal": "goals",
+}
+
+
+class FakePlausible(BaseHTTPRequestHandler):
+    """The Stats API endpoints gather() calls, over HTTP/1.1 keep-alive.
+
+    server.script maps a section to the answers for its successive requests,
+    each one of: an HTTP status (with a JSON error body), ("delay", s) then
+    200, ("retry-after", status, value), "garbage" (a 200 that is not JSON),
+    "hang" (sleep past the client's timeout) or "drop" (answer, then silently
+    close the connection). Past the end of its script a section gets a 200.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        srv = self.server
+        url = urllib.parse.urlsplit(self.path)
+        params = dict(urllib.parse.parse_qsl(url.query))
+        endpoint = url.path.rsplit("/", 1)[-1]
+        section = SECTION_OF.get(params.get("property"), endpoint)
+        with srv.lock:
+            srv.requests.append((section, self.path, self.headers.get("Authorization")))
+            srv.inflight += 1
+            srv.peak = max(srv.peak, srv.inflight)
+            script = srv.script.get(section, [])
+            step = script.pop(0) if script and not srv.repeat.get(section) else \
+                (script[0] if script else 200)
+        try:
+            headers, status = {}, 200
+            payload = srv.payloads.get(endpoint, {})
+            if isinstance(step, tuple) and step[0] == "delay":
+                time.sleep(step[1])
+            elif isinstance(step, tuple) and step[0] == "retry-after":
+                status, headers = step[1], {"Retry-After": step[2]}
+            elif step == "hang":
+                time.sleep(srv.hang)
+            elif isinstance(step, int):
+                status = step
+            body = (b"this is not json" if step == "garbage" else
+                    json.dumps(payload if status == 200 else
+                               {"error": "fake %d for %s" % (status, section)}).encode())
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+            if step == "drop":
+                self.close_connection = True
+        finally:
+            with srv.lock:
+                srv.inflight -= 1
+
+
+class FakeServer:
+    def __init__(self, script=None, repeat=(), hang=2.0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakePlausible)
+        self.httpd.daemon_threads = True
+        self.httpd.lock = threading.Lock()
+        self.httpd.script = {k: list(v) for k, v in (script or {}).items()}
+        self.httpd.repeat = {k: True for k in repeat}
+        self.httpd.payloads = good_payloads()
+        self.httpd.requests, self.httpd.connections = [], 0
+        self.httpd.inflight = self.httpd.peak = 0
+        self.httpd.hang = hang
+        self.url = "http://127.0.0.1:%d" % self.httpd.server_address[1]
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self.httpd
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def count(srv, section):
+    return sum(1 for s, _, _ in srv.requests if s == section)
+
+
+def urllib_api(mod):
+    """The client gather() used before: one urllib request per section."""
+    def api(path, params, key):
+        url = "%s/api/v1/stats/%s?%s" % (mod.HOST, path, urllib.parse.urlencode(params))
+        req = urllib.request.Request(url, headers={"Authorization": "Bearer %s" % key})
+        with urllib.request.urlopen(req, timeout=mod.TIMEOUT) as r:
+            return json.loads(r.read().decode("utf-8"))
+    return api
+
+
+def closed_port():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return "http://127.0.0.1:%d" % port
+
+
+def quiet_gather(mod, key="fake-key", period="30d"):
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        t0 = time.perf_counter()
+        snap = mod.gather(key, period)
+    return snap, time.perf_counter() - t0, buf.getvalue()
+
+
+def test_fetcher():
+    print("\nconcurrent fetcher, against a fake Plausible")
+    mod = load_module()
+    mod.RETRY_BASE = 0.01
+    pooled_api = mod.api
+
+    # 1. Concurrency: seven 0.4 s sections, the slowest first, take about two
+    #    rounds of four -- not 2.8 s -- and land in SECTION_NAMES order anyway.
+    script = {name: [("delay", 0.4)] for name in mod.SECTION_NAMES}
+    script["aggregate"] = [("delay", 0.7)]
+    with FakeServer(script) as srv:
+        mod.HOST = "http://127.0.0.1:%d" % srv.server_address[1]
+        snap, took, _ = quiet_gather(mod)
+    check("seven slow sections are fetched concurrently",
+          took < 1.6 and srv.peak == mod.FETCH_WORKERS,
+          "%.2fs, peak %d in flight" % (took, srv.peak))
+    check("sections are recorded in SECTION_NAMES order, not arrival order",
+          list(snap["sections"]) == list(mod.SECTION_NAMES) and snap["errors"] == {},
+          str(list(snap["sections"])))
+    check("connections are pooled and kept alive",
+          srv.connections <= mod.FETCH_WORKERS and len(srv.requests) == 7,
+          "%d connections for %d requests" % (srv.connections, len(srv.requests)))
+    common = {"site_id": mod.SITE_ID, "period": "30d"}
+    expected = sorted("/api/v1/stats/%s?%s" % (path, urllib.parse.urlencode(dict(common, **extra)))
+                      for _, path, extra in mod.SECTIONS)
+    check("every request is the URL the urllib client sent, with the key",
+          sorted(p for _, p, _ in srv.requests) == expected
+          and all(a == "Bearer fake-key" for _, _, a in srv.requests))
+
+    # 2. Transient errors are retried and, when they clear, leave no trace.
+    with FakeServer({"pages": [503, 502], "sources": [("retry-after", 429, "0")],
+                     "countries": ["drop"]}) as srv:
+        mod.HOST = "http://127.0.0.1:%d" % srv.server_address[1]
+        snap, _, out = quiet_gather(mod)
+        pages, sources = count(srv, "pages"), count(srv, "sources")
+    check("a 503, a 502 and a 429 are retried until they clear",
+          snap["errors"] == {} and pages == 3 and sources == 2,
+          "errors %s, pages x%d, sources x%d" % (snap["errors"], pages, sources))
+    check("each retry is logged", "pages: 503; retrying" in out and "attempt 3 of 3" in out)
+
+    # 3. ...but only RETRY_ATTEMPTS times, and never for a 4xx.
+    with FakeServer({"goals": [502], "aggregate": [401]}, repeat=("goals",)) as srv:
+        mod.HOST = "http://127.0.0.1:%d" % srv.server_address[1]
+        snap, _, _ = quiet_gather(mod)
+        goals, aggregate = count(srv, "goals"), count(srv, "aggregate")
+    check("a 5xx that persists is given up after RETRY_ATTEMPTS",
+          goals == mod.RETRY_ATTEMPTS
+          and snap["errors"]["goals"] == 'HTTP 502 {"error": "fake 502 for goals"}',
+          "%d attempts: %s" % (goals, snap["errors"].get("goals")))
+    check("a 401 is not retried, and still fails the run",
+          aggregate == 1 and mod.validate(snap)[0] == mod.EXIT_FETCH,
+          "%d attempts" % aggregate)
+
+    # 4. The errors are the old client's, string for string.
+    scenarios = [("4xx, persistent 5xx and a 200 that is not JSON",
+                  {"aggregate": [401], "goals": [502], "sources": ["garbage"]}, None),
+                 ("a host that refuses connections", {}, closed_port())]
+    for label, script, host in scenarios:
+        results = []
+        for client in (pooled_api, urllib_api(mod)):
+            mod.api = client
+            with FakeServer(script, repeat=("goals",)) as srv:
+                mod.HOST = host or "http://127.0.0.1:%d" % srv.server_address[1]
+                snap, _, _ = quiet_gather(mod)
+            results.append((snap["errors"], list(snap["sections"]), mod.validate(snap)))
+        mod.api = pooled_api
+        check("same errors, sections and verdict as the urllib client: " + label,
+              results[0] == results[1] and results[0][0],
+              "%s vs %s" % (results[0][0], results[1][0]))
+
+    # 5. A hung section times out on its own; the rest are unaffected.
+    mod.TIMEOUT = 0.3
+    with FakeServer({"countries": ["hang"]}, repeat=("countries",), hang=1.0) as srv:
+        mod.HOST = "http://127.0.0.1:%d" % srv.server_address[1]
+        snap, took, _ = quiet_gather(mod)
+    mod.TIMEOUT = 30
+    check("a section that hangs times out, is retried, and is recorded",
+          snap["errors"] == {"countries": "TimeoutError: timed out"}
+          and len(snap["sections"]) == 6 and took < 3,
+          "%s in %.1fs" % (snap["errors"], took))
+
+    # 6. A keep-alive connection the server closed while idle is replaced
+    #    silently: that is not an API failure, and costs no retry.
+    mod.FETCH_WORKERS = 1
+    with FakeServer({name: ["drop"] for name in mod.SECTION_NAMES}) as srv:
+        mod.HOST = "http://127.0.0.1:%d" % srv.server_address[1]
+        snap, _, out = quiet_gather(mod)
+    mod.FETCH_WORKERS = 4
+    check("a dropped idle connection is reopened without a retry",
+          snap["errors"] == {} and "retrying" not in out and len(srv.requests) == 7,
+          "%s; %d requests" % (snap["errors"], len(srv.requests)))
+
+    # 7. Backoff: jittered, bounded, and Retry-After is honoured up to the cap.
+    delays = [mod.retry_delay(n) for n in (1, 2, 3, 4, 9) for _ in range(20)]
+    check("backoff is full jitter under an exponential, capped ceiling",
+          all(0 <= d <= min(mod.RETRY_CAP, mod.RETRY_BASE * 2 ** 8) for d in delays)
+          and len(set(delays)) > 50
+          and max(mod.retry_delay(1) for _ in range(50)) <= mod.RETRY_BASE)
+    check("Retry-After is a floor, capped, and ignored when not a number",
+          mod.retry_delay(1, "3") >= 3 and mod.retry_delay(1, "9999") <= mod.RETRY_CAP
+          and mod.retry_delay(1, "Wed, 21 Oct 2026 07:28:00 GMT") <= mod.RETRY_BASE)
+
+    # 8. main() end to end against the fake, with one optional section degraded.
+    with FakeServer({"utm_campaign": [500]}, repeat=("utm_campaign",)) as srv, \
+            tempfile.TemporaryDirectory() as tmp:
+        mod.HOST = "http://127.0.0.1:%d" % srv.server_address[1]
+        code, out, out_dir, latest = run_main(mod, ["--date", "2026-07-29"], tmp)
+        written = json.loads((out_dir / "2026-07-29.json").read_text(encoding="utf-8")) \
+            if code == mod.EXIT_OK else {}
+    check("main() writes a snapshot fetched over the pool",
+          code == mod.EXIT_OK and written["source"] == mod.HOST
+          and list(written["sections"]) == [n for n in mod.SECTION_NAMES if n != "utm_campaign"]
+          and "utm_campaign" in written["errors"] and "degraded" in out,
+          "got %s" % code)
+
+
 # ------------------------------------------------- trap 1, demonstrated
 def _rm(path):
     def onerror(func, p, _exc):
@@ -371,6 +622,7 @@ def test_workflow():
 def main():
     print("Testing the analytics-to-git hedge (no API key required)")
     test_script()
+    test_fetcher()
     test_git_add_ordering()
     test_workflow()
 
@@ -13,7 +13,8 @@ consistent with "the condition is safe" and "the check never fires".
 So this drives the real main() against a fixture pdoom-data corpus in a temp
 directory, with output redirected to a temp public/ tree, and:
 
-  * simulates a REDACTION REGRESSION (redact_pii narrowed to a no-op, which is
+  * simulates a REDACTION REGRESSION (redact_emails_in_text(), the per-string
+    step both redact_pii() and transform_event() call, narrowed to a no-op --
     exactly what a future refactor to a named field list would look like) and
     asserts the sync exits non-zero, creates no page, and leaves an existing
     events.json byte-identical;
@@ -232,9 +233,12 @@ def test_forced_failure_redaction_regression():
         before_json = sentinel_json.read_bytes()
         before_page = sentinel_page.read_bytes()
 
-        # THE REGRESSION. This is what narrowing redact_pii() back to a named
+        # THE REGRESSION. This is what narrowing the redaction back to a named
         # field list, or forgetting to call it, looks like from the gate's side.
-        module.redact_pii = lambda value: value
+        # Patched at the per-string step because main() reaches it through
+        # transform_event(), not redact_pii(); patching a function main() no
+        # longer calls would leave redaction intact and force nothing.
+        module.redact_emails_in_text = lambda text: text
 
         code, out = run_sync(module, corpus)
 
@@ -271,7 +275,7 @@ def test_forced_failure_json_only_field():
             )
         })
         public = point_module_at(module, root)
-        module.redact_pii = lambda value: value
+        module.redact_emails_in_text = lambda text: text
 
         code, out = run_sync(module, corpus)
 
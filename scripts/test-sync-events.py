@@ -277,10 +277,12 @@ check(long_desc.strip() in page, "the full description still reaches the page bo
 # see its docstring. That exemption is only sound while every attribute in the
 # template is double-quoted, so pin the precondition rather than trusting it.
 # Without this, someone writing style='...' in the template silently reopens the
-# hole, and only for a payload containing an apostrophe.
-tmpl_src = (ROOT / "scripts" / "sync" / "sync-events.py").read_text(
+# hole, and only for a payload containing an apostrophe. The template's own
+# {{ }} / {% %} tags are Python (quotes in subscripts, == in conditions), not
+# markup, so they are blanked out before looking at attributes.
+tmpl_src = (ROOT / "scripts" / "sync" / "templates" / "event-detail.html.tmpl").read_text(
     encoding="utf-8").replace("\r\n", "\n")
-tmpl = tmpl_src.split("html_content = f", 1)[1]
+tmpl = re.sub(r"\{\{.*?\}\}|\{%.*?%\}|\{#.*?#\}", "X", tmpl_src, flags=re.DOTALL)
 single_quoted_attrs = re.findall(r"<[a-zA-Z][^>]*?=\'[^\']*\'", tmpl)
 check(not single_quoted_attrs,
       f"every attribute in the page template is double-quoted, so esc() may leave "
@@ -356,8 +358,8 @@ class Sandbox:
         return False
 
 
-def run_main(sandbox):
-    sys.argv = ["sync-events.py", "--pdoom-data-path", str(sandbox.data_path)]
+def run_main(sandbox, *extra):
+    sys.argv = ["sync-events.py", "--pdoom-data-path", str(sandbox.data_path), *extra]
     buf = io.StringIO()
     with redirect_stdout(buf):
         se.main()
@@ -529,6 +531,533 @@ with Sandbox(IMG_CORPUS) as sb:
     check("Replaced" in out, "the run says out loud that it replaced something")
 
 
+# =========================================================================== 9
+print("\n9. --incremental touches only what changed, and publishes what a full run would")
+
+
+def snapshot(root):
+    """{relative path: bytes} for every published file under a sandbox."""
+    return {p.relative_to(root).as_posix(): p.read_bytes()
+            for p in sorted(root.rglob("*"))
+            if p.is_file() and "pdoom-data" not in p.parts
+            and p.name != "events-sync-summary.json"}
+
+
+def live(snap):
+    """A snapshot without the content-hashed files under data/events/ that its
+    catalog no longer names. publish() keeps the previous generation one more
+    run on purpose (see "Sharded events data"), so a run that replaced one has
+    more files on disk than a fresh run -- but serves exactly the same ones."""
+    catalog = json.loads(snap.get("data/events/" + se.CATALOG_NAME, b"{}"))
+    named = {catalog.get("index"), *catalog.get("shards", {}).values(),
+             *catalog.get("pages", [])}
+    return {k: v for k, v in snap.items()
+            if not (k.startswith("data/events/")
+                    and se.HASHED_SHARD_NAME.match(k.rsplit("/", 1)[1])
+                    and k.rsplit("/", 1)[1] not in named)}
+
+
+def rewrite_corpus(sandbox, events):
+    src = sandbox.data_path / "data" / "serveable" / "api" / "timeline_events"
+    (src / "all_events.json").write_text(json.dumps(events), encoding="utf-8")
+
+
+INC_CORPUS = {
+    "evt_a": make_event(f"first, reach {ADDR}"),
+    "evt_b": make_event("![](https://cdn.example.net/b.png) second"),
+    "evt_c": make_event("third, see http://arxiv.org/abs/1"),
+    "evt_d": make_event("fourth, to be dropped upstream"),
+}
+EDITED = dict(INC_CORPUS)
+EDITED["evt_b"] = make_event("second, edited upstream")
+EDITED["evt_e"] = make_event("fifth, new upstream")
+del EDITED["evt_d"]
+
+with Sandbox(INC_CORPUS) as sb:
+    run_main(sb, "--incremental")
+    manifest_file = sb.tmp / "events" / se.MANIFEST_NAME
+    check(manifest_file.exists(), "the first incremental run writes a manifest")
+    first = snapshot(sb.tmp)
+
+    # Plant an orphan: a page this generator never wrote. Deletion must be
+    # bounded by the manifest, or the alignmentforum_* pages go with it.
+    orphan = sb.tmp / "events" / "alignmentforum_orphan.html"
+    orphan.write_text("<html>no generator owns me</html>", encoding="utf-8")
+    untouched = sb.tmp / "events" / "evt_a.html"
+    stamp = untouched.stat().st_mtime_ns
+
+    rewrite_corpus(sb, EDITED)
+    out = run_main(sb, "--incremental")
+    check("Incremental: 2 changed, 2 unchanged, 1 removed" in out,
+          "the run reports exactly the edited and the new record as changed")
+    check(untouched.stat().st_mtime_ns == stamp,
+          "an unchanged page is not rewritten (its mtime did not move)")
+    check(not (sb.tmp / "events" / "evt_d.html").exists(),
+          "the page for an event removed upstream is deleted")
+    check(orphan.exists(), "a page the manifest never recorded is left alone")
+    orphan.unlink()
+    inc = live(snapshot(sb.tmp))
+    inc_summary = json.loads(
+        (sb.tmp / "data" / "events-sync-summary.json").read_text(encoding="utf-8"))
+
+with Sandbox(EDITED) as sb:
+    run_main(sb)
+    full = snapshot(sb.tmp)
+    full_summary = json.loads(
+        (sb.tmp / "data" / "events-sync-summary.json").read_text(encoding="utf-8"))
+
+strip_manifest = lambda snap: {k: v for k, v in snap.items() if se.MANIFEST_NAME not in k}
+check(strip_manifest(inc) == strip_manifest(full),
+      "every published byte of the incremental run equals a full rebuild of the same corpus")
+check(inc_summary["pii"] == full_summary["pii"],
+      "the PII counts in the summary include records the incremental run skipped")
+check(json.loads(inc["events/" + se.MANIFEST_NAME])["events"].keys()
+      == json.loads(full["events/" + se.MANIFEST_NAME])["events"].keys(),
+      "both modes leave the same manifest ids behind")
+
+with Sandbox(INC_CORPUS) as sb:
+    run_main(sb, "--incremental")
+    manifest = json.loads((sb.tmp / "events" / se.MANIFEST_NAME).read_text(encoding="utf-8"))
+    manifest["fingerprint"] = "an older generator"
+    (sb.tmp / "events" / se.MANIFEST_NAME).write_text(json.dumps(manifest), encoding="utf-8")
+    out = run_main(sb, "--incremental")
+    check(f"Incremental: {len(INC_CORPUS)} changed" in out,
+          "a generator change invalidates every page, so a template fix reaches them all")
+
+    (sb.tmp / "events" / "evt_c.html").unlink()
+    out = run_main(sb, "--incremental")
+    check("Incremental: 1 changed" in out and (sb.tmp / "events" / "evt_c.html").exists(),
+          "a page missing from disk is re-rendered even though its record did not change")
+
+
+# =========================================================================== 10
+print("\n10. --jobs shards rendering and both gates, and changes nothing else")
+
+# Workers unpickle _render_shard by module name, and under fork they inherit
+# this process's sys.modules -- so registering the by-path import is enough.
+# Under spawn/forkserver the child would re-import "sync_events" from scratch
+# and could not find it; the CLI path (__main__) is unaffected by that.
+import multiprocessing  # noqa: E402
+
+if multiprocessing.get_start_method() != "fork":
+    print("  SKIP  start method is not fork; --jobs is exercised by the CLI only")
+else:
+    sys.modules.setdefault(se.__name__, se)
+    saved_min = se.MIN_PAGES_PER_JOB
+    se.MIN_PAGES_PER_JOB = 2
+    try:
+        JOBS_CORPUS = {f"evt_{i:02d}": make_event(f"event {i} <b>&</b> {ADDR}")
+                       for i in range(11)}
+        with Sandbox(JOBS_CORPUS) as sb:
+            run_main(sb)
+            serial = snapshot(sb.tmp)
+        with Sandbox(JOBS_CORPUS) as sb:
+            out = run_main(sb, "--jobs", "3")
+            parallel = snapshot(sb.tmp)
+        check("across up to 3 processes" in out, "the run actually used the pool")
+        check(parallel == serial,
+              "every published byte under --jobs 3 equals the serial run's")
+
+        # Forced failure THROUGH the pool: a leak in one shard must stop every
+        # shard's pages from reaching disk, including the clean ones.
+        saved_redact = se.redact_emails_in_text
+        se.redact_emails_in_text = lambda text: text
+        try:
+            with Sandbox(JOBS_CORPUS) as sb:
+                code = None
+                try:
+                    out = run_main(sb, "--jobs", "3")
+                except SystemExit as exc:
+                    code = exc.code
+                pages = list((sb.tmp / "events").glob("*.html"))
+                check(code == 1, f"a leak found by a worker refuses the run (exit {code})")
+                check(not pages, f"no shard's pages were written ({len(pages)} on disk)")
+        finally:
+            se.redact_emails_in_text = saved_redact
+    finally:
+        se.MIN_PAGES_PER_JOB = saved_min
+
+check(se.resolve_jobs(0) >= 1 and se.resolve_jobs(3) == 3,
+      "--jobs 0 means one per CPU, anything else is taken literally")
+
+
+# =========================================================================== 11
+print("\n11. transform_event() is the old multi-pass chain, fused")
+
+import copy  # noqa: E402
+
+
+def legacy_chain(event):
+    """The pre-fusion main(), step for step: the reference transform_event()
+    must reproduce, counters included."""
+    e = copy.deepcopy(event)
+    before = json.dumps(e)
+    e = se.sanitize_event_urls(e)
+    counts = {"urls": int(json.dumps(e) != before)}
+    counts["emails"] = se.count_emails(e)
+    if counts["emails"]:
+        e = se.redact_pii(e)
+    counts["obfuscated"] = se.count_obfuscated_contacts(e)
+    counts["images"] = se.count_markdown_images(e)
+    if counts["images"]:
+        e = se.strip_markdown_images(e)
+    return e, counts
+
+
+FUSION_CASES = {
+    "everything": make_event(
+        f"  see http://arxiv.org/x, mail {ADDR}, or jane [at] example DOT edu "
+        "![](https://cdn.example.net/a.png)  "),
+    "url_only_in_sources": make_event(
+        "plain", sources=["http://lesswrong.com/a", "http://elsewhere.example/b"]),
+    # sanitize_event_urls() names its fields; a URL elsewhere must stay http.
+    "url_outside_named_fields": make_event(
+        "plain", future_field_added_upstream={"u": "http://arxiv.org/y"}),
+    # The one non-local rule: an image anywhere trims whitespace everywhere.
+    "image_trims_siblings": make_event(
+        "  padded  ", description="![](https://cdn.example.net/a.png) body"),
+    "address_in_image_title": make_event(
+        f'![alt](https://cdn.example.net/a.png "by {ADDR}") after'),
+}
+corpora = [FUSION_CASES]
+for extra in (ROOT / "scripts" / "sync" / "backups").glob("all_events_backup_*.json"):
+    corpora.append(json.loads(extra.read_text(encoding="utf-8")))
+published = ROOT / "public" / "data" / "events.json"
+if published.exists():
+    corpora.append(json.loads(published.read_text(encoding="utf-8")))
+
+mismatched = []
+compared = 0
+for corpus in corpora:
+    for event_id, event in corpus.items():
+        pristine = json.dumps(event)
+        got = se.transform_event(event)
+        compared += 1
+        if got != legacy_chain(event):
+            mismatched.append(event_id)
+        if json.dumps(event) != pristine:
+            mismatched.append(event_id + " (input mutated)")
+check(compared > len(FUSION_CASES),
+      f"compared {compared} records, including every shipped one")
+check(not mismatched,
+      f"record and counters match the multi-pass chain exactly (mismatched: {mismatched[:5]})")
+
+record, counts = se.transform_event(
+    {"description": FUSION_CASES["everything"]["description"], "year": 2024})
+check(counts == {"urls": 1, "emails": 1, "obfuscated": 1, "images": 1},
+      f"one pass reports every counter main() logs (got {counts})")
+check(ADDR not in json.dumps(record) and "cdn.example.net" not in json.dumps(record),
+      "and the record it returns carries neither the address nor the CDN URL")
+
+
+
+# =========================================================================== 12
+print("\n12. --stream publishes what a full run would, and only once everything passed")
+
+STREAM_CORPUS = dict(INC_CORPUS)
+STREAM_CORPUS["evt_html"] = CORPUS["evt_html"]
+STREAM_CORPUS["evt_dropped"] = CORPUS["evt_dropped"]
+
+saved_batch = se.STREAM_BATCH_PAGES
+se.STREAM_BATCH_PAGES = 2   # several batches even on a handful of events
+try:
+    with Sandbox(STREAM_CORPUS) as sb:
+        run_main(sb)
+        full = snapshot(sb.tmp)
+        full_summary = json.loads(
+            (sb.tmp / "data" / "events-sync-summary.json").read_text(encoding="utf-8"))
+    with Sandbox(STREAM_CORPUS) as sb:
+        run_main(sb, "--stream")
+        streamed = snapshot(sb.tmp)
+        stream_summary = json.loads(
+            (sb.tmp / "data" / "events-sync-summary.json").read_text(encoding="utf-8"))
+    check(streamed == full, "every published byte of a --stream run equals a full run's, "
+                            "manifest and events.json included")
+    for block in ("pages", "sync_timestamp"):
+        full_summary.pop(block), stream_summary.pop(block)
+    check(stream_summary == full_summary,
+          "the summary counts the same things without ever holding the corpus")
+
+    # Incremental on top of a stream: same plan, same bytes, and the swap keeps
+    # every page it did not rewrite -- orphan included -- on its original inode.
+    with Sandbox(INC_CORPUS) as sb:
+        run_main(sb, "--stream", "--incremental")
+        orphan = sb.tmp / "events" / "alignmentforum_orphan.html"
+        orphan.write_text("<html>no generator owns me</html>", encoding="utf-8")
+        untouched = sb.tmp / "events" / "evt_a.html"
+        before = (untouched.stat().st_ino, untouched.stat().st_mtime_ns,
+                  orphan.stat().st_ino)
+        rewrite_corpus(sb, EDITED)
+        out = run_main(sb, "--stream", "--incremental")
+        check("Incremental: 2 changed, 2 unchanged, 1 removed" in out,
+              "--stream --incremental plans exactly what --incremental does")
+        check((untouched.stat().st_ino, untouched.stat().st_mtime_ns,
+               orphan.stat().st_ino) == before,
+              "unchanged pages and the orphan survive the swap as the same files")
+        check(not (sb.tmp / "events" / "evt_d.html").exists(),
+              "the page for an event removed upstream is not carried into the swap")
+        orphan.unlink()
+        inc = live(snapshot(sb.tmp))
+    with Sandbox(EDITED) as sb:
+        run_main(sb)
+        full = snapshot(sb.tmp)
+    check(strip_manifest(inc) == strip_manifest(full),
+          "and what it publishes equals a full rebuild of the edited corpus")
+
+    # Forced failure: the leak is in the LAST batch, after clean batches were
+    # already staged. None of them may reach public/.
+    LATE_LEAK = {f"evt_{i:02d}": make_event(f"clean event {i}") for i in range(6)}
+    LATE_LEAK["evt_zz"] = make_event(f"late, reach {ADDR}")
+    saved_redact = se.redact_emails_in_text
+    with Sandbox(LATE_LEAK) as sb:
+        run_main(sb, "--stream")
+        before = snapshot(sb.tmp)
+        rewrite_corpus(sb, {k: make_event(v["description"] + " (edited)")
+                            for k, v in LATE_LEAK.items()})
+        se.redact_emails_in_text = lambda text: text
+        code = None
+        try:
+            out = run_main(sb, "--stream")
+        except SystemExit as exc:
+            code = exc.code
+        finally:
+            se.redact_emails_in_text = saved_redact
+        check(code == 1, f"a leak in the last batch refuses the run (exit {code})")
+        check(snapshot(sb.tmp) == before,
+              "public/events/ and events.json are byte-for-byte what they were")
+        leftovers = sorted(p.name for p in sb.tmp.iterdir() if p.name.startswith("."))
+        leftovers += sorted(p.name for p in (sb.tmp / "data").iterdir()
+                            if p.name.startswith("."))
+        check(not leftovers, f"no staging directory or file is left behind ({leftovers})")
+
+    # Crash between the two renames: public/events/ is gone and the previous
+    # tree sits beside it. The next run, in either mode, puts it back first.
+    with Sandbox(INC_CORPUS) as sb:
+        run_main(sb, "--stream")
+        orphan = sb.tmp / "events" / "alignmentforum_orphan.html"
+        orphan.write_text("<html>no generator owns me</html>", encoding="utf-8")
+        (sb.tmp / "events").rename(sb.tmp / se.PREVIOUS_NAME)
+        (sb.tmp / se.STAGING_NAME).mkdir()
+        out = run_main(sb, "--incremental")
+        check("interrupted --stream swap" in out and orphan.exists(),
+              "an interrupted swap is recovered before anything reads public/events/")
+        check(not (sb.tmp / se.PREVIOUS_NAME).exists()
+              and not (sb.tmp / se.STAGING_NAME).exists(),
+              "and neither side directory survives the recovery")
+        check(f"Incremental: 0 changed, {len(INC_CORPUS)} unchanged" in out,
+              "the recovered tree is trusted as the one the manifest describes")
+finally:
+    se.STREAM_BATCH_PAGES = saved_batch
+
+# The parser itself: json.load()'s answer, value for value, at chunk sizes
+# small enough to cut every token in half somewhere.
+PARSE_CASES = [
+    "{}", " { } ", '{"a": 1}', '{"a": 12345, "b": -0.5e+10, "c": true}',
+    '{"k": {"nested": [1, 2, {"x": "y\\"z"}]}, "u": "\\u00e9\\ud83d\\ude00"}',
+    json.dumps(STREAM_CORPUS, indent=2),
+    json.dumps(STREAM_CORPUS, ensure_ascii=False),
+]
+parse_bad = []
+for text in PARSE_CASES:
+    for chunk in (1, 2, 3, 7, 64):
+        got = list(se.iter_json_object(io.StringIO(text), chunk_chars=chunk))
+        if got != list(json.loads(text).items()):
+            parse_bad.append((text[:20], chunk))
+check(not parse_bad, f"iter_json_object() equals json.load() at every chunk size "
+                     f"(differ: {parse_bad[:3]})")
+malformed = []
+for text in ('{"a": 1', '{"a": 1} {}', '[1, 2]', '{"a" 1}', '{1: 2}', ''):
+    try:
+        list(se.iter_json_object(io.StringIO(text), chunk_chars=2))
+        malformed.append(text)
+    except ValueError:
+        pass
+check(not malformed, f"truncated, trailing or non-object input is an error (accepted: {malformed})")
+
+with Sandbox({}) as sb:
+    src = sb.data_path / "data" / "serveable" / "api" / "timeline_events" / "all_events.json"
+    one = json.dumps(make_event("first copy"))
+    src.write_text('{"evt_dup": %s, "evt_dup": %s}' % (one, one), encoding="utf-8")
+    code = None
+    try:
+        out = run_main(sb, "--stream")
+    except SystemExit as exc:
+        code = exc.code
+    check(code == 1 and not list((sb.tmp / "events").glob("*.html")),
+          f"a repeated event id refuses the run instead of guessing (exit {code})")
+
+# Memory: the point of the mode. Eight times the corpus must not cost anything
+# like eight times the peak; the in-memory run is measured alongside to show
+# the measurement can tell the difference.
+import tracemalloc  # noqa: E402
+
+# Prose, not one long token: EMAIL_PATTERN is slow on a single 4,000-character word.
+BULK = "lorem ipsum dolor " * 400
+
+
+def peak_for(n, *extra):
+    corpus = {f"evt_{i:04d}": make_event(f"event {i}", description=BULK) for i in range(n)}
+    with Sandbox(corpus) as sb:
+        tracemalloc.start()
+        run_main(sb, *extra)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return peak
+
+
+se.STREAM_BATCH_PAGES = 16
+try:
+    stream_ratio = peak_for(320, "--stream") / peak_for(40, "--stream")
+    memory_ratio = peak_for(320) / peak_for(40)
+finally:
+    se.STREAM_BATCH_PAGES = saved_batch
+check(stream_ratio < 2 < memory_ratio,
+      f"8x the corpus: --stream peak x{stream_ratio:.2f}, in-memory peak x{memory_ratio:.2f}")
+
+# =========================================================================== 13
+print("\n13. The sharded copy: a small index, year shards and pages, named by content")
+
+import hashlib  # noqa: E402
+
+
+def shard_files(root):
+    d = root / "data" / "events"
+    return {p.name: p.read_bytes() for p in sorted(d.iterdir())} if d.exists() else {}
+
+
+RARITIES = ["common", "rare", "legendary", "mythic"]
+SHARD_CORPUS = {
+    f"evt_{i:02d}": make_event(f"event number {i}", year=2016 + i % 4,
+                               rarity=RARITIES[i % 7 % 4],
+                               impacts=[{"variable": "cash", "change": 1}] * (i % 3))
+    for i in range(23)
+}
+SHARD_CORPUS["evt_pii"] = make_event(f"shard, reach {ADDR}", year=2018)
+
+saved_page_size = se.SHARD_PAGE_SIZE
+se.SHARD_PAGE_SIZE = 4
+try:
+    with Sandbox(SHARD_CORPUS) as sb:
+        run_main(sb)
+        files = shard_files(sb.tmp)
+        ejson = json.loads((sb.tmp / "data" / "events.json").read_text(encoding="utf-8"))
+        catalog = json.loads(files[se.CATALOG_NAME])
+        named = [catalog["index"], *catalog["shards"].values(), *catalog["pages"]]
+
+        check(sorted(named) == sorted(n for n in files if n != se.CATALOG_NAME),
+              f"the catalog names every file written, and nothing else ({len(named)} files)")
+        misnamed = [n for n in named
+                    if hashlib.sha256(files[n]).hexdigest()[:se.CONTENT_HASH_CHARS]
+                    != n.rsplit(".", 2)[1]]
+        check(not misnamed, f"every name carries the hash of its own bytes (misnamed: {misnamed})")
+
+        # The order /events/ sorts into: year descending, then rarity, then
+        # events.json order -- Array.prototype.sort is stable.
+        def js_key(item):
+            year = item[1]["year"]
+            dated = isinstance(year, int)
+            return (not dated, -year if dated else 0,
+                    -se.RARITY_ORDER.get(item[1]["rarity"], 0))
+        want_order = [k for k, _ in sorted(ejson.items(), key=js_key)]
+
+        index = json.loads(files[catalog["index"]])
+        check(index["fields"] == list(se.INDEX_FIELDS)
+              and [r[0] for r in index["rows"]] == want_order,
+              "the index lists every event once, in the order /events/ shows them")
+        row = dict(zip(index["fields"], index["rows"][want_order.index("evt_05")]))
+        check(row == {"id": "evt_05", "title": ejson["evt_05"]["title"], "year": 2017,
+                      "category": ejson["evt_05"]["category"], "rarity": "rare",
+                      "impacts": 2},
+              f"an index row carries the table's fields and an impact COUNT (got {row})")
+        check(len(files[catalog["index"]]) * 4 < len(
+              (sb.tmp / "data" / "events.json").read_bytes()),
+              "the index is a fraction of events.json")
+
+        merged, strays = {}, []
+        for year, name in catalog["shards"].items():
+            shard = json.loads(files[name])
+            strays += [k for k, v in shard.items() if se.shard_year(v) != year]
+            merged.update(shard)
+        check(merged == ejson and not strays,
+              f"the year shards are events.json, partitioned by year (misplaced: {strays})")
+        check([se.shard_year({"year": y}) for y in (2019, "2019", True, None)]
+              == ["2019", "unknown", "unknown", "unknown"],
+              "only an integer year names a shard; anything else goes to year-unknown")
+
+        paged = [json.loads(files[n]) for n in catalog["pages"]]
+        check([p["page"] for p in paged] == list(range(1, len(paged) + 1))
+              and all(p["pages"] == len(paged) for p in paged)
+              and all(len(p["events"]) == 4 for p in paged[:-1])
+              and [e[0] for p in paged for e in p["events"]] == want_order
+              and all(ejson[k] == v for p in paged for k, v in p["events"]),
+              f"{len(paged)} pages of {se.SHARD_PAGE_SIZE} full records, in index order")
+        check(all(ADDR not in body.decode("utf-8") for body in files.values()),
+              "no shard carries an address events.json redacted")
+
+        mtimes = {n: (sb.tmp / "data" / "events" / n).stat().st_mtime_ns for n in files}
+        run_main(sb)
+        check(shard_files(sb.tmp) == files and all(
+              (sb.tmp / "data" / "events" / n).stat().st_mtime_ns == t
+              for n, t in mtimes.items()),
+              "an unchanged corpus leaves every file, catalog included, untouched")
+
+        # One edit moves one year shard, the index and the pages from the edit
+        # onward; every other name survives, and the old generation is kept for
+        # one run so a cached catalog never points at a missing file.
+        foreign = sb.tmp / "data" / "events" / "README.txt"
+        foreign.write_text("not the generator's", encoding="utf-8")
+        first = set(named)
+        edited = dict(SHARD_CORPUS)
+        edited["evt_03"] = make_event("event number 3, edited", year=2019, rarity="mythic")
+        rewrite_corpus(sb, edited)
+        run_main(sb)
+        second_catalog = json.loads(shard_files(sb.tmp)[se.CATALOG_NAME])
+        second = {second_catalog["index"], *second_catalog["shards"].values(),
+                  *second_catalog["pages"]}
+        moved = {n.split(".")[0] for n in first - second}
+        check(moved and "year-2019" in moved and "year-2016" not in moved,
+              f"an edit renames only the files it changed ({sorted(moved)})")
+        check(first | second <= set(shard_files(sb.tmp)),
+              "the previous generation is still there for a reader with a cached catalog")
+        edited["evt_04"] = make_event("event number 4, edited", year=2016)
+        rewrite_corpus(sb, edited)
+        run_main(sb)
+        on_disk = set(shard_files(sb.tmp))
+        check(not (first - second) & on_disk and second <= on_disk and foreign.exists(),
+              "two runs later it is pruned, and a file the generator did not name is not")
+
+        # Refusal: the shards are gated like every other artefact and publish
+        # nothing when the run is refused.
+        before = shard_files(sb.tmp)
+        saved_redact = se.redact_emails_in_text
+        se.redact_emails_in_text = lambda text: text
+        code = None
+        try:
+            run_main(sb)
+        except SystemExit as exc:
+            code = exc.code
+        finally:
+            se.redact_emails_in_text = saved_redact
+        check(code == 1 and shard_files(sb.tmp) == before
+              and not (sb.tmp / "data" / se.SHARDS_STAGING_NAME).exists(),
+              f"a refused run leaves public/data/events/ as it was, with no staging "
+              f"left behind (exit {code})")
+
+    # The shard gate on its own: an address only the sharded serialisation
+    # could carry is still refused there, by name.
+    leaks, disagreements = {}, {}
+    with Sandbox({}) as sb:
+        shards = se.EventShards()
+        shards.add("evt_x", make_event(f"reach {ADDR}"))
+        shards.build(lambda name, text: se.gate_text(name, text, lambda a: False,
+                                                     leaks, disagreements))
+        shards.discard()
+    check(any("/year-2024" in n for n in leaks) and any("/page-001" in n for n in leaks),
+          f"the gate reports a shard finding under the shard's name ({sorted(leaks)})")
+finally:
+    se.SHARD_PAGE_SIZE = saved_page_size
+
+
 print()
 if failures:
     print(f"{len(failures)} FAILURE(S)")
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""The shared tree scan reads each file once, and its cache never answers for
+bytes it has not seen.
+
+WHY THIS EXISTS
+---------------
+scripts/tree_scan.py sits underneath five guards, two of them blocking. A
+speed-up underneath a guard is only acceptable if the guard's verdicts do not
+move, and a CACHE underneath a guard has a specific way to lie: report the
+verdict for yesterday's bytes about today's file. So this forces each way an
+entry can go stale and asserts it is rescanned:
+
+  1. one walk, one read per file, however many checkers select it;
+  2. an untouched file is not opened again -- and an edited one is, including
+     a SAME-SIZE edit, and including one inside the racy timestamp window;
+  3. a changed checker key throws away that checker's answers and nobody
+     else's; a deleted file leaves the cache; a corrupt cache is ignored;
+  4. the mmap path decodes exactly what open() does, valid UTF-8 or not;
+  5. the email guard still FAILS on a cached run over a planted address, and
+     the cache file never holds the address itself;
+  6. on the real tree, every migrated guard answers the same cold and warm.
+
+Everything except section 6 runs in a temp directory.
+
+Run:  python scripts/test-tree-scan.py     (exit 0 = pass)
+"""
+
+import importlib.util
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+import tree_scan  # noqa: E402  (must follow the sys.path line)
+
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+def load(name):
+    spec = importlib.util.spec_from_file_location(
+        name[:-3].replace("-", "_"), ROOT / "scripts" / name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Well outside the racy window, so an untouched file is trusted.
+OLD = time.time() - 3600
+
+
+def write(root, rel, data, mtime=OLD):
+    p = root / rel
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_bytes(data.encode("utf-8") if isinstance(data, str) else data)
+    os.utime(p, (mtime, mtime))
+    return p
+
+
+def recorder(name, suffix, key="k1", roots=("",)):
+    """A checker that records which files it was asked to compute."""
+    calls = []
+
+    def check(f):
+        calls.append(f.rel)
+        return {"len": len(f.text), "lines": f.universal_text().count("\n")}
+
+    c = tree_scan.Checker(name, key, lambda rel: rel.endswith(suffix), check, roots)
+    return c, calls
+
+
+def sandbox():
+    tmp = Path(tempfile.mkdtemp())
+    write(tmp, "public/index.html", "<p>hello</p>\n")
+    write(tmp, "public/a-b.html", "<p>a-b</p>\n")
+    write(tmp, "public/a/b.html", "<p>nested</p>\r\nline two\r")
+    write(tmp, "public/data/x.json", '{"a": 1}')
+    write(tmp, "scripts/tool.py", "print('hi')\n")
+    write(tmp, "public/node_modules/dep.html", "<p>never walked</p>")
+    write(tmp, ".git/HEAD.html", "<p>never walked</p>")
+    return tmp
+
+
+# =========================================================================== 1
+print("\n1. One walk, one read per file, whatever the number of checkers")
+tmp = sandbox()
+try:
+    html, html_calls = recorder("html", ".html", roots=("public",))
+    html2, html2_calls = recorder("html-again", ".html", roots=("public",))
+    py, py_calls = recorder("py", ".py", roots=("scripts",))
+    r = tree_scan.scan([html, html2, py], tmp)
+    check(r.read == 4, f"4 files selected, 4 reads (got {r.read}) -- two checkers on "
+                       "the same page share one read")
+    check(html_calls == html2_calls == ["public/a/b.html", "public/a-b.html",
+                                        "public/index.html"],
+          f"path order is sorted(Path.rglob()) order, by component (got {html_calls})")
+    check(py_calls == ["scripts/tool.py"], "each checker sees only its own roots")
+    check(all("node_modules" not in rel and ".git" not in rel
+              for rel in r.results["html"]), "pruned directories are never walked")
+    check(r.results["html"]["public/a/b.html"]["lines"] == 2,
+          "universal_text() folds CRLF and a lone CR the way open() does")
+    check(tree_scan.cache_path(tmp).is_file(), "the cache is written under the scanned root")
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+# =========================================================================== 2
+print("\n2. Untouched files are not reopened; edited ones always are")
+tmp = sandbox()
+try:
+    c, calls = recorder("html", ".html", roots=("public",))
+    first = tree_scan.scan([c], tmp).results["html"]
+    calls.clear()
+    r = tree_scan.scan([c], tmp)
+    check(r.read == 0 and not calls, f"second run reads nothing (read {r.read})")
+    check(r.results["html"] == first, "and returns the same results from the cache")
+
+    write(tmp, "public/index.html", "<p>HELLO</p>\n", mtime=OLD + 60)   # same size
+    calls.clear()
+    r = tree_scan.scan([c], tmp)
+    check(calls == ["public/index.html"],
+          f"a same-size edit with a new mtime is rescanned, alone (got {calls})")
+
+    write(tmp, "public/a-b.html", "<p>a--b</p>\n", mtime=OLD)          # same mtime
+    calls.clear()
+    tree_scan.scan([c], tmp)
+    check(calls == ["public/a-b.html"], "a size change alone is enough to rescan")
+
+    # THE RACY WINDOW: same size, and an mtime the cache cannot tell apart from
+    # the moment it was written. Trusting this entry is how a cache lies.
+    now = time.time()
+    write(tmp, "public/a/b.html", "<p>NESTED</p>\r\nline two\r", mtime=now)
+    tree_scan.scan([c], tmp)
+    write(tmp, "public/a/b.html", "<p>Nested</p>\r\nline two\r", mtime=now)
+    calls.clear()
+    tree_scan.scan([c], tmp)
+    check("public/a/b.html" in calls,
+          "a file modified inside the racy window is re-read, never trusted")
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+# =========================================================================== 3
+print("\n3. Keys, deletions, corruption")
+tmp = sandbox()
+try:
+    a, a_calls = recorder("a", ".html", key="v1", roots=("public",))
+    b, b_calls = recorder("b", ".json", key="v1", roots=("public",))
+    tree_scan.scan([a, b], tmp)
+    a2, a2_calls = recorder("a", ".html", key="v2", roots=("public",))
+    tree_scan.scan([a2], tmp)
+    check(len(a2_calls) == 3, "a changed key recomputes every file for that checker")
+    b_calls.clear()
+    r = tree_scan.scan([b], tmp)
+    check(r.read == 0 and not b_calls,
+          "and leaves another checker's cached answers alone")
+
+    (tmp / "public" / "index.html").unlink()
+    r = tree_scan.scan([a2], tmp)
+    check("public/index.html" not in r.results["a"], "a deleted file is not reported")
+    doc = json.loads(tree_scan.cache_path(tmp).read_text(encoding="utf-8"))
+    check("public/index.html" not in doc["checkers"]["a"]["files"],
+          "and is dropped from the cache")
+
+    tree_scan.cache_path(tmp).write_text("{not json", encoding="utf-8")
+    a2_calls.clear()
+    r = tree_scan.scan([a2], tmp)
+    check(len(a2_calls) == 2, "a corrupt cache is treated as empty, not as an error")
+    r = tree_scan.scan([a2], tmp)
+    check(r.read == 0, "and is replaced by a good one")
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+# =========================================================================== 4
+print("\n4. The mmap path decodes exactly what open() does")
+tmp = Path(tempfile.mkdtemp())
+saved = tree_scan.MMAP_MIN_BYTES
+try:
+    bodies = {
+        "public/ok.html": "café — ok\r\n" * 50,
+        "public/bad.html": b"before \xff\xfe after \xe2\x80 cut" * 50,
+        "public/empty.html": "",
+    }
+    for rel, body in bodies.items():
+        write(tmp, rel, body)
+    seen = {}
+
+    def grab(f):
+        seen[f.rel] = (f.text, f.valid_utf8)
+
+    for threshold in (1, saved):
+        tree_scan.MMAP_MIN_BYTES = threshold
+        seen.clear()
+        tree_scan.scan([tree_scan.Checker("grab", "k", lambda rel: True, grab)],
+                       tmp, use_cache=False)
+        for rel in bodies:
+            with open(tmp / rel, "r", encoding="utf-8", errors="replace", newline="") as f:
+                want = f.read()
+            try:
+                (tmp / rel).read_bytes().decode("utf-8")
+                valid = True
+            except UnicodeDecodeError:
+                valid = False
+            check(seen[rel] == (want, valid),
+                  f"{rel} via {'mmap' if threshold == 1 else 'read'}: same text, "
+                  f"valid_utf8={valid}")
+finally:
+    tree_scan.MMAP_MIN_BYTES = saved
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+# =========================================================================== 5
+print("\n5. The email guard, cached, still fails -- and the cache holds no address")
+cpe = load("check-published-emails.py")
+tmp = Path(tempfile.mkdtemp())
+saved = (cpe.REPO_ROOT, cpe.PUBLIC_DIR, sys.argv)
+PLANTED = "a.researcher@example-university.edu"
+try:
+    write(tmp, "public/events/leak.html", f"<p>Contact {PLANTED}</p>\n"
+                                          "<a href='mailto:team@pdoom1.com'>us</a>\n")
+    write(tmp, "public/events/clean.html", "<a href='mailto:team@pdoom1.com'>us</a>\n")
+    cpe.REPO_ROOT, cpe.PUBLIC_DIR = tmp, tmp / "public"
+    verdicts = []
+    for _ in range(2):
+        buf = io.StringIO()
+        sys.argv = ["check-published-emails.py"]
+        with redirect_stdout(buf):
+            code = cpe.main()
+        verdicts.append((code, "public/events/leak.html: 1 occurrence" in buf.getvalue()))
+    check(verdicts[0] == (1, True), "cold run: exit 1, names the file")
+    check(verdicts[1] == (1, True), "cached run: the SAME failure, from the cache")
+    cache_text = tree_scan.cache_path(tmp).read_text(encoding="utf-8")
+    check(PLANTED not in cache_text and "example-university" not in cache_text,
+          "the cache file stores a digest, never the address")
+finally:
+    cpe.REPO_ROOT, cpe.PUBLIC_DIR, sys.argv = saved
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+# =========================================================================== 6
+print("\n6. On the real tree, every migrated guard answers the same cold and warm")
+pattern, _, unexplained = cpe.load_generator_pattern()
+cold = cpe.scan(pattern, unexplained, use_cache=False)
+warm = cpe.scan(pattern, unexplained)
+check(cold == warm, "check-published-emails: identical findings and residue")
+
+# The read the guard did before the shared scan, done by hand.
+direct = {}
+for path in sorted(cpe.PUBLIC_DIR.rglob("*")):
+    if path.is_file() and path.suffix.lower() in cpe.SCAN_SUFFIXES:
+        hits = [m for m in pattern.findall(cpe.read(path)) if not cpe.is_allowed(m)]
+        if hits:
+            direct[path.relative_to(ROOT).as_posix()] = len(hits)
+check({rel: len(h) for rel, h in cold[0].items()} == direct,
+      f"and the same per-file counts as a direct rglob+findall ({len(direct)} file(s))")
+
+for name, attr, run in (
+        ("check-stale-facts.py", "stale-facts", lambda m: m.scan(180)),
+        ("check-control-characters.py", "control-characters",
+         lambda m: tree_scan.scan(m.scan_checkers(), ROOT).results["control-characters"]),
+        ("check-token-drift.py", "token-drift",
+         lambda m: tree_scan.scan(m.scan_checkers(), ROOT).results["token-drift"])):
+    module = load(name)
+    with redirect_stdout(io.StringIO()):
+        saved_scan = tree_scan.scan
+        tree_scan.scan = lambda checkers, root=None, use_cache=True: saved_scan(
+            checkers, root, use_cache=False)
+        try:
+            uncached = run(module)
+        finally:
+            tree_scan.scan = saved_scan
+        cached = run(module)
+    check(uncached == cached, f"{name}: identical results cold and warm")
+
+r = tree_scan.scan(tree_scan.load_registered())
+check(r.read == 0, f"after a warm-up every registered guard is served from the "
+                   f"cache ({r.summary()})")
+
+
+print()
+if failures:
+    print(f"{len(failures)} FAILURE(S)")
+    for f in failures:
+        print("  -", f)
+    sys.exit(1)
+print("OK: the shared scan reads each file once, the cache rescans everything that "
+      "moved, and every guard on it gives the answer it gave before.")
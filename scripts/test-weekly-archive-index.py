@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests for the incremental weekly archive index (weekly-league-manager.py).
+
+WHY THIS EXISTS
+---------------
+The archive page reads only archive/index.json. It used to be rebuilt by parsing
+every archived week and every preserved board on each rollover. Now it keeps a
+content fingerprint per file and parses only what is new or changed, and archiving
+a week updates one row in place. An index that reuses a stale row would show a week
+that is not on disk, or an entry count the file no longer has, and nothing on the
+page would look wrong. So every shortcut is checked against a full rebuild of the
+same directory:
+
+  1. a fresh rebuild parses everything and summarises each real archive and
+     preserved board exactly as the full rebuild does;
+  2. a second rebuild parses nothing and writes the same rows;
+  3. an edited archive, a new one, a deleted one and a renamed one: only the files
+     that changed are parsed, and the result equals a full rebuild;
+  4. a different key (code or ladder contract changed), a missing or damaged index:
+     everything is parsed again, never trusted;
+  5. archiving a week opens no other archive, and leaves the same index a full
+     rebuild would; a rollover that archived does not rebuild again;
+  6. scale: with 500 archived weeks a rebuild parses none of them.
+
+Every path the manager writes is redirected into a temp dir; the real archive is
+only read, as fixture data.
+
+Run:  python scripts/test-weekly-archive-index.py     (exit 0 = pass)
+"""
+
+import importlib.util
+import json
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+ROOT = Path(__file__).resolve().parent.parent
+_spec = importlib.util.spec_from_file_location(
+    "weekly_league_manager", ROOT / "scripts" / "weekly-league-manager.py")
+wlm = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(wlm)
+
+REAL = ROOT / "public" / "leaderboard" / "data"
+NOW = datetime(2026, 8, 17, 12, 0, tzinfo=timezone.utc)
+
+failures = []
+
+
+def check(cond, msg):
+    print(("  PASS  " if cond else "  FAIL  ") + msg)
+    if not cond:
+        failures.append(msg)
+
+
+def sandbox(tmp):
+    """A manager whose every path is under tmp, seeded with the real archive."""
+    data = tmp / "leaderboard" / "data"
+    shutil.copytree(REAL / "weekly" / "archive", data / "weekly" / "archive",
+                    ignore=shutil.ignore_patterns("index.json"))
+    if (REAL / "preserved").exists():
+        shutil.copytree(REAL / "preserved", data / "preserved")
+    m = wlm.WeeklyLeagueManager.__new__(wlm.WeeklyLeagueManager)
+    m.website_dir = ROOT
+    m.version_file = ROOT / "public" / "data" / "version.json"
+    m.league_data_dir = data / "weekly"
+    m.current_league_file = m.league_data_dir / "current.json"
+    m.archive_dir = m.league_data_dir / "archive"
+    m.config_file = tmp / "weekly-league-config.json"
+    m.config = m.load_config()
+    return m
+
+
+def counting(m):
+    """Count the files the manager summarises (= parses) from here on."""
+    seen = []
+    real_a, real_p = m._archive_row, m._preserved_row
+    m._archive_row = lambda p, d: (seen.append(p.name), real_a(p, d))[1]
+    m._preserved_row = lambda p, d: (seen.append(p.name), real_p(p, d))[1]
+    return seen
+
+
+def index(m):
+    d = json.loads((m.archive_dir / "index.json").read_text(encoding="utf-8"))
+    d.pop("last_updated", None)
+    return d
+
+
+def full_index(m):
+    """What a full rebuild of m's directory writes, leaving m's index as it was."""
+    path = m.archive_dir / "index.json"
+    held = path.read_bytes() if path.exists() else None
+    quiet(m.rebuild_archive_index, NOW, full=True)
+    d = index(m)
+    if held is None:
+        path.unlink()
+    else:
+        path.write_bytes(held)
+    return d
+
+
+def quiet(fn, *a, **kw):
+    import io
+    from contextlib import redirect_stdout
+    with redirect_stdout(io.StringIO()) as out:
+        r = fn(*a, **kw)
+    return r, out.getvalue()
+
+
+tmp = Path(tempfile.mkdtemp())
+try:
+    # =================================================================== 1
+    print("\n1. A fresh rebuild")
+    m = sandbox(tmp / "a")
+    n_arch = len(list(m.archive_dir.glob("*_league.json")))
+    n_pres = len([p for p in (m.league_data_dir.parent / "preserved").glob("*/*.json")
+                  if p.name.lower() not in ("index.json", "readme.json")])
+    seen = counting(m)
+    ok, _ = quiet(m.rebuild_archive_index, NOW)
+    first = index(m)
+    check(ok and len(seen) == n_arch + n_pres,
+          "with no index, all %d archives and %d preserved boards are parsed"
+          % (n_arch, n_pres))
+    check(first["archives"] == [m._archive_row(p, json.loads(p.read_text(encoding="utf-8")))
+                                for p in sorted(m.archive_dir.glob("*_league.json"))],
+          "one row per archive, in file order, each that file's summary")
+    check(first["preserved_boards"] == m.scan_preserved_boards(),
+          "preserved boards summarised as scan_preserved_boards() does")
+    fp = first["fingerprints"]
+    check(fp["key"] == m.index_key() and len(fp["archives"]) == n_arch
+          and len(fp["preserved"]) == n_pres,
+          "every file is fingerprinted under the current key")
+
+    # =================================================================== 2
+    print("\n2. Nothing changed")
+    seen.clear()
+    ok, out = quiet(m.rebuild_archive_index, NOW)
+    check(ok and seen == [] and index(m) == first,
+          "a second rebuild parses nothing and writes the same index")
+    check("parsed 0 of %d archive(s)" % n_arch in out, "and says so: %s"
+          % out.strip().split("(", 1)[-1].split(")")[0])
+
+    # =================================================================== 3
+    print("\n3. Only what changed is parsed")
+    files = sorted(m.archive_dir.glob("*_league.json"))
+    edited = files[3]
+    d = json.loads(edited.read_text(encoding="utf-8"))
+    d["entries"] = (d.get("entries") or []) + [{"player_name": "New", "score": 9}]
+    edited.write_text(json.dumps(d, indent=2), encoding="utf-8")
+    added = m.archive_dir / "2027_W01_league.json"
+    added.write_text(files[-1].read_text(encoding="utf-8"), encoding="utf-8")
+    files[5].unlink()
+    renamed = m.archive_dir / "2030_W01_league.json"
+    files[6].rename(renamed)
+    seen.clear()
+    quiet(m.rebuild_archive_index, NOW)
+    check(sorted(seen) == sorted([edited.name, added.name, renamed.name]),
+          "an edit, an addition and a rename are parsed, nothing else (%s)"
+          % ", ".join(sorted(seen)))
+    now_idx = index(m)
+    check(now_idx == full_index(m), "and the index equals a full rebuild")
+    rows = {a["file"]: a for a in now_idx["archives"]}
+    check(files[5].name not in rows and files[5].name not in now_idx["fingerprints"]["archives"]
+          and rows[edited.name]["entry_count"] == len(d["entries"])
+          and rows[renamed.name]["week_id"] == json.loads(
+              renamed.read_text(encoding="utf-8")).get("meta", {}).get("week_id", renamed.stem),
+          "the deleted week is gone, the edited one has its new count, the renamed one "
+          "its own row")
+
+    # =================================================================== 4
+    print("\n4. Nothing stale is trusted")
+    real_key = m.index_key
+    m.index_key = lambda: "another-contract"
+    seen.clear()
+    quiet(m.rebuild_archive_index, NOW)
+    total = len(list(m.archive_dir.glob("*_league.json"))) + n_pres
+    check(len(seen) == total, "a different key (code or ladder contract) reparses all %d"
+          % total)
+    seen.clear()
+    quiet(m.rebuild_archive_index, NOW)
+    m.index_key = real_key
+    check(seen == [], "and the next run under that key reuses what it wrote")
+    seen.clear()
+    quiet(m.rebuild_archive_index, NOW)
+    check(len(seen) == total, "changing it back is another change: everything again")
+    (m.archive_dir / "index.json").write_text("{not json", encoding="utf-8")
+    seen.clear()
+    quiet(m.rebuild_archive_index, NOW)
+    check(len(seen) == total and index(m) == full_index(m),
+          "a damaged index is rebuilt from every file")
+    seen.clear()
+    quiet(m.rebuild_archive_index, NOW, full=True)
+    check(len(seen) == total, "--full parses every file regardless")
+
+    # =================================================================== 5
+    print("\n5. Archiving a week")
+    current = json.loads(files[-1].read_text(encoding="utf-8"))
+    current["week_info"] = dict(current.get("week_info") or {}, week_id="2026_W34")
+    current["meta"] = dict(current.get("meta") or {}, week_id="2026_W34")
+    current.pop("archived_at", None)
+    m.current_league_file.write_text(json.dumps(current), encoding="utf-8")
+    scans = []
+    real_scan = m._scan
+    m._scan = lambda *a, **kw: (scans.append(a[3]), real_scan(*a, **kw))[1]
+    seen.clear()
+    ok, out = quiet(m.archive_current_week, NOW)
+    m._scan = real_scan
+    check(ok and scans == [] and seen == ["2026_W34_league.json"],
+          "archive_current_week() summarises the week it wrote and scans nothing else")
+    check(index(m) == full_index(m), "and leaves the index a full rebuild would write")
+    check("2026_W34_league.json" in {a["file"] for a in index(m)["archives"]}
+          and not m.current_league_file.exists(), "the week is in the index and no longer current")
+
+    rebuilds = []
+    m.rebuild_archive_index = lambda *a, **kw: rebuilds.append(a) or True
+    m.current_league_file.write_text(json.dumps(dict(current, week_info=dict(
+        current["week_info"], week_id="2026_W35"))), encoding="utf-8")
+    ok, _ = quiet(m.start_new_week, NOW)
+    check(ok and rebuilds == [], "a rollover that archived a week does not rebuild the index")
+    m.current_league_file.unlink()
+    ok, _ = quiet(m.start_new_week, NOW)
+    check(ok and len(rebuilds) == 1, "one that archived nothing still does")
+    del m.rebuild_archive_index
+
+    # =================================================================== 6
+    print("\n6. Scale")
+    s = sandbox(tmp / "b")
+    template = files[-1].read_text(encoding="utf-8")
+    for i in range(500):
+        (s.archive_dir / ("2040_W%03d_league.json" % i)).write_text(
+            template, encoding="utf-8")
+    seen = counting(s)
+    t0 = time.perf_counter()
+    quiet(s.rebuild_archive_index, NOW)
+    cold = time.perf_counter() - t0
+    seen.clear()
+    t0 = time.perf_counter()
+    quiet(s.rebuild_archive_index, NOW)
+    warm = time.perf_counter() - t0
+    check(seen == [], "%d archived weeks: the second rebuild parses none of them"
+          % len(list(s.archive_dir.glob("*_league.json"))))
+    print("    rebuild %.0f ms cold, %.0f ms with fingerprints" % (cold * 1e3, warm * 1e3))
+finally:
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+print()
+if failures:
+    print("%d FAILURE(S)" % len(failures))
+    for f in failures:
+        print("  - " + f)
+    sys.exit(1)
+print("OK: the archive index parses only new or changed files, archiving a week")
+print("    touches one row, and every shortcut matches a full rebuild.")
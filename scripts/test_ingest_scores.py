@@ -13,6 +13,14 @@ Smoke test for scripts/ingest_scores.py -- proves the paths that matter:
      so fixtures are never shown as real player scores.
   4. meta.game_version is stamped from public/data/version.json, never from what a
      producer wrote into the seed file.
+  5. The seed file cache changes nothing but the work: a warm run publishes the
+     same board while parsing nothing, an edited file is re-parsed, a corrupt
+     cache is ignored, and a cached schema verdict still drops an invalid entry.
+  6. The k-way merge publishes the board the old collect-and-sort did -- order,
+     ties and duplicates across files included -- and --top N publishes its
+     first N entries. When two files disagree about one run, the later file's
+     copy is published, a score corrected downward included. A file already in
+     rank order is merged as it stands; only one out of order is sorted.
 
 EVERY fixture is built in a temp directory by this test. Nothing here reads
 public/leaderboard/data/ or scripts/fixtures/, so the result depends on
@@ -30,6 +38,7 @@ Run:  python scripts/test_ingest_scores.py     (exit 0 = pass)
 """
 
 import json
+import random
 import subprocess
 import sys
 import tempfile
@@ -85,6 +94,19 @@ TWO_ENTRIES = [
 ]
 
 
+def run_ingest(indir, out, cache, *flags):
+    """Run ingest_scores on indir with its seed cache at `cache` (never the repo's
+    own), and return (published document, stdout)."""
+    r = subprocess.run(
+        [PY, str(ROOT / "scripts" / "ingest_scores.py"),
+         "--input", str(indir), "--output", str(out), "--cache", str(cache), *flags],
+        capture_output=True, text=True, encoding="utf-8", errors="replace",
+        cwd=str(ROOT),
+    )
+    assert r.returncode == 0, f"ingest_scores exited {r.returncode}\n{r.stdout}\n{r.stderr}"
+    return json.loads(out.read_text(encoding="utf-8")), r.stdout
+
+
 def publish(seed_files, *flags):
     """Write seed_files ({filename: doc}) into a fresh temp dir, run ingest_scores
     against it, and return the published leaderboard document."""
@@ -93,15 +115,13 @@ def publish(seed_files, *flags):
     indir.mkdir()
     for name, doc in seed_files.items():
         (indir / name).write_text(json.dumps(doc, indent=2), encoding="utf-8")
-    out = tmp / "leaderboard.json"
-    r = subprocess.run(
-        [PY, str(ROOT / "scripts" / "ingest_scores.py"),
-         "--input", str(indir), "--output", str(out), *flags],
-        capture_output=True, text=True, encoding="utf-8", errors="replace",
-        cwd=str(ROOT),
-    )
-    assert r.returncode == 0, f"ingest_scores exited {r.returncode}\n{r.stdout}\n{r.stderr}"
-    return json.loads(out.read_text(encoding="utf-8"))
+    return run_ingest(indir, tmp / "leaderboard.json", tmp / "cache.json", *flags)[0]
+
+
+def board(doc):
+    """The published document minus its generation timestamp."""
+    return {k: v for k, v in doc.items() if k != "meta"}, \
+        {k: v for k, v in doc["meta"].items() if k != "generated"}
 
 
 def main():
@@ -175,13 +195,162 @@ def main():
           f"empty input expected pre-launch, got {empty['data_status']}")
     check(len(empty["entries"]) == 0, "empty input should publish 0 entries")
 
+    # 6. The seed file cache: same board, less work, never a stale answer.
+    tmp = Path(tempfile.mkdtemp())
+    indir, out, cache = tmp / "in", tmp / "leaderboard.json", tmp / "cache.json"
+    indir.mkdir()
+    weeks = {f"seed_leaderboard_2026{w:02d}_abc123.json":
+             seed_doc(DEPLOYED, f"week_{w}", [entry(f"P{w}", w, 1.0, f"week-{w}")])
+             for w in range(10, 16)}
+    weeks["seed_leaderboard_202609_old.json"] = seed_doc("vNOT-THE-DEPLOYED-VERSION",
+                                                         "old", TWO_ENTRIES)
+    for name, doc in weeks.items():
+        (indir / name).write_text(json.dumps(doc, indent=2), encoding="utf-8")
+
+    cold, cold_out = run_ingest(indir, out, cache)
+    uncached, _ = run_ingest(indir, out, tmp / "unused.json", "--no-cache")
+    check(board(cold) == board(uncached), "a cached run publishes what --no-cache publishes")
+    check("0 file(s) reused, 7 parsed" in cold_out,
+          f"a cold cache parses every file once: {cold_out!r}")
+    check(not (tmp / "unused.json").exists(), "--no-cache writes no cache")
+
+    warm, warm_out = run_ingest(indir, out, cache)
+    check(board(warm) == board(cold), "a warm run publishes the same board")
+    check("7 file(s) reused, 0 parsed, 0 validated" in warm_out,
+          f"a warm run parses and validates nothing: {warm_out!r}")
+    check(warm["exclusions"]["version_mismatched_entries"] == 2,
+          "an excluded file's entry count comes from the cache, not a re-read")
+
+    # An edit is new content: that file, and only that file, is parsed again.
+    edited = seed_doc(DEPLOYED, "week_15", [entry("Edited", 99, 1.0, "week-15")])
+    (indir / "seed_leaderboard_202615_abc123.json").write_text(json.dumps(edited),
+                                                              encoding="utf-8")
+    after, after_out = run_ingest(indir, out, cache)
+    check("6 file(s) reused, 1 parsed" in after_out, f"an edit re-parses one file: {after_out!r}")
+    check(after["entries"][0]["player_name"] == "Edited",
+          "and the board carries the edit, never the cached copy")
+
+    # A cache that is not ours is ignored, not trusted and not fatal.
+    cache.write_text("{ not json", encoding="utf-8")
+    broken, broken_out = run_ingest(indir, out, cache)
+    check(board(broken) == board(after) and "0 file(s) reused, 7 parsed" in broken_out,
+          "a corrupt cache is treated as empty")
+
+    # A deleted file's record leaves the cache with it.
+    (indir / "seed_leaderboard_202610_abc123.json").unlink()
+    run_ingest(indir, out, cache)
+    check(len(json.loads(cache.read_text(encoding="utf-8"))["files"]) == 6,
+          "records for files that are gone are dropped")
+
+    # The schema verdict is cached too, and a cached "invalid" still drops the entry.
+    try:
+        import jsonschema  # noqa: F401
+        have_jsonschema = True
+    except ImportError:
+        have_jsonschema = False
+    if have_jsonschema:
+        bad_entry = dict(entry("Bad", 5, 1.0, "bad-1"), score="not a number")
+        (indir / "seed_leaderboard_202620_bad.json").write_text(
+            json.dumps(seed_doc(DEPLOYED, "bad", [bad_entry, entry("Good", 6, 1.0, "good-1")])),
+            encoding="utf-8")
+        first, _ = run_ingest(indir, out, cache)
+        second, second_out = run_ingest(indir, out, cache)
+        for label, doc in (("freshly validated", first), ("cached verdict", second)):
+            names = [e["player_name"] for e in doc["entries"]]
+            check("Bad" not in names and "Good" in names
+                  and doc["exclusions"]["invalid_entries_dropped"] == 1,
+                  f"{label}: the invalid entry is dropped and counted ({names})")
+        check("0 validated" in second_out, "the verdict was reused, not recomputed")
+    else:
+        print("SKIP: jsonschema not installed -- cached schema verdicts not exercised")
+
+    # 7. The k-way merge against the collect-and-sort it replaced. Scores and
+    #    integrals are drawn from small ranges so ties are everywhere, and some runs
+    #    appear in several files -- as identical copies, which is what a re-export
+    #    is, and as revisions with another score, which is what a correction is.
+    sys.path.insert(0, str(ROOT / "scripts"))
+    import ingest_scores
+
+    def reference(streams):
+        entries = {}
+        for stream in streams:
+            for e in stream:
+                entries[ingest_scores.entry_key(e)] = e
+        return sorted(entries.values(),
+                      key=lambda e: (e.get("score", 0), e.get("doom_integral", 0)),
+                      reverse=True)
+
+    rng = random.Random(17)
+    pool = [entry(f"R{i % 9}" if i % 5 else f"NoUuid{i}", rng.randint(0, 20),
+                  float(rng.randint(0, 3)), f"run-{i}" if i % 5 else None)
+            for i in range(400)]
+    for e in pool:
+        if e["entry_uuid"] is None:
+            del e["entry_uuid"]     # identity falls back to name|score|date
+    pool += [dict(e, score=rng.randint(0, 20), doom_integral=float(rng.randint(0, 3)),
+                  player_name=e["player_name"] + "-rev")
+             for e in pool[:200] if "entry_uuid" in e]
+    agree = True
+    for _ in range(25):
+        streams = [sorted(rng.sample(pool, rng.randint(0, 60)), key=ingest_scores.adr_rank,
+                          reverse=True) for _ in range(rng.randint(1, 8))]
+        want = reference(streams)
+        agree &= list(ingest_scores.merge_ranked(streams)) == want
+        n = rng.randint(0, 30)
+        agree &= list(ingest_scores.merge_ranked(streams, n)) == want[:n]
+    check(agree, "the k-way merge (whole, and stopped at N) differs from collect-and-sort")
+
+    top = publish({
+        "seed_leaderboard_a_abc123.json": seed_doc(DEPLOYED, "a", [
+            entry("A1", 30, 1.0, "a1"), entry("A2", 10, 1.0, "a2")]),
+        "seed_leaderboard_b_abc123.json": seed_doc(DEPLOYED, "b", [
+            entry("A1", 30, 1.0, "a1"), entry("B1", 20, 1.0, "b1")]),
+    }, "--top", "2")
+    check([e["player_name"] for e in top["entries"]] == ["A1", "B1"]
+          and top["meta"]["top_n"] == 2 and top["meta"]["total_entries"] == 2,
+          f"--top 2 publishes the best 2 distinct entries and says so: {top['meta']}")
+
+    # Order is checked, not assumed: a file out of order is sorted before the
+    # merge, one in order (equal ranks included) is taken as it stands.
+    in_order = ingest_scores.in_rank_order
+    check(in_order([]) and in_order([entry("X", 1, 0.0, "x")])
+          and in_order([entry("X", 9, 2.0, "x"), entry("Y", 9, 2.0, "y"),
+                        entry("Z", 9, 1.0, "z"), entry("W", 3, 7.0, "w")]),
+          "in_rank_order rejects a list in ADR-0002 order")
+    check(not in_order([entry("X", 9, 1.0, "x"), entry("Y", 9, 2.0, "y")])
+          and not in_order([entry("X", 3, 0.0, "x"), entry("Y", 9, 0.0, "y")]),
+          "in_rank_order accepts a list out of ADR-0002 order")
+    mixed = publish({
+        "seed_leaderboard_a_abc123.json": seed_doc(DEPLOYED, "a", [
+            entry("F1", 30, 1.0, "f1"), entry("F2", 10, 1.0, "f2")]),
+        "seed_leaderboard_b_abc123.json": seed_doc(DEPLOYED, "b", [
+            entry("G2", 5, 1.0, "g2"), entry("G1", 20, 1.0, "g1")]),
+    })
+    names = [e["player_name"] for e in mixed["entries"]]
+    check(names == ["F1", "G1", "F2", "G2"],
+          f"an out-of-order seed file merges in rank order: {names}")
+
+    # A newer export (seed files sort by name, which is by date) corrected run c1
+    # down from 90 to 5. The stale 90 must not outrank the correction onto the board.
+    corrected = {
+        "seed_leaderboard_2026-01-01_abc123.json": seed_doc(DEPLOYED, "old", [
+            entry("C1", 90, 1.0, "c1"), entry("D1", 40, 1.0, "d1")]),
+        "seed_leaderboard_2026-02-01_abc123.json": seed_doc(DEPLOYED, "new", [
+            entry("E1", 50, 1.0, "e1"), entry("C1", 5, 1.0, "c1")]),
+    }
+    for flags in ((), ("--top", "2")):
+        doc = publish(corrected, *flags)
+        got = [(e["player_name"], e["score"]) for e in doc["entries"]]
+        want = [("E1", 50), ("D1", 40), ("C1", 5)][:2 if flags else 3]
+        check(got == want, f"later file's copy wins {' '.join(flags)}: {got} != {want}")
+
     if failures:
         print("FAIL:")
         for f in failures:
             print("  -", f)
         sys.exit(1)
     print(f"PASS: live/pre-launch/legacy paths, ADR-0002 sort + tiebreak, "
-          f"test-seed exclusion, version stamp pinned to {DEPLOYED} "
+          f"test-seed exclusion, version stamp pinned to {DEPLOYED}, seed cache, k-way merge "
           f"(all fixtures built in temp dirs -- no live-data dependency)")
 
 
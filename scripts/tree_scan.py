@@ -0,0 +1,392 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""One walk, one read per file, every tree guard fed from it -- with a cache.
+
+THE PROBLEM THIS SOLVES
+-----------------------
+Five guards read the same ~100 MB tree, each with its own walk and its own
+open():
+
+  check-published-emails.py     public/  (twice: scan() and scan_residue())
+  check-stale-facts.py          public/, scripts/, .github/workflows/
+  check-platform-claims.py      the reachable pages under public/
+  check-token-drift.py          public/**/*.html
+  check-control-characters.py   every tracked text file
+
+That is roughly six full reads of the tree per CI run, and all but a handful
+of the files are byte-identical to the last time anyone looked at them.
+
+WHAT THIS DOES
+--------------
+A guard describes what it wants as a Checker -- a name, a `select(rel)`
+predicate on the repo-relative POSIX path, a `check(scanned_file)` function,
+and a `key` naming everything its result depends on OTHER than the file's
+bytes. scan() then walks the union of the checkers' roots ONCE, reads each
+selected file ONCE (mmap above MMAP_MIN_BYTES), decodes it ONCE, and hands the
+same text to every checker that selected it.
+
+Results go into an on-disk cache keyed by (path, mtime_ns, size) per checker.
+A file whose stat has not moved is not opened at all.
+
+WHAT THE CACHE MUST NEVER DO: ANSWER FOR A FILE IT HAS NOT SEEN
+---------------------------------------------------------------
+A guard that reports PASS off a stale cache entry is worse than a slow guard,
+so every way an entry can outlive its truth is closed explicitly:
+
+  * The checker's `key` changed -> that checker's whole section is dropped.
+    Keys hash the checker's own source (and this module's), plus any input
+    the result depends on: the current game version, today's date, the token
+    palette. Editing a rule invalidates every answer the old rule gave.
+  * The file's mtime_ns or size changed -> rescanned.
+  * THE RACY WINDOW. Filesystem timestamps are coarse (a jiffy, 1-4 ms on
+    Linux; 2 s on FAT). A file rewritten inside the same tick as the scan
+    that cached it, at the same size, would present an identical stat with
+    different bytes. Same hazard git calls "racy git", same remedy: an entry
+    whose mtime is within RACY_NS of the moment the cache was written is
+    never trusted, only re-read.
+  * The cache file is unreadable, malformed, or from another CACHE_VERSION ->
+    treated as empty. A cache is an optimisation; it is never an input.
+
+Results must be JSON-serialisable, because that is what the cache stores.
+Anything a checker would not want written to a local file does not go in its
+result -- check-published-emails.py stores address DIGESTS, never addresses.
+
+The cache lives at <root>/.scan-cache/, which is gitignored and outside
+public/, so it is neither committed nor deployed. A sandbox root gets its own.
+
+SHARING ACROSS SCRIPTS
+----------------------
+Each guard still runs as its own CI step with its own exit code -- folding
+five verdicts into one would make a red step say less. The sharing happens
+through the cache: `python scripts/tree_scan.py` loads every registered
+guard's checkers and runs ONE scan for all of them, so each guard after it
+stats its files and reads none. content-honesty.yml runs that first.
+
+USAGE
+-----
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import tree_scan
+
+    checker = tree_scan.Checker("my-guard", key, select, check,
+                                roots=("public",))
+    result = tree_scan.scan([checker])
+    for rel, value in result.results["my-guard"].items(): ...
+
+CLI:
+    python scripts/tree_scan.py               # warm the cache for every guard
+    python scripts/tree_scan.py --no-cache    # full walk, report the cost
+"""
+
+import argparse
+import codecs
+import hashlib
+import importlib.util
+import json
+import mmap
+import os
+import stat
+import sys
+import time
+from pathlib import Path
+
+for _stream in (sys.stdout, sys.stderr):
+    try:
+        _stream.reconfigure(encoding="utf-8", errors="replace")
+    except (AttributeError, ValueError):
+        pass
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPTS_DIR.parent
+
+CACHE_DIR_NAME = ".scan-cache"
+CACHE_FILE_NAME = "tree-scan.json"
+CACHE_VERSION = 1
+
+# Files at or above this are mapped rather than read into a bytes object, so
+# the only full copy in memory is the decoded text every checker shares. The
+# multi-megabyte JSON files under public/data/ are the ones this is for.
+MMAP_MIN_BYTES = 1 << 20
+
+# See "THE RACY WINDOW" above. Two seconds covers the coarsest timestamp
+# resolution in common use (FAT), which is what git settles on too.
+RACY_NS = 2_000_000_000
+
+# Never descended into. No registered guard reads any of these: the cache is
+# our own output, and the rest are either version control or build debris.
+PRUNE_DIRS = {".git", "node_modules", "__pycache__", CACHE_DIR_NAME}
+
+# The guards `python scripts/tree_scan.py` warms the cache for. Each exposes
+# scan_checkers(), returning the Checkers its own main() would use.
+REGISTERED = (
+    "check-published-emails.py",
+    "check-stale-facts.py",
+    "check-platform-claims.py",
+    "check-token-drift.py",
+    "check-control-characters.py",
+)
+
+
+class Checker:
+    """One guard's view of the tree.
+
+    `select(rel)` is called with the repo-relative POSIX path of every file
+    under `roots`; `check(scanned_file)` is called for each selected file whose
+    cached result is missing or untrustworthy, and returns a JSON-serialisable
+    value (None is a value, and is cached like any other).
+
+    `key` must change whenever the answer for unchanged bytes could change.
+    Build it with fingerprint().
+    """
+
+    def __init__(self, name, key, select, check, roots=("",)):
+        self.name = name
+        self.key = key
+        self.select = select
+        self.check = check
+        self.roots = tuple(r.strip("/") for r in roots)
+
+    def __repr__(self):
+        return f"<Checker {self.name} roots={self.roots}>"
+
+
+class ScannedFile:
+    """A selected file, read and decoded at most once, on first use.
+
+    `text` is UTF-8 decoded with errors="replace" and NO newline translation,
+    which is what check-published-emails.py has always read -- a CRLF file
+    round-trips. `valid_utf8` says whether the strict decode would have
+    succeeded, for the guards that skip undecodable files. A read error
+    propagates from `text` so each checker keeps its own policy for it.
+    """
+
+    def __init__(self, root, rel, size):
+        self.root = root
+        self.rel = rel
+        self.path = root / rel
+        self.size = size
+        self._text = None
+        self._valid = None
+        self.reads = 0
+
+    def _load(self):
+        self.reads += 1
+        with open(self.path, "rb") as f:
+            if self.size >= MMAP_MIN_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    self._decode(mm)
+            else:
+                self._decode(f.read())
+
+    def _decode(self, buf):
+        try:
+            self._text = codecs.utf_8_decode(buf, "strict", True)[0]
+            self._valid = True
+        except UnicodeDecodeError:
+            self._text = codecs.utf_8_decode(buf, "replace", True)[0]
+            self._valid = False
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._load()
+        return self._text
+
+    @property
+    def valid_utf8(self):
+        if self._valid is None:
+            self._load()
+        return self._valid
+
+    def universal_text(self):
+        """`text` with \\r\\n and lone \\r folded to \\n -- exactly what
+        open(..., "r") without newline="" produces, for the guards that read
+        that way and count lines on it."""
+        text = self.text
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
+
+
+class ScanResult:
+    """`results[name]` maps rel -> result for every file that checker selected,
+    in path order. The counters say what the cache saved."""
+
+    def __init__(self):
+        self.results = {}
+        self.walked = 0
+        self.read = 0
+        self.cached = 0
+        self.computed = 0
+
+    def summary(self):
+        return (f"{self.walked} file(s) walked, {self.read} read, "
+                f"{self.computed} result(s) computed, {self.cached} from cache")
+
+
+def fingerprint(*parts):
+    """A cache key over this module, plus every part: a Path contributes its
+    bytes (or a marker if it is absent), anything else its repr()."""
+    h = hashlib.sha256()
+    h.update(Path(__file__).read_bytes())
+    for part in parts:
+        if isinstance(part, Path):
+            try:
+                h.update(b"F" + part.read_bytes())
+            except OSError:
+                h.update(b"MISSING")
+        else:
+            h.update(b"V" + repr(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def cache_path(root):
+    return Path(root) / CACHE_DIR_NAME / CACHE_FILE_NAME
+
+
+def _load_cache(path):
+    try:
+        doc = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(doc, dict) or doc.get("version") != CACHE_VERSION:
+        return None
+    if not isinstance(doc.get("written_ns"), int) or not isinstance(doc.get("checkers"), dict):
+        return None
+    return doc
+
+
+def _save_cache(path, doc):
+    """Atomic: a crash mid-write leaves the previous cache, never half of one."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(doc, separators=(",", ":"), ensure_ascii=False),
+                   encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _under(rel_dir, roots):
+    """Could a file under `rel_dir` fall under one of `roots`?"""
+    for r in roots:
+        if not r or rel_dir == r or rel_dir.startswith(r + "/") or r.startswith(rel_dir + "/"):
+            return True
+    return False
+
+
+def walk(root, roots=("",)):
+    """Yield (rel, stat_result) for every regular file under `roots`, sorted the
+    way sorted(Path.rglob()) sorts -- by path components, not by string."""
+    root = Path(root)
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+        rel_dir = "" if rel_dir == "." else rel_dir
+        dirnames[:] = [d for d in dirnames if d not in PRUNE_DIRS
+                       and _under(f"{rel_dir}/{d}" if rel_dir else d, roots)]
+        for name in filenames:
+            rel = f"{rel_dir}/{name}" if rel_dir else name
+            if not any(not r or rel.startswith(r + "/") for r in roots):
+                continue
+            try:
+                st = os.stat(os.path.join(dirpath, name))
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                found.append((rel, st))
+    found.sort(key=lambda item: item[0].split("/"))
+    return found
+
+
+def scan(checkers, root=None, use_cache=True):
+    """Walk once, read each selected file at most once, feed every checker."""
+    root = Path(root) if root is not None else REPO_ROOT
+    out = ScanResult()
+    for c in checkers:
+        out.results[c.name] = {}
+    if not checkers:
+        return out
+
+    cpath = cache_path(root)
+    doc = _load_cache(cpath) if use_cache else None
+    trusted_before = doc["written_ns"] - RACY_NS if doc else 0
+    old = {}
+    for c in checkers:
+        section = (doc or {}).get("checkers", {}).get(c.name)
+        if isinstance(section, dict) and section.get("key") == c.key:
+            old[c.name] = section.get("files") or {}
+        else:
+            old[c.name] = {}
+    new = {c.name: {} for c in checkers}
+
+    roots = tuple({r for c in checkers for r in c.roots})
+    for rel, st in walk(root, roots):
+        out.walked += 1
+        wanting = [c for c in checkers
+                   if any(not r or rel.startswith(r + "/") for r in c.roots)
+                   and c.select(rel)]
+        if not wanting:
+            continue
+        scanned = None
+        for c in wanting:
+            hit = old[c.name].get(rel)
+            if (hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size
+                    and st.st_mtime_ns < trusted_before):
+                result = hit[2]
+                out.cached += 1
+            else:
+                if scanned is None:
+                    scanned = ScannedFile(root, rel, st.st_size)
+                result = c.check(scanned)
+                out.computed += 1
+            out.results[c.name][rel] = result
+            new[c.name][rel] = [st.st_mtime_ns, st.st_size, result]
+        if scanned is not None:
+            out.read += scanned.reads
+
+    if use_cache:
+        # Sections for checkers not in this run are kept as they were: a guard
+        # run on its own must not evict what the warm-up stored for the others.
+        merged = dict((doc or {}).get("checkers", {}))
+        for c in checkers:
+            merged[c.name] = {"key": c.key, "files": new[c.name]}
+        try:
+            _save_cache(cpath, {"version": CACHE_VERSION,
+                                "written_ns": time.time_ns(),
+                                "checkers": merged})
+        except OSError as e:
+            # A read-only checkout still gets a correct answer, just a slow one.
+            print(f"  note: scan cache not written ({e})", file=sys.stderr)
+    return out
+
+
+def load_registered():
+    """Every registered guard's checkers, as its own main() would build them."""
+    checkers = []
+    for name in REGISTERED:
+        spec = importlib.util.spec_from_file_location(
+            name[:-3].replace("-", "_"), SCRIPTS_DIR / name)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        checkers.extend(module.scan_checkers())
+    return checkers
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--no-cache", action="store_true",
+                    help="ignore and do not write the cache (measures a cold run)")
+    args = ap.parse_args()
+
+    checkers = load_registered()
+    t0 = time.perf_counter()
+    result = scan(checkers, use_cache=not args.no_cache)
+    elapsed = time.perf_counter() - t0
+    print(f"Shared tree scan: {len(checkers)} checker(s): "
+          + ", ".join(c.name for c in checkers))
+    print(f"  {result.summary()} in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,6 +29,9 @@ import sys
 from datetime import datetime, timezone, date
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import schema_compiler  # noqa: E402
+
 # Windows consoles default to cp1252: the first non-ASCII byte written to stdout
 # raises UnicodeEncodeError and kills the script before it does any work. No-op
 # on UTF-8 platforms. See CLAUDE.md "Environment / tooling".
@@ -57,19 +60,12 @@ def load_json(path):
     return json.loads(Path(path).read_text(encoding="utf-8"))
 
 
-# ---- schema validation (jsonschema preferred; degrade gracefully) --------------
+# ---- schema validation (compiled verdict; jsonschema for the report) -----------
+# scripts/schema_compiler.py turns each schema into plain Python once, cached in
+# .schema-cache/. A valid file -- the normal case -- is settled by that alone.
+# jsonschema is asked only to say WHERE a file is invalid, or when a schema uses a
+# keyword the compiler does not implement.
 def validate_schema(name, data_path, schema_name):
-    try:
-        import jsonschema
-        from jsonschema import Draft7Validator
-        from referencing import Registry, Resource
-    except Exception:
-        # Fallback: jsonschema present but no referencing (older), or absent.
-        try:
-            import jsonschema  # noqa
-        except Exception:
-            add(f"schema:{name}", WARN, "jsonschema not installed -- schema check skipped (pip install jsonschema)")
-            return
     try:
         data = load_json(data_path)
     except FileNotFoundError:
@@ -79,6 +75,27 @@ def validate_schema(name, data_path, schema_name):
         add(f"schema:{name}", FAIL, f"{data_path} is not valid JSON: {e}")
         return
 
+    compiled_invalid = False
+    try:
+        if schema_compiler.load(schema_name, schemas_dir=SCHEMAS).is_valid(data):
+            add(f"schema:{name}", OK, "valid")
+            return
+        compiled_invalid = True
+    except Exception:
+        # Unsupported (a keyword the compiler does not implement) or anything else:
+        # jsonschema below is the reference either way.
+        pass
+
+    try:
+        import jsonschema  # noqa: F401
+    except Exception:
+        if compiled_invalid:
+            add(f"schema:{name}", FAIL,
+                "violates the contract (pip install jsonschema to see where)")
+        else:
+            add(f"schema:{name}", WARN, "jsonschema not installed -- schema check skipped (pip install jsonschema)")
+        return
+
     schema = load_json(SCHEMAS / schema_name)
     try:
         import jsonschema
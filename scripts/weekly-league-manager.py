@@ -7,6 +7,9 @@ This script manages the weekly league competition system:
 2. Manage league resets and archival
 3. Track weekly standings and statistics
 4. Handle season management
+5. Keep archive/index.json and the columnar league history
+   (scripts/league_history.py: every archived and preserved entry, plus per-player
+   and per-epoch aggregates) in step with the archive, one changed file at a time
 
 Usage:
     python scripts/weekly-league-manager.py --status          # Show current league status
@@ -24,6 +27,9 @@ from typing import Dict, Any, Optional
 import hashlib
 import random
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import league_history  # noqa: E402
+
 for _s in (sys.stdout, sys.stderr):
     try: _s.reconfigure(encoding="utf-8", errors="replace")
     except (AttributeError, ValueError): pass
@@ -644,10 +650,12 @@ class WeeklyLeagueManager:
         print(f"EPOCH: {week_info['epoch']['id']} "
               f"(anomalous={week_info['epoch']['anomalous']})")
 
-        # Archive current week if it exists
+        # Archive current week if it exists. Archiving keeps the archive index
+        # current itself; only a rollover that archived nothing rebuilds it below.
+        archived = False
         if self.current_league_file.exists():
             print("ARCHIVE: Archiving previous week...")
-            self.archive_current_week(now)
+            archived = self.archive_current_week(now)
 
         # Create new league data structure
         new_league_data = {
@@ -709,7 +717,8 @@ class WeeklyLeagueManager:
             self.config["current_seed"] = new_seed
             self.save_config()
 
-            self.rebuild_archive_index()
+            if not archived:
+                self.rebuild_archive_index()
 
             return True
 
@@ -755,7 +764,7 @@ class WeeklyLeagueManager:
             self.current_league_file.unlink()
             print("SUCCESS: Current league file removed")
 
-            self.rebuild_archive_index(now)
+            self.record_archive(archive_path, league_data, now)
 
             return True
 
@@ -780,43 +789,197 @@ class WeeklyLeagueManager:
         capture lives on branch `data/preserve-orphaned-boards`; the moment it
         merges, any rollover or `--rebuild-archive-index` lights this up.)
         """
+        return self._scan_preserved({})[0]
+
+    def _scan_preserved(self, known: Dict[str, Any]) -> tuple:
+        """(rows, fingerprints, parsed) for the preserved boards; see _scan()."""
         root = self.league_data_dir.parent / "preserved"
-        out = []
         if not root.exists():
-            return out
-        for path in sorted(root.glob("*/*.json")):
-            if path.name.lower() in ("index.json", "readme.json"):
-                continue
+            return [], {}, 0
+        paths = [p for p in sorted(root.glob("*/*.json"))
+                 if p.name.lower() not in ("index.json", "readme.json")]
+        return self._scan(paths, known, self._preserved_row, "preserved board",
+                          lambda p: f"{p.parent.name}/{p.name}")
+
+    @staticmethod
+    def _preserved_row(path: Path, d: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        entries = d.get("entries") or []
+        if not isinstance(entries, list):
+            return None
+        dates = sorted(str(e.get("date")) for e in entries if e.get("date"))
+        players = sorted({str(e.get("player_name")) for e in entries
+                          if e.get("player_name")})
+        version = d.get("version")
+        return {
+            "file": f"{path.parent.name}/{path.name}",
+            "captured": path.parent.name,
+            "seed": d.get("seed"),
+            "version": version,
+            # `L<n>` is a ladder epoch; anything else is a build version, i.e.
+            # a board forked by the OLD (seed, game_version) keying.
+            "key_kind": "ladder" if isinstance(version, str) and version.startswith("L")
+                        else "build-version (pre-split keying)",
+            "board_key": f"({d.get('seed')}, {version})",
+            "entry_count": len(entries),
+            "players": players,
+            "first_entry": dates[0] if dates else None,
+            "last_entry": dates[-1] if dates else None,
+        }
+
+    @staticmethod
+    def _archive_row(path: Path, d: Dict[str, Any]) -> Dict[str, Any]:
+        meta = d.get("meta") or {}
+        wi = d.get("week_info") or {}
+        start = wi.get("start_timestamp") or wi.get("start_date")
+        epoch = d.get("epoch") or wi.get("epoch")
+        if not epoch and start:
             try:
-                d = json.loads(path.read_text(encoding="utf-8"))
-            except Exception as e:
-                print(f"WARNING: skipping unreadable preserved board {path.name}: {e}")
-                continue
-            entries = d.get("entries") or []
-            if not isinstance(entries, list):
+                epoch = epoch_for(datetime.fromisoformat(str(start).replace("Z", "+00:00")))
+            except ValueError:
+                epoch = None
+        return {
+            "week_id": meta.get("week_id") or wi.get("week_id") or path.stem,
+            "season": meta.get("season"),
+            "year": wi.get("year"),
+            "week_number": wi.get("week_number"),
+            "start_date": wi.get("start_date"),
+            "end_date": wi.get("end_date"),
+            "file": path.name,
+            "archived_at": d.get("archived_at"),
+            "game_version": meta.get("game_version"),
+            "entry_count": len(d.get("entries") or []),
+            "epoch": epoch,
+        }
+
+    # --- Archive index fingerprints ----------------------------------------
+    #
+    # Every rollover used to open and parse all of archive/*_league.json and every
+    # preserved board to rebuild index.json -- one more file each week, forever --
+    # although a file is never edited once archived. index.json now keeps the
+    # SHA-256 of every file it summarised:
+    #
+    #   "fingerprints": {"key": <hash of this script + the ladder contract>,
+    #                    "archives": {"2026_W33_league.json": <sha256>, ...},
+    #                    "preserved": {"<captured>/<file>": <sha256>, ...}}
+    #
+    # A rebuild reads each file's bytes, and parses only those whose hash is not
+    # recorded; the rest keep their row from the previous index. Keyed by CONTENT,
+    # as ingest_scores.py keys its seed cache: a restamped or hand-edited archive
+    # (stamp-league-epoch.py rewrites them) misses and is re-summarised, and a
+    # fresh checkout, where every mtime is new, still hits. The key covers what a
+    # row is derived from besides the file: the code that builds it and the ladder
+    # contract epoch_for() reads. A different key, or an index that is missing or
+    # unreadable, rebuilds everything; so does --full.
+    #
+    # Archiving a week does not rebuild at all: archive_current_week() hands the
+    # one record it just wrote to record_archive(), which replaces that row and
+    # recomputes the totals from the rows already in the index. The index lives in
+    # the repo, so the fingerprints survive between workflow runs.
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def index_key() -> str:
+        h = hashlib.sha256(Path(__file__).read_bytes())
+        h.update((Path(__file__).parent.parent / LADDER_CONTRACT_REL).read_bytes())
+        return h.hexdigest()
+
+    def load_archive_index(self) -> Optional[Dict[str, Any]]:
+        """The current index.json if its rows can be reused, else None."""
+        try:
+            d = json.loads((self.archive_dir / "index.json").read_text(encoding="utf-8"))
+            prints = d["fingerprints"]
+            if (prints["key"] == self.index_key() and isinstance(d["archives"], list)
+                    and isinstance(d.get("preserved_boards", []), list)
+                    and isinstance(prints["archives"], dict)
+                    and isinstance(prints["preserved"], dict)):
+                return d
+        except Exception:
+            pass
+        return None
+
+    @staticmethod
+    def _known(rows: list, prints: Dict[str, str]) -> Dict[str, Any]:
+        """{(file, sha256): row} from a previous index. A row is derived from the
+        file's name as well as its bytes (week_id falls back to it, `captured` is
+        its directory), so both must match. A fingerprint with no row is a file
+        that was read and deliberately left out (e.g. a board with no entry list)."""
+        by_file = {r.get("file"): r for r in rows if isinstance(r, dict)}
+        return {(name, digest): by_file.get(name) for name, digest in prints.items()}
+
+    def _scan(self, paths: list, known: Dict[str, Any], summarise, kind: str,
+              name=lambda p: p.name) -> tuple:
+        """(rows, fingerprints, parsed): one row per file, reused from `known` by
+        content hash where possible, parsed and summarised otherwise."""
+        rows, prints, parsed = [], {}, 0
+        for path in paths:
+            try:
+                raw = path.read_bytes()
+            except OSError as e:
+                print(f"WARNING: skipping unreadable {kind} {path.name}: {e}")
                 continue
-            dates = sorted(str(e.get("date")) for e in entries if e.get("date"))
-            players = sorted({str(e.get("player_name")) for e in entries
-                              if e.get("player_name")})
-            version = d.get("version")
-            out.append({
-                "file": f"{path.parent.name}/{path.name}",
-                "captured": path.parent.name,
-                "seed": d.get("seed"),
-                "version": version,
-                # `L<n>` is a ladder epoch; anything else is a build version, i.e.
-                # a board forked by the OLD (seed, game_version) keying.
-                "key_kind": "ladder" if isinstance(version, str) and version.startswith("L")
-                            else "build-version (pre-split keying)",
-                "board_key": f"({d.get('seed')}, {version})",
-                "entry_count": len(entries),
-                "players": players,
-                "first_entry": dates[0] if dates else None,
-                "last_entry": dates[-1] if dates else None,
-            })
-        return out
-
-    def rebuild_archive_index(self, now: Optional[datetime] = None) -> bool:
+            digest = hashlib.sha256(raw).hexdigest()
+            if (name(path), digest) in known:
+                row = known[(name(path), digest)]
+            else:
+                try:
+                    d = json.loads(raw.decode("utf-8"))
+                except Exception as e:
+                    print(f"WARNING: skipping unreadable {kind} {path.name}: {e}")
+                    continue
+                parsed += 1
+                row = summarise(path, d) if isinstance(d, dict) else None
+            prints[name(path)] = digest
+            if row is not None:
+                rows.append(row)
+        return rows, prints, parsed
+
+    def _write_archive_index(self, archives: list, preserved: list,
+                             prints: Dict[str, Any], now: datetime) -> int:
+        """Write index.json from summarised rows; returns the anomalous count."""
+        anomalous = [a for a in archives if (a.get("epoch") or {}).get("anomalous")]
+        contract = ladder_contract()
+        cut = contract["regularised_from"]
+        payload = {
+            "archives": archives,
+            "total_archives": len(archives),
+            "seasons": sorted({a["season"] for a in archives if a.get("season")}),
+            # Boards captured from the live API that the website never
+            # published. Derived from the directory, so this key is absent
+            # when there is nothing to show and the page claims nothing.
+            "preserved_boards": preserved,
+            "epochs": {
+                "ladder_version": cut["ladder_version"],
+                "board_key": contract.get("board_key"),
+                "board_opens_local": cut.get("board_opens_local"),
+                "board_opens_confirmed": bool(cut.get("board_opens_confirmed")),
+                "boundary_local": epoch_boundary().isoformat(),
+                "boundary_tz": LEAGUE_TZ_NAME,
+                "boundary_utc": as_utc(epoch_boundary()).isoformat().replace("+00:00", "Z"),
+                "boundary_why": cut.get("boundary_why"),
+                "see": EPOCH_DOC,
+                EPOCH_PRE_ID: {
+                    "count": len(anomalous),
+                    "anomalous": True,
+                    "reason": cut["reason_pre"],
+                },
+                EPOCH_POST_ID: {
+                    "count": len(archives) - len(anomalous),
+                    "anomalous": False,
+                    "reason": cut["reason_post"],
+                },
+            },
+            "last_updated": iso_z(now),
+            "fingerprints": {"key": self.index_key(), **prints},
+        }
+        index_path = self.archive_dir / "index.json"
+        tmp = index_path.with_name(index_path.name + ".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        tmp.replace(index_path)
+        return len(anomalous)
+
+    def rebuild_archive_index(self, now: Optional[datetime] = None,
+                              full: bool = False) -> bool:
         """Regenerate archive/index.json from the archive files that exist.
 
         Nothing used to write this file after the initial hand-authored version:
@@ -824,84 +987,106 @@ class WeeklyLeagueManager:
         was frozen at 2025-10-31. The archive page reads ONLY the index, so 38
         weeks of pre-history were invisible. Rebuilding from the directory makes
         the index a derived fact instead of a stale assertion.
+
+        Only new or changed files are parsed (see "Archive index fingerprints"
+        above); `full` parses every one regardless.
         """
         now = as_utc(now if now is not None else datetime.now(timezone.utc))
         index_path = self.archive_dir / "index.json"
-        archives = []
         try:
-            for path in sorted(self.archive_dir.glob("*_league.json")):
-                try:
-                    with open(path, 'r', encoding='utf-8') as f:
-                        d = json.load(f)
-                except Exception as e:
-                    print(f"WARNING: skipping unreadable archive {path.name}: {e}")
-                    continue
-                meta = d.get("meta") or {}
-                wi = d.get("week_info") or {}
-                start = wi.get("start_timestamp") or wi.get("start_date")
-                epoch = d.get("epoch") or wi.get("epoch")
-                if not epoch and start:
-                    try:
-                        epoch = epoch_for(datetime.fromisoformat(str(start).replace("Z", "+00:00")))
-                    except ValueError:
-                        epoch = None
-                archives.append({
-                    "week_id": meta.get("week_id") or wi.get("week_id") or path.stem,
-                    "season": meta.get("season"),
-                    "year": wi.get("year"),
-                    "week_number": wi.get("week_number"),
-                    "start_date": wi.get("start_date"),
-                    "end_date": wi.get("end_date"),
-                    "file": path.name,
-                    "archived_at": d.get("archived_at"),
-                    "game_version": meta.get("game_version"),
-                    "entry_count": len(d.get("entries") or []),
-                    "epoch": epoch,
-                })
-
-            anomalous = [a for a in archives if (a.get("epoch") or {}).get("anomalous")]
-            contract = ladder_contract()
-            cut = contract["regularised_from"]
-            payload = {
-                "archives": archives,
-                "total_archives": len(archives),
-                "seasons": sorted({a["season"] for a in archives if a.get("season")}),
-                # Boards captured from the live API that the website never
-                # published. Derived from the directory, so this key is absent
-                # when there is nothing to show and the page claims nothing.
-                "preserved_boards": self.scan_preserved_boards(),
-                "epochs": {
-                    "ladder_version": cut["ladder_version"],
-                    "board_key": contract.get("board_key"),
-                    "board_opens_local": cut.get("board_opens_local"),
-                    "board_opens_confirmed": bool(cut.get("board_opens_confirmed")),
-                    "boundary_local": epoch_boundary().isoformat(),
-                    "boundary_tz": LEAGUE_TZ_NAME,
-                    "boundary_utc": as_utc(epoch_boundary()).isoformat().replace("+00:00", "Z"),
-                    "boundary_why": cut.get("boundary_why"),
-                    "see": EPOCH_DOC,
-                    EPOCH_PRE_ID: {
-                        "count": len(anomalous),
-                        "anomalous": True,
-                        "reason": cut["reason_pre"],
-                    },
-                    EPOCH_POST_ID: {
-                        "count": len(archives) - len(anomalous),
-                        "anomalous": False,
-                        "reason": cut["reason_post"],
-                    },
-                },
-                "last_updated": iso_z(now),
-            }
-            with open(index_path, 'w', encoding='utf-8') as f:
-                json.dump(payload, f, indent=2, ensure_ascii=False)
+            prior = None if full else self.load_archive_index()
+            prior = prior or {"archives": [], "preserved_boards": [],
+                              "fingerprints": {"archives": {}, "preserved": {}}}
+            archives, archive_prints, parsed = self._scan(
+                sorted(self.archive_dir.glob("*_league.json")),
+                self._known(prior["archives"], prior["fingerprints"]["archives"]),
+                self._archive_row, "archive")
+            preserved, preserved_prints, parsed_preserved = self._scan_preserved(
+                self._known(prior.get("preserved_boards", []),
+                            prior["fingerprints"]["preserved"]))
+            anomalous = self._write_archive_index(
+                archives, preserved,
+                {"archives": archive_prints, "preserved": preserved_prints}, now)
             print(f"SUCCESS: Rebuilt archive index ({len(archives)} weeks, "
-                  f"{len(anomalous)} anomalous): {index_path}")
-            return True
+                  f"{anomalous} anomalous; parsed {parsed} of {len(archive_prints)} "
+                  f"archive(s) and {parsed_preserved} of {len(preserved_prints)} "
+                  f"preserved board(s), the rest unchanged): {index_path}")
         except Exception as e:
             print(f"ERROR: Failed to rebuild archive index: {e}")
             return False
-    
+        return self.rebuild_league_history(now, full)
+
+    def history_sources(self) -> list:
+        """(source, name, path) for every file the league history store holds:
+        the same archives and preserved boards the archive index summarises."""
+        sources = [("archive", p.name, p)
+                   for p in sorted(self.archive_dir.glob("*_league.json"))]
+        root = self.league_data_dir.parent / "preserved"
+        if root.exists():
+            sources += [("preserved", f"{p.parent.name}/{p.name}", p)
+                        for p in sorted(root.glob("*/*.json"))
+                        if p.name.lower() not in ("index.json", "readme.json")]
+        return sources
+
+    def rebuild_league_history(self, now: Optional[datetime] = None,
+                               full: bool = False) -> bool:
+        """Bring the columnar league history (scripts/league_history.py) and its
+        published aggregates up to date with the archive, parsing only new or
+        changed files unless `full`."""
+        now = as_utc(now if now is not None else datetime.now(timezone.utc))
+        try:
+            path = league_history.history_paths(self.league_data_dir)["store"]
+            prior = None if full else league_history.load(path)
+            store, parsed = league_history.build(self.history_sources(), prior)
+            league_history.write(store, self.league_data_dir, iso_z(now))
+            print(f"SUCCESS: League history holds {len(store)} entries from "
+                  f"{len(store.segments)} boards (parsed {parsed}): {path}")
+            return True
+        except Exception as e:
+            print(f"ERROR: Failed to rebuild league history: {e}")
+            return False
+
+    def record_archive(self, archive_path: Path, league_data: Dict[str, Any],
+                       now: Optional[datetime] = None) -> bool:
+        """Put one just-archived week into index.json without rescanning the archive.
+
+        Replaces (or adds) that file's row and fingerprint and recomputes the
+        totals from the rows already in the index; no other archive is opened.
+        Falls back to rebuild_archive_index() when there is no reusable index.
+        """
+        now = as_utc(now if now is not None else datetime.now(timezone.utc))
+        prior = self.load_archive_index()
+        if prior is None:
+            return self.rebuild_archive_index(now)
+        try:
+            name = archive_path.name
+            archives = sorted([a for a in prior["archives"] if a.get("file") != name]
+                              + [self._archive_row(archive_path, league_data)],
+                              key=lambda a: str(a.get("file")))
+            prints = prior["fingerprints"]
+            digest = hashlib.sha256(archive_path.read_bytes()).hexdigest()
+            prints["archives"][name] = digest
+            anomalous = self._write_archive_index(
+                archives, prior.get("preserved_boards", []),
+                {"archives": prints["archives"], "preserved": prints["preserved"]}, now)
+            print(f"SUCCESS: Added {name} to the archive index ({len(archives)} weeks, "
+                  f"{anomalous} anomalous): {self.archive_dir / 'index.json'}")
+        except Exception as e:
+            print(f"ERROR: Failed to update archive index: {e}")
+            return False
+        # The league history takes the same one record, the same way.
+        store = league_history.load(league_history.history_paths(self.league_data_dir)["store"])
+        if store is None:
+            return self.rebuild_league_history(now)
+        try:
+            store = league_history.replace(store, "archive", name, league_data, digest)
+            league_history.write(store, self.league_data_dir, iso_z(now))
+            print(f"SUCCESS: Added {name} to the league history ({len(store)} entries)")
+            return True
+        except Exception as e:
+            print(f"ERROR: Failed to update league history: {e}")
+            return False
+
     def get_league_standings(self) -> Optional[Dict[str, Any]]:
         """Get current league standings with rankings."""
         if not self.current_league_file.exists():
@@ -957,6 +1142,9 @@ def main():
     parser.add_argument("--week-id", type=str, help="Specify week ID (for seed generation)")
     parser.add_argument("--rebuild-archive-index", action="store_true",
                         help="Regenerate archive/index.json from the archive files on disk")
+    parser.add_argument("--full", action="store_true",
+                        help="With --rebuild-archive-index: parse every file, ignoring "
+                             "the fingerprints of the previous index")
     parser.add_argument("--as-of", type=str, metavar="ISO8601",
                         help="Pretend the run happens at this instant "
                              "(e.g. 2026-08-06T14:00:00Z, the rollover that opens the "
@@ -1001,7 +1189,7 @@ def main():
             sys.exit(0 if success else 1)
 
         elif args.rebuild_archive_index:
-            success = manager.rebuild_archive_index(now)
+            success = manager.rebuild_archive_index(now, full=args.full)
             sys.exit(0 if success else 1)
 
         elif args.generate_seed:
@@ -1046,6 +1234,7 @@ def main():
             print("   --generate-seed   Generate new competitive seed")
             print("   --standings       Show current league standings")
             print("   --rebuild-archive-index  Regenerate archive/index.json from disk")
+            print("                     (only new or changed files; add --full for all)")
             print("   --as-of ISO8601   Pin the run instant (testing / backfill)")
 
             # Show current status